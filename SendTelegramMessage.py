@@ -4,6 +4,7 @@ from telegram import Bot
 from config import *
 
 async def send_telegram_message(message):
+    validate_telegram_config()
     bot = Bot(token=TelegramToken)
     for chat_id in TelegramChatID:
         await bot.send_message(chat_id=chat_id, text=message)
@@ -1,97 +1,78 @@
 import json
+import os
 import time
-from main import get_object_information
+from selenium.common.exceptions import WebDriverException
 from utils import *
+from src.analyzer.offers import normalize_estimate, select_items_to_check
+from src.analyzer.price_stats import PriceStatistics
+from src.config.runtime import start_config_reloading
+from src.config.settings import PRICE_STATS_FILE
+from src.distributed.ownership import start_ownership
+from src.metrics.instruments import QUEUE_DEPTH, STORE_ITEMS, heartbeat
+from src.metrics.latency import mark_stage
+from src.metrics.profiling import CycleProfiler, span
+from src.metrics.server import start_metrics_server
+from src.scraper.browser import BrowserManager, scrape_lot
+from src.utils.logger import logger
 
-# get number of item that are 30% lower than the median price and have less than 2 days remaining
+try:
+    import fcntl
+except ImportError:  # Windows: writes of several monitors are not serialized
+    fcntl = None
+
+# lots priced under PRICE_PERCENTAGE_THRESHOLD of the median estimate and closing within REMAINING_TIME_THRESHOLD
 def get_item_to_check(items):
-    items_to_check = []
     for item in items:
         # in estimated price, remove the \xa0
-        if item['estimated_price'] != 'No estimated price':
-            item['estimated_price'] = item['estimated_price'].replace('\xa0', '')
-
-    # print the items
-    i = 0
-    while i < len(items):
-        # print(f"Item {i+1}/{len(items)}")
-        # print(items[i]['estimated_price'])
-        if items[i]['estimated_price'] != 'No estimated price':
-            # print(f"Estimated price: {items[i]['estimated_price'].split(' - ')}")
-            high, low = items[i]['estimated_price'].split(' - ')
-            high = high.replace(' €', '')
-            low = low.replace(' €', '')
-            try:
-                high = float(high)
-                low = float(low)
-            except:
-                print("Error converting to float")
-                print(f"High: {high}")
-                print(f"Low: {low}")
-                print(items[i])
-                i += 1
-                continue
-            # print(f"High: {high}")
-            # print(f"Low: {low}")
-            median = (high + low) / 2
-            # print(f"Median: {median}")
-            # print(f"price: {items[i]['price']}," + f" time: {items[i]['time']}")
-            # check if price is 30% lower than the median and if remaining time is less than 2 days
-            if items[i]['price'] != 'No price' and items[i]['time'] != 'No time':
-                price = items[i]['price'].replace(' €', '')
-                price = price.replace('\xa0', '')
-                price = float(price)
-                # print(f"Price: {price}")
-                time_var = items[i]['time']
-                pull_time = items[i]['pull_time']
-                time_in_seconds = get_total_seconds(time_var)
-                remaining_time = get_difference_with_pull_time(pull_time, time_var)
-                # print(f"Remaining time: {remaining_time}")
-                if remaining_time < 0:
-                    i += 1
-                    continue
-                reserve_price = items[i]['reserve_price']
-                # print(f"Time in seconds: {time_in_seconds}")
-                # print(f"Remaining time: {remaining_time}")
-                # print(f"Price: {price}, Median: {median}, Remaining time: {remaining_time}, Reserve price: {reserve_price}")
-                if price < median * PERCENTAGE_THRESHOLD and remaining_time < 172800:
-                    # print(f"Price is 20% lower than the median")
-                    # print the countdown based on the remaining time converted to days, hours, minutes and seconds all rouded to the nearest integer
-                    temp = remaining_time
-                    temp2 = get_time_var_from_seconds(remaining_time)
-                    days = temp // 86400
-                    temp = temp % 86400
-                    hours = temp // 3600
-                    temp = temp % 3600
-                    minutes = temp // 60
-                    temp = temp % 60
-                    seconds = temp
-                    # print(f"Time remaining: {int(days)} days, {int(hours)} hours, {int(minutes)} minutes, {int(seconds)} seconds")
-                    # print(f"Item: {items[i]}")
-                    
-                    # if time is less than 1 hours send a telegram message to the user with all info
-                    if remaining_time < REMAINING_TIME_THRESHOLD:
-                        # print(f"Time is less than 1 day")
-                        # print(f"link: {items[i]['url']}")
-                        # print(f"Time var: {time_var}")
-                        # print(f"New time var: {temp2}")
-                        # print(f"Time remaining: {int(days)} days, {int(hours)} hours, {int(minutes)} minutes, {int(seconds)} seconds")
-                        items_to_check.append(items[i])
-                else:
-                    # print(f"Price is not 30% lower than the median")
-                    pass
-        i += 1
+        normalize_estimate(item)
+    items_to_check = select_items_to_check(items, price_stats=price_stats)
+    if ownership is not None:
+        # other monitor instances re-check the lots of the partitions they own
+        items_to_check = ownership.filter(items_to_check)
     return items_to_check
 
+def save_item(item):
+    # the only write of this script: under a lock shared with the other monitors, re-read the file
+    # and replace this lot, so their updates and the scraper's new lots are kept
+    with span('store'), open('items.json.lock', 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open('items.json', 'r') as f:
+                items = [item if x['url'] == item['url'] else x for x in json.load(f)]
+        except (OSError, ValueError) as e:
+            logger.warning("items.json unreadable, %s not saved: %s", item['url'], e)
+            return
+        # replaced atomically, readers never see a partial file
+        with open('items.json.tmp', 'w') as f:
+            json.dump(items, f)
+        os.replace('items.json.tmp', 'items.json')
+
+start_metrics_server('monitor')
+# thresholds are re-read from RUNTIME_CONFIG_FILE on change or SIGHUP
+start_config_reloading()
+# OWNERSHIP_ENABLED: several monitors share the lots, each re-checking only those it holds a lease on
+ownership = start_ownership('monitor')
+# one browser for every re-check, replaced past BROWSER_MAX_PAGES / BROWSER_MAX_RSS_MB
+browser = BrowserManager()
+# realised prices recorded by the alert loop, re-read every cycle
+price_stats = PriceStatistics(PRICE_STATS_FILE)
+cycle_profiler = CycleProfiler('monitor')
 while True:
+    cycle_profiler.next_cycle()
+    if os.path.exists(PRICE_STATS_FILE):
+        price_stats.load()
     with open('items.json', 'r') as f:
         items = json.load(f)
+    STORE_ITEMS.set(len(items))
     items = sorted(items, key=lambda x: get_total_seconds(x['time']) if x['time'] != 'No time' else float('inf'))
     items_to_check = []
     while len(items_to_check) == 0:
         items_to_check = get_item_to_check(items)
         if len(items_to_check) == 0:
-            print("No items to check, waiting 5 minutes")
+            # idle is not stalled
+            heartbeat()
+            logger.info("No items to check, waiting 5 minutes")
             time.sleep(300)
     i = 0
     j = 0
@@ -99,29 +80,38 @@ while True:
         if items[i]['url'] not in [item['url'] for item in items_to_check]:
             i += 1
             continue
-        print(f"Item {j+1}/{len(items_to_check)}")
-        item = get_object_information(items[i]['url'], False)
+        if ownership is not None and not ownership.owns_item(items[i]):
+            # the partition was handed over to another monitor during this pass
+            i += 1
+            j += 1
+            continue
+        logger.debug("Item %d/%d", j + 1, len(items_to_check))
+        QUEUE_DEPTH.labels('recheck').set(len(items_to_check) - j)
+        try:
+            item = scrape_lot(browser, items[i]['url'])
+        except WebDriverException as e:
+            logger.warning("Browser failed on %s, restarting it: %s", items[i]['url'], e)
+            item = None
         if item:
             if item['estimated_price'] != 'No estimated price':
                 item['estimated_price'] = item['estimated_price'].replace('\xa0', '')
-            # get difference between the old item and the new item an print the new item with highlated differences
-            for key, value in item.items():
-                
-                # print old: in red
-                if items[i][key] != value and key != 'pull_time':
-                    print(f"{key} : {value} " + f"\033[91m(old: {items[i][key]})\033[0m")
-                else: 
-                    print(f"{key} : {value}")
-            print()
+            # log what changed since the last visit
+            changes = {
+                key: (items[i].get(key), value)
+                for key, value in item.items()
+                if key not in ('pull_time', 'timings') and items[i].get(key) != value
+            }
+            if changes:
+                logger.info("Lot changed %s: %s", item['url'], changes, extra={"changes": changes})
+            else:
+                logger.debug("Lot unchanged %s", item['url'])
             # add the item with actual price to the items list at the place of the old item and remove the old item
             items[i] = item
-            with open('items.json', 'w') as f:
-                json.dump(items, f)
-        elif not item:
-            # remove the item if it is not found
-            new_items = items.copy()
-            with open('items.json', 'w') as f:
-                json.dump(new_items, f)
+            mark_stage(item['timings'], 'stored')
+            save_item(item)
+        else:
+            # the stored lot is kept as it was, it is tried again next cycle
+            logger.warning("Lot not found, left unchanged: %s", items[i]['url'])
         i += 1
         j += 1
     # break
\ No newline at end of file
@@ -13,11 +13,12 @@ load_dotenv()
 TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_IDS: List[str] = os.getenv("TELEGRAM_CHAT_IDS", "").split(",")
 
-# Validate required configuration
-if not TELEGRAM_BOT_TOKEN:
-    raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
-if not TELEGRAM_CHAT_IDS or TELEGRAM_CHAT_IDS == [""]:
-    raise ValueError("TELEGRAM_CHAT_IDS environment variable is required")
+# Validate required configuration (when sending, so thresholds can be imported without it)
+def validate_telegram_config() -> None:
+    if not TELEGRAM_BOT_TOKEN:
+        raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
+    if not TELEGRAM_CHAT_IDS or TELEGRAM_CHAT_IDS == [""]:
+        raise ValueError("TELEGRAM_CHAT_IDS environment variable is required")
 
 # Scraper Configuration
 CATAWIKI_BASE_URL: str = os.getenv(
@@ -2,79 +2,57 @@ import json
 import time
 import os
 from utils import *
-from SendTelegramMessage import send_telegram_message
-import asyncio
+from src.analyzer.offers import OfferClassifier
+from src.analyzer.price_stats import PriceStatistics
+from src.config.runtime import start_config_reloading
+from src.distributed.ownership import start_ownership
+from src.config.settings import PRICE_STATS_FILE, DEDUP_SIMILARITY_THRESHOLD, ALERT_COALESCE_WINDOW, LATENCY_STATS_FILE
+from src.metrics.instruments import DEALS_FOUND, QUEUE_DEPTH, STORE_ITEMS, heartbeat
+from src.metrics.latency import LatencyTracker, mark_stage
+from src.metrics.profiling import CycleProfiler, span
+from src.metrics.server import start_metrics_server
+from src.storage.models import WatchItem
+from src.notifications.background import BackgroundNotifier
+from src.notifications.coalescer import AlertCoalescer
+from src.notifications.messages import build_alert
+from src.notifications.outbox import NotificationOutbox, OutboxDispatcher
+from src.notifications.base import create_notifier
+from src.utils.logger import logger
 
-sended_offers = []
-closed_offers = []
-
-def check_sended_and_actual_difference(item, sended_offers):
-    for sended_item in sended_offers:
-        if item['url'] == sended_item['url']:
-            # check if price or time or estimated price changed
-            if item['price'] != sended_item['price'] or item['reserve_price'] != sended_item['reserve_price']:
-                return True
-            else:
-                return False
-    return False
+# alerts are persisted before sending, so a restart neither re-alerts nor drops them
+outbox = NotificationOutbox()
+# realised prices of closed lots, updated incrementally each cycle
+price_stats = PriceStatistics(PRICE_STATS_FILE)
+# new/updated/closing offers, alert history comes from the outbox
+# deals are judged against realised prices once a brand has PRICE_STATS_MIN_SAMPLES sales
+classifier = OfferClassifier(outbox, dedup_threshold=DEDUP_SIMILARITY_THRESHOLD, price_stats=price_stats)
+# one notifier session for the whole run (NOTIFIER_BACKEND), the outbox is drained in the background
+notifier = BackgroundNotifier(create_notifier()).start()
+# alerts are batched per recipient, closing lots flush immediately
+coalescer = AlertCoalescer() if ALERT_COALESCE_WINDOW > 0 else None
+# per-stage scrape-to-alert latency, report with `python -m src.metrics.latency`
+latency = LatencyTracker(LATENCY_STATS_FILE)
+dispatcher = OutboxDispatcher(outbox, notifier.notifier, coalescer=coalescer, latency=latency)
+notifier.run_coroutine(dispatcher.run())
+# the heartbeat only moves when fresh items are analysed, so a stalled scraper shows up here too
+start_metrics_server('alerts')
+# thresholds are re-read from RUNTIME_CONFIG_FILE on change or SIGHUP
+start_config_reloading()
+# OWNERSHIP_ENABLED: several alert instances share the lots, each alerting only on those it holds a lease on
+ownership = start_ownership('alerts')
+QUEUE_DEPTH.labels('outbox').set_function(lambda: outbox.counts()['pending'])
+if coalescer is not None:
+    QUEUE_DEPTH.labels('coalescer').set_function(lambda: len(coalescer))
 
 def get_good_offer(items):
-    good_offers = []
-    offers_updated = []
-    closing_soon_offers = []
-    for item in items:
-        # in estimated price, remove the \xa0
-        if item['estimated_price'] != 'No estimated price':
-            item['estimated_price'] = item['estimated_price'].replace('\xa0', '')
-    
-    i = 0
-    while i < len(items):
-        if items[i]['estimated_price'] != 'No estimated price' and (items[i]['reserve_price'] == "Reserve price reached" or items[i]['reserve_price'] == "No reserve price") and items[i]['price'] != 'No price' and items[i]['time'] != 'No time':
-            price = items[i]['price'].replace(' €', '')
-            price = price.replace('\xa0', '')
-            price = float(price)
-            time_var = items[i]['time']
-            pull_time = items[i]['pull_time']
-            time_in_seconds = get_total_seconds(time_var)
-            remaining_time = get_difference_with_pull_time(pull_time, time_var)
-            high, low = items[i]['estimated_price'].split(' - ')
-            high = high.replace(' €', '')
-            low = low.replace(' €', '')
-            try:
-                high = float(high)
-                low = float(low)
-                median = (high + low) / 2
-            except:
-                print("Error converting to float")
-                print(f"High: {high}")
-                print(f"Low: {low}")
-                print(items[i])
-                i += 1
-                continue
-            
-            if price < median * PERCENTAGE_THRESHOLD and remaining_time < REMAINING_TIME_THRESHOLD:
-                # print(f"Price is 20% lower than the median and less than 30 minutes remaining")
-                sended_offer_urls = [offer['url'] for offer in sended_offers]
-                if items[i]['url'] not in sended_offer_urls and remaining_time > 0:
-                    good_offers.append(items[i])
-                    sended_offers.append(items[i])
-                elif check_sended_and_actual_difference(items[i], sended_offers) and remaining_time > 0:
-                    offers_updated.append(items[i])
-                    print("Offer already sent")
-                    for index, sended_item in enumerate(sended_offers):
-                        if items[i]['url'] == sended_item['url']:
-                            sended_offers[index] = items[i]
-                            break
-                    print("Offer updated")
-                elif remaining_time < 90 and remaining_time > 0:
-                    closed_offers_urls = [offer['url'] for offer in closed_offers]
-                    if items[i]['url'] not in closed_offers_urls:
-                        closing_soon_offers.append(items[i])
-                        closed_offers.append(items[i])
-        i += 1
-    return good_offers, offers_updated, closing_soon_offers
+    if ownership is not None:
+        # other alert instances handle the lots of the partitions they own
+        items = ownership.filter(items)
+    return classifier.classify(items)
 
+cycle_profiler = CycleProfiler('alerts')
 while True:
+    cycle_profiler.next_cycle()
     error = False
     with open('items.json', 'r') as f:
         try:
@@ -83,83 +61,39 @@ while True:
             error = True
         # if error is True, wait 1 second and try again
         if error:
-            print("Error loading items.json, retrying...")
+            logger.warning("Error loading items.json, retrying...")
             time.sleep(0.25)
             continue
     items = sorted(items, key=lambda x: get_total_seconds(x['time']))
-    good_offers, offers_updated, closing_soon_offers = get_good_offer(items)
-    if len(good_offers) > 0:
-        print("Good offers found:")
-        for offer in good_offers:
-            pull_time = offer['pull_time']
-            time_var = offer['time']
-            remaining_time = get_difference_with_pull_time(pull_time, time_var)
-            # convert remainin time to  hours, minutes and seconds
-            temp = remaining_time
-            minutes = temp // 60
-            seconds = temp % 60
-            remaining_time_str = f"{int(minutes)}m {int(seconds)}s"
-            message = "NEW OFFER FOUND:\n\n"
-            for key, value in offer.items():
-                if key == 'pull_time':
-                    continue
-                if key == 'time':
-                    message += f"{key} : {remaining_time_str}\n"
-                    print(f"{key} : {remaining_time_str}")
-                    continue
-                message += f"{key} : {value}\n"
-                print(f"{key} : {value}")
-            asyncio.run(send_telegram_message(message))
-            print("\n")
-            time.sleep(0.25)
-    if len(offers_updated) > 0:
-        print("Updated offers found:")
-        for offer in offers_updated:
-            pull_time = offer['pull_time']
-            time_var = offer['time']
-            remaining_time = get_difference_with_pull_time(pull_time, time_var)
-            # convert remainin time to  hours, minutes and seconds
-            temp = remaining_time
-            minutes = temp // 60
-            seconds = temp % 60
-            remaining_time_str = f"{int(minutes)}m {int(seconds)}s"
-            message = "OFFER UPDATED:\n\n"
-            for key, value in offer.items():
-                if key == 'pull_time':
-                    continue
-                if key == 'time':
-                    message += f"{key} : {remaining_time_str}\n"
-                    print(f"{key} : {remaining_time_str}")
-                    continue
-                message += f"{key} : {value}\n"
-                print(f"{key} : {value}")
-            asyncio.run(send_telegram_message(message))
-            print("\n")
-            time.sleep(0.25)
-    if len(closing_soon_offers) > 0:
-        print("Closing soon offers found:")
-        for offer in closing_soon_offers:
-            pull_time = offer['pull_time']
-            time_var = offer['time']
-            remaining_time = get_difference_with_pull_time(pull_time, time_var)
-            # convert remainin time to  hours, minutes and seconds
-            temp = remaining_time
-            minutes = temp // 60
-            seconds = temp % 60
-            remaining_time_str = f"{int(minutes)}m {int(seconds)}s"
-            message = "OFFER CLOSING SOON:\n\n"
-            for key, value in offer.items():
-                if key == 'pull_time':
-                    continue
-                if key == 'time':
-                    message += f"{key} : {remaining_time_str}\n"
-                    print(f"{key} : {remaining_time_str}")
-                    continue
-                message += f"{key} : {value}\n"
-                print(f"{key} : {value}")
-            asyncio.run(send_telegram_message(message))
-            print("\n")
-            time.sleep(0.25)
+    STORE_ITEMS.set(len(items))
+    # record lots that just closed so deal scoring can use realised prices
+    recorded = [price_stats.observe(WatchItem.from_dict(item)) for item in items]
+    if any(recorded):
+        price_stats.save()
+    with span('analyze'):
+        good_offers, offers_updated, closing_soon_offers = get_good_offer(items)
+    analysed_at = time.time()
+    offers_by_type = [
+        ("Good offers found:", 'new', good_offers),
+        ("Updated offers found:", 'updated', offers_updated),
+        ("Closing soon offers found:", 'closing', closing_soon_offers),
+    ]
+    for header, alert_type, offers in offers_by_type:
+        if len(offers) > 0:
+            logger.info("%s %d", header, len(offers))
+            DEALS_FOUND.labels(alert_type).inc(len(offers))
+        for offer in offers:
+            mark_stage(offer.setdefault('timings', {}), 'analysed', analysed_at)
+            alert = build_alert(WatchItem.from_dict(offer), alert_type)
+            # enqueue is a local write: delivery happens in the dispatcher
+            if outbox.enqueue(alert):
+                logger.info(
+                    "Queued %s alert for %s", alert_type, offer['url'],
+                    extra={"lot_id": alert.lot_id, "alert_type": alert_type},
+                )
+    latency.save()
+    heartbeat()
+    cycle_profiler.finish()
     # check if file items.json was modified in the last 90 seconds
     time.sleep(0.5)
     while time.time() - os.path.getmtime('items.json') > 1:
@@ -1,32 +1,103 @@
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import WebDriverException
+import sys
 import time
 import json
+from urllib.parse import urljoin
+from src.analyzer.dedup import lot_id_from_url
+from src.analyzer.offers import OfferClassifier
+from src.config.settings import CRAWL_INCREMENTAL, CRAWL_KNOWN_RUN, SEEN_LOTS_FILE
+from src.config.runtime import current_config, start_config_reloading
+from src.metrics.instruments import (
+    DRIVER_CRASHES, DRIVER_LAUNCHES, FETCH_RETRIES, LOTS_FAILED, PAGES_FETCHED, PARSE_SECONDS,
+    QUEUE_DEPTH, STORE_ITEMS, heartbeat,
+)
+from src.metrics.latency import mark_stage
+from src.metrics.profiling import CycleProfiler, record_span, span
+from src.metrics.server import start_metrics_server
+from src.notifications.outbox import NotificationOutbox
+from src.scraper.browser import BrowserManager, wait_for_load
+from src.scraper.extraction import listing_cards, lot_fields, soup_lot_fields
+from src.storage.seen_lots import LISTING_SORT, SeenLots, lot_key, sorted_by_closing
+from src.utils.logger import logger
 
 CHROME_BIN = "/usr/bin/chromium"       # ajuste si `which chromium` retourne autre chose
 CHROMEDRIVER_BIN = "/usr/bin/chromedriver"
 
-def get_object_links_with_scroll(base_url):
+def launch_driver(options=None):
+    DRIVER_LAUNCHES.inc()
+    try:
+        return webdriver.Chrome(options=options)
+    except WebDriverException:
+        DRIVER_CRASHES.inc()
+        raise
+
+def fetch_page(driver, url, kind):
+    # every page load is counted, a driver error is counted as a crash
+    try:
+        with span('browser_load'):
+            driver.get(url)
+            # a driver serving tabs returns from get() before the page loaded
+            wait_for_load(driver)
+    except WebDriverException:
+        DRIVER_CRASHES.inc()
+        raise
+    PAGES_FETCHED.labels(kind).inc()
+    heartbeat()
+
+def get_object_links_with_scroll(base_url, driver=None, known=None, known_run=CRAWL_KNOWN_RUN, relists=None):
+    # with `known` (lot IDs already crawled, e.g. a SeenLots), only new lots are returned and
+    # the listing is read until `known_run` known lots in a row: new lots close last, so they come first
+    # with `relists` (an OfferClassifier), relists of ended alerted lots are left out by card title
     first_page = True
     # headless option
     options = webdriver.ChromeOptions()
     options.add_argument('headless')
-    driver = webdriver.Chrome()
-    driver.get(base_url)
-    time.sleep(0.05)
+    # a driver passed in is left open for the caller
+    owns_driver = driver is None
+    if owns_driver:
+        driver = launch_driver()
+    # read once, a reload takes effect on the next crawl
+    config = current_config()
+    fetch_page(driver, base_url, 'listing')
+    time.sleep(config.scroll_delay)
     links = set()
+    # the same lot can surface under several URLs; lots with the same title are distinct
+    # lots, only those duplicating an ended alerted lot are relists
+    seen_lot_ids = set()
+    relist_count = 0
+    known_streak = 0
     last_height = driver.execute_script("return window.scrollY")
     
     while True:
         broke = False
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        for link in soup.find_all('a', class_='c-lot-card'):
-            links.add(link['href'])
-            if len(links) > 300:
+        # cards and page buttons, read inside the browser unless EXTRACTION_MODE=soup
+        listing = listing_cards(driver)
+        for card in listing['cards']:
+            href = card['href']
+            lot_id = lot_id_from_url(href) or href
+            if lot_id in seen_lot_ids:
+                continue
+            seen_lot_ids.add(lot_id)
+            if known is not None and lot_id in known:
+                known_streak += 1
+                if known_streak >= known_run:
+                    logger.info("%d known lots in a row, the rest of the listing is known", known_streak)
+                    broke = True
+                    break
+                continue
+            known_streak = 0
+            relist_of = relists.relist_of_card(card) if relists is not None else None
+            if relist_of:
+                logger.debug("Relist of ended lot %s, skipped: %s", relist_of, href)
+                relist_count += 1
+                continue
+            links.add(href)
+            if len(links) >= config.scraper_max_items:
                 broke = True
                 break
         if broke:
@@ -36,31 +107,54 @@ def get_object_links_with_scroll(base_url):
 
         new_height = driver.execute_script("return window.scrollY")
         if new_height == last_height:
-            links_var = soup.find_all('a', class_='c-button-template u-cursor-pointer c-button__container c-button--primary u-bgcolor-brand u-typography-h7 u-w-full')
+            links_var = listing['pages']
             if len(links_var) == 0:
                 break
             elif len(links_var) == 1 and first_page:
                 first_page = False
-                l = links_var[0]['href']
-                l = "https://www.catawiki.com" + l
-                driver.get(l)
-                time.sleep(0.05)
+                l = links_var[0]
+                l = urljoin(driver.current_url, l)
+                fetch_page(driver, l, 'listing')
+                time.sleep(config.scroll_delay)
             elif len(links_var) == 2:
-                l = links_var[1]['href']
-                l = "https://www.catawiki.com" + l
-                driver.get(l)
-                time.sleep(0.05)
+                l = links_var[1]
+                l = urljoin(driver.current_url, l)
+                fetch_page(driver, l, 'listing')
+                time.sleep(config.scroll_delay)
             else:
                 break
             new_height = driver.execute_script("return window.scrollY")
         last_height = new_height
 
-    driver.quit()
+    if relist_count:
+        logger.info("%d relists of ended lots skipped", relist_count)
+    if owns_driver:
+        driver.quit()
     return list(links)
 
 if __name__ == '__main__':
-    base_url = 'https://www.catawiki.com/fr/c/333-montres?sort=bidding_end_desc&filters=909%255B%255D%3D60922%26909%255B%255D%3D60796%26909%255B%255D%3D60226%26909%255B%255D%3D60548%26909%255B%255D%3D60654%26909%255B%255D%3D61062%26909%255B%255D%3D61158%26909%255B%255D%3D60424%26909%255B%255D%3D60430%26909%255B%255D%3D60555%26909%255B%255D%3D60210%26909%255B%255D%3D60156%26909%255B%255D%3D60088%26seller_location%255B%255D%3Dfr%26seller_location%255B%255D%3Dtr%26seller_location%255B%255D%3Dnl%26seller_location%255B%255D%3Dit%26seller_location%255B%255D%3Dpl%26seller_location%255B%255D%3Dlt%26seller_location%255B%255D%3Des%26seller_location%255B%255D%3Dpt%26seller_location%255B%255D%3Dbe%26seller_location%255B%255D%3Dde%26seller_location%255B%255D%3Dse%26seller_location%255B%255D%3Dro%26seller_location%255B%255D%3Dat%26seller_location%255B%255D%3Dhu%26seller_location%255B%255D%3Dcz%26seller_location%255B%255D%3Dlv%26seller_location%255B%255D%3Dgr%26seller_location%255B%255D%3Dch%26seller_location%255B%255D%3Dgb%26object_type%255B%255D%3D18131%26object_type%255B%255D%3D18129%26object_type%255B%255D%3D18133'
-    links = get_object_links_with_scroll(base_url)
+    start_metrics_server('scraper')
+    # thresholds, limits and delays can be changed in RUNTIME_CONFIG_FILE while running
+    start_config_reloading()
+    # the whole crawl is one cycle (PROFILING_ENABLED / PROFILER)
+    crawl_profiler = CycleProfiler('crawl')
+    crawl_profiler.next_cycle()
+    # the listing URL can be overridden, e.g. with a local fixture server (src/scraper/fixture_server.py)
+    base_url = sys.argv[1] if len(sys.argv) > 1 else 'https://www.catawiki.com/fr/c/333-montres?sort=bidding_end_desc&filters=909%255B%255D%3D60922%26909%255B%255D%3D60796%26909%255B%255D%3D60226%26909%255B%255D%3D60548%26909%255B%255D%3D60654%26909%255B%255D%3D61062%26909%255B%255D%3D61158%26909%255B%255D%3D60424%26909%255B%255D%3D60430%26909%255B%255D%3D60555%26909%255B%255D%3D60210%26909%255B%255D%3D60156%26909%255B%255D%3D60088%26seller_location%255B%255D%3Dfr%26seller_location%255B%255D%3Dtr%26seller_location%255B%255D%3Dnl%26seller_location%255B%255D%3Dit%26seller_location%255B%255D%3Dpl%26seller_location%255B%255D%3Dlt%26seller_location%255B%255D%3Des%26seller_location%255B%255D%3Dpt%26seller_location%255B%255D%3Dbe%26seller_location%255B%255D%3Dde%26seller_location%255B%255D%3Dse%26seller_location%255B%255D%3Dro%26seller_location%255B%255D%3Dat%26seller_location%255B%255D%3Dhu%26seller_location%255B%255D%3Dcz%26seller_location%255B%255D%3Dlv%26seller_location%255B%255D%3Dgr%26seller_location%255B%255D%3Dch%26seller_location%255B%255D%3Dgb%26object_type%255B%255D%3D18131%26object_type%255B%255D%3D18129%26object_type%255B%255D%3D18133'
+    # one browser for the listing and every lot, on a persistent profile (BROWSER_PROFILE_DIR),
+    # replaced past BROWSER_MAX_PAGES / BROWSER_MAX_RSS_MB
+    browser = BrowserManager()
+    # CRAWL_INCREMENTAL: only the lots not crawled before are fetched (SEEN_LOTS_FILE)
+    seen = SeenLots(SEEN_LOTS_FILE) if CRAWL_INCREMENTAL else None
+    if seen is not None and not sorted_by_closing(base_url):
+        # new lots are only on top of a listing sorted by closing date
+        logger.warning("Listing not sorted by sort=%s, crawling it in full", LISTING_SORT)
+        seen = None
+    # relists of lots alerted on and ended are not fetched (alert history of the outbox)
+    relists = OfferClassifier(NotificationOutbox())
+    links = get_object_links_with_scroll(
+        base_url, driver=browser.get_driver(), known=seen, relists=relists
+    )
     print(f"Nombre total de liens : {len(links)}")
 
 count = 0
@@ -77,65 +171,75 @@ item_template = {
 
 def get_object_information(link, isCounted=True, driver=None):
     global count, last_items, item_template
-    if not driver:
+    # a driver passed in (e.g. by a BrowserManager) is left open for the next lot
+    owns_driver = not driver
+    if owns_driver:
         options = webdriver.ChromeOptions()
         # options.add_argument('--headless=new')
-        driver = webdriver.Chrome(options=options)
-    driver.get(link)
-    time.sleep(0.25)
+        driver = launch_driver(options)
+    page_load_delay = current_config().page_load_delay
+    fetch_page(driver, link, 'lot')
+    time.sleep(page_load_delay)
     # WebDriverWait(driver, 3)
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    time_obj = soup.find_all('time', class_='u-text-tabular-figures')
-    # until soup.find_all('div', class_='LotBidStatusSection_subtitle-content__kkad5 LotBidStatusSection_visible__kj_F3 u-typography-h7 u-m-t-xs')
+    fetched_at = time.time()
+    # the page's texts, read inside the browser unless EXTRACTION_MODE=soup
+    fields = lot_fields(driver)
     # if there is no time object, load the link again
     count_retry = 0
-    while len(time_obj) == 0:
-        driver.get(link)
-        time.sleep(0.75)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        time_obj = soup.find_all('time', class_='u-text-tabular-figures')
+    while fields['time'] is None:
+        FETCH_RETRIES.inc()
+        fetch_page(driver, link, 'lot')
+        time.sleep(3 * page_load_delay)
+        fetched_at = time.time()
+        fields = lot_fields(driver)
         count_retry += 1
         if count_retry == 3:
             # skip the link if it fails to load
             break
-    if len(time_obj) == 0:
-        print("No time : ", link)
-        driver.quit()
+    if fields['time'] is None:
+        logger.warning("No countdown on %s, skipped", link)
+        LOTS_FAILED.inc()
+        if owns_driver:
+            driver.quit()
         return None
 
-    title_obj = soup.find_all('h1')
-    try:
-        price_obj = soup.find_all('div', class_='LotBidStatusSection_bid-amount__bWWF4 u-typography-h2')
-    except:
-        print("No price")
-        price_obj = None
+    item = item_from_fields(fields, link, fetched_at)
+    if isCounted:
+        logger.info("Item %d/%d", count, len(links))
+    # for key, value in item.items():
+    #     print(f"{key} : {value}")
+    # print()
+    if owns_driver:
+        driver.quit()
+    return item
+
+def parse_object_page(soup, link, fetched_at):
+    # item of a lot page already parsed with BeautifulSoup
+    return item_from_fields(soup_lot_fields(soup), link, fetched_at)
+
+def item_from_fields(fields, link, fetched_at):
+    # item from the texts of a loaded lot page (the countdown is known to be present),
+    # see src/scraper/extraction.py
     try:
-        estimated_price_obj = soup.find_all('span', class_='u-no-wrap')
-        
-        price = estimated_price_obj[1].text
+        price = fields['estimate']
         if '€' not in price:
             raise Exception("No estimated price")
 
         low_estimated_price_obj1 = price.split(' - ')[0].replace(' € ', '') + ' €'
         high_estimated_price_obj1 = price.split(' - ')[1].replace(' € ', '') + ' €'
         
-        print(low_estimated_price_obj1, high_estimated_price_obj1)
+        logger.debug("Estimate %s - %s", low_estimated_price_obj1, high_estimated_price_obj1)
     except:
         low_estimated_price_obj1 = None
         high_estimated_price_obj1 = None
-    print(link)
-    try:
-       time_var = time_obj[0].text.strip()
-    except:
-        time_var = "No time"
-    
-        
-    title_var = title_obj[0].text
-    try:
-        price_var = price_obj[0].text.replace(' €', '') + ' €'
-    except:
+    logger.debug("Parsing %s", link)
+    time_var = fields['time'].strip() if fields['time'] is not None else "No time"
+    title_var = fields['title']
+    if fields['price'] is not None:
+        price_var = fields['price'].replace(' €', '') + ' €'
+    else:
         price_var = "No price"
-        print(price_obj)
+        logger.debug("No bid amount on %s", link)
     estimated_price_var = (low_estimated_price_obj1 + ' - ' + high_estimated_price_obj1) if low_estimated_price_obj1 and high_estimated_price_obj1 else "No estimated price"
     item = item_template.copy()
     item['time'] = time_var
@@ -143,48 +247,62 @@ def get_object_information(link, isCounted=True, driver=None):
     item['title'] = title_var
     item['price'] = price_var
     item['estimated_price'] = estimated_price_var
-    try:
-        reserve_price_obj = soup.find_all('div', class_='LotBidStatusSection_subtitle-content__kkad5 LotBidStatusSection_visible__kj_F3 u-typography-h7 u-m-t-xs')
-        print(reserve_price_obj)
-        print(len(reserve_price_obj))
-        if len(reserve_price_obj) > 0:
-            item['reserve_price'] = reserve_price_obj[0].text
-            if "Prix de réserve non atteint" in item['reserve_price']:
-                item['reserve_price'] = "Reserve price not reached"
-            elif "Sans prix de réserve" in item['reserve_price']:
-                item['reserve_price'] = "No reserve price"
-            else:
-                item['reserve_price'] = "Reserve price reached"
-        else:
+    reserve_text = fields['reserve']
+    if reserve_text is not None:
+        item['reserve_price'] = reserve_text
+        if "Prix de réserve non atteint" in reserve_text:
+            item['reserve_price'] = "Reserve price not reached"
+        elif "Sans prix de réserve" in reserve_text:
             item['reserve_price'] = "No reserve price"
-    except:
+        else:
+            item['reserve_price'] = "Reserve price reached"
+    else:
         item['reserve_price'] = "No reserve price"
     
     item['pull_time'] = time.time()
-    
-    if isCounted:
-        print(f"Item number: {count}/{len(links)}")
-    # for key, value in item.items():
-    #     print(f"{key} : {value}")
-    # print()
-    driver.quit()
+    # stage timestamps for scrape-to-alert latency (see src/metrics/latency.py)
+    item['timings'] = {'fetched': fetched_at, 'parsed': item['pull_time']}
+    PARSE_SECONDS.observe(item['pull_time'] - fetched_at)
+    record_span('parse', item['pull_time'] - fetched_at)
     return item
     
 
 if __name__ == '__main__':
-    options = webdriver.ChromeOptions()
-    # options.add_argument('headless')
-    driver = webdriver.Chrome(options=options)
     for link in links:
         # for each link open the page and time object with class u-text-tabular-figures
         count += 1
-        item = get_object_information(link)
+        QUEUE_DEPTH.labels('links').set(len(links) - count)
+        try:
+            item = get_object_information(link, driver=browser.get_driver())
+        except WebDriverException as e:
+            logger.warning("Browser failed on %s, restarting it: %s", link, e)
+            browser.discard()
+            item = None
         if item:
             last_items.append(item)
+    browser.close()
 
-    print(last_items)
+    logger.info("Scraped %d of %d lots", len(last_items), len(links))
+    stored_at = time.time()
+    for item in last_items:
+        mark_stage(item['timings'], 'stored', stored_at)
+    if seen is not None:
+        for item in last_items:
+            seen.record(item)
+        seen.prune()
+        seen.save()
+        # the known lots were not fetched: keep their stored items while they run
+        scraped = {item['url'] for item in last_items}
+        try:
+            with open('items.json', 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = []
+        last_items += [x for x in stored if x['url'] not in scraped and lot_key(x['url']) in seen]
     # sort items by time remaining (ascending)
     last_items = sorted(last_items, key=lambda x: x['time'])
     # save items to a file
-    with open('items.json', 'w') as f:
-        json.dump(last_items, f)
\ No newline at end of file
+    with span('store'), open('items.json', 'w') as f:
+        json.dump(last_items, f)
+    STORE_ITEMS.set(len(last_items))
+    crawl_profiler.finish()
\ No newline at end of file
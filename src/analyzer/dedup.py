@@ -0,0 +1,247 @@
+"""
+Near-duplicate lot detection.
+
+Each lot is reduced to a compact MinHash signature over its normalized title
+tokens plus a bucketed estimate token. Signatures are banded into an LSH
+index so candidate duplicates are found without comparing against every
+known lot.
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.storage.models import WatchItem
+
+# Mersenne prime used by the universal hash family
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Title words that carry no identity (lot boilerplate, units)
+STOP_WORDS = frozenset(
+    {"-", "de", "du", "la", "le", "les", "et", "the", "and", "for", "with", "sans", "no", "mm"}
+)
+
+_LOT_ID_PATTERN = re.compile(r"/l/(\d+)")
+
+
+def normalize_title(title: str) -> List[str]:
+    """
+    Normalize a lot title into identity-bearing tokens.
+
+    Args:
+        title: Raw lot title
+
+    Returns:
+        Lower-case, accent-free tokens without punctuation or stop words
+    """
+    text = unicodedata.normalize("NFKD", title.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    tokens = re.findall(r"[a-z0-9]+", text)
+    return [t for t in tokens if t not in STOP_WORDS]
+
+
+def estimate_bucket(midpoint: Optional[float], width: float = 0.25) -> Optional[str]:
+    """
+    Bucket an estimate midpoint on a log scale.
+
+    Estimates within roughly 25% of each other share a bucket, so a relisting
+    with a slightly revised estimate still matches.
+
+    Returns:
+        Bucket token, or None without an estimate
+    """
+    if not midpoint or midpoint <= 0:
+        return None
+    return f"est:{int(math.log(midpoint) / width)}"
+
+
+def lot_id_from_url(url: str) -> Optional[str]:
+    """Extract the numeric Catawiki lot ID from a lot URL."""
+    match = _LOT_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def _hash_token(token: str) -> int:
+    """Stable 64-bit hash of a token (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@dataclass(frozen=True)
+class LotSignature:
+    """
+    Compact MinHash signature of a lot.
+
+    Attributes:
+        values: MinHash values, one per permutation
+        tokens: Number of distinct tokens the signature was built from
+    """
+
+    values: Tuple[int, ...]
+    tokens: int
+
+    def similarity(self, other: "LotSignature") -> float:
+        """Estimated Jaccard similarity with another signature."""
+        if not self.values or len(self.values) != len(other.values):
+            return 0.0
+        matches = sum(1 for a, b in zip(self.values, other.values) if a == b)
+        return matches / len(self.values)
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with a fixed family of hash permutations.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """
+        Initialize hasher.
+
+        Args:
+            num_perm: Number of permutations (signature length)
+            seed: Seed of the permutation family
+        """
+        self.num_perm = num_perm
+        self._params: List[Tuple[int, int]] = []
+        for i in range(num_perm):
+            a = _hash_token(f"a:{seed}:{i}") % (_PRIME - 1) + 1
+            b = _hash_token(f"b:{seed}:{i}") % _PRIME
+            self._params.append((a, b))
+
+    def signature(self, tokens: Iterable[str]) -> LotSignature:
+        """Compute the signature of a token set."""
+        hashes = {_hash_token(t) for t in tokens}
+        if not hashes:
+            return LotSignature(values=(), tokens=0)
+        values = tuple(
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in self._params
+        )
+        return LotSignature(values=values, tokens=len(hashes))
+
+
+class DuplicateDetector:
+    """
+    LSH index of lot signatures for near-duplicate lookups.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16):
+        """
+        Initialize detector.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a duplicate
+            num_perm: MinHash signature length
+            bands: Number of LSH bands (num_perm must be divisible by it)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [
+            defaultdict(set) for _ in range(bands)
+        ]
+        self._signatures: Dict[str, LotSignature] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, lot_id: str) -> bool:
+        return lot_id in self._signatures
+
+    def signature(self, title: str, estimate_midpoint: Optional[float] = None) -> LotSignature:
+        """
+        Compute the signature of a lot.
+
+        Args:
+            title: Lot title
+            estimate_midpoint: Midpoint of the seller's estimate, if known
+
+        Returns:
+            LotSignature
+        """
+        tokens = set(normalize_title(title))
+        bucket = estimate_bucket(estimate_midpoint)
+        if bucket:
+            tokens.add(bucket)
+        return self._hasher.signature(tokens)
+
+    def _band_keys(self, signature: LotSignature) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        """Yield (band index, band key) pairs of a signature."""
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature.values[start : start + self.rows]
+
+    def add(self, lot_id: str, title: str, estimate_midpoint: Optional[float] = None) -> None:
+        """Index a lot."""
+        signature = self.signature(title, estimate_midpoint)
+        if not signature.values or lot_id in self._signatures:
+            return
+        self._signatures[lot_id] = signature
+        for band, key in self._band_keys(signature):
+            self._buckets[band][key].add(lot_id)
+
+    def remove(self, lot_id: str) -> None:
+        """Remove a lot from the index."""
+        signature = self._signatures.pop(lot_id, None)
+        if signature is None:
+            return
+        for band, key in self._band_keys(signature):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                bucket.discard(lot_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def find_duplicates(
+        self,
+        title: str,
+        estimate_midpoint: Optional[float] = None,
+        exclude: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Find indexed lots similar to the given one.
+
+        Args:
+            title: Lot title
+            estimate_midpoint: Midpoint of the seller's estimate, if known
+            exclude: Lot ID to ignore (typically the lot itself)
+
+        Returns:
+            List of (lot_id, similarity) above the threshold, most similar first
+        """
+        signature = self.signature(title, estimate_midpoint)
+        if not signature.values:
+            return []
+
+        candidates: Set[str] = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        candidates.discard(exclude)
+
+        matches = []
+        for lot_id in candidates:
+            similarity = signature.similarity(self._signatures[lot_id])
+            if similarity >= self.threshold:
+                matches.append((lot_id, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def add_item(self, item: WatchItem) -> None:
+        """Index a WatchItem."""
+        self.add(item.item_id or item.url, item.title, item.get_median_estimate())
+
+    def find_item_duplicate(self, item: WatchItem) -> Optional[str]:
+        """
+        Get the ID of an indexed lot the item duplicates.
+
+        Returns:
+            Lot ID of the best match, or None if the item is new
+        """
+        lot_id = item.item_id or item.url
+        matches = self.find_duplicates(item.title, item.get_median_estimate(), exclude=lot_id)
+        return matches[0][0] if matches else None
@@ -2,12 +2,19 @@
 Deal filtering and analysis logic.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
 from src.storage.models import WatchItem
+from src.analyzer.price_stats import PriceStatistics
+from src.metrics.profiling import timed
 from src.utils.time_utils import get_difference_with_pull_time, get_total_seconds
-from src.config.settings import PERCENTAGE_THRESHOLD, REMAINING_TIME_THRESHOLD
+from src.config.runtime import RuntimeConfig, current_config
+from src.config.settings import (
+    PERCENTAGE_THRESHOLD,
+    REMAINING_TIME_THRESHOLD,
+    PRICE_STATS_MIN_SAMPLES,
+)
 from src.utils.logger import logger
 
 
@@ -20,11 +27,21 @@ class DealCriteria:
         price_threshold: Maximum price as percentage of estimate (0.0-1.0)
         time_threshold: Maximum remaining time in seconds
         require_reserve_met: Only include items with met/no reserve
+        min_price_samples: Realised sales needed before a segment replaces the estimate
     """
 
     price_threshold: float = PERCENTAGE_THRESHOLD
     time_threshold: int = REMAINING_TIME_THRESHOLD
     require_reserve_met: bool = True
+    min_price_samples: int = PRICE_STATS_MIN_SAMPLES
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "DealCriteria":
+        """Create criteria from a runtime configuration."""
+        return cls(
+            price_threshold=config.price_threshold,
+            time_threshold=config.remaining_time_threshold,
+        )
 
 
 class DealAnalyzer:
@@ -32,29 +49,57 @@ class DealAnalyzer:
     Analyzes watch items to identify good deals.
     """
 
-    def __init__(self, criteria: Optional[DealCriteria] = None):
+    def __init__(
+        self,
+        criteria: Optional[DealCriteria] = None,
+        price_stats: Optional[PriceStatistics] = None,
+    ):
         """
         Initialize analyzer with criteria.
 
         Args:
-            criteria: Deal filtering criteria (uses defaults if None)
+            criteria: Deal filtering criteria (follows the runtime configuration if None)
+            price_stats: Realised price statistics (estimate midpoint only if None)
         """
-        self.criteria = criteria or DealCriteria()
+        self._criteria = criteria
+        self._live: Tuple[Optional[RuntimeConfig], Optional[DealCriteria]] = (None, None)
+        self.price_stats = price_stats
         logger.debug(
             f"DealAnalyzer initialized with threshold {self.criteria.price_threshold:.0%}, "
             f"time limit {self.criteria.time_threshold}s"
         )
 
-    def is_good_deal(self, item: WatchItem) -> tuple[bool, Optional[str]]:
+    @property
+    def criteria(self) -> DealCriteria:
+        """Criteria in force: the ones given, or those of the current runtime configuration."""
+        if self._criteria is not None:
+            return self._criteria
+        config = current_config()
+        live_config, criteria = self._live
+        if live_config is not config:
+            criteria = DealCriteria.from_config(config)
+            self._live = (config, criteria)
+        return criteria
+
+    @criteria.setter
+    def criteria(self, criteria: Optional[DealCriteria]) -> None:
+        self._criteria = criteria
+
+    def is_good_deal(
+        self, item: WatchItem, criteria: Optional[DealCriteria] = None
+    ) -> tuple[bool, Optional[str]]:
         """
         Determine if an item is a good deal.
 
         Args:
             item: WatchItem to analyze
+            criteria: Criteria to apply (uses the criteria in force if None)
 
         Returns:
             Tuple of (is_good_deal, reason_if_not)
         """
+        criteria = criteria or self.criteria
+
         # Check basic validity
         if not item.is_valid_price:
             return False, "No valid price"
@@ -66,40 +111,47 @@ class DealAnalyzer:
             return False, "No estimated price"
 
         # Check reserve price if required
-        if self.criteria.require_reserve_met and not item.reserve_met:
+        if criteria.require_reserve_met and not item.reserve_met:
             return False, "Reserve price not met"
 
         # Get numeric values
         current_price = item.get_price_numeric()
-        median_estimate = item.get_median_estimate()
+        reference_price, reference_label = self.get_reference_price(item, criteria)
 
-        if current_price is None or median_estimate is None:
+        if current_price is None or reference_price is None:
             return False, "Cannot parse price values"
 
         # Check price threshold
-        price_ratio = current_price / median_estimate
-        if price_ratio > self.criteria.price_threshold:
-            return False, f"Price too high ({price_ratio:.1%} of estimate)"
+        price_ratio = current_price / reference_price
+        if price_ratio > criteria.price_threshold:
+            return False, f"Price too high ({price_ratio:.1%} of {reference_label})"
 
         # Check time remaining
         remaining_time = get_difference_with_pull_time(item.pull_time, item.time)
         if remaining_time < 0:
             return False, "Auction ended"
 
-        if remaining_time > self.criteria.time_threshold:
+        if remaining_time > criteria.time_threshold:
             return False, f"Too much time remaining ({remaining_time:.0f}s)"
 
         # It's a good deal!
         logger.debug(
-            f"Good deal found: {item.title[:50]}... - "
-            f"{price_ratio:.1%} of estimate, {remaining_time:.0f}s remaining"
+            "Good deal found: %.50s... - %.1f%% of %s, %.0fs remaining",
+            item.title,
+            price_ratio * 100,
+            reference_label,
+            remaining_time,
         )
         return True, None
 
+    @timed("analyze")
     def filter_good_deals(self, items: List[WatchItem]) -> List[WatchItem]:
         """
         Filter a list of items to only good deals.
 
+        The whole list is judged with the same criteria, even if the
+        configuration is reloaded meanwhile.
+
         Args:
             items: List of WatchItem objects
 
@@ -107,15 +159,39 @@ class DealAnalyzer:
             Filtered list of good deals
         """
         good_deals = []
+        criteria = self.criteria
 
         for item in items:
-            is_good, reason = self.is_good_deal(item)
+            is_good, reason = self.is_good_deal(item, criteria)
             if is_good:
                 good_deals.append(item)
 
         logger.info(f"Found {len(good_deals)} good deals out of {len(items)} items")
         return good_deals
 
+    def get_reference_price(
+        self, item: WatchItem, criteria: Optional[DealCriteria] = None
+    ) -> tuple[Optional[float], str]:
+        """
+        Get the price an item is expected to sell for.
+
+        Uses realised prices of the item's segment when enough sales have been
+        recorded, and falls back to the seller's estimate midpoint otherwise.
+
+        Args:
+            item: WatchItem to evaluate
+            criteria: Criteria to apply (uses the criteria in force if None)
+
+        Returns:
+            Tuple of (reference_price, label describing its source)
+        """
+        if self.price_stats is not None:
+            min_samples = (criteria or self.criteria).min_price_samples
+            expected = self.price_stats.expected_price(item, min_samples)
+            if expected:
+                return expected, "realised price"
+        return item.get_median_estimate(), "estimate"
+
     def get_deal_score(self, item: WatchItem) -> float:
         """
         Calculate a deal score (lower price ratio = better deal).
@@ -127,12 +203,12 @@ class DealAnalyzer:
             Score from 0.0 (best) to 1.0 (worst), or -1.0 if invalid
         """
         current_price = item.get_price_numeric()
-        median_estimate = item.get_median_estimate()
+        reference_price, _ = self.get_reference_price(item)
 
-        if current_price is None or median_estimate is None:
+        if current_price is None or reference_price is None:
             return -1.0
 
-        return current_price / median_estimate
+        return current_price / reference_price
 
     def sort_by_deal_quality(self, items: List[WatchItem]) -> List[WatchItem]:
         """
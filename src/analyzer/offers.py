@@ -0,0 +1,326 @@
+"""
+Selection of lots to re-check and of offers to alert on.
+
+Shared by the standalone monitor/alert scripts and the daemon. Works on the
+raw item dictionaries the scraper produces.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.analyzer.dedup import DuplicateDetector, lot_id_from_url
+from src.analyzer.price_stats import PriceStatistics
+from src.config.runtime import current_config
+from src.config.settings import (
+    DEDUP_RELIST_HORIZON,
+    DEDUP_SIMILARITY_THRESHOLD,
+    PRICE_STATS_MIN_SAMPLES,
+)
+from src.storage.models import WatchItem
+from src.utils.logger import logger
+from src.utils.time_utils import get_difference_with_pull_time
+
+# Lots closing later than this are never re-checked (2 days)
+RECHECK_HORIZON = 172800
+# Lots closing within this are alerted as "closing"
+CLOSING_SOON = 90
+
+RESERVE_OK = ("Reserve price reached", "No reserve price")
+
+
+def normalize_estimate(item: Dict) -> None:
+    """Remove non-breaking spaces from an item's estimate, in place."""
+    if item["estimated_price"] != "No estimated price":
+        item["estimated_price"] = item["estimated_price"].replace("\xa0", "")
+
+
+def _amount(text: str) -> float:
+    """Parse an amount such as "5 000 €" (raises ValueError)."""
+    return float(text.replace("€", "").replace("\xa0", "").replace(" ", ""))
+
+
+def estimate_median(item: Dict) -> Optional[float]:
+    """
+    Midpoint of an item's estimate.
+
+    Returns:
+        Midpoint, or None if the item has no parseable estimate
+    """
+    if item["estimated_price"] == "No estimated price":
+        return None
+    try:
+        low, high = item["estimated_price"].replace("\xa0", "").split(" - ")
+        return (_amount(low) + _amount(high)) / 2
+    except ValueError:
+        logger.warning("Unparseable estimate %r on %s", item["estimated_price"], item["url"])
+        return None
+
+
+def price_value(item: Dict) -> Optional[float]:
+    """Current bid of an item, or None without a parseable price."""
+    if item["price"] == "No price":
+        return None
+    try:
+        return _amount(item["price"])
+    except ValueError:
+        return None
+
+
+def reference_price(
+    item: Dict,
+    price_stats: Optional[PriceStatistics] = None,
+    min_samples: int = PRICE_STATS_MIN_SAMPLES,
+) -> Optional[float]:
+    """
+    Price a lot is expected to sell for.
+
+    Realised prices of the lot's segment when at least `min_samples` sales
+    were recorded in `price_stats`, the estimate midpoint otherwise.
+
+    Returns:
+        Reference price, or None if the lot has no parseable estimate
+    """
+    median = estimate_median(item)
+    if median is not None and price_stats is not None:
+        expected = price_stats.expected_price(WatchItem.from_dict(item), min_samples)
+        if expected:
+            return expected
+    return median
+
+
+def is_underpriced(
+    item: Dict,
+    threshold: Optional[float] = None,
+    price_stats: Optional[PriceStatistics] = None,
+) -> bool:
+    """
+    Whether the current bid is below `threshold` of the lot's reference price.
+
+    Args:
+        item: Item dictionary
+        threshold: Maximum price as a fraction of the reference (runtime value if None)
+        price_stats: PriceStatistics of realised prices (estimate midpoint only if None)
+    """
+    if threshold is None:
+        threshold = current_config().price_threshold
+    reference = reference_price(item, price_stats)
+    price = price_value(item)
+    return reference is not None and price is not None and price < reference * threshold
+
+
+def remaining_seconds(item: Dict) -> Optional[float]:
+    """Seconds until the auction closes, or None without a countdown."""
+    if item["time"] == "No time":
+        return None
+    return get_difference_with_pull_time(item["pull_time"], item["time"])
+
+
+def select_items_to_check(
+    items: List[Dict],
+    threshold: Optional[float] = None,
+    time_limit: Optional[int] = None,
+    price_stats: Optional[PriceStatistics] = None,
+) -> List[Dict]:
+    """
+    Lots worth re-visiting: underpriced and closing within `time_limit`.
+
+    Args:
+        items: Item dictionaries
+        threshold: Maximum price as a fraction of the reference price
+            (runtime configuration if None)
+        time_limit: Maximum remaining time in seconds (runtime configuration if None)
+        price_stats: Realised prices used as reference (estimate midpoint only if None)
+
+    Returns:
+        Items to re-check, in input order
+    """
+    config = current_config()
+    threshold = config.price_threshold if threshold is None else threshold
+    time_limit = config.remaining_time_threshold if time_limit is None else time_limit
+    selected = []
+    for item in items:
+        remaining = remaining_seconds(item)
+        if remaining is None or not 0 <= remaining < min(time_limit, RECHECK_HORIZON):
+            continue
+        if is_underpriced(item, threshold, price_stats):
+            selected.append(item)
+    return selected
+
+
+class OfferClassifier:
+    """
+    Sorts underpriced lots into new, updated and closing-soon offers.
+
+    Alert history comes from the outbox, so a lot is alerted as new once, as
+    updated when its price or reserve changed since the last alert, and as
+    closing once. A near-duplicate of an alerted lot that has already ended
+    is a relist and is skipped; lots of the same model running side by side
+    are alerted each. Relists can already be told from their listing card
+    title (relist_of_card), before their page is fetched.
+
+    Lots ended more than `relist_horizon` ago are forgotten. The index is
+    shared by the crawler and the analyzer threads of the daemon.
+    """
+
+    def __init__(
+        self,
+        outbox,
+        dedup_threshold: float = DEDUP_SIMILARITY_THRESHOLD,
+        threshold: Optional[float] = None,
+        time_limit: Optional[int] = None,
+        price_stats: Optional[PriceStatistics] = None,
+        relist_horizon: float = DEDUP_RELIST_HORIZON,
+    ):
+        """
+        Initialize classifier.
+
+        Args:
+            outbox: NotificationOutbox holding the alert history
+            dedup_threshold: Similarity above which a lot duplicates an alerted one
+            threshold: Maximum price as a fraction of the reference price
+                (follows the runtime configuration if None)
+            time_limit: Maximum remaining time in seconds (runtime configuration if None)
+            price_stats: Realised prices used as reference price once a segment has
+                PRICE_STATS_MIN_SAMPLES sales (estimate midpoint only if None)
+            relist_horizon: Seconds after closing an alerted lot can still be relisted
+        """
+        self.outbox = outbox
+        self.threshold = threshold
+        self.time_limit = time_limit
+        self.price_stats = price_stats
+        self.relist_horizon = relist_horizon
+        # signatures and closing times of alerted lots, so relisted lots are not alerted twice;
+        # listing cards carry no estimate, so they are matched on title-only signatures
+        self.duplicates = DuplicateDetector(threshold=dedup_threshold)
+        self.titles = DuplicateDetector(threshold=dedup_threshold)
+        self.end_times: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+        for alert in outbox.latest_alerts():
+            self.index(alert.item)
+        self.prune()
+
+    def index(self, item: WatchItem) -> None:
+        """Remember an alerted lot's signature and closing time."""
+        lot_id = item.item_id or item.url
+        remaining = remaining_seconds(item.to_dict())
+        end_time = item.pull_time + remaining if remaining is not None else None
+        with self._lock:
+            self.duplicates.add_item(item)
+            self.titles.add(lot_id, item.title)
+            self.end_times[lot_id] = end_time
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Forget the lots ended more than relist_horizon ago.
+
+        Returns:
+            Number of lots forgotten
+        """
+        cutoff = (now if now is not None else time.time()) - self.relist_horizon
+        with self._lock:
+            expired = [
+                lot_id
+                for lot_id, end_time in self.end_times.items()
+                if end_time is not None and end_time < cutoff
+            ]
+            for lot_id in expired:
+                self.duplicates.remove(lot_id)
+                self.titles.remove(lot_id)
+                del self.end_times[lot_id]
+        if expired:
+            logger.debug("Forgot %d lots ended before the relist horizon", len(expired))
+        return len(expired)
+
+    def _ended_match(self, matches: List[Tuple[str, float]], now: Optional[float]) -> Optional[str]:
+        """Best of the matches whose lot has ended by now (lock held)."""
+        now = now if now is not None else time.time()
+        for match_id, _ in matches:
+            end_time = self.end_times.get(match_id)
+            if end_time is not None and end_time < now:
+                return match_id
+        return None
+
+    def relist_of(self, item: WatchItem, now: Optional[float] = None) -> Optional[str]:
+        """
+        Get the ID of an alerted lot, ended by now, that the item duplicates.
+
+        Returns:
+            Lot ID of the best ended match, or None if the item is not a relist
+        """
+        lot_id = item.item_id or item.url
+        with self._lock:
+            matches = self.duplicates.find_duplicates(
+                item.title, item.get_median_estimate(), exclude=lot_id
+            )
+            return self._ended_match(matches, now)
+
+    def relist_of_card(self, card: Dict, now: Optional[float] = None) -> Optional[str]:
+        """
+        Get the ID of an alerted lot, ended by now, that a listing card's title duplicates.
+
+        Args:
+            card: Listing card ({"href", "title"})
+            now: Current time (time.time() if None)
+
+        Returns:
+            Lot ID of the best ended match, or None if the card is not a relist
+        """
+        if not card.get("title"):
+            return None
+        lot_id = lot_id_from_url(card["href"]) or card["href"]
+        with self._lock:
+            matches = self.titles.find_duplicates(card["title"], exclude=lot_id)
+            return self._ended_match(matches, now)
+
+    def price_changed(self, item: Dict, lot_id: str) -> bool:
+        """Whether price or reserve changed since the lot's last alert."""
+        last_alert = self.outbox.latest_alert(lot_id)
+        if last_alert is None:
+            return False
+        return (
+            item["price"] != last_alert.item.price
+            or item["reserve_price"] != last_alert.item.reserve_price
+        )
+
+    def classify(self, items: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Classify items (estimates are normalized in place).
+
+        Returns:
+            Tuple of (new offers, updated offers, closing-soon offers)
+        """
+        # one configuration for the whole pass
+        config = current_config()
+        self.prune()
+        threshold = config.price_threshold if self.threshold is None else self.threshold
+        time_limit = config.remaining_time_threshold if self.time_limit is None else self.time_limit
+        good_offers, offers_updated, closing_soon = [], [], []
+        for item in items:
+            normalize_estimate(item)
+            if item["reserve_price"] not in RESERVE_OK:
+                continue
+            remaining = remaining_seconds(item)
+            if remaining is None or remaining >= time_limit:
+                continue
+            if not is_underpriced(item, threshold, self.price_stats):
+                continue
+
+            watch_item = WatchItem.from_dict(item)
+            lot_id = watch_item.item_id or watch_item.url
+            if remaining <= 0:
+                continue
+            if not self.outbox.has_alert(lot_id, "new"):
+                relist_of = self.relist_of(watch_item)
+                if relist_of:
+                    # judged again on every pass, so not worth more than a debug line
+                    logger.debug("Relist of ended lot %s, skipped: %s", relist_of, item["url"])
+                else:
+                    good_offers.append(item)
+                    self.index(watch_item)
+            elif self.price_changed(item, lot_id):
+                offers_updated.append(item)
+                logger.debug("Offer updated: %s", item["url"])
+            elif remaining < CLOSING_SOON and not self.outbox.has_alert(lot_id, "closing"):
+                closing_soon.append(item)
+        return good_offers, offers_updated, closing_soon
@@ -0,0 +1,465 @@
+"""
+Streaming price statistics built from closed auctions.
+
+Every closed lot updates a handful of running aggregates for its segment
+(brand) in constant time and memory. Nothing is ever recomputed over the
+full history, so lookups from the analyzer stay O(1).
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import PRICE_STATS_CLOSE_WINDOW
+from src.storage.models import WatchItem
+from src.utils.logger import logger
+from src.utils.time_utils import get_difference_with_pull_time, get_total_seconds
+
+# Segment shared by every recorded sale, used as a fallback for sparse brands
+GLOBAL_SEGMENT = "__all__"
+
+# Brands matched against lot titles, multi-word names first
+KNOWN_BRANDS: Tuple[str, ...] = (
+    "audemars piguet",
+    "patek philippe",
+    "vacheron constantin",
+    "jaeger-lecoultre",
+    "a. lange & söhne",
+    "grand seiko",
+    "tag heuer",
+    "baume & mercier",
+    "frederique constant",
+    "maurice lacroix",
+    "rolex",
+    "tudor",
+    "omega",
+    "breitling",
+    "cartier",
+    "iwc",
+    "panerai",
+    "hublot",
+    "zenith",
+    "longines",
+    "tissot",
+    "seiko",
+    "citizen",
+    "oris",
+    "sinn",
+    "hamilton",
+    "certina",
+    "rado",
+    "chopard",
+    "bulgari",
+    "breguet",
+    "blancpain",
+    "montblanc",
+    "nomos",
+    "junghans",
+    "casio",
+)
+
+# Number of lot IDs remembered to avoid recording the same sale twice
+RECORDED_IDS_LIMIT = 10000
+
+
+def extract_brand(title: str) -> str:
+    """
+    Derive a segment key (brand) from a lot title.
+
+    Args:
+        title: Lot title as scraped
+
+    Returns:
+        Lower-case brand name, or the first title word for unknown brands
+    """
+    lowered = title.lower().strip()
+    for brand in KNOWN_BRANDS:
+        if brand in lowered:
+            return brand
+    words = lowered.split()
+    return words[0] if words else "unknown"
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimator (P-square algorithm, Jain & Chlamtac).
+
+    Keeps five markers whatever the number of observations, so both
+    updates and reads are O(1).
+    """
+
+    def __init__(self, quantile: float):
+        """
+        Initialize estimator.
+
+        Args:
+            quantile: Target quantile (0.0-1.0)
+        """
+        if not 0.0 < quantile < 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1, got {quantile}")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions: List[int] = [0, 1, 2, 3, 4]
+        self._desired: List[float] = [0.0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4.0]
+        self._increments: List[float] = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        """Add an observation."""
+        self.count += 1
+
+        if self.count <= 5:
+            self._heights.append(value)
+            if self.count == 5:
+                self._heights.sort()
+            return
+
+        q = self._heights
+        n = self._positions
+
+        # Locate the cell containing the new value, stretching the extremes
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the three middle markers towards their desired positions
+        for i in range(1, 4):
+            delta = self._desired[i] - n[i]
+            if (delta >= 1 and n[i + 1] - n[i] > 1) or (delta <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if delta > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = self._linear(i, step)
+                q[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        """Piecewise-parabolic marker height prediction."""
+        q = self._heights
+        n = self._positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        """Linear marker height prediction (fallback)."""
+        q = self._heights
+        n = self._positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current quantile estimate, or None without observations."""
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            ordered = sorted(self._heights)
+            index = min(int(round(self.quantile * (len(ordered) - 1))), len(ordered) - 1)
+            return ordered[index]
+        return self._heights[2]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "quantile": self.quantile,
+            "count": self.count,
+            "heights": self._heights,
+            "positions": self._positions,
+            "desired": self._desired,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "P2Quantile":
+        """Create estimator from dictionary."""
+        estimator = cls(data["quantile"])
+        estimator.count = data["count"]
+        estimator._heights = list(data["heights"])
+        estimator._positions = list(data["positions"])
+        estimator._desired = list(data["desired"])
+        return estimator
+
+
+@dataclass
+class RunningStats:
+    """
+    Running mean/variance (Welford) with min and max.
+
+    Attributes:
+        count: Number of observations
+        mean: Running mean
+        m2: Sum of squared differences from the mean
+        minimum: Smallest observation
+        maximum: Largest observation
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Add an observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two observations)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Create RunningStats from dictionary."""
+        return cls(**data)
+
+
+@dataclass
+class SegmentStats:
+    """
+    Realised price statistics for one segment.
+
+    Attributes:
+        ratio: Running stats of hammer price / estimate midpoint
+        price: Running stats of final (hammer) prices
+        ratio_quantiles: Streaming quantiles of the hammer-to-estimate ratio
+        price_median: Streaming median of final prices
+    """
+
+    ratio: RunningStats = field(default_factory=RunningStats)
+    price: RunningStats = field(default_factory=RunningStats)
+    ratio_quantiles: Dict[float, P2Quantile] = field(
+        default_factory=lambda: {q: P2Quantile(q) for q in (0.25, 0.5, 0.75)}
+    )
+    price_median: P2Quantile = field(default_factory=lambda: P2Quantile(0.5))
+
+    def add(self, hammer_price: float, estimate_midpoint: float) -> None:
+        """Record one realised sale."""
+        hammer_ratio = hammer_price / estimate_midpoint
+        self.ratio.add(hammer_ratio)
+        self.price.add(hammer_price)
+        for estimator in self.ratio_quantiles.values():
+            estimator.add(hammer_ratio)
+        self.price_median.add(hammer_price)
+
+    @property
+    def count(self) -> int:
+        """Number of recorded sales."""
+        return self.ratio.count
+
+    def ratio_quantile(self, quantile: float) -> Optional[float]:
+        """Get a tracked quantile of the hammer-to-estimate ratio."""
+        estimator = self.ratio_quantiles.get(quantile)
+        return estimator.value if estimator else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "ratio": self.ratio.to_dict(),
+            "price": self.price.to_dict(),
+            "ratio_quantiles": [e.to_dict() for e in self.ratio_quantiles.values()],
+            "price_median": self.price_median.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentStats":
+        """Create SegmentStats from dictionary."""
+        quantiles = [P2Quantile.from_dict(e) for e in data["ratio_quantiles"]]
+        return cls(
+            ratio=RunningStats.from_dict(data["ratio"]),
+            price=RunningStats.from_dict(data["price"]),
+            ratio_quantiles={e.quantile: e for e in quantiles},
+            price_median=P2Quantile.from_dict(data["price_median"]),
+        )
+
+
+class PriceStatistics:
+    """
+    Incremental store of realised prices per brand segment.
+    """
+
+    def __init__(
+        self, file_path: Optional[str] = None, close_window: float = PRICE_STATS_CLOSE_WINDOW
+    ):
+        """
+        Initialize statistics store.
+
+        Args:
+            file_path: Optional JSON file used to persist the statistics
+            close_window: Longest time between a lot's last scrape and its close for
+                its last price to count as hammer price (seconds)
+        """
+        self.file_path = Path(file_path) if file_path else None
+        self.close_window = close_window
+        self._segments: Dict[str, SegmentStats] = {}
+        self._recorded_ids: "OrderedDict[str, None]" = OrderedDict()
+
+        if self.file_path and self.file_path.exists():
+            self.load()
+
+    def segment_for(self, item: WatchItem) -> str:
+        """Get the segment key of an item."""
+        return extract_brand(item.title)
+
+    def get(self, segment: str) -> Optional[SegmentStats]:
+        """Get statistics for a segment (None if nothing recorded)."""
+        return self._segments.get(segment)
+
+    def record_sale(self, item: WatchItem, hammer_price: Optional[float] = None) -> bool:
+        """
+        Record a closed auction in O(1).
+
+        Args:
+            item: Closed lot (its last price is used as hammer price by default)
+            hammer_price: Explicit final price, if known
+
+        Returns:
+            True if the sale was recorded
+        """
+        price = hammer_price if hammer_price is not None else item.get_price_numeric()
+        midpoint = item.get_median_estimate()
+        if price is None or not midpoint:
+            return False
+
+        key = item.item_id or item.url
+        if key in self._recorded_ids:
+            return False
+        self._recorded_ids[key] = None
+        if len(self._recorded_ids) > RECORDED_IDS_LIMIT:
+            self._recorded_ids.popitem(last=False)
+
+        for segment in (self.segment_for(item), GLOBAL_SEGMENT):
+            self._segments.setdefault(segment, SegmentStats()).add(price, midpoint)
+
+        logger.debug(f"Recorded sale of {key}: {price:.0f} € ({price / midpoint:.1%} of estimate)")
+        return True
+
+    def observe(self, item: WatchItem) -> bool:
+        """
+        Record an item if its auction has ended with the reserve met.
+
+        Only lots last scraped within close_window of their close are recorded:
+        the price of a lot seen days before it closed is an early bid, not its
+        hammer price. Safe to call on every item each cycle: already recorded
+        lots are skipped.
+
+        Returns:
+            True if a new sale was recorded
+        """
+        if not (item.is_valid_time and item.reserve_met):
+            return False
+        if get_difference_with_pull_time(item.pull_time, item.time) > 0:
+            return False
+        if get_total_seconds(item.time) > self.close_window:
+            return False
+        return self.record_sale(item)
+
+    def expected_ratio(
+        self, item: WatchItem, min_samples: int = 20, quantile: float = 0.5
+    ) -> Optional[float]:
+        """
+        Expected hammer-to-estimate ratio for an item.
+
+        Uses the item's brand segment when it has enough samples, otherwise
+        the global segment.
+
+        Returns:
+            Ratio, or None if there is not enough history
+        """
+        for segment in (self.segment_for(item), GLOBAL_SEGMENT):
+            stats = self._segments.get(segment)
+            if stats and stats.count >= min_samples:
+                return stats.ratio_quantile(quantile)
+        return None
+
+    def expected_price(self, item: WatchItem, min_samples: int = 20) -> Optional[float]:
+        """
+        Expected hammer price for an item from realised sales.
+
+        Returns:
+            Estimate midpoint scaled by the segment's median ratio, or None
+        """
+        ratio = self.expected_ratio(item, min_samples)
+        midpoint = item.get_median_estimate()
+        if ratio is None or midpoint is None:
+            return None
+        return midpoint * ratio
+
+    def save(self) -> bool:
+        """
+        Persist statistics to the configured file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.file_path:
+            return False
+        try:
+            data = {
+                "updated_at": time.time(),
+                "segments": {k: v.to_dict() for k, v in self._segments.items()},
+                "recorded_ids": list(self._recorded_ids),
+            }
+            tmp_path = self.file_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.file_path)
+            logger.debug(f"Saved price statistics ({len(self._segments)} segments)")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save price statistics: {e}")
+            return False
+
+    def load(self) -> bool:
+        """
+        Load statistics from the configured file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._segments = {
+                k: SegmentStats.from_dict(v) for k, v in data.get("segments", {}).items()
+            }
+            self._recorded_ids = OrderedDict((k, None) for k in data.get("recorded_ids", []))
+            logger.debug(f"Loaded price statistics ({len(self._segments)} segments)")
+            return True
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.error(f"Failed to parse price statistics from {self.file_path}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error loading price statistics: {e}")
+            return False
@@ -0,0 +1,131 @@
+"""
+Savings of request blocking on real lot pages.
+
+Loads each lot twice in one browser with the HTTP cache disabled, without
+and with the configured RequestBlocker, and reports the bytes and
+milliseconds blocking saves per page. The extracted fields of both loads
+are compared, so a blocking setting that breaks extraction shows up as a
+mismatch. Settings are read from the environment like production, e.g.
+BROWSER_BLOCK_RESOURCES=image,font,media,stylesheet to try blocking CSS.
+
+Usage:
+    python -m src.bench.blocking https://www.catawiki.com/fr/l/12345678-omega
+    python -m src.bench.blocking --lots 20          # lots of the configured listing
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from src.config.settings import CATAWIKI_BASE_URL
+from src.scraper.blocking import RequestBlocker, page_cost
+from src.scraper.extraction import lot_fields
+
+# Item fields that must not change when requests are blocked
+EXTRACTED_FIELDS = ("title", "price", "estimated_price", "reserve_price")
+
+
+def load(driver, url: str, settle: float) -> Dict:
+    """
+    Load a page and extract its item.
+
+    Returns:
+        page_cost() of the load, with the item dictionary (or None) under "item"
+    """
+    # main.py is the production parser; imported lazily as it pulls in Selenium
+    import main as scraper
+
+    driver.get(url)
+    time.sleep(settle)
+    cost = page_cost(driver)
+    fields = lot_fields(driver)
+    cost["item"] = None
+    if fields["time"] is not None:
+        cost["item"] = scraper.item_from_fields(fields, url, time.time())
+    return cost
+
+
+def run_benchmark(urls: List[str], settle: float = 2.0) -> Dict[str, float]:
+    """
+    Compare unblocked and blocked loads of every URL.
+
+    Returns:
+        Medians of bytes and ms per page with and without blocking, and the
+        number of pages whose extracted fields differ
+    """
+    from src.scraper.browser import BrowserManager
+
+    blocker = RequestBlocker()
+    browser = BrowserManager(max_pages=0, max_rss_mb=0, warm_spare=False, tabs=1, blocker=blocker)
+    driver = browser.get_driver()
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    plain: List[Dict] = []
+    blocked: List[Dict] = []
+    mismatches = 0
+    try:
+        for url in urls:
+            RequestBlocker.clear(driver)
+            plain.append(load(driver, url, settle))
+            blocker.apply(driver)
+            blocked.append(load(driver, url, settle))
+            before, after = plain[-1]["item"], blocked[-1]["item"]
+            if before is not None and (
+                after is None or any(before[field] != after[field] for field in EXTRACTED_FIELDS)
+            ):
+                mismatches += 1
+    finally:
+        browser.close()
+
+    def median(costs: List[Dict], key: str) -> float:
+        return statistics.median(cost[key] for cost in costs) if costs else 0.0
+
+    return {
+        "pages": len(urls),
+        "patterns": len(blocker.patterns),
+        "bytes": median(plain, "bytes"),
+        "bytes_blocked": median(blocked, "bytes"),
+        "ms": median(plain, "ms"),
+        "ms_blocked": median(blocked, "ms"),
+        "requests": median(plain, "requests"),
+        "requests_blocked": median(blocked, "requests"),
+        "mismatches": mismatches,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Bytes and time saved by request blocking")
+    parser.add_argument("urls", nargs="*", help="lot pages (default: from the listing)")
+    parser.add_argument("--lots", type=int, default=10, help="lots taken from the listing")
+    parser.add_argument("--settle", type=float, default=2.0, help="wait after load (s)")
+    args = parser.parse_args(argv)
+
+    urls = args.urls
+    if not urls:
+        import main as scraper
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            urls = scraper.get_object_links_with_scroll(CATAWIKI_BASE_URL)[: args.lots]
+
+    result = run_benchmark(urls, args.settle)
+    print(f"{result['pages']} pages, {result['patterns']} blocking patterns (medians per page)")
+    print(
+        f"  unblocked: {result['bytes'] / 1024:.0f} KB in {result['ms']:.0f} ms, "
+        f"{result['requests']:.0f} requests"
+    )
+    print(
+        f"  blocked:   {result['bytes_blocked'] / 1024:.0f} KB in {result['ms_blocked']:.0f} ms, "
+        f"{result['requests_blocked']:.0f} requests"
+    )
+    print(
+        f"  saved:     {(result['bytes'] - result['bytes_blocked']) / 1024:.0f} KB and "
+        f"{result['ms'] - result['ms_blocked']:.0f} ms per page"
+    )
+    print(f"  pages with different extracted fields: {result['mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
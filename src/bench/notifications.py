@@ -0,0 +1,173 @@
+"""
+End-to-end notification benchmark.
+
+Pushes synthetic DealAlerts through a notifier backend (optionally via the
+outbox) and reports throughput and delivery latency percentiles. Telegram
+and webhook backends run against a local MockTelegramServer, so no real
+API is hit.
+
+Usage:
+    python -m src.bench.notifications --backend telegram --alerts 5000 --chats 5
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.bench.reporting import format_summary, summarize
+from src.notifications.base import create_notifier
+from src.notifications.messages import build_alert
+from src.notifications.mock_server import MockTelegramServer
+from src.notifications.outbox import NotificationOutbox, OutboxDispatcher
+from src.storage.models import DealAlert, WatchItem
+
+_BRANDS = ["Rolex", "Omega", "Seiko", "Tudor", "Longines", "Cartier", "Breitling", "Tissot"]
+
+
+def make_alerts(count: int, seed: int = 0) -> List[DealAlert]:
+    """
+    Generate synthetic deal alerts.
+
+    Args:
+        count: Number of alerts
+        seed: Random seed for reproducible runs
+
+    Returns:
+        List of DealAlert objects for distinct lots
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    alerts = []
+    for i in range(count):
+        low = rng.randrange(500, 20000, 100)
+        item = WatchItem(
+            title=f"{rng.choice(_BRANDS)} - Synthetic lot {i}",
+            price=f"{int(low * rng.uniform(0.3, 0.9))} €",
+            time=f"{rng.randint(1, 29)}m",
+            url=f"https://www.catawiki.com/fr/l/{90000000 + i}-synthetic",
+            estimated_price=f"{low} € - {int(low * 1.4)} €",
+            pull_time=now,
+            reserve_price="No reserve price",
+        )
+        alerts.append(build_alert(item, rng.choice(["new", "updated", "closing"])))
+    return alerts
+
+
+async def run_direct(notifier, alerts: List[DealAlert], rate: Optional[float]) -> Dict:
+    """
+    Send alerts straight through a notifier.
+
+    Args:
+        notifier: Started notifier
+        alerts: Alerts to send
+        rate: Arrival rate in alerts/s (None sends everything at once)
+
+    Returns:
+        Benchmark summary
+    """
+    latencies: List[float] = []
+    started = time.perf_counter()
+
+    async def push(index: int, alert: DealAlert) -> None:
+        if rate:
+            await asyncio.sleep(max(0.0, index / rate - (time.perf_counter() - started)))
+        sent_at = time.perf_counter()
+        results = await notifier.send(alert.message)
+        if all(results.values()):
+            latencies.append(time.perf_counter() - sent_at)
+
+    await asyncio.gather(*(push(i, alert) for i, alert in enumerate(alerts)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_outbox(notifier, alerts: List[DealAlert], chat_ids: List[str], db_path: str) -> Dict:
+    """
+    Enqueue alerts in an outbox and let the dispatcher deliver them.
+
+    Latency is measured from enqueue to the recorded delivery.
+
+    Returns:
+        Benchmark summary
+    """
+    outbox = NotificationOutbox(db_path, base_delay=0.1)
+    dispatcher = OutboxDispatcher(outbox, notifier, poll_interval=0.01, batch_size=500)
+    started = time.perf_counter()
+    for alert in alerts:
+        outbox.enqueue(alert, chat_ids)
+
+    task = asyncio.create_task(dispatcher.run())
+    while outbox.counts()["pending"]:
+        await asyncio.sleep(0.05)
+    dispatcher.stop()
+    await task
+
+    summary = summarize(outbox.delivery_latencies(), time.perf_counter() - started)
+    outbox.close()
+    return summary
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict:
+    """Run one benchmark configuration and return its summary."""
+    alerts = make_alerts(args.alerts, args.seed)
+    chat_ids = [str(1000 + i) for i in range(args.chats)]
+    with tempfile.TemporaryDirectory(prefix="notif-bench-") as tmp:
+        workdir = Path(tmp)
+        server = None
+        options: Dict = {"chat_ids": chat_ids}
+        if args.backend in ("telegram", "webhook"):
+            server = MockTelegramServer(
+                latency=args.latency, error_rate=args.error_rate, flood_rate=args.flood_rate
+            ).start()
+        if args.backend == "telegram":
+            options.update(
+                token="0:benchmark",
+                base_url=server.bot_api_url,
+                global_rate=args.global_rate,
+                per_chat_rate=args.per_chat_rate,
+                concurrency=args.concurrency,
+            )
+        elif args.backend == "webhook":
+            options.update(url=server.webhook_url, concurrency=args.concurrency)
+        elif args.backend == "file":
+            options.update(file_path=str(workdir / "notifications.jsonl"))
+
+        try:
+            async with create_notifier(args.backend, **options) as notifier:
+                if args.outbox:
+                    return await run_outbox(notifier, alerts, chat_ids, str(workdir / "outbox.db"))
+                return await run_direct(notifier, alerts, args.rate)
+        finally:
+            if server:
+                server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Notification throughput/latency benchmark")
+    parser.add_argument(
+        "--backend", default="telegram", choices=["telegram", "webhook", "file", "stdout"]
+    )
+    parser.add_argument("--alerts", type=int, default=2000, help="number of synthetic alerts")
+    parser.add_argument("--chats", type=int, default=3, help="recipients per alert")
+    parser.add_argument("--rate", type=float, help="arrival rate in alerts/s (default: burst)")
+    parser.add_argument("--outbox", action="store_true", help="go through the outbox")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock HTTP 500 ratio")
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="mock HTTP 429 ratio")
+    parser.add_argument("--global-rate", type=float, default=10000.0, help="Telegram msg/s")
+    parser.add_argument("--per-chat-rate", type=float, default=1000.0, help="msg/s per chat")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_benchmark(args))
+    mode = "outbox" if args.outbox else "direct"
+    print(format_summary(f"{args.backend}/{mode} x{args.chats} chats", summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Cold and warm browser starts on real lot pages.
+
+Starts a browser several times on a temporary profile (cold) and on a
+persistent profile slot (warm), and reports for each how long Chrome took
+to start and what its first lot page cost. The warm runs use a scratch
+profile store, seeded by one unmeasured load, so the production profiles
+are left untouched.
+
+Usage:
+    python -m src.bench.profiles https://www.catawiki.com/fr/l/12345678-omega
+    python -m src.bench.profiles --starts 5
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from src.config.settings import CATAWIKI_BASE_URL
+from src.scraper.blocking import page_cost
+from src.scraper.profiles import ProfileStore
+
+
+def start(store: ProfileStore, url: str, settle: float) -> Dict[str, float]:
+    """
+    Start a browser on the store's profiles and load one page.
+
+    Returns:
+        page_cost() of the page, with the browser start time in "start_ms"
+    """
+    from src.scraper.browser import BrowserManager
+
+    browser = BrowserManager(max_pages=0, max_rss_mb=0, warm_spare=False, tabs=1, profiles=store)
+    try:
+        begin = time.perf_counter()
+        driver = browser.get_driver()
+        started = time.perf_counter()
+        driver.get(url)
+        time.sleep(settle)
+        cost = page_cost(driver)
+        cost["start_ms"] = (started - begin) * 1000
+        return cost
+    finally:
+        browser.close()
+
+
+def run_benchmark(url: str, starts: int = 3, settle: float = 2.0) -> Dict[str, float]:
+    """
+    Compare cold and warm starts.
+
+    Returns:
+        Medians of start ms, first page ms and first page bytes, cold and warm
+    """
+    cold: List[Dict] = []
+    warm: List[Dict] = []
+    with tempfile.TemporaryDirectory() as root:
+        store = ProfileStore(root, slots=1)
+        # fills the slot's cache and cookies
+        start(store, url, settle)
+        for _ in range(starts):
+            cold.append(start(ProfileStore(""), url, settle))
+            warm.append(start(store, url, settle))
+
+    def median(costs: List[Dict], key: str) -> float:
+        return statistics.median(cost[key] for cost in costs) if costs else 0.0
+
+    return {
+        "starts": starts,
+        **{f"{key}_cold": median(cold, key) for key in ("start_ms", "ms", "bytes")},
+        **{f"{key}_warm": median(warm, key) for key in ("start_ms", "ms", "bytes")},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Cold and warm browser profile starts")
+    parser.add_argument("url", nargs="?", help="lot page (default: first lot of the listing)")
+    parser.add_argument("--starts", type=int, default=3, help="starts of each kind")
+    parser.add_argument("--settle", type=float, default=2.0, help="wait after load (s)")
+    args = parser.parse_args(argv)
+
+    url = args.url
+    if url is None:
+        import main as scraper
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            url = scraper.get_object_links_with_scroll(CATAWIKI_BASE_URL)[0]
+
+    result = run_benchmark(url, args.starts, args.settle)
+    print(f"{result['starts']} starts of each kind (medians)")
+    for kind in ("cold", "warm"):
+        print(
+            f"  {kind}: browser start {result[f'start_ms_{kind}']:.0f} ms, first page "
+            f"{result[f'ms_{kind}']:.0f} ms and {result[f'bytes_{kind}'] / 1024:.0f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
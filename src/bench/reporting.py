@@ -0,0 +1,57 @@
+"""
+Helpers to summarize and print benchmark measurements.
+"""
+
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Compute a percentile with linear interpolation.
+
+    Args:
+        values: Measurements (need not be sorted)
+        q: Percentile in 0-100
+
+    Returns:
+        Percentile value (0.0 for an empty sequence)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarize per-operation latencies of a run.
+
+    Args:
+        latencies: Per-operation latencies in seconds
+        elapsed: Wall-clock duration of the run in seconds
+
+    Returns:
+        Dictionary with count, throughput and latency percentiles (ms)
+    """
+    return {
+        "count": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+def format_summary(name: str, summary: Dict[str, float]) -> str:
+    """Format a summary as a one-line report."""
+    return (
+        f"{name}: {summary['count']} ops in {summary['elapsed_s']:.2f}s "
+        f"({summary['throughput_per_s']:.1f}/s) "
+        f"p50={summary['p50_ms']:.1f}ms p90={summary['p90_ms']:.1f}ms "
+        f"p99={summary['p99_ms']:.1f}ms max={summary['max_ms']:.1f}ms"
+    )
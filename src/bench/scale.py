@@ -0,0 +1,352 @@
+"""
+Benchmarks of models, analyzer and storage at scale.
+
+Runs each case against synthetic datasets of 1k/10k/100k WatchItems and
+reports the median time per call. Results can be saved under a version label
+(the git revision by default) and compared with a previous run, so
+regressions between versions show up.
+
+Usage:
+    python -m src.bench.scale --sizes 1000 10000 --save
+    python -m src.bench.scale --compare            # against the latest saved run
+    python -m src.bench.scale --compare v1.2 --threshold 0.1
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.analyzer.filters import DealAnalyzer
+from src.config.settings import BENCH_RESULTS_DIR
+from src.storage.json_store import JSONStorage
+from src.storage.models import WatchItem
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+_BRANDS = ["Rolex", "Omega", "Seiko", "Tudor", "Longines", "Cartier", "Breitling", "Tissot"]
+_RESERVES = ["Reserve price reached", "No reserve price", "Reserve price not reached"]
+
+
+def make_items(count: int, seed: int = 0) -> List[WatchItem]:
+    """
+    Generate a realistic mix of synthetic watch items.
+
+    About 5% of items have no price, 10% no estimate, and remaining times
+    range from a few seconds to several days.
+
+    Args:
+        count: Number of items
+        seed: Random seed for reproducible datasets
+
+    Returns:
+        List of WatchItem objects
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    items = []
+    for i in range(count):
+        low = rng.randrange(200, 20000, 50)
+        remaining = int(rng.expovariate(1 / 7200)) + 1
+        days, rest = divmod(remaining, 86400)
+        hours, rest = divmod(rest, 3600)
+        minutes, seconds = divmod(rest, 60)
+        time_var = " ".join(
+            f"{value}{unit}"
+            for value, unit in ((days, "j"), (hours, "h"), (minutes, "m"), (seconds, "s"))
+            if value
+        )
+        price = int(low * rng.uniform(0.2, 1.3))
+        items.append(
+            WatchItem(
+                title=f"{rng.choice(_BRANDS)} - Synthetic lot {i}",
+                price="No price"
+                if rng.random() < 0.05
+                else f"{price:,}".replace(",", "\xa0") + " €",
+                time=time_var,
+                url=f"https://www.catawiki.com/fr/l/{80000000 + i}-synthetic",
+                estimated_price=(
+                    "No estimated price"
+                    if rng.random() < 0.1
+                    else f"{low}\xa0€ - {int(low * 1.4)}\xa0€"
+                ),
+                pull_time=now,
+                reserve_price=rng.choice(_RESERVES),
+            )
+        )
+    return items
+
+
+@dataclass
+class Case:
+    """
+    A benchmark case.
+
+    Attributes:
+        name: Case name (e.g. "analyzer.filter_good_deals")
+        prepare: Builds the function to time from a dataset (untimed)
+    """
+
+    name: str
+    prepare: Callable[[List[WatchItem], Path], Callable[[], Any]]
+
+
+def _storage(items: List[WatchItem], workdir: Path, name: str) -> JSONStorage:
+    """Create a JSONStorage pre-filled with the dataset."""
+    storage = JSONStorage(str(workdir / name))
+    storage.save(items)
+    return storage
+
+
+def _update(items: List[WatchItem], workdir: Path) -> Callable[[], Any]:
+    """Update one item in the middle of a pre-filled store."""
+    storage = _storage(items, workdir, "update.json")
+    target = items[len(items) // 2]
+    return lambda: storage.update_by_url(target)
+
+
+CASES: List[Case] = [
+    Case(
+        "model.get_price_numeric",
+        lambda items, _: lambda: [item.get_price_numeric() for item in items],
+    ),
+    Case(
+        "model.get_estimated_range",
+        lambda items, _: lambda: [item.get_estimated_range() for item in items],
+    ),
+    Case(
+        "analyzer.filter_good_deals",
+        lambda items, _: lambda: DealAnalyzer().filter_good_deals(items),
+    ),
+    Case(
+        "analyzer.sort_by_deal_quality",
+        lambda items, _: lambda: DealAnalyzer().sort_by_deal_quality(items),
+    ),
+    Case(
+        "analyzer.get_urgent_items",
+        lambda items, _: lambda: DealAnalyzer().get_urgent_items(items),
+    ),
+    Case(
+        "storage.save",
+        lambda items, workdir: lambda: JSONStorage(str(workdir / "save.json")).save(items),
+    ),
+    Case("storage.load", lambda items, workdir: _storage(items, workdir, "load.json").load),
+    Case("storage.update_by_url", _update),
+]
+
+
+def measure(function: Callable[[], Any], rounds: int, budget: float) -> Dict[str, float]:
+    """
+    Time a function over several rounds.
+
+    Stops early once the time budget is spent (after at least one round), so
+    slow cases at 100k items stay affordable.
+
+    Args:
+        function: Function to time
+        rounds: Maximum number of rounds
+        budget: Seconds after which no new round is started
+
+    Returns:
+        Dictionary with rounds, median_s, min_s and max_s
+    """
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < rounds:
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget:
+            break
+    return {
+        "rounds": len(timings),
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+    }
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    rounds: int = 5,
+    budget: float = 10.0,
+    only: Optional[str] = None,
+    seed: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run every case at every dataset size.
+
+    Args:
+        sizes: Dataset sizes
+        rounds: Maximum rounds per case
+        budget: Time budget per case in seconds
+        only: Substring filter on case names
+        seed: Dataset seed
+
+    Returns:
+        Mapping of "case[size]" to its measurement (plus per_item_us)
+    """
+    results = {}
+    for size in sizes:
+        items = make_items(size, seed)
+        for case in CASES:
+            if only and only not in case.name:
+                continue
+            with tempfile.TemporaryDirectory() as workdir:
+                function = case.prepare(items, Path(workdir))
+                result = measure(function, rounds, budget)
+            result["per_item_us"] = result["median_s"] / size * 1e6
+            results[f"{case.name}[{size}]"] = result
+            print(
+                f"{case.name + f'[{size}]':<38} median {result['median_s'] * 1000:>10.2f}ms "
+                f"({result['per_item_us']:.2f}us/item, {result['rounds']} rounds)"
+            )
+    return results
+
+
+def current_version() -> str:
+    """Short git revision of the working tree, or 'unknown'."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet"], capture_output=True).returncode != 0
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(
+    results: Dict[str, Dict[str, float]], label: str, results_dir: str = BENCH_RESULTS_DIR
+) -> Path:
+    """
+    Store a run under a version label.
+
+    Returns:
+        Path of the written file
+    """
+    directory = Path(results_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{label}.json"
+    data = {
+        "version": label,
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+def load_results(reference: Optional[str], results_dir: str = BENCH_RESULTS_DIR) -> Optional[Dict]:
+    """
+    Load a saved run.
+
+    Args:
+        reference: Version label, path to a results file, or None for the latest run
+
+    Returns:
+        Saved run, or None if nothing matches
+    """
+    if reference and Path(reference).is_file():
+        path = Path(reference)
+    elif reference:
+        path = Path(results_dir) / f"{reference}.json"
+    else:
+        runs = sorted(Path(results_dir).glob("*.json"), key=lambda p: p.stat().st_mtime)
+        if not runs:
+            return None
+        path = runs[-1]
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """
+    Compare two runs case by case on their median time.
+
+    Args:
+        current: Results of this run
+        baseline: Results of the reference run
+        threshold: Relative slowdown reported as a regression (0.2 = 20%)
+
+    Returns:
+        One row per common case with baseline, current, change and regression flag
+    """
+    rows = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["median_s"], result["median_s"]
+        change = (after - before) / before if before else 0.0
+        rows.append(
+            {
+                "case": name,
+                "baseline_s": before,
+                "current_s": after,
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (exit status 1 on regressions)."""
+    parser = argparse.ArgumentParser(description="Models/analyzer/storage benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--rounds", type=int, default=5, help="maximum rounds per case")
+    parser.add_argument("--budget", type=float, default=10.0, help="seconds per case")
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--save", nargs="?", const="", help="store results under a label (default: git revision)"
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const="", help="compare with a saved run (default: latest)"
+    )
+    parser.add_argument("--threshold", type=float, default=0.2, help="regression threshold")
+    parser.add_argument("--results-dir", default=BENCH_RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    # Load the baseline first, so --save of this run cannot become its own baseline
+    baseline = None
+    if args.compare is not None:
+        baseline = load_results(args.compare or None, args.results_dir)
+        if baseline is None:
+            print(f"No saved run to compare with in {args.results_dir}")
+
+    results = run_suite(args.sizes, args.rounds, args.budget, args.only, args.seed)
+
+    if args.save is not None:
+        path = save_results(results, args.save or current_version(), args.results_dir)
+        print(f"Results saved to {path}")
+
+    if baseline is None:
+        return 0
+    rows = compare(results, baseline["results"], args.threshold)
+    print(f"\nCompared with {baseline['version']}:")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['case']:<38} {row['baseline_s'] * 1000:>10.2f}ms -> "
+            f"{row['current_s'] * 1000:>10.2f}ms ({row['change']:+.0%}){flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+End-to-end scraper benchmark against the synthetic Catawiki site.
+
+Starts a CatawikiFixtureServer and runs the scraper's own functions
+(get_object_links_with_scroll, get_object_information) against it, with no
+network. The "http" driver fetches pages without a browser, isolating
+parsing and bookkeeping costs; the "chrome" driver measures the full
+browser path like production. The scraper's own limits apply (at most ~300
+links per crawl, fixed page-load sleeps).
+
+With --tabs N, the chrome driver loads lots concurrently in N tabs of one
+browser (BrowserManager.fetch_pages). Chrome runs also report the peak
+memory of the browser's process tree and lots/s per GB of it; as
+throughput and memory both grow with the number of one-driver workers,
+`--tabs 1` gives that deployment's ratio to compare against.
+
+Usage:
+    python -m src.bench.scraper --lots 2000 --driver http --latency 0.05
+    python -m src.bench.scraper --lots 200 --driver chrome --passes 3
+    python -m src.bench.scraper --lots 200 --driver chrome --tabs 8 --latency 0.5
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from src.bench.reporting import format_summary, summarize
+from src.scraper.extraction import lot_fields
+from src.scraper.fixture_server import CatawikiFixtureServer
+
+
+class HttpDriver:
+    """
+    Minimal stand-in for a Selenium driver fetching pages over plain HTTP.
+
+    Implements the calls the scraper makes (get, page_source, current_url,
+    execute_script, quit). JavaScript does not run, so listing pages must be
+    served without infinite scroll (scroll_batch=0). One keep-alive
+    connection is reused per host.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        self.timeout = timeout
+        self.page_source = ""
+        self.current_url = ""
+        self._connections: Dict[str, http.client.HTTPConnection] = {}
+
+    def get(self, url: str) -> None:
+        """Load a page (HTTP errors leave an error page, as in a browser)."""
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        for attempt in range(2):
+            connection = self._connections.get(parts.netloc)
+            if connection is None:
+                connection = http.client.HTTPConnection(parts.netloc, timeout=self.timeout)
+                self._connections[parts.netloc] = connection
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                self.page_source = response.read().decode("utf-8")
+                self.current_url = url
+                return
+            except (http.client.HTTPException, ConnectionError):
+                # Stale keep-alive connection: reconnect once
+                connection.close()
+                del self._connections[parts.netloc]
+                if attempt:
+                    raise
+
+    def execute_script(self, script: str, *args):
+        """Scrolling is a no-op; the page never moves."""
+        return 0
+
+    def quit(self) -> None:
+        """Connections are kept for the next page (call close() to release them)."""
+
+    def close(self) -> None:
+        """Close every connection."""
+        for connection in self._connections.values():
+            connection.close()
+        self._connections = {}
+
+
+def run_benchmark(args) -> Dict[str, Dict[str, float]]:
+    """
+    Crawl the listing, then visit every lot for the requested number of passes.
+
+    Returns:
+        Summaries of the listing crawl and of the lot visits
+    """
+    # main.py is the production scraper; imported lazily as it pulls in Selenium
+    import main as scraper
+
+    server = CatawikiFixtureServer(
+        lots=args.lots,
+        per_page=args.per_page,
+        scroll_batch=0 if args.driver == "http" else args.scroll_batch,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        incomplete_rate=args.incomplete_rate,
+        seed=args.seed,
+    )
+    results = {}
+    with server, contextlib.redirect_stdout(io.StringIO()):
+        browser = None
+        if args.driver == "http":
+            driver = HttpDriver()
+        else:
+            from src.scraper.browser import BrowserManager
+
+            # no recycling, so the memory measured is that of one long-lived browser
+            browser = BrowserManager(max_pages=0, max_rss_mb=0, warm_spare=False, tabs=args.tabs)
+            driver = browser.get_driver()
+
+        start = time.perf_counter()
+        links = scraper.get_object_links_with_scroll(server.listing_url, driver=driver)
+        listing_elapsed = time.perf_counter() - start
+        results["listing"] = {"links": len(links), "elapsed_s": listing_elapsed}
+
+        latencies: List[float] = []
+        failures = 0
+        peak_rss = 0
+        start = time.perf_counter()
+        for _ in range(args.passes):
+            if browser is not None and args.tabs > 1:
+                for page in browser.fetch_pages(links, read=lot_fields):
+                    item = None
+                    if page.content is not None and page.content["time"] is not None:
+                        item = scraper.item_from_fields(page.content, page.url, page.fetched_at)
+                    latencies.append(page.fetched_at - page.started)
+                    failures += item is None
+            else:
+                for link in links:
+                    begin = time.perf_counter()
+                    item = scraper.get_object_information(link, isCounted=False, driver=driver)
+                    latencies.append(time.perf_counter() - begin)
+                    failures += item is None
+            if browser is not None:
+                peak_rss = max(peak_rss, browser.driver_rss(browser.get_driver()) or 0)
+        results["lots"] = summarize(latencies, time.perf_counter() - start)
+        results["lots"]["failures"] = failures
+        if browser is not None:
+            results["memory"] = {
+                "peak_rss_mb": peak_rss / 1024**2,
+                "lots_per_s_per_gb": (
+                    results["lots"]["throughput_per_s"] / (peak_rss / 1024**3)
+                    if peak_rss
+                    else 0.0
+                ),
+            }
+            browser.close()
+        else:
+            driver.close()
+    results["server"] = server.stats()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Scraper benchmark against a synthetic site")
+    parser.add_argument("--driver", default="http", choices=["http", "chrome"])
+    parser.add_argument("--tabs", type=int, default=1, help="concurrent tabs (chrome driver)")
+    parser.add_argument("--lots", type=int, default=200, help="synthetic lots")
+    parser.add_argument("--passes", type=int, default=1, help="visits per lot (monitor loop)")
+    parser.add_argument("--per-page", type=int, default=48)
+    parser.add_argument("--scroll-batch", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 ratio")
+    parser.add_argument("--incomplete-rate", type=float, default=0.0, help="pages without timer")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args)
+    listing = results["listing"]
+    print(
+        f"listing ({args.driver}): {listing['links']} links in {listing['elapsed_s']:.2f}s "
+        f"({results['server'].get('listing', 0)} listing pages)"
+    )
+    print(format_summary(f"lots ({args.driver})", results["lots"]))
+    print(f"failed lots: {results['lots']['failures']}, server requests: {results['server']}")
+    if "memory" in results:
+        memory = results["memory"]
+        print(
+            f"browser memory ({args.tabs} tabs): peak {memory['peak_rss_mb']:.0f} MB, "
+            f"{memory['lots_per_s_per_gb']:.2f} lots/s per GB"
+        )
+
+
+if __name__ == "__main__":
+    main()
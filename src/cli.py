@@ -0,0 +1,185 @@
+"""
+Command-line entry point.
+
+One command for every process of the scraper. Each subcommand imports what
+it needs when it runs, so `analyze` never loads Selenium, BeautifulSoup or
+python-telegram-bot and starts in milliseconds, and only commands that send
+messages need Telegram credentials.
+
+Usage:
+    python -m src daemon [LISTING_URL]     # every stage in one process
+    python -m src coordinator [LISTING_URL]  # distributed mode: queue jobs, analyze, alert
+    python -m src worker                   # distributed mode: fetch queued lots
+    python -m src sniper                   # watch deals in their final minutes
+    python -m src profiles reset           # delete the persistent browser profiles
+    python -m src crawl [LISTING_URL]
+    python -m src monitor
+    python -m src notify                 # alert loop
+    python -m src notify --message "Hi"  # one message to the configured chats
+    python -m src analyze --limit 20
+    python -m src bench scale --sizes 1000 10000
+"""
+
+import argparse
+import runpy
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Long-running loops are the top-level scripts of the project
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS = {
+    "crawl": "main.py",
+    "monitor": "checkItemLoop.py",
+    "notify": "extract_good_offer.py",
+}
+# Long-running services of the src package, run through their main()
+SERVICES = {
+    "daemon": "src.daemon",
+    "coordinator": "src.distributed.coordinator",
+    "worker": "src.distributed.worker",
+    "sniper": "src.scraper.sniping",
+}
+BENCHMARKS = ("scale", "scraper", "notifications", "blocking", "profiles")
+
+
+def run_script(command: str, args: List[str]) -> int:
+    """Run a project script as if it had been started with `python <script>`."""
+    path = PROJECT_ROOT / SCRIPTS[command]
+    sys.argv = [str(path), *args]
+    # the scripts import `src` and each other from the project root
+    sys.path.insert(0, str(PROJECT_ROOT))
+    runpy.run_path(str(path), run_name="__main__")
+    return 0
+
+
+def run_service(command: str, args: List[str]) -> int:
+    """Run the main() of a long-running service module."""
+    import importlib
+
+    # services drive the scraper of main.py, importable from the project root
+    sys.path.insert(0, str(PROJECT_ROOT))
+    importlib.import_module(SERVICES[command]).main(args)
+    return 0
+
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    """Print the good deals among the stored items."""
+    from src.analyzer.filters import DealAnalyzer, DealCriteria
+    from src.analyzer.price_stats import PriceStatistics
+    from src.config.runtime import runtime_config
+    from src.config.settings import DATA_FILE, PRICE_STATS_FILE
+    from src.storage.json_store import JSONStorage
+
+    # thresholds from RUNTIME_CONFIG_FILE, then the command line
+    runtime_config.reload()
+    criteria = DealCriteria.from_config(runtime_config.current())
+    if args.threshold is not None:
+        criteria.price_threshold = args.threshold
+    if args.max_time is not None:
+        criteria.time_threshold = args.max_time
+    # deals are judged against realised prices where enough sales were recorded
+    analyzer = DealAnalyzer(criteria, price_stats=PriceStatistics(PRICE_STATS_FILE))
+
+    items = JSONStorage(args.file or DATA_FILE).load()
+    deals = analyzer.sort_by_deal_quality(analyzer.filter_good_deals(items))
+    for item in deals[: args.limit]:
+        print(f"{analyzer.get_deal_score(item):>6.1%}  {item.price:>12}  {item.title}")
+        print(f"        {item.url}")
+    print(f"{len(deals)} good deal(s) out of {len(items)} item(s)")
+    return 0
+
+
+def cmd_notify(args: argparse.Namespace) -> int:
+    """Run the alert loop, or send a single message."""
+    if args.message is None:
+        return run_script("notify", [])
+
+    import asyncio
+
+    from src.notifications.base import create_notifier
+
+    async def send() -> bool:
+        async with create_notifier(args.backend) as notifier:
+            results = await notifier.send(args.message)
+        return all(results.values())
+
+    return 0 if asyncio.run(send()) else 1
+
+
+def cmd_profiles(args: argparse.Namespace) -> int:
+    """List, warm or reset the persistent browser profiles."""
+    from src.scraper.profiles import main as profiles_main
+
+    profiles_main(args.args)
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Run a benchmark module with the remaining arguments."""
+    import importlib
+
+    module = importlib.import_module(f"src.bench.{args.suite}")
+    return module.main(args.args) or 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(prog="python -m src", description="Catawiki Scraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    daemon = commands.add_parser("daemon", help="run every stage in one process")
+    daemon.add_argument("args", nargs=argparse.REMAINDER, help="listing URL")
+    daemon.set_defaults(handler=lambda args: run_service("daemon", args.args))
+
+    coordinator = commands.add_parser("coordinator", help="queue scraping jobs for workers")
+    coordinator.add_argument("args", nargs=argparse.REMAINDER, help="listing URL")
+    coordinator.set_defaults(handler=lambda args: run_service("coordinator", args.args))
+
+    worker = commands.add_parser("worker", help="fetch queued lots for the coordinator")
+    worker.add_argument("args", nargs=argparse.REMAINDER, help="worker options")
+    worker.set_defaults(handler=lambda args: run_service("worker", args.args))
+
+    sniper = commands.add_parser("sniper", help="watch good deals in their final minutes")
+    sniper.add_argument("args", nargs=argparse.REMAINDER, help="sniper options")
+    sniper.set_defaults(handler=lambda args: run_service("sniper", args.args))
+
+    profiles = commands.add_parser("profiles", help="manage the persistent browser profiles")
+    profiles.add_argument("args", nargs=argparse.REMAINDER, help="list, warm [URL] or reset [SLOT]")
+    profiles.set_defaults(handler=cmd_profiles)
+
+    crawl = commands.add_parser("crawl", help="scrape the listing and every lot")
+    crawl.add_argument("args", nargs=argparse.REMAINDER, help="listing URL")
+    crawl.set_defaults(handler=lambda args: run_script("crawl", args.args))
+
+    monitor = commands.add_parser("monitor", help="re-check promising lots continuously")
+    monitor.set_defaults(handler=lambda args: run_script("monitor", []))
+
+    analyze = commands.add_parser("analyze", help="list good deals in the stored items")
+    analyze.add_argument("--file", default=None, help="items file (default: DATA_FILE)")
+    analyze.add_argument("--threshold", type=float, help="maximum price/estimate ratio")
+    analyze.add_argument("--max-time", type=int, help="maximum remaining time (s)")
+    analyze.add_argument("--limit", type=int, default=50, help="deals to print")
+    analyze.set_defaults(handler=cmd_analyze)
+
+    notify = commands.add_parser("notify", help="run the alert loop")
+    notify.add_argument("--message", help="send this message once instead")
+    notify.add_argument("--backend", help="notifier backend (default: NOTIFIER_BACKEND)")
+    notify.set_defaults(handler=cmd_notify)
+
+    bench = commands.add_parser("bench", help="run a benchmark suite")
+    bench.add_argument("suite", choices=BENCHMARKS)
+    bench.add_argument("args", nargs=argparse.REMAINDER, help="benchmark options")
+    bench.set_defaults(handler=cmd_bench)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
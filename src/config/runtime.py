@@ -0,0 +1,286 @@
+"""
+Runtime-reloadable configuration.
+
+Thresholds, crawl limits, delays and daemon intervals start from the
+environment (src.config.settings) and can be overridden at runtime from a
+JSON file (RUNTIME_CONFIG_FILE) using the same names as the environment:
+
+    {"PRICE_PERCENTAGE_THRESHOLD": 0.85, "SCRAPER_PAGE_LOAD_DELAY": 0.5}
+
+The file is re-read when it changes (polled every CONFIG_RELOAD_INTERVAL
+seconds) or on SIGHUP. A new configuration is validated first and then
+swapped in as one immutable object, so readers that call current() once per
+unit of work never see half of an update; an invalid file is logged and the
+running configuration is kept.
+"""
+
+import json
+import os
+import signal
+import threading
+from dataclasses import dataclass, fields, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.settings import (
+    CONFIG_RELOAD_INTERVAL,
+    DAEMON_ANALYZE_INTERVAL,
+    DAEMON_CRAWL_INTERVAL,
+    DAEMON_RECHECK_IDLE,
+    DAEMON_SNAPSHOT_INTERVAL,
+    PERCENTAGE_THRESHOLD,
+    REMAINING_TIME_THRESHOLD,
+    RUNTIME_CONFIG_FILE,
+    SCRAPER_MAX_ITEMS,
+    SCRAPER_PAGE_LOAD_DELAY,
+    SCRAPER_SCROLL_DELAY,
+)
+from src.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """
+    Settings that can change while the scraper runs.
+
+    Attributes:
+        price_threshold: Maximum price as a fraction of the estimate
+        remaining_time_threshold: Maximum remaining time of an offer in seconds
+        scraper_max_items: Maximum lot links collected per crawl
+        scroll_delay: Pause after a listing scroll or page change in seconds
+        page_load_delay: Pause after loading a lot page in seconds
+        crawl_interval: Seconds between daemon listing crawls
+        recheck_idle: Longest daemon wait when no lot needs a re-check
+        analyze_interval: Longest daemon wait between analyses
+        snapshot_interval: Seconds between daemon snapshots
+    """
+
+    price_threshold: float = PERCENTAGE_THRESHOLD
+    remaining_time_threshold: int = REMAINING_TIME_THRESHOLD
+    scraper_max_items: int = SCRAPER_MAX_ITEMS
+    scroll_delay: float = SCRAPER_SCROLL_DELAY
+    page_load_delay: float = SCRAPER_PAGE_LOAD_DELAY
+    crawl_interval: float = DAEMON_CRAWL_INTERVAL
+    recheck_idle: float = DAEMON_RECHECK_IDLE
+    analyze_interval: float = DAEMON_ANALYZE_INTERVAL
+    snapshot_interval: float = DAEMON_SNAPSHOT_INTERVAL
+
+    def validate(self) -> None:
+        """
+        Check that every value is usable.
+
+        Raises:
+            ValueError: Listing every invalid value
+        """
+        errors = []
+        if not 0 < self.price_threshold <= 1:
+            errors.append(f"price_threshold must be in (0, 1], got {self.price_threshold}")
+        if self.remaining_time_threshold <= 0:
+            errors.append("remaining_time_threshold must be positive")
+        if self.scraper_max_items < 1:
+            errors.append("scraper_max_items must be at least 1")
+        for name in ("scroll_delay", "page_load_delay"):
+            if getattr(self, name) < 0:
+                errors.append(f"{name} must not be negative")
+        for name in ("crawl_interval", "recheck_idle", "analyze_interval", "snapshot_interval"):
+            if getattr(self, name) <= 0:
+                errors.append(f"{name} must be positive")
+        if errors:
+            raise ValueError("; ".join(errors))
+
+
+# Names used in the environment and in the runtime file, per field
+ENV_NAMES = {
+    "PRICE_PERCENTAGE_THRESHOLD": "price_threshold",
+    "REMAINING_TIME_THRESHOLD": "remaining_time_threshold",
+    "SCRAPER_MAX_ITEMS": "scraper_max_items",
+    "SCRAPER_SCROLL_DELAY": "scroll_delay",
+    "SCRAPER_PAGE_LOAD_DELAY": "page_load_delay",
+    "DAEMON_CRAWL_INTERVAL": "crawl_interval",
+    "DAEMON_RECHECK_IDLE": "recheck_idle",
+    "DAEMON_ANALYZE_INTERVAL": "analyze_interval",
+    "DAEMON_SNAPSHOT_INTERVAL": "snapshot_interval",
+}
+
+
+def parse_overrides(data: Dict[str, Any], base: Optional[RuntimeConfig] = None) -> RuntimeConfig:
+    """
+    Apply overrides (keyed by environment name) to a configuration.
+
+    Args:
+        data: Overrides, e.g. {"PRICE_PERCENTAGE_THRESHOLD": 0.85}
+        base: Configuration to start from (defaults from the environment if None)
+
+    Returns:
+        New validated configuration
+
+    Raises:
+        ValueError: On unknown keys, wrong types or invalid values
+    """
+    types = {field.name: field.type for field in fields(RuntimeConfig)}
+    changes = {}
+    for key, value in data.items():
+        name = ENV_NAMES.get(key)
+        if name is None:
+            raise ValueError(f"Unknown setting: {key}")
+        cast = int if types[name] in (int, "int") else float
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{key} must be a number, got {value!r}")
+        try:
+            changes[name] = cast(value)
+        except ValueError:
+            raise ValueError(f"{key} must be a number, got {value!r}") from None
+    config = replace(base or RuntimeConfig(), **changes)
+    config.validate()
+    return config
+
+
+class ConfigManager:
+    """
+    Holds the current RuntimeConfig and reloads it from a file.
+    """
+
+    def __init__(self, file_path: Optional[str] = RUNTIME_CONFIG_FILE):
+        """
+        Initialize manager with the environment defaults.
+
+        Args:
+            file_path: JSON file of overrides (None disables reloading)
+        """
+        self.file_path = file_path
+        self.version = 0
+        self._config = RuntimeConfig()
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[RuntimeConfig, RuntimeConfig], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def current(self) -> RuntimeConfig:
+        """The configuration in force (read it once per unit of work)."""
+        return self._config
+
+    def subscribe(self, listener: Callable[[RuntimeConfig, RuntimeConfig], None]) -> None:
+        """Call listener(old, new) after every change."""
+        self._listeners.append(listener)
+
+    def update(self, config: RuntimeConfig) -> bool:
+        """
+        Validate and swap in a configuration.
+
+        Returns:
+            True if the configuration changed
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        config.validate()
+        with self._lock:
+            old = self._config
+            if config == old:
+                return False
+            self._config = config
+            self.version += 1
+        changed = {
+            field.name: getattr(config, field.name)
+            for field in fields(config)
+            if getattr(config, field.name) != getattr(old, field.name)
+        }
+        logger.info(f"Configuration updated: {changed}")
+        for listener in self._listeners:
+            try:
+                listener(old, config)
+            except Exception as e:
+                logger.error(f"Configuration listener failed: {e}")
+        return True
+
+    def reload(self) -> bool:
+        """
+        Re-read the overrides file (a missing file means environment defaults).
+
+        Invalid files are logged and leave the configuration unchanged.
+
+        Returns:
+            True if the configuration changed
+        """
+        if not self.file_path:
+            return False
+        try:
+            self._mtime = os.path.getmtime(self.file_path)
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            config = parse_overrides(data)
+        except FileNotFoundError:
+            self._mtime = None
+            config = RuntimeConfig()
+        except (OSError, ValueError) as e:
+            logger.error(f"Invalid configuration in {self.file_path}, keeping current: {e}")
+            return False
+        return self.update(config)
+
+    def _file_changed(self) -> bool:
+        """Whether the overrides file changed since the last reload."""
+        try:
+            mtime = os.path.getmtime(self.file_path)
+        except OSError:
+            mtime = None
+        return mtime != self._mtime
+
+    def watch(self, interval: float = CONFIG_RELOAD_INTERVAL) -> None:
+        """
+        Load the overrides now and reload them whenever the file changes.
+
+        Args:
+            interval: Seconds between file checks (0 loads once without watching)
+        """
+        self.reload()
+        if interval <= 0 or not self.file_path or self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def poll() -> None:
+            while not self._stop.wait(interval):
+                if self._file_changed():
+                    self.reload()
+
+        self._watcher = threading.Thread(target=poll, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """Stop watching the file."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGHUP", 0)) -> bool:
+        """
+        Reload on a signal (SIGHUP by default; main thread only).
+
+        Returns:
+            True if the handler was installed
+        """
+        if not signum or threading.current_thread() is not threading.main_thread():
+            return False
+        # reload outside the handler, which may interrupt a thread holding the lock
+        signal.signal(
+            signum,
+            lambda signum, frame: threading.Thread(target=self.reload, daemon=True).start(),
+        )
+        return True
+
+
+# Process-wide configuration
+runtime_config = ConfigManager()
+
+
+def current_config() -> RuntimeConfig:
+    """The configuration in force for this process."""
+    return runtime_config.current()
+
+
+def start_config_reloading() -> None:
+    """Load the overrides file, watch it and reload on SIGHUP."""
+    runtime_config.watch()
+    runtime_config.install_signal_handler()
@@ -4,27 +4,68 @@ Uses environment variables for sensitive data.
 """
 
 import os
+from pathlib import Path
 from typing import List
-from dotenv import load_dotenv
+
+
+def _load_env_file() -> None:
+    """Load .env from the working directory or the project root, if there is one."""
+    for directory in (Path.cwd(), Path(__file__).resolve().parents[2]):
+        env_file = directory / ".env"
+        if env_file.is_file():
+            # python-dotenv is only imported when there is something to load
+            from dotenv import load_dotenv
+
+            load_dotenv(env_file)
+            return
+
 
 # Load environment variables from .env file
-load_dotenv()
+_load_env_file()
 
 # Telegram Configuration
 TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_IDS: List[str] = os.getenv("TELEGRAM_CHAT_IDS", "").split(",")
 
-# Validate required configuration (only in non-test environments)
+# Telegram delivery limits (Telegram allows ~30 msg/s overall and ~1 msg/s per chat)
+TELEGRAM_GLOBAL_RATE: float = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+TELEGRAM_PER_CHAT_RATE: float = float(os.getenv("TELEGRAM_PER_CHAT_RATE", "1"))
+TELEGRAM_SEND_CONCURRENCY: int = int(os.getenv("TELEGRAM_SEND_CONCURRENCY", "8"))
+# Attempts per message under Telegram flood control; other send errors are left to the outbox
+TELEGRAM_MAX_RETRIES: int = int(os.getenv("TELEGRAM_MAX_RETRIES", "3"))
+TELEGRAM_API_URL: str = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org/bot")
+
+# Notification backend: telegram, webhook, file or stdout
+NOTIFIER_BACKEND: str = os.getenv("NOTIFIER_BACKEND", "telegram")
+NOTIFIER_WEBHOOK_URL: str = os.getenv("NOTIFIER_WEBHOOK_URL", "")
+NOTIFIER_FILE: str = os.getenv("NOTIFIER_FILE", "notifications.jsonl")
+
 TESTING_MODE = os.getenv("TESTING_MODE", "false").lower() == "true"
 
-if not TESTING_MODE:
+
+def validate_telegram_config() -> None:
+    """
+    Check that the Telegram credentials are set (skipped in testing mode).
+
+    Called when a Telegram notifier is created rather than at import, so
+    commands that never send messages run without credentials.
+
+    Raises:
+        ValueError: If the bot token or the chat IDs are missing
+    """
+    if TESTING_MODE:
+        return
     if not TELEGRAM_BOT_TOKEN:
         raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
     if not TELEGRAM_CHAT_IDS or TELEGRAM_CHAT_IDS == [""]:
         raise ValueError("TELEGRAM_CHAT_IDS environment variable is required")
 
+
 # Scraper Configuration
-CATAWIKI_BASE_URL: str = os.getenv("CATAWIKI_BASE_URL", "https://www.catawiki.com/fr/c/333-montres")
+# sorted by closing date, latest first, as incremental crawls require (see CRAWL_INCREMENTAL)
+CATAWIKI_BASE_URL: str = os.getenv(
+    "CATAWIKI_BASE_URL", "https://www.catawiki.com/fr/c/333-montres?sort=bidding_end_desc"
+)
 SCRAPER_MAX_ITEMS: int = int(os.getenv("SCRAPER_MAX_ITEMS", "300"))
 SCRAPER_SCROLL_DELAY: float = float(os.getenv("SCRAPER_SCROLL_DELAY", "0.05"))
 SCRAPER_PAGE_LOAD_DELAY: float = float(os.getenv("SCRAPER_PAGE_LOAD_DELAY", "0.25"))
@@ -33,17 +74,150 @@ SCRAPER_PAGE_LOAD_DELAY: float = float(os.getenv("SCRAPER_PAGE_LOAD_DELAY", "0.2
 CHROME_BINARY: str = os.getenv("CHROME_BINARY", "/usr/bin/chromium")
 CHROMEDRIVER_BINARY: str = os.getenv("CHROMEDRIVER_BINARY", "/usr/bin/chromedriver")
 HEADLESS_MODE: bool = os.getenv("HEADLESS_MODE", "true").lower() == "true"
+# A driver is replaced after this many pages or once its process tree uses this much memory
+BROWSER_MAX_PAGES: int = int(os.getenv("BROWSER_MAX_PAGES", "300"))
+BROWSER_MAX_RSS_MB: float = float(os.getenv("BROWSER_MAX_RSS_MB", "1500"))
+# Pages between two memory checks (a check scans /proc)
+BROWSER_RSS_CHECK_EVERY: int = int(os.getenv("BROWSER_RSS_CHECK_EVERY", "10"))
+# Launch the replacement in the background before the limits are reached
+BROWSER_WARM_SPARE: bool = os.getenv("BROWSER_WARM_SPARE", "true").lower() == "true"
+# Tabs of one browser loading lot pages concurrently during crawls (1 loads one page at a time)
+BROWSER_TABS: int = int(os.getenv("BROWSER_TABS", "1"))
+# Seconds a page may take in a tab before the tab is reset
+BROWSER_TAB_TIMEOUT: float = float(os.getenv("BROWSER_TAB_TIMEOUT", "30"))
+# Persistent Chrome profiles (HTTP cache and cookies kept between browsers): one slot directory
+# per running browser, new slots copied from the template warmed by `python -m src profiles warm`.
+# An empty BROWSER_PROFILE_DIR starts every browser on a temporary profile
+BROWSER_PROFILE_DIR: str = os.getenv("BROWSER_PROFILE_DIR", "browser_profiles")
+BROWSER_PROFILE_SLOTS: int = int(os.getenv("BROWSER_PROFILE_SLOTS", "8"))
+# Disk cache size of a profile in MB (0 for Chrome's default)
+BROWSER_PROFILE_CACHE_MB: int = int(os.getenv("BROWSER_PROFILE_CACHE_MB", "200"))
+# Where page fields are read: "browser" runs one script in the page and returns only the
+# fields, "soup" transfers page_source and parses it with BeautifulSoup
+EXTRACTION_MODE: str = os.getenv("EXTRACTION_MODE", "browser")
+# Pin the lots closing soonest in browser tabs and read their bid updates from the page's
+# API responses (Chrome performance log) instead of reloading them
+BID_CAPTURE_ENABLED: bool = os.getenv("BID_CAPTURE_ENABLED", "false").lower() == "true"
+# URL patterns (* wildcards) of the API calls carrying bid status
+BID_CAPTURE_URLS: str = os.getenv("BID_CAPTURE_URLS", "*catawiki.com/buyer/api/*")
+# Lots pinned at once, and seconds between two reads of their responses
+BID_CAPTURE_PINNED: int = int(os.getenv("BID_CAPTURE_PINNED", "5"))
+BID_CAPTURE_POLL: float = float(os.getenv("BID_CAPTURE_POLL", "1"))
+# Track good deals closing within SNIPING_WINDOW seconds in their own tabs, observed every
+# SNIPING_INTERVAL seconds, at most SNIPING_MAX_LOTS at once (daemon task or `python -m src sniper`)
+SNIPING_ENABLED: bool = os.getenv("SNIPING_ENABLED", "false").lower() == "true"
+SNIPING_WINDOW: float = float(os.getenv("SNIPING_WINDOW", "300"))
+SNIPING_INTERVAL: float = float(os.getenv("SNIPING_INTERVAL", "0.5"))
+SNIPING_MAX_LOTS: int = int(os.getenv("SNIPING_MAX_LOTS", "8"))
+# Seconds between two selections of the lots to track
+SNIPING_REFRESH: float = float(os.getenv("SNIPING_REFRESH", "5"))
+# Requests blocked in the browser: resource types (image, font, media, stylesheet)
+# and URL patterns with * wildcards; patterns the extraction needs are ignored
+BROWSER_BLOCK_RESOURCES: str = os.getenv("BROWSER_BLOCK_RESOURCES", "image,font,media")
+BROWSER_BLOCK_URLS: str = os.getenv(
+    "BROWSER_BLOCK_URLS",
+    "*google-analytics.com/*,*googletagmanager.com/*,*doubleclick.net/*,*facebook.net/*,"
+    "*hotjar.com/*,*criteo.com/*,*criteo.net/*,*bat.bing.com/*,*cookielaw.org/*",
+)
 
 # Filtering Thresholds
 PERCENTAGE_THRESHOLD: float = float(os.getenv("PRICE_PERCENTAGE_THRESHOLD", "0.90"))
 REMAINING_TIME_THRESHOLD: int = int(os.getenv("REMAINING_TIME_THRESHOLD", "1800"))
 
+# Runtime overrides of thresholds, crawl limits and intervals (see src/config/runtime.py),
+# re-read when the file changes (checked every CONFIG_RELOAD_INTERVAL seconds, 0 disables) or on SIGHUP
+RUNTIME_CONFIG_FILE: str = os.getenv("RUNTIME_CONFIG_FILE", "runtime_config.json")
+CONFIG_RELOAD_INTERVAL: float = float(os.getenv("CONFIG_RELOAD_INTERVAL", "5"))
+
+# Realised price statistics
+PRICE_STATS_FILE: str = os.getenv("PRICE_STATS_FILE", "price_stats.json")
+PRICE_STATS_MIN_SAMPLES: int = int(os.getenv("PRICE_STATS_MIN_SAMPLES", "20"))
+# A closed lot is recorded only if it was last scraped at most this many seconds before its
+# close: an earlier bid is not its hammer price
+PRICE_STATS_CLOSE_WINDOW: float = float(os.getenv("PRICE_STATS_CLOSE_WINDOW", "120"))
+
+# Near-duplicate detection (estimated Jaccard similarity of lot signatures)
+DEDUP_SIMILARITY_THRESHOLD: float = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.8"))
+# Seconds after closing during which a near-duplicate of an alerted lot counts as its relist
+DEDUP_RELIST_HORIZON: int = int(os.getenv("DEDUP_RELIST_HORIZON", "2592000"))
+
+# Latency instrumentation (stage histograms of the scrape-to-alert pipeline)
+LATENCY_STATS_FILE: str = os.getenv("LATENCY_STATS_FILE", "latency_stats.json")
+
+# Metrics endpoint (each process serves METRICS_PORT + its component offset:
+# scraper, daemon and coordinator +0, monitor +1, alerts +2, worker +3, sniper +4)
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_HOST: str = os.getenv("METRICS_HOST", "0.0.0.0")
+METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9108"))
+METRICS_STALL_SECONDS: float = float(os.getenv("METRICS_STALL_SECONDS", "600"))
+
+# Profiling (spans per stage; PROFILER captures cycle PROFILE_CYCLE: none, cprofile or sampling)
+PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILER: str = os.getenv("PROFILER", "none").lower()
+PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_CYCLE: int = int(os.getenv("PROFILE_CYCLE", "1"))
+PROFILE_SAMPLE_INTERVAL: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Benchmark results (one JSON file per version)
+BENCH_RESULTS_DIR: str = os.getenv("BENCH_RESULTS_DIR", "benchmarks")
+
 # Storage
 DATA_FILE: str = os.getenv("DATA_FILE", "items.json")
 
+# Incremental crawls: the listing (latest closing first, so new lots on top) is read until
+# CRAWL_KNOWN_RUN lots in a row are in the seen-set, and only new lots are fetched.
+# Every CRAWL_FULL_EVERY-th crawl of the daemon (and its first) visits every lot (0: never).
+# A listing URL without sort=bidding_end_desc is always crawled in full.
+CRAWL_INCREMENTAL: bool = os.getenv("CRAWL_INCREMENTAL", "false").lower() == "true"
+SEEN_LOTS_FILE: str = os.getenv("SEEN_LOTS_FILE", "seen_lots.json")
+CRAWL_KNOWN_RUN: int = int(os.getenv("CRAWL_KNOWN_RUN", "20"))
+CRAWL_FULL_EVERY: int = int(os.getenv("CRAWL_FULL_EVERY", "12"))
+
+# Notification outbox
+OUTBOX_DB_FILE: str = os.getenv("OUTBOX_DB_FILE", "outbox.db")
+OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BASE_DELAY: float = float(os.getenv("OUTBOX_RETRY_BASE_DELAY", "2"))
+OUTBOX_RETRY_MAX_DELAY: float = float(os.getenv("OUTBOX_RETRY_MAX_DELAY", "300"))
+
+# Alert coalescing (0 disables batching)
+ALERT_COALESCE_WINDOW: float = float(os.getenv("ALERT_COALESCE_WINDOW", "5"))
+ALERT_DIGEST_MAX_ITEMS: int = int(os.getenv("ALERT_DIGEST_MAX_ITEMS", "8"))
+
+# Daemon (crawl, re-check, analysis and alerts in one process, see src/daemon.py)
+DAEMON_CRAWL_INTERVAL: float = float(os.getenv("DAEMON_CRAWL_INTERVAL", "600"))
+DAEMON_RECHECK_IDLE: float = float(os.getenv("DAEMON_RECHECK_IDLE", "300"))
+DAEMON_ANALYZE_INTERVAL: float = float(os.getenv("DAEMON_ANALYZE_INTERVAL", "1"))
+DAEMON_SNAPSHOT_INTERVAL: float = float(os.getenv("DAEMON_SNAPSHOT_INTERVAL", "30"))
+# Ended lots are kept this long (seconds) before being dropped from the store
+DAEMON_ENDED_RETENTION: float = float(os.getenv("DAEMON_ENDED_RETENTION", "3600"))
+
+# Distributed mode (a coordinator and workers sharing a job queue, see src/distributed)
+WORK_QUEUE_DB_FILE: str = os.getenv("WORK_QUEUE_DB_FILE", "work_queue.db")
+# Seconds a claimed job stays invisible to other workers before it is re-delivered
+WORK_QUEUE_LEASE: float = float(os.getenv("WORK_QUEUE_LEASE", "120"))
+WORK_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "5"))
+WORK_QUEUE_RETRY_DELAY: float = float(os.getenv("WORK_QUEUE_RETRY_DELAY", "30"))
+# Finished jobs are kept this long (seconds); the coordinator prunes older ones on every crawl
+WORK_QUEUE_RETENTION: float = float(os.getenv("WORK_QUEUE_RETENTION", "86400"))
+WORKER_POLL_INTERVAL: float = float(os.getenv("WORKER_POLL_INTERVAL", "1"))
+
+# Lot ownership: several monitor / alert instances share the lots (see src/distributed/ownership.py)
+OWNERSHIP_ENABLED: bool = os.getenv("OWNERSHIP_ENABLED", "false").lower() == "true"
+OWNERSHIP_DB_FILE: str = os.getenv("OWNERSHIP_DB_FILE", "ownership.db")
+# Must be the same for every instance of a group
+OWNERSHIP_PARTITIONS: int = int(os.getenv("OWNERSHIP_PARTITIONS", "64"))
+# Seconds before the partitions of a silent instance are taken over
+OWNERSHIP_LEASE: float = float(os.getenv("OWNERSHIP_LEASE", "30"))
+
 # Logging
 LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE: str = os.getenv("LOG_FILE", "catawiki_scraper.log")
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()  # text or json
+LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Debug records allowed per second per call site, and the fraction kept (1.0 keeps all)
+LOG_DEBUG_RATE: float = float(os.getenv("LOG_DEBUG_RATE", "20"))
+LOG_DEBUG_SAMPLE: float = float(os.getenv("LOG_DEBUG_SAMPLE", "1.0"))
 
 # Backward compatibility (deprecated - will be removed)
 TelegramChatID = TELEGRAM_CHAT_IDS
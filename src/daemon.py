@@ -0,0 +1,583 @@
+"""
+Single-process scraper daemon.
+
+Runs crawling, re-checking, analysis and notification as cooperating
+threads sharing one in-memory ItemStore, instead of three processes
+exchanging items.json. Stages hand work over through store events:
+
+    crawler ──upsert──▶ ItemStore ──events──▶ analyzer ──▶ outbox ──▶ dispatcher
+    rechecker ─upsert─▶     │
+                            └──snapshot──▶ items.json (every DAEMON_SNAPSHOT_INTERVAL)
+
+The snapshot keeps items.json up to date for the standalone scripts and
+`python -m src analyze`, and seeds the store after a restart.
+
+Usage:
+    python -m src daemon [LISTING_URL]
+"""
+
+import queue
+import signal
+import threading
+import time
+from typing import Callable, Container, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.analyzer.offers import (
+    OfferClassifier,
+    normalize_estimate,
+    remaining_seconds,
+    select_items_to_check,
+)
+from src.analyzer.price_stats import PriceStatistics
+from src.config.runtime import current_config, start_config_reloading
+from src.config.settings import (
+    ALERT_COALESCE_WINDOW,
+    BID_CAPTURE_ENABLED,
+    BID_CAPTURE_PINNED,
+    BID_CAPTURE_POLL,
+    BROWSER_TABS,
+    CATAWIKI_BASE_URL,
+    CRAWL_FULL_EVERY,
+    CRAWL_INCREMENTAL,
+    DAEMON_ENDED_RETENTION,
+    DATA_FILE,
+    DEDUP_SIMILARITY_THRESHOLD,
+    LATENCY_STATS_FILE,
+    PRICE_STATS_FILE,
+    SEEN_LOTS_FILE,
+    SNIPING_ENABLED,
+)
+from src.metrics.instruments import DEALS_FOUND, QUEUE_DEPTH, heartbeat
+from src.metrics.latency import LatencyTracker, mark_stage
+from src.metrics.profiling import span
+from src.notifications.background import BackgroundNotifier
+from src.notifications.coalescer import AlertCoalescer
+from src.notifications.messages import build_alert
+from src.notifications.outbox import NotificationOutbox, OutboxDispatcher
+from src.storage.memory_store import ItemStore
+from src.storage.models import WatchItem
+from src.storage.seen_lots import LISTING_SORT, SeenLots, lot_key, sorted_by_closing
+from src.utils.logger import logger
+
+# Seconds before a failed task is restarted
+RESTART_DELAY = 5.0
+
+
+class ScraperDaemon:
+    """
+    Crawler, rechecker, analyzer and snapshot tasks around one ItemStore.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ItemStore] = None,
+        listing_url: str = CATAWIKI_BASE_URL,
+        fetch_links: Optional[Callable[[str, Optional[Container[str]]], List[str]]] = None,
+        fetch_item: Optional[Callable[[str], Optional[Dict]]] = None,
+        fetch_items: Optional[Callable[[List[str]], Iterable[Tuple[str, Optional[Dict]]]]] = None,
+        notifier=None,
+        outbox: Optional[NotificationOutbox] = None,
+        coalescer: Optional[AlertCoalescer] = None,
+        price_stats: Optional[PriceStatistics] = None,
+        latency: Optional[LatencyTracker] = None,
+        crawl_interval: Optional[float] = None,
+        recheck_idle: Optional[float] = None,
+        recheck_pause: float = 1.0,
+        analyze_interval: Optional[float] = None,
+        snapshot_interval: Optional[float] = None,
+        ended_retention: float = DAEMON_ENDED_RETENTION,
+        bid_capture: bool = BID_CAPTURE_ENABLED,
+        sniping: bool = SNIPING_ENABLED,
+        incremental: bool = CRAWL_INCREMENTAL,
+        seen_lots: Optional[SeenLots] = None,
+        full_crawl_every: int = CRAWL_FULL_EVERY,
+    ):
+        """
+        Initialize daemon.
+
+        Args:
+            store: Shared item store (snapshotted to DATA_FILE if None)
+            listing_url: Listing page crawled for lot links
+            fetch_links: Returns the lot URLs of a listing given its URL and the lot IDs
+                already crawled, which it may stop at (main.py scraper if None)
+            fetch_item: Returns a lot's item dictionary or None (main.py scraper with a
+                recycled browser per task if None)
+            fetch_items: Yields (URL, item or None) for the lots of a crawl (fetch_item one
+                lot at a time if None, or BROWSER_TABS tabs of the crawler's browser)
+            notifier: Notifier backend (create_notifier() if None)
+            outbox: Alert outbox (OUTBOX_DB_FILE if None)
+            coalescer: Alert coalescer (from ALERT_COALESCE_WINDOW if None)
+            price_stats: Realised price statistics (PRICE_STATS_FILE if None)
+            latency: Stage latency tracker (LATENCY_STATS_FILE if None)
+            crawl_interval: Seconds between listing crawls
+            recheck_idle: Longest wait for new items when nothing needs a re-check
+            recheck_pause: Pause between two re-check passes
+            analyze_interval: Longest wait for store events between analyses
+            snapshot_interval: Seconds between snapshots
+            (intervals left to None follow the runtime configuration)
+            ended_retention: Seconds ended lots stay in the store
+            bid_capture: Pin the lots closing soonest in browser tabs and store the bid
+                changes of their API responses, instead of re-visiting them
+            sniping: Observe good deals in their final window from pinned tabs and alert
+                on every change (see src/scraper/sniping.py)
+            incremental: Crawl only the lots not crawled before (see src/storage/seen_lots.py)
+            seen_lots: Lots crawled before (SEEN_LOTS_FILE if None)
+            full_crawl_every: Every nth crawl, and the first, visits every lot (0: only the first)
+        """
+        self.store = store if store is not None else ItemStore(DATA_FILE)
+        self.listing_url = listing_url
+        self.fetch_links = fetch_links or self._scrape_listing
+        self.fetch_item = fetch_item or self._scrape_lot
+        if fetch_items is None:
+            tabbed = fetch_item is None and BROWSER_TABS > 1
+            fetch_items = self._scrape_lots if tabbed else self._fetch_each
+        self.fetch_items = fetch_items
+        self.outbox = outbox if outbox is not None else NotificationOutbox()
+        self.price_stats = (
+            price_stats if price_stats is not None else PriceStatistics(PRICE_STATS_FILE)
+        )
+        self.latency = latency if latency is not None else LatencyTracker(LATENCY_STATS_FILE)
+        if coalescer is None and ALERT_COALESCE_WINDOW > 0:
+            coalescer = AlertCoalescer()
+        self.coalescer = coalescer
+        self.classifier = OfferClassifier(
+            self.outbox, dedup_threshold=DEDUP_SIMILARITY_THRESHOLD, price_stats=self.price_stats
+        )
+        self._notifier = notifier
+        self.recheck_pause = recheck_pause
+        self._intervals = {
+            "crawl_interval": crawl_interval,
+            "recheck_idle": recheck_idle,
+            "analyze_interval": analyze_interval,
+            "snapshot_interval": snapshot_interval,
+        }
+        self.ended_retention = ended_retention
+        self.bid_capture = bid_capture
+        self.sniping = sniping
+        self.seen_lots = None
+        if incremental and not sorted_by_closing(listing_url):
+            logger.warning(
+                f"Listing {listing_url} is not sorted by sort={LISTING_SORT}: "
+                "new lots are not on top, every crawl is a full crawl"
+            )
+        elif incremental:
+            self.seen_lots = seen_lots if seen_lots is not None else SeenLots(SEEN_LOTS_FILE)
+        self.full_crawl_every = full_crawl_every
+        self._crawls = 0
+        # URLs of the lots whose bids are captured, skipped by the rechecker
+        self._pinned: Set[str] = set()
+        self._sniper = None
+
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # one browser per task thread, see _local_browser()
+        self._local = threading.local()
+        self._browsers = []
+        self._background: Optional[BackgroundNotifier] = None
+        self._dispatcher: Optional[OutboxDispatcher] = None
+        self._dispatch_future = None
+        # subscribe now, so events of the first crawl are not missed
+        self._analyzer_events = self.store.subscribe()
+        self._recheck_events = self.store.subscribe()
+
+    @property
+    def running(self) -> bool:
+        """Whether the tasks are running."""
+        return bool(self._threads) and not self._stop.is_set()
+
+    def start(self) -> "ScraperDaemon":
+        """Load the last snapshot and start every task."""
+        if self._threads:
+            return self
+        self.store.load()
+
+        if self._notifier is None:
+            from src.notifications.base import create_notifier
+
+            self._notifier = create_notifier()
+        self._background = BackgroundNotifier(self._notifier).start()
+        self._dispatcher = OutboxDispatcher(
+            self.outbox, self._notifier, coalescer=self.coalescer, latency=self.latency
+        )
+        self._dispatch_future = self._background.run_coroutine(self._dispatcher.run())
+
+        QUEUE_DEPTH.labels("events").set_function(self._analyzer_events.qsize)
+        QUEUE_DEPTH.labels("outbox").set_function(lambda: self.outbox.counts()["pending"])
+        if self.coalescer is not None:
+            QUEUE_DEPTH.labels("coalescer").set_function(lambda: len(self.coalescer))
+
+        self._stop.clear()
+        for name, target in self._tasks():
+            thread = threading.Thread(
+                target=self._supervise, args=(name, target), name=name, daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Daemon started with {len(self.store)} items")
+        return self
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop the tasks, deliver queued alerts and write a final snapshot."""
+        if not self._threads:
+            return
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+        self._dispatcher.stop()
+        try:
+            self._dispatch_future.result(timeout)
+        except Exception as e:
+            logger.warning(f"Dispatcher did not stop cleanly: {e}")
+        self._background.stop(timeout)
+
+        for browser in self._browsers:
+            browser.close()
+        self._browsers = []
+
+        self.store.snapshot()
+        self.latency.save()
+        self.price_stats.save()
+        logger.info("Daemon stopped")
+
+    def __enter__(self) -> "ScraperDaemon":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def run_forever(self) -> None:
+        """Run until SIGINT or SIGTERM."""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self._stop.set())
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _tasks(self) -> List[Tuple[str, Callable[[], None]]]:
+        """Name and loop of every task thread."""
+        tasks = [
+            ("crawler", self._crawl_loop),
+            ("rechecker", self._recheck_loop),
+            ("analyzer", self._analyze_loop),
+            ("snapshots", self._snapshot_loop),
+        ]
+        if self.bid_capture:
+            tasks.append(("bids", self._bid_loop))
+        if self.sniping:
+            tasks.append(("sniper", self._snipe_loop))
+        return tasks
+
+    def interval(self, name: str) -> float:
+        """An interval given to the constructor, or its current runtime value."""
+        value = self._intervals[name]
+        return getattr(current_config(), name) if value is None else value
+
+    def _local_browser(self):
+        """The calling task's browser, recycled past its limits."""
+        from src.scraper.browser import BrowserManager
+
+        browser = getattr(self._local, "browser", None)
+        if browser is None:
+            browser = self._local.browser = BrowserManager()
+            self._browsers.append(browser)
+        return browser
+
+    def _scrape_listing(self, url: str, known: Optional[Container[str]] = None) -> List[str]:
+        """Collect a listing's (new) lot links with the calling task's browser, without relists."""
+        from src.scraper.browser import scrape_listing
+
+        return scrape_listing(self._local_browser(), url, known, relists=self.classifier)
+
+    def _scrape_lot(self, url: str) -> Optional[Dict]:
+        """Scrape a lot with the calling task's browser."""
+        from src.scraper.browser import scrape_lot
+
+        return scrape_lot(self._local_browser(), url)
+
+    def _scrape_lots(self, urls: List[str]) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Scrape lots concurrently in the tabs of the calling task's browser."""
+        from src.scraper.browser import scrape_lots
+
+        return scrape_lots(self._local_browser(), urls)
+
+    def _fetch_each(self, urls: List[str]) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Fetch lots one at a time with fetch_item."""
+        for url in urls:
+            yield url, self.fetch_item(url)
+
+    def _supervise(self, name: str, target: Callable[[], None]) -> None:
+        """Run a task, restarting it after an unexpected error."""
+        while not self._stop.is_set():
+            try:
+                target()
+                return
+            except Exception:
+                logger.exception(f"{name} task failed, restarting in {RESTART_DELAY:.0f}s")
+                self._stop.wait(RESTART_DELAY)
+
+    def crawl_once(self) -> int:
+        """
+        Visit the lots of the listing and store them, then drop long-ended lots.
+
+        An incremental crawl visits only the lots not crawled before; the
+        others are kept up to date by the re-checks and the full crawls.
+
+        Returns:
+            Number of lots stored
+        """
+        known = None
+        if self.seen_lots is not None:
+            full = self._crawls == 0 or (
+                self.full_crawl_every > 0 and self._crawls % self.full_crawl_every == 0
+            )
+            known = None if full else self.seen_lots
+        self._crawls += 1
+        links = self.fetch_links(self.listing_url, known)
+        if known is not None:
+            links = [link for link in links if lot_key(link) not in known]
+        logger.info(f"Crawling {len(links)} {'new ' if known is not None else ''}lots")
+        stored = 0
+        for count, (link, item) in enumerate(self.fetch_items(links), 1):
+            QUEUE_DEPTH.labels("links").set(len(links) - count)
+            if item:
+                self.store.upsert(item)
+                if self.seen_lots is not None:
+                    self.seen_lots.record(item)
+                stored += 1
+            heartbeat("scraper")
+            if self._stop.is_set():
+                break
+
+        if self.seen_lots is not None:
+            self.seen_lots.prune()
+            self.seen_lots.save()
+        self.prune_ended()
+        logger.info(f"Crawl stored {stored} of {len(links)} lots")
+        return stored
+
+    def prune_ended(self) -> int:
+        """
+        Drop lots that ended longer ago than the retention.
+
+        Returns:
+            Number of lots removed
+        """
+        removed = 0
+        for item in self.store.items():
+            remaining = remaining_seconds(item)
+            if remaining is not None and remaining < -self.ended_retention:
+                removed += self.store.remove(item["url"])
+        return removed
+
+    def _crawl_loop(self) -> None:
+        """Crawl the listing every crawl_interval."""
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.crawl_once()
+            heartbeat("scraper")
+            self._stop.wait(
+                max(0.0, self.interval("crawl_interval") - (time.monotonic() - started))
+            )
+
+    def recheck_once(self) -> int:
+        """
+        Re-visit the lots worth watching, soonest closing first.
+
+        Returns:
+            Number of lots re-visited
+        """
+        sniper = self._sniper
+        observed = self._pinned | (sniper.tracked if sniper is not None else frozenset())
+        due = [item for item in self.due_for_recheck() if item["url"] not in observed]
+        for index, item in enumerate(due):
+            if self._stop.is_set():
+                break
+            QUEUE_DEPTH.labels("recheck").set(len(due) - index)
+            fresh = self.fetch_item(item["url"])
+            if not fresh:
+                continue
+            normalize_estimate(fresh)
+            event = self.store.upsert(fresh)
+            if event is not None:
+                logger.info(
+                    "Lot changed %s: %s",
+                    fresh["url"],
+                    event.changes,
+                    extra={"changes": event.changes},
+                )
+            heartbeat("monitor")
+        QUEUE_DEPTH.labels("recheck").set(0)
+        return len(due)
+
+    def due_for_recheck(self) -> List[Dict]:
+        """The stored lots worth re-visiting, soonest closing first."""
+        items = sorted(
+            self.store.items(),
+            key=lambda x: remaining_seconds(x) if x["time"] != "No time" else float("inf"),
+        )
+        return select_items_to_check(items, price_stats=self.price_stats)
+
+    def watch_bids_once(self, pinned) -> int:
+        """
+        Pin the lots due for a re-check closing soonest and store their bid changes.
+
+        Args:
+            pinned: PinnedLots of a browser with network capture
+
+        Returns:
+            Number of lots updated
+        """
+        wanted = [item["url"] for item in self.due_for_recheck()[:BID_CAPTURE_PINNED]]
+        for url in pinned.urls():
+            if url not in wanted:
+                pinned.unpin(url)
+        for url in wanted:
+            pinned.pin(url)
+        self._pinned = set(pinned.urls())
+
+        updated = 0
+        for status in pinned.poll():
+            item = self.store.get(pinned.url_of(status))
+            if item is None:
+                continue
+            event = self.store.upsert(status.apply(item))
+            if event is not None:
+                logger.info("Bid changed %s: %s", item["url"], event.changes)
+                updated += 1
+        heartbeat("monitor")
+        return updated
+
+    def _bid_loop(self) -> None:
+        """Capture the bids of pinned lots every BID_CAPTURE_POLL."""
+        from src.scraper.bid_capture import PinnedLots
+        from src.scraper.browser import BrowserManager
+
+        # pinned tabs live as long as their lots, so the browser is not recycled by pages
+        browser = BrowserManager(max_pages=0, warm_spare=False, tabs=1, capture_network=True)
+        try:
+            pinned = PinnedLots(browser.get_driver())
+            while not self._stop.wait(BID_CAPTURE_POLL):
+                self.watch_bids_once(pinned)
+        finally:
+            # the rechecker takes the lots over again
+            self._pinned = set()
+            browser.close()
+
+    def _snipe_loop(self) -> None:
+        """Track good deals in their final window, storing every bid change."""
+        from src.scraper.sniping import SnipingTracker
+
+        # its own classifier: the analyzer's is not shared across threads
+        self._sniper = SnipingTracker(
+            self.store.items,
+            self.outbox,
+            on_update=self.store.upsert,
+            price_stats=self.price_stats,
+        )
+        try:
+            self._sniper.run(self._stop)
+        finally:
+            self._sniper.close()
+            self._sniper = None
+
+    def _recheck_loop(self) -> None:
+        """Re-check continuously; when idle, wait for new items or recheck_idle."""
+        while not self._stop.is_set():
+            checked = self.recheck_once()
+            heartbeat("monitor")
+            if checked:
+                self._stop.wait(self.recheck_pause)
+                continue
+            try:
+                self._recheck_events.get(timeout=self.interval("recheck_idle"))
+            except queue.Empty:
+                pass
+            _drain(self._recheck_events)
+
+    def analyze_once(self) -> int:
+        """
+        Record ended lots, classify the stored items and enqueue alerts.
+
+        Returns:
+            Number of alerts enqueued
+        """
+        items = self.store.items()
+        recorded = [self.price_stats.observe(WatchItem.from_dict(item)) for item in items]
+        if any(recorded):
+            self.price_stats.save()
+
+        with span("analyze"):
+            offers_by_type = zip(("new", "updated", "closing"), self.classifier.classify(items))
+        analysed_at = time.time()
+        enqueued = 0
+        for alert_type, offers in offers_by_type:
+            if offers:
+                DEALS_FOUND.labels(alert_type).inc(len(offers))
+            for offer in offers:
+                mark_stage(offer["timings"], "analysed", analysed_at)
+                alert = build_alert(WatchItem.from_dict(offer), alert_type)
+                if self.outbox.enqueue(alert):
+                    enqueued += 1
+                    logger.info(
+                        "Queued %s alert for %s",
+                        alert_type,
+                        offer["url"],
+                        extra={"lot_id": alert.lot_id, "alert_type": alert_type},
+                    )
+        return enqueued
+
+    def _analyze_loop(self) -> None:
+        """Analyze on every batch of store events, and at least every analyze_interval."""
+        while not self._stop.is_set():
+            try:
+                self._analyzer_events.get(timeout=self.interval("analyze_interval"))
+            except queue.Empty:
+                pass
+            _drain(self._analyzer_events)
+            self.analyze_once()
+            heartbeat("alerts")
+
+    def _snapshot_loop(self) -> None:
+        """Write the store and latency statistics to disk periodically."""
+        while not self._stop.wait(self.interval("snapshot_interval")):
+            self.store.snapshot()
+            self.latency.save()
+            heartbeat()
+
+
+def _drain(events: queue.Queue) -> int:
+    """Discard every queued event; returns how many there were."""
+    drained = 0
+    while True:
+        try:
+            events.get_nowait()
+        except queue.Empty:
+            return drained
+        drained += 1
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    import argparse
+
+    from src.metrics.server import start_metrics_server
+
+    parser = argparse.ArgumentParser(description="Run every scraper stage in one process")
+    parser.add_argument("listing_url", nargs="?", default=CATAWIKI_BASE_URL)
+    args = parser.parse_args(argv)
+
+    start_metrics_server("daemon")
+    start_config_reloading()
+    ScraperDaemon(listing_url=args.listing_url).run_forever()
+
+
+if __name__ == "__main__":
+    main()
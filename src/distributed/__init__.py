@@ -0,0 +1 @@
+"""Distributed work mode: a shared job queue, a coordinator and scraping workers."""
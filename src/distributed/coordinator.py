@@ -0,0 +1,152 @@
+"""
+Coordinator of the distributed work mode.
+
+Runs the daemon's analysis, alerting and snapshot tasks, but instead of
+driving a browser it puts jobs on the shared work queue and applies the
+results reported by the workers:
+
+    coordinator ──listing / lot / recheck jobs──▶ WorkQueue ◀──claim── workers (Chrome)
+         ▲                                            │
+         └──────── results (lot links, items) ◀───────┘
+
+Only the coordinator writes the item store, so analysis and alerting work
+exactly as in the single-process daemon.
+
+Usage:
+    python -m src coordinator [LISTING_URL]
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+from src.analyzer.offers import normalize_estimate
+from src.config.runtime import start_config_reloading
+from src.config.settings import CATAWIKI_BASE_URL
+from src.daemon import ScraperDaemon
+from src.distributed.work_queue import LISTING, LOT, PENDING, RECHECK, SQLiteWorkQueue, WorkQueue
+from src.metrics.instruments import QUEUE_DEPTH, heartbeat
+from src.utils.logger import logger
+
+
+class Coordinator(ScraperDaemon):
+    """
+    Daemon whose crawls and re-checks are done by workers.
+    """
+
+    def __init__(
+        self,
+        work_queue: Optional[WorkQueue] = None,
+        result_batch: int = 100,
+        result_poll: float = 0.5,
+        **kwargs,
+    ):
+        """
+        Initialize coordinator.
+
+        Args:
+            work_queue: Queue shared with the workers (WORK_QUEUE_DB_FILE if None)
+            result_batch: Maximum results applied per poll
+            result_poll: Seconds between polls for results when idle
+            **kwargs: ScraperDaemon arguments (its fetchers are not used)
+        """
+        super().__init__(**kwargs)
+        self.work_queue = work_queue if work_queue is not None else SQLiteWorkQueue()
+        self.result_batch = result_batch
+        self.result_poll = result_poll
+
+    def start(self) -> "Coordinator":
+        """Start the daemon tasks and the result consumer."""
+        super().start()
+        QUEUE_DEPTH.labels("jobs").set_function(lambda: self.work_queue.counts()[PENDING])
+        return self
+
+    def _tasks(self) -> List[Tuple[str, Callable[[], None]]]:
+        """The daemon tasks plus the result consumer."""
+        return super()._tasks() + [("results", self._results_loop)]
+
+    def crawl_once(self) -> int:
+        """
+        Queue a crawl of the listing, then drop long-ended lots and old finished jobs.
+
+        Returns:
+            Number of jobs queued (0 if the last crawl is still pending)
+        """
+        queued = self.work_queue.put(LISTING, [self.listing_url])
+        self.prune_ended()
+        pruned = self.work_queue.prune()
+        if pruned:
+            logger.debug("Pruned %d finished job(s)", pruned)
+        return queued
+
+    def recheck_once(self) -> int:
+        """
+        Queue a re-check of the lots worth watching.
+
+        Lots whose last re-check is still pending are not queued twice.
+
+        Returns:
+            Number of lots due for a re-check
+        """
+        due = self.due_for_recheck()
+        queued = self.work_queue.put(RECHECK, [item["url"] for item in due])
+        if queued:
+            logger.debug("Queued %d re-check(s)", queued)
+        QUEUE_DEPTH.labels("recheck").set(len(due))
+        return len(due)
+
+    def apply_results(self) -> int:
+        """
+        Apply the results reported by the workers.
+
+        Listing results queue a job per lot; lot results go to the store.
+
+        Returns:
+            Number of results applied
+        """
+        results = self.work_queue.take_results(self.result_batch)
+        for result in results:
+            if result.kind == LISTING:
+                links = result.result or []
+                queued = self.work_queue.put(LOT, links)
+                logger.info(f"Listing returned {len(links)} lots, {queued} queued")
+                heartbeat("scraper")
+                continue
+            item = result.result
+            if not item:
+                continue
+            if result.kind == RECHECK:
+                normalize_estimate(item)
+            event = self.store.upsert(item)
+            if event is not None and event.kind == "changed":
+                logger.info(
+                    "Lot changed %s: %s",
+                    item["url"],
+                    event.changes,
+                    extra={"changes": event.changes},
+                )
+            heartbeat("scraper" if result.kind == LOT else "monitor")
+        return len(results)
+
+    def _results_loop(self) -> None:
+        """Apply results as they arrive."""
+        while not self._stop.is_set():
+            if not self.apply_results():
+                self._stop.wait(self.result_poll)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    import argparse
+
+    from src.metrics.server import start_metrics_server
+
+    parser = argparse.ArgumentParser(description="Queue scraping jobs for workers")
+    parser.add_argument("listing_url", nargs="?", default=CATAWIKI_BASE_URL)
+    args = parser.parse_args(argv)
+
+    start_metrics_server("coordinator")
+    start_config_reloading()
+    Coordinator(listing_url=args.listing_url).run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Lease-based lot ownership for several monitor or alert instances.
+
+Lot IDs are hashed into a fixed number of partitions. Instances of a group
+("monitor", "alerts", ...) register with a renewable membership lease, and
+partitions are assigned to the live members with a consistent hash ring,
+so a joining or leaving instance only moves its share of partitions. An
+instance works on a partition only while it holds that partition's lease:
+
+    refresh()  renew membership, release partitions now assigned elsewhere,
+               acquire assigned partitions that are free or whose lease expired
+
+A partition changes hands only once the previous owner released it or its
+lease expired, so no lot is fetched or alerted by two instances at once.
+When an instance dies, its leases expire and the survivors take over its
+partitions on their next refresh.
+
+Membership and leases live in a SQLite file shared by the instances.
+"""
+
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from src.analyzer.dedup import lot_id_from_url
+from src.config.settings import (
+    OWNERSHIP_DB_FILE,
+    OWNERSHIP_ENABLED,
+    OWNERSHIP_LEASE,
+    OWNERSHIP_PARTITIONS,
+)
+from src.metrics.instruments import OWNED_PARTITIONS
+from src.utils.logger import logger
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash of a string (the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+def partition_of(lot_id: str, partitions: int = OWNERSHIP_PARTITIONS) -> int:
+    """Partition a lot ID belongs to."""
+    return _hash(lot_id) % partitions
+
+
+def _lot_key(item: Dict) -> str:
+    """Lot ID of a scraped item (its URL if the ID cannot be parsed)."""
+    return lot_id_from_url(item["url"]) or item["url"]
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to members.
+    """
+
+    def __init__(self, members: Iterable[str], vnodes: int = 64):
+        """
+        Initialize ring.
+
+        Args:
+            members: Member names
+            vnodes: Points per member on the ring (more points, more even shares)
+        """
+        points = sorted(
+            (_hash(f"{member}#{index}"), member) for member in members for index in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._members = [member for _, member in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        """Member owning a key (None if the ring is empty)."""
+        if not self._members:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._members[index]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    grp TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (grp, instance)
+);
+CREATE TABLE IF NOT EXISTS partitions (
+    grp TEXT NOT NULL,
+    partition INTEGER NOT NULL,
+    owner TEXT,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (grp, partition)
+);
+"""
+
+
+class LotOwnership:
+    """
+    The partitions of lot IDs this instance owns within its group.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        db_path: str = OWNERSHIP_DB_FILE,
+        instance_id: Optional[str] = None,
+        partitions: int = OWNERSHIP_PARTITIONS,
+        lease: float = OWNERSHIP_LEASE,
+    ):
+        """
+        Initialize ownership (nothing is owned before the first refresh).
+
+        Args:
+            group: Instances sharing the lots, e.g. "monitor" or "alerts"
+            db_path: SQLite file shared by the instances
+            instance_id: Name of this instance (host name and PID if None)
+            partitions: Number of lot partitions (the same for every instance)
+            lease: Seconds a membership or partition lease lasts without renewal
+        """
+        self.group = group
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.partitions = partitions
+        self.lease = lease
+        self._owned: Set[int] = set()
+        self._valid_until = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(
+            db_path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction holding the database write lock."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def members(self) -> List[str]:
+        """Live instances of the group."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT instance FROM members WHERE grp = ? AND expires_at >= ? ORDER BY instance",
+                (self.group, time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def refresh(self) -> Set[int]:
+        """
+        Renew this instance's leases and rebalance with the live members.
+
+        Returns:
+            Partitions owned until the next refresh
+        """
+        now = time.time()
+        until = now + self.lease
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO members (grp, instance, expires_at) VALUES (?, ?, ?)",
+                (self.group, self.instance_id, until),
+            )
+            conn.execute("DELETE FROM members WHERE grp = ? AND expires_at < ?", (self.group, now))
+            live = [
+                row[0]
+                for row in conn.execute("SELECT instance FROM members WHERE grp = ?", (self.group,))
+            ]
+            ring = HashRing(live)
+            assigned = {p for p in range(self.partitions) if ring.owner(str(p)) == self.instance_id}
+            # hand over what the ring moved away, so the new owner need not wait for expiry
+            held = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT partition FROM partitions WHERE grp = ? AND owner = ?",
+                    (self.group, self.instance_id),
+                )
+            }
+            conn.executemany(
+                "UPDATE partitions SET owner = NULL, expires_at = 0 "
+                "WHERE grp = ? AND partition = ? AND owner = ?",
+                [(self.group, p, self.instance_id) for p in held - assigned],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO partitions (grp, partition, owner, expires_at) "
+                "VALUES (?, ?, NULL, 0)",
+                [(self.group, p) for p in assigned],
+            )
+            owned = set()
+            for p in sorted(assigned):
+                cursor = conn.execute(
+                    "UPDATE partitions SET owner = ?, expires_at = ? WHERE grp = ? AND partition = ? "
+                    "AND (owner = ? OR owner IS NULL OR expires_at < ?)",
+                    (self.instance_id, until, self.group, p, self.instance_id, now),
+                )
+                if cursor.rowcount:
+                    owned.add(p)
+        if owned != self._owned:
+            logger.info(
+                f"{self.group} instance {self.instance_id} owns {len(owned)}/{self.partitions} "
+                f"partitions ({len(live)} live, {len(assigned) - len(owned)} awaiting handover)"
+            )
+        self._owned = owned
+        self._valid_until = until
+        OWNED_PARTITIONS.labels(self.group).set(len(owned))
+        return owned
+
+    def owned(self) -> Set[int]:
+        """Partitions owned now (none once the leases expired without renewal)."""
+        return self._owned if time.time() < self._valid_until else set()
+
+    def owns(self, lot_id: str) -> bool:
+        """Whether this instance should fetch and alert on a lot."""
+        return partition_of(lot_id, self.partitions) in self.owned()
+
+    def owns_item(self, item: Dict) -> bool:
+        """Whether this instance owns the lot of a scraped item."""
+        return self.owns(_lot_key(item))
+
+    def filter(self, items: List[Dict]) -> List[Dict]:
+        """The items whose lots this instance owns."""
+        owned = self.owned()
+        return [item for item in items if partition_of(_lot_key(item), self.partitions) in owned]
+
+    def start(self, interval: Optional[float] = None) -> "LotOwnership":
+        """
+        Refresh now and then in the background.
+
+        Args:
+            interval: Seconds between refreshes (a third of the lease if None)
+        """
+        self.refresh()
+        if self._thread is not None:
+            return self
+        interval = interval or self.lease / 3
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except sqlite3.Error as e:
+                    logger.error(f"Ownership refresh failed: {e}")
+
+        self._thread = threading.Thread(target=loop, name="ownership", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop refreshing and release every lease, so others take over at once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE partitions SET owner = NULL, expires_at = 0 WHERE grp = ? AND owner = ?",
+                (self.group, self.instance_id),
+            )
+            conn.execute(
+                "DELETE FROM members WHERE grp = ? AND instance = ?",
+                (self.group, self.instance_id),
+            )
+        self._owned = set()
+        OWNED_PARTITIONS.labels(self.group).set(0)
+
+
+def start_ownership(group: str) -> Optional[LotOwnership]:
+    """Join a group and keep its leases renewed if OWNERSHIP_ENABLED (None otherwise)."""
+    if not OWNERSHIP_ENABLED:
+        return None
+    return LotOwnership(group).start()
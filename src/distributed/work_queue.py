@@ -0,0 +1,359 @@
+"""
+Job queue shared by the coordinator and the workers.
+
+Jobs are URLs to fetch: a listing page, a lot seen for the first time, or
+a lot re-checked while it closes. A worker claims jobs under a lease: a
+claimed job is invisible to other workers until the lease (visibility
+timeout) expires, so the jobs of a crashed worker are delivered again.
+Workers report a result per job, which the coordinator takes and applies.
+
+WorkQueue is the interface; SQLiteWorkQueue keeps the queue in a SQLite
+file that every container mounts (one host). Other brokers can implement
+the same interface.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.config.settings import (
+    WORK_QUEUE_DB_FILE,
+    WORK_QUEUE_LEASE,
+    WORK_QUEUE_MAX_ATTEMPTS,
+    WORK_QUEUE_RETENTION,
+    WORK_QUEUE_RETRY_DELAY,
+)
+from src.utils.logger import logger
+
+# Job kinds
+LISTING = "listing"
+LOT = "lot"
+RECHECK = "recheck"
+
+# Job states (a claimed job stays pending, hidden until its lease expires)
+PENDING = "pending"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Job:
+    """
+    A claimed job.
+
+    Attributes:
+        id: Job ID
+        kind: "listing", "lot" or "recheck"
+        url: Page to fetch
+        attempts: Deliveries so far, this one included
+        lease_token: Identifies this claim (a re-delivered job gets a new one)
+    """
+
+    id: int
+    kind: str
+    url: str
+    attempts: int
+    lease_token: str
+
+
+@dataclass
+class JobResult:
+    """
+    The outcome of a job, reported by a worker.
+
+    Attributes:
+        job_id: ID of the job
+        kind: Kind of the job
+        url: Page that was fetched
+        result: Lot URLs of a listing, a lot's item dictionary, or None
+        worker: ID of the worker that ran the job
+    """
+
+    job_id: int
+    kind: str
+    url: str
+    result: Any
+    worker: str
+
+
+class WorkQueue(ABC):
+    """
+    Interface of the job queue.
+    """
+
+    @abstractmethod
+    def put(self, kind: str, urls: Iterable[str]) -> int:
+        """
+        Add jobs, skipping URLs that already have a pending job of that kind.
+
+        Returns:
+            Number of jobs added
+        """
+
+    @abstractmethod
+    def claim(self, worker: str, limit: int = 1, lease: Optional[float] = None) -> List[Job]:
+        """
+        Claim visible jobs, oldest first, hiding them for the lease.
+
+        Returns:
+            Claimed jobs
+        """
+
+    @abstractmethod
+    def extend(self, job: Job, lease: Optional[float] = None) -> bool:
+        """
+        Extend the lease of a job still being worked on.
+
+        Returns:
+            False if the lease was lost (the job expired and was re-claimed)
+        """
+
+    @abstractmethod
+    def complete(self, job: Job, result: Any = None) -> bool:
+        """
+        Finish a job and report its result.
+
+        Returns:
+            False if the lease was lost, in which case the result is dropped
+        """
+
+    @abstractmethod
+    def fail(self, job: Job, error: str = "") -> bool:
+        """
+        Release a job after an error, to be retried later.
+
+        Returns:
+            False if the lease was lost
+        """
+
+    @abstractmethod
+    def take_results(self, limit: int = 100) -> List[JobResult]:
+        """Remove and return reported results, oldest first."""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+
+    @abstractmethod
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """
+        Delete finished jobs older than a cutoff in seconds (the queue's retention if None).
+
+        Returns:
+            Number of jobs removed
+        """
+
+    def close(self) -> None:
+        """Release resources (no-op by default)."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    visible_at REAL NOT NULL,
+    lease_token TEXT,
+    worker TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_visible ON jobs (status, visible_at);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_open ON jobs (kind, url) WHERE status = 'pending';
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT,
+    worker TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Work queue in a SQLite file shared by every process on a host.
+    """
+
+    def __init__(
+        self,
+        db_path: str = WORK_QUEUE_DB_FILE,
+        lease: float = WORK_QUEUE_LEASE,
+        max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+        retry_delay: float = WORK_QUEUE_RETRY_DELAY,
+        retention: float = WORK_QUEUE_RETENTION,
+    ):
+        """
+        Initialize queue.
+
+        Args:
+            db_path: SQLite database file
+            lease: Default visibility timeout of a claim in seconds
+            max_attempts: Deliveries of a job before it is given up
+            retry_delay: Delay before a failed job is visible again (times attempts)
+            retention: Seconds finished jobs are kept before prune() removes them
+        """
+        self.db_path = db_path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retention = retention
+        self._lock = threading.Lock()
+        # transactions are explicit, see _write()
+        self._conn = sqlite3.connect(
+            db_path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a write transaction.
+
+        BEGIN IMMEDIATE takes the database write lock up front, so two
+        processes claiming at once cannot both read the same visible job.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def put(self, kind: str, urls: Iterable[str]) -> int:
+        now = time.time()
+        with self._write() as conn:
+            added = 0
+            for url in urls:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (kind, url, status, visible_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (kind, url, PENDING, now, now),
+                )
+                added += cursor.rowcount
+        return added
+
+    def claim(self, worker: str, limit: int = 1, lease: Optional[float] = None) -> List[Job]:
+        now = time.time()
+        lease = self.lease if lease is None else lease
+        with self._write() as conn:
+            # delivered max_attempts times without finishing: the job keeps killing workers
+            given_up = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, "
+                "last_error = COALESCE(last_error, 'lease expired') "
+                "WHERE status = ? AND visible_at <= ? AND attempts >= ?",
+                (DEAD, now, PENDING, now, self.max_attempts),
+            ).rowcount
+            rows = conn.execute(
+                "SELECT id, kind, url, attempts FROM jobs WHERE status = ? AND visible_at <= ? "
+                "ORDER BY visible_at LIMIT ?",
+                (PENDING, now, limit),
+            ).fetchall()
+            jobs = [
+                Job(job_id, kind, url, attempts + 1, uuid.uuid4().hex)
+                for job_id, kind, url, attempts in rows
+            ]
+            conn.executemany(
+                "UPDATE jobs SET attempts = ?, visible_at = ?, lease_token = ?, worker = ? "
+                "WHERE id = ?",
+                [(job.attempts, now + lease, job.lease_token, worker, job.id) for job in jobs],
+            )
+        if given_up:
+            logger.error(f"Gave up {given_up} job(s) after {self.max_attempts} attempts")
+        return jobs
+
+    def extend(self, job: Job, lease: Optional[float] = None) -> bool:
+        lease = self.lease if lease is None else lease
+        with self._write() as conn:
+            return self._update_leased(conn, job, "visible_at = ?", (time.time() + lease,))
+
+    def complete(self, job: Job, result: Any = None) -> bool:
+        now = time.time()
+        with self._write() as conn:
+            if not self._update_leased(conn, job, "status = ?, finished_at = ?", (DONE, now)):
+                return False
+            worker = conn.execute("SELECT worker FROM jobs WHERE id = ?", (job.id,)).fetchone()
+            conn.execute(
+                "INSERT INTO results (job_id, kind, url, payload, worker, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.kind, job.url, json.dumps(result), worker[0], now),
+            )
+        return True
+
+    def fail(self, job: Job, error: str = "") -> bool:
+        now = time.time()
+        if job.attempts >= self.max_attempts:
+            changes = "status = ?, finished_at = ?, last_error = ?"
+            values: tuple = (DEAD, now, error)
+        else:
+            changes = "visible_at = ?, last_error = ?"
+            values = (now + self.retry_delay * job.attempts, error)
+        # the claim is over either way, later updates need a new one
+        changes += ", lease_token = NULL"
+        with self._write() as conn:
+            released = self._update_leased(conn, job, changes, values)
+        if released and job.attempts >= self.max_attempts:
+            logger.error(f"Gave up {job.kind} job {job.url} after {job.attempts} attempts: {error}")
+        return released
+
+    @staticmethod
+    def _update_leased(conn: sqlite3.Connection, job: Job, changes: str, values: tuple) -> bool:
+        """Update a job only while this claim still holds its lease."""
+        cursor = conn.execute(
+            f"UPDATE jobs SET {changes} WHERE id = ? AND status = ? AND lease_token = ?",
+            (*values, job.id, PENDING, job.lease_token),
+        )
+        return cursor.rowcount == 1
+
+    def take_results(self, limit: int = 100) -> List[JobResult]:
+        with self._write() as conn:
+            rows = conn.execute(
+                "SELECT id, job_id, kind, url, payload, worker FROM results ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+            conn.executemany("DELETE FROM results WHERE id = ?", [(row[0],) for row in rows])
+        return [
+            JobResult(job_id, kind, url, json.loads(payload), worker)
+            for _, job_id, kind, url, payload, worker in rows
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT CASE WHEN status = ? AND visible_at > ? AND lease_token IS NOT NULL "
+                "THEN 'leased' ELSE status END, COUNT(*) FROM jobs GROUP BY 1",
+                (PENDING, now),
+            ).fetchall()
+            results = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        counts = {PENDING: 0, "leased": 0, DONE: 0, DEAD: 0, "results": results}
+        counts.update(dict(rows))
+        return counts
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        older_than = self.retention if older_than is None else older_than
+        with self._write() as conn:
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, DEAD, time.time() - older_than),
+            ).rowcount
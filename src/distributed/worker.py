@@ -0,0 +1,184 @@
+"""
+Scraping worker of the distributed work mode.
+
+Claims jobs from the shared work queue, fetches them with the Selenium
+scraper and reports the results. Run as many workers as there is memory
+for browsers, e.g. `docker compose --profile distributed up --scale
+worker=4`. A worker renews its lease while a job runs; if it dies, the
+lease expires and the job is delivered to another worker.
+
+Usage:
+    python -m src worker [--id NAME]
+"""
+
+import os
+import signal
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.config.settings import WORK_QUEUE_LEASE, WORKER_POLL_INTERVAL
+from src.distributed.work_queue import LISTING, LOT, RECHECK, Job, SQLiteWorkQueue, WorkQueue
+from src.metrics.instruments import JOBS_PROCESSED, heartbeat
+from src.utils.logger import logger
+
+
+class Worker:
+    """
+    Claims jobs one at a time and runs them.
+    """
+
+    def __init__(
+        self,
+        work_queue: Optional[WorkQueue] = None,
+        fetch_links: Optional[Callable[[str], List[str]]] = None,
+        fetch_item: Optional[Callable[[str], Optional[Dict]]] = None,
+        worker_id: Optional[str] = None,
+        lease: float = WORK_QUEUE_LEASE,
+        poll_interval: float = WORKER_POLL_INTERVAL,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            work_queue: Queue shared with the coordinator (WORK_QUEUE_DB_FILE if None)
+            fetch_links: Returns the lot URLs of a listing (main.py scraper if None)
+            fetch_item: Returns a lot's item dictionary or None (main.py scraper with a
+                recycled browser if None)
+            worker_id: Name recorded on claimed jobs (host name and PID if None)
+            lease: Visibility timeout of a claim, renewed every third of it while running
+            poll_interval: Seconds between polls when the queue is empty
+        """
+        self.work_queue = work_queue if work_queue is not None else SQLiteWorkQueue()
+        self.fetch_links = fetch_links or self._scrape_listing
+        self.fetch_item = fetch_item or self._scrape_lot
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._browser = None
+
+    def _get_browser(self):
+        """The worker's browser, recycled past its limits."""
+        from src.scraper.browser import BrowserManager
+
+        if self._browser is None:
+            self._browser = BrowserManager()
+        return self._browser
+
+    def _scrape_listing(self, url: str) -> List[str]:
+        """Collect a listing's lot links with the worker's browser."""
+        from src.scraper.browser import scrape_listing
+
+        return scrape_listing(self._get_browser(), url)
+
+    def _scrape_lot(self, url: str) -> Optional[Dict]:
+        """Scrape a lot with the worker's browser."""
+        from src.scraper.browser import scrape_lot
+
+        return scrape_lot(self._get_browser(), url)
+
+    def handle(self, job: Job) -> Any:
+        """
+        Run a job.
+
+        Returns:
+            Lot URLs for a listing job, the item dictionary (or None) for a lot
+
+        Raises:
+            ValueError: If the job kind is unknown
+        """
+        if job.kind == LISTING:
+            return self.fetch_links(job.url)
+        if job.kind in (LOT, RECHECK):
+            return self.fetch_item(job.url)
+        raise ValueError(f"Unknown job kind: {job.kind}")
+
+    @contextmanager
+    def _leased(self, job: Job) -> Iterator[None]:
+        """Renew the lease of a job in the background while it runs."""
+        done = threading.Event()
+
+        def renew() -> None:
+            while not done.wait(self.lease / 3):
+                if not self.work_queue.extend(job, self.lease):
+                    logger.warning(f"Lost the lease of {job.kind} job {job.url}")
+                    return
+
+        renewer = threading.Thread(target=renew, name="lease-renewer", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            done.set()
+            renewer.join()
+
+    def work_once(self) -> bool:
+        """
+        Claim and run one job.
+
+        Returns:
+            False if there was no job to claim
+        """
+        jobs = self.work_queue.claim(self.worker_id, limit=1, lease=self.lease)
+        if not jobs:
+            return False
+        job = jobs[0]
+        try:
+            with self._leased(job):
+                result = self.handle(job)
+        except Exception as e:
+            logger.warning(f"{job.kind} job {job.url} failed (attempt {job.attempts}): {e}")
+            outcome = "failed" if self.work_queue.fail(job, str(e)) else "lost"
+        else:
+            outcome = "done" if self.work_queue.complete(job, result) else "lost"
+        JOBS_PROCESSED.labels(job.kind, outcome).inc()
+        heartbeat()
+        return True
+
+    def run(self) -> None:
+        """Work until stop() is called."""
+        logger.info(f"Worker {self.worker_id} started")
+        while not self._stop.is_set():
+            if not self.work_once():
+                # idle is not stalled
+                heartbeat()
+                self._stop.wait(self.poll_interval)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        """Stop after the current job."""
+        self._stop.set()
+
+    def run_forever(self) -> None:
+        """Run until SIGINT or SIGTERM, finishing the current job."""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        try:
+            self.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self._browser is not None:
+                self._browser.close()
+            self.work_queue.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    import argparse
+
+    from src.metrics.server import start_metrics_server
+
+    parser = argparse.ArgumentParser(description="Fetch queued lots for the coordinator")
+    parser.add_argument("--id", dest="worker_id", help="worker name (default: host-pid)")
+    parser.add_argument("--lease", type=float, default=WORK_QUEUE_LEASE, help="lease (s)")
+    args = parser.parse_args(argv)
+
+    start_metrics_server("worker")
+    Worker(worker_id=args.worker_id, lease=args.lease).run_forever()
+
+
+if __name__ == "__main__":
+    main()
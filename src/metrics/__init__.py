@@ -0,0 +1 @@
+"""Metrics module for latency, throughput and health instrumentation."""
@@ -0,0 +1,106 @@
+"""
+Fixed-bucket histogram for latency measurements.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+# Exponential buckets from 1ms to ~36h (upper bounds, in seconds)
+DEFAULT_BUCKETS: Sequence[float] = tuple(0.001 * 2**i for i in range(28))
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed upper-bound buckets.
+
+    Bucket layout matches Prometheus histograms (each bucket counts
+    observations <= its bound), so it can be exported as is.
+    """
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds (uses DEFAULT_BUCKETS if None)
+        """
+        self.buckets: List[float] = list(buckets or DEFAULT_BUCKETS)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    @property
+    def mean(self) -> float:
+        """Mean of the observations (0.0 when empty)."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating inside its bucket.
+
+        Args:
+            q: Quantile (0.0-1.0)
+
+        Returns:
+            Estimated value (0.0 when empty)
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            cumulative = 0
+            for index, bucket_count in enumerate(self.counts):
+                if cumulative + bucket_count >= target and bucket_count:
+                    lower = self.buckets[index - 1] if index > 0 else 0.0
+                    if index >= len(self.buckets):
+                        return lower
+                    upper = self.buckets[index]
+                    return lower + (upper - lower) * (target - cumulative) / bucket_count
+                cumulative += bucket_count
+            return self.buckets[-1]
+
+    def cumulative_counts(self) -> List[int]:
+        """Cumulative count per bucket, +Inf last (Prometheus 'le' semantics)."""
+        with self._lock:
+            totals, running = [], 0
+            for bucket_count in self.counts:
+                running += bucket_count
+                totals.append(running)
+            return totals
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram with the same buckets into this one."""
+        if other.buckets != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        with self._lock:
+            self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+            self.count += other.count
+            self.sum += other.sum
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "buckets": self.buckets,
+            "counts": self.counts,
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        """Create Histogram from dictionary."""
+        histogram = cls(data["buckets"])
+        histogram.counts = list(data["counts"])
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        return histogram
@@ -0,0 +1,83 @@
+"""
+Metrics exported by the scraper, monitor and alerting processes.
+
+Each process serves its own registry (see src.metrics.server); Prometheus
+aggregates them.
+"""
+
+from typing import Optional
+
+from src.metrics.registry import REGISTRY
+
+# Buckets for page loads and parsing (seconds)
+PAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PAGES_FETCHED = REGISTRY.counter(
+    "catawiki_pages_fetched_total", "Pages loaded in the browser", ["kind"]
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "catawiki_parse_seconds", "Time spent extracting lot fields from a page", buckets=PAGE_BUCKETS
+)
+FETCH_RETRIES = REGISTRY.counter(
+    "catawiki_fetch_retries_total", "Lot page reloads because the page was incomplete"
+)
+LOTS_FAILED = REGISTRY.counter(
+    "catawiki_lots_failed_total", "Lot pages abandoned after all retries"
+)
+DRIVER_LAUNCHES = REGISTRY.counter("catawiki_driver_launches_total", "Browser drivers started")
+DRIVER_CRASHES = REGISTRY.counter(
+    "catawiki_driver_crashes_total", "WebDriver errors while starting or driving the browser"
+)
+DRIVER_RECYCLES = REGISTRY.counter(
+    "catawiki_driver_recycles_total",
+    "Browser drivers replaced by the lifecycle manager",
+    ["reason"],
+)
+DRIVER_RSS = REGISTRY.gauge(
+    "catawiki_driver_rss_bytes", "Resident memory of the current browser process tree"
+)
+TAB_RESETS = REGISTRY.counter(
+    "catawiki_tab_resets_total", "Browser tabs replaced after a page timed out"
+)
+PROFILE_RESETS = REGISTRY.counter(
+    "catawiki_profile_resets_total", "Persistent browser profiles deleted or found corrupted"
+)
+BID_UPDATES = REGISTRY.counter(
+    "catawiki_bid_updates_total", "Bid changes of pinned lots read from API responses"
+)
+SNIPING_LOTS = REGISTRY.gauge(
+    "catawiki_sniping_lots",
+    "Deals in their final window, tracked in tabs or over the tab limit",
+    ["state"],
+)
+QUEUE_DEPTH = REGISTRY.gauge("catawiki_queue_depth", "Items waiting in a queue", ["queue"])
+STORE_ITEMS = REGISTRY.gauge("catawiki_store_items", "Lots in the items store")
+DEALS_FOUND = REGISTRY.counter(
+    "catawiki_deals_found_total", "Deals selected by the analyzer", ["type"]
+)
+ALERTS_SENT = REGISTRY.counter(
+    "catawiki_alerts_sent_total", "Alert deliveries by outcome", ["result"]
+)
+JOBS_PROCESSED = REGISTRY.counter(
+    "catawiki_jobs_processed_total", "Distributed jobs finished by workers", ["kind", "result"]
+)
+OWNED_PARTITIONS = REGISTRY.gauge(
+    "catawiki_owned_partitions", "Lot partitions owned by this instance", ["group"]
+)
+HEARTBEAT = REGISTRY.gauge(
+    "catawiki_heartbeat_timestamp_seconds", "Last time a component made progress", ["component"]
+)
+
+# Role of this process (scraper, monitor, alerts, daemon, coordinator or worker), set by start_metrics_server
+_component = "scraper"
+
+
+def set_component(component: str) -> None:
+    """Set the role reported by heartbeat()."""
+    global _component
+    _component = component
+
+
+def heartbeat(component: Optional[str] = None) -> None:
+    """Record that a component (this process's role by default) made progress."""
+    HEARTBEAT.labels(component or _component).set_to_current_time()
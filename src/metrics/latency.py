@@ -0,0 +1,193 @@
+"""
+Scrape-to-alert latency instrumentation.
+
+Each lot carries a `timings` mapping of pipeline stage to Unix timestamp,
+stamped as it moves through the pipeline:
+
+    fetched    lot page loaded in the browser
+    parsed     fields extracted from the page
+    stored     written to the items file
+    analysed   selected as a deal by the analyzer
+    queued     alert written to the outbox
+    delivered  alert acknowledged by the notifier
+
+A bid change on Catawiki is only observable once the page is fetched, so
+"fetched" is the start of the measured pipeline. When an alert is delivered
+the time spent in each stage is added to a histogram; the report shows where
+the seconds go.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.config.settings import LATENCY_STATS_FILE
+from src.metrics.histogram import Histogram
+from src.utils.logger import logger
+
+PIPELINE_STAGES = ("fetched", "parsed", "stored", "analysed", "queued", "delivered")
+TOTAL = "total"
+
+
+def mark_stage(timings: Dict[str, float], stage: str, at: Optional[float] = None) -> None:
+    """
+    Stamp a pipeline stage on a lot's timings.
+
+    Works on WatchItem.timings as well as on the raw item dictionaries of
+    the scraping scripts.
+
+    Args:
+        timings: Stage timestamps of the lot (modified in place)
+        stage: Stage name (one of PIPELINE_STAGES)
+        at: Timestamp (defaults to now)
+    """
+    timings[stage] = at if at is not None else time.time()
+
+
+def stage_durations(
+    timings: Dict[str, float], stages: Sequence[str] = PIPELINE_STAGES
+) -> Dict[str, float]:
+    """
+    Compute the time spent reaching each stage from the previous stamped one.
+
+    Stages missing from the timings are skipped, so their time is counted in
+    the next stamped stage. Clock skew between processes is clamped to zero.
+
+    Returns:
+        Mapping of stage to seconds, plus the end-to-end TOTAL
+    """
+    durations: Dict[str, float] = {}
+    stamped = [(stage, timings[stage]) for stage in stages if stage in timings]
+    for (_, previous), (stage, current) in zip(stamped, stamped[1:]):
+        durations[stage] = max(0.0, current - previous)
+    if len(stamped) > 1:
+        durations[TOTAL] = max(0.0, stamped[-1][1] - stamped[0][1])
+    return durations
+
+
+class LatencyTracker:
+    """
+    Histograms of pipeline stage latencies, persisted to a JSON file.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, stages: Sequence[str] = PIPELINE_STAGES):
+        """
+        Initialize tracker.
+
+        Args:
+            file_path: Where histograms are persisted (None keeps them in memory)
+            stages: Ordered pipeline stages
+        """
+        self.file_path = Path(file_path) if file_path else None
+        self.stages = tuple(stages)
+        self.histograms: Dict[str, Histogram] = {
+            stage: Histogram() for stage in (*self.stages[1:], TOTAL)
+        }
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.file_path and self.file_path.exists():
+            self.load()
+
+    def record(self, timings: Dict[str, float]) -> Dict[str, float]:
+        """
+        Add a lot's stage latencies to the histograms.
+
+        Args:
+            timings: Stage timestamps of the lot
+
+        Returns:
+            The recorded durations per stage
+        """
+        durations = stage_durations(timings, self.stages)
+        with self._lock:
+            for stage, seconds in durations.items():
+                self.histograms[stage].observe(seconds)
+            self._dirty = self._dirty or bool(durations)
+        return durations
+
+    def report(self) -> str:
+        """
+        Format a table of stage latencies.
+
+        The share column is each stage's part of the mean end-to-end latency.
+        """
+        total_mean = self.histograms[TOTAL].mean
+        lines = [
+            f"{'stage':<10} {'count':>7} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'share':>6}"
+        ]
+        for stage, histogram in self.histograms.items():
+            share = f"{histogram.mean / total_mean:.0%}" if total_mean and stage != TOTAL else ""
+            lines.append(
+                f"{stage:<10} {histogram.count:>7} {histogram.mean:>8.2f}s"
+                f" {histogram.quantile(0.5):>8.2f}s {histogram.quantile(0.9):>8.2f}s"
+                f" {histogram.quantile(0.99):>8.2f}s {share:>6}"
+            )
+        return "\n".join(lines)
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Persist histograms to the configured file.
+
+        Args:
+            force: Write even if nothing was recorded since the last save
+
+        Returns:
+            True if the file was written
+        """
+        if not self.file_path or not (self._dirty or force):
+            return False
+        try:
+            with self._lock:
+                data = {
+                    "updated_at": time.time(),
+                    "histograms": {k: v.to_dict() for k, v in self.histograms.items()},
+                }
+                self._dirty = False
+            tmp_path = self.file_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.file_path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save latency statistics: {e}")
+            return False
+
+    def load(self) -> bool:
+        """
+        Load histograms from the configured file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                for stage, histogram in data.get("histograms", {}).items():
+                    if stage in self.histograms:
+                        self.histograms[stage] = Histogram.from_dict(histogram)
+            return True
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.error(f"Failed to parse latency statistics from {self.file_path}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error loading latency statistics: {e}")
+            return False
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the latency report (usage: python -m src.metrics.latency [stats_file])."""
+    argv = sys.argv[1:] if argv is None else argv
+    file_path = argv[0] if argv else LATENCY_STATS_FILE
+    if not Path(file_path).exists():
+        print(f"No latency statistics in {file_path}")
+        return
+    print(LatencyTracker(file_path).report())
+
+
+if __name__ == "__main__":
+    main()
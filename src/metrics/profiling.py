@@ -0,0 +1,357 @@
+"""
+Profiling hooks for the scraping and alerting cycles.
+
+Spans time the pipeline stages (browser_load, parse, store, analyze,
+notify). When profiling is on, span durations feed a Prometheus histogram
+and an in-process tree that can be dumped as flamegraph-compatible folded
+stacks. One cycle (PROFILE_CYCLE) can also be captured with cProfile or a
+sampling profiler.
+
+When profiling is off, span() returns a shared no-op context manager and
+timed() returns the function unchanged, so the hooks cost next to nothing.
+"""
+
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from src.config.settings import (
+    PROFILE_CYCLE,
+    PROFILE_DIR,
+    PROFILE_SAMPLE_INTERVAL,
+    PROFILER,
+    PROFILING_ENABLED,
+)
+from src.metrics.registry import REGISTRY
+from src.utils.logger import logger
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "catawiki_stage_seconds", "Time spent in a pipeline stage (profiling only)", ["stage"]
+)
+
+_config = {
+    "enabled": PROFILING_ENABLED,
+    "profiler": PROFILER,
+    "output_dir": PROFILE_DIR,
+    "cycle": PROFILE_CYCLE,
+    "interval": PROFILE_SAMPLE_INTERVAL,
+}
+
+# Path of the enclosing spans; a context variable so concurrent tasks keep their own
+_current_path: contextvars.ContextVar[Tuple[str, ...]] = contextvars.ContextVar(
+    "profiling_path", default=()
+)
+_totals: Dict[Tuple[str, ...], float] = defaultdict(float)
+_counts: Dict[Tuple[str, ...], int] = defaultdict(int)
+_lock = threading.Lock()
+
+
+def configure(
+    enabled: Optional[bool] = None,
+    profiler: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    cycle: Optional[int] = None,
+    interval: Optional[float] = None,
+) -> None:
+    """
+    Override the profiling configuration (arguments left as None are kept).
+
+    Functions already decorated with timed() keep the behaviour they were
+    decorated with.
+
+    Args:
+        enabled: Record spans
+        profiler: Profiler for the captured cycle ("none", "cprofile" or "sampling")
+        output_dir: Directory for dumped reports
+        cycle: Number of the cycle to capture (0 disables capture)
+        interval: Seconds between samples of the sampling profiler
+    """
+    for key, value in (
+        ("enabled", enabled),
+        ("profiler", profiler),
+        ("output_dir", output_dir),
+        ("cycle", cycle),
+        ("interval", interval),
+    ):
+        if value is not None:
+            _config[key] = value
+
+
+def is_enabled() -> bool:
+    """Whether spans are recorded."""
+    return _config["enabled"]
+
+
+class _NullSpan:
+    """Span used while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times a block and records it under the enclosing spans."""
+
+    __slots__ = ("name", "_token", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._token = _current_path.set(_current_path.get() + (self.name,))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = time.perf_counter() - self._start
+        path = _current_path.get()
+        _current_path.reset(self._token)
+        with _lock:
+            _totals[path] += elapsed
+            _counts[path] += 1
+        STAGE_SECONDS.labels(self.name).observe(elapsed)
+        return False
+
+
+def span(name: str):
+    """
+    Time a block of code as a pipeline stage.
+
+    Usage:
+        with span("parse"):
+            ...
+    """
+    if not _config["enabled"]:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Record a duration measured elsewhere as a span under the current one."""
+    if not _config["enabled"]:
+        return
+    path = _current_path.get() + (name,)
+    with _lock:
+        _totals[path] += seconds
+        _counts[path] += 1
+    STAGE_SECONDS.labels(name).observe(seconds)
+
+
+def timed(name: str) -> Callable:
+    """Decorator running a function inside span(name) (a no-op when profiling is off)."""
+
+    def decorator(function: Callable) -> Callable:
+        if not _config["enabled"]:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def reset_spans() -> None:
+    """Forget recorded span timings."""
+    with _lock:
+        _totals.clear()
+        _counts.clear()
+
+
+def span_totals() -> Dict[Tuple[str, ...], Tuple[int, float]]:
+    """Recorded spans as {path: (count, total seconds)}."""
+    with _lock:
+        return {path: (_counts[path], total) for path, total in _totals.items()}
+
+
+def span_report() -> str:
+    """Format recorded spans as an indented table, slowest branches first."""
+    totals = span_totals()
+    lines = [f"{'span':<40} {'count':>8} {'total':>10} {'mean':>10}"]
+
+    def add(prefix: Tuple[str, ...]) -> None:
+        children = [p for p in totals if len(p) == len(prefix) + 1 and p[:-1] == prefix]
+        for path in sorted(children, key=lambda p: totals[p][1], reverse=True):
+            count, total = totals[path]
+            label = "  " * (len(path) - 1) + path[-1]
+            lines.append(f"{label:<40} {count:>8} {total:>9.3f}s {total / count * 1000:>8.2f}ms")
+            add(path)
+
+    add(())
+    return "\n".join(lines)
+
+
+def folded_spans() -> str:
+    """
+    Recorded spans as folded stacks ("a;b;c <microseconds>" per line).
+
+    Each line carries the span's self time, so the output can be fed to
+    flamegraph.pl or speedscope directly.
+    """
+    totals = span_totals()
+    lines = []
+    for path, (_, total) in sorted(totals.items()):
+        children = sum(
+            t for p, (_, t) in totals.items() if len(p) == len(path) + 1 and p[:-1] == path
+        )
+        self_time = max(0.0, total - children)
+        lines.append(f"{';'.join(path)} {int(self_time * 1_000_000)}")
+    return "\n".join(lines) + "\n"
+
+
+def _frame_label(frame) -> str:
+    """Folded-stack label of a frame."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread at a fixed interval.
+
+    Cheaper than cProfile on deep call trees and gives wall-clock stacks,
+    including time blocked on the browser or the network.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Initialize profiler.
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (defaults to the calling thread)
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        """Start sampling in a background thread."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Samples as folded stacks ("a;b;c <samples>" per line)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class CycleProfiler:
+    """
+    Marks the cycles of a loop and captures the configured one.
+
+    Loops call next_cycle() at the top of every iteration (and finish()
+    after the last one). The cycle numbered PROFILE_CYCLE runs under the
+    configured profiler; its reports are written to PROFILE_DIR.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize cycle profiler.
+
+        Args:
+            name: Loop name, used for the cycle span and report file names
+        """
+        self.name = name
+        self.cycle = 0
+        self._span = None
+        self._profiler = None
+        self._captured = False
+
+    def next_cycle(self) -> None:
+        """End the current cycle (if any) and start the next one."""
+        self.finish()
+        if not _config["enabled"]:
+            return
+        self.cycle += 1
+        if self.cycle == _config["cycle"] and not self._captured:
+            self._start_capture()
+        self._span = _Span(self.name)
+        self._span.__enter__()
+
+    def finish(self) -> None:
+        """End the current cycle, writing reports if it was captured."""
+        if self._span is not None:
+            self._span.__exit__(None, None, None)
+            self._span = None
+        if self._captured and self._profiler is not None:
+            self._stop_capture()
+
+    def __enter__(self) -> "CycleProfiler":
+        self.next_cycle()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.finish()
+        return False
+
+    def _start_capture(self) -> None:
+        self._captured = True
+        reset_spans()
+        profiler = _config["profiler"]
+        if profiler == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif profiler == "sampling":
+            self._profiler = SamplingProfiler(_config["interval"]).start()
+        else:
+            self._profiler = False  # spans only
+
+    def _stop_capture(self) -> None:
+        profiler, self._profiler = self._profiler, None
+        output_dir = Path(_config["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = output_dir / f"{self.name}-{self.cycle}-{time.strftime('%Y%m%d-%H%M%S')}"
+
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            profiler.dump_stats(f"{prefix}.prof")
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+            Path(f"{prefix}.txt").write_text(text.getvalue(), encoding="utf-8")
+        elif isinstance(profiler, SamplingProfiler):
+            profiler.stop()
+            Path(f"{prefix}.folded").write_text(profiler.folded(), encoding="utf-8")
+
+        Path(f"{prefix}.spans.folded").write_text(folded_spans(), encoding="utf-8")
+        Path(f"{prefix}.spans.txt").write_text(span_report() + "\n", encoding="utf-8")
+        logger.info(f"Profile of {self.name} cycle {self.cycle} written to {prefix}.*")
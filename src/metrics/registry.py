@@ -0,0 +1,282 @@
+"""
+Prometheus-style metrics registry.
+
+Counters, gauges and histograms with optional labels, rendered in the
+Prometheus text exposition format (version 0.0.4).
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.metrics.histogram import Histogram
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set as {a="1",b="2"} (empty string without labels)."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """
+    Base class of labelled metrics.
+
+    A metric without label names is its own (single) child; with label
+    names, children are created on demand by labels().
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize metric.
+
+        Args:
+            name: Metric name (e.g. catawiki_pages_fetched_total)
+            documentation: Help text
+            labelnames: Label names, in order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **kwargs: str) -> "_Metric":
+        """
+        Get the child metric of a label set.
+
+        Args:
+            values: Label values, in labelnames order
+            kwargs: Label values by name
+
+        Returns:
+            Child metric (created on first use)
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                self._children[key] = child
+        return child
+
+    def _new_child(self) -> "_Metric":
+        raise NotImplementedError
+
+    def series(self) -> List[Tuple[LabelValues, "_Metric"]]:
+        """(label values, child) pairs to render."""
+        if not self.labelnames:
+            return [((), self)]
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        """(suffix, extra labels, value) samples of a single child."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render the metric in the text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in self.series():
+            base = _format_labels(self.labelnames, values)
+            for suffix, extra, value in child._samples():
+                labels = base
+                if extra:
+                    labels = base[:-1] + "," + extra + "}" if base else "{" + extra + "}"
+                lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+
+    def _new_child(self) -> "Counter":
+        return Counter(self.name, self.documentation)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Current count."""
+        return self._value
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        return [("", "", self._value)]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def _new_child(self) -> "Gauge":
+        return Gauge(self.name, self.documentation)
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount)
+
+    def set_to_current_time(self) -> None:
+        """Set the gauge to the current Unix time (heartbeats)."""
+        self.set(time.time())
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from a callback at scrape time (e.g. a queue length)."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        """Current value (calls the callback if one is set)."""
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        return [("", "", self.value)]
+
+
+class HistogramMetric(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self.histogram = Histogram(buckets)
+
+    def _new_child(self) -> "HistogramMetric":
+        return HistogramMetric(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        self.histogram.observe(value)
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        histogram = self.histogram
+        samples = [
+            ("_bucket", f'le="{_format_value(bound)}"', count)
+            for bound, count in zip([*histogram.buckets, math.inf], histogram.cumulative_counts())
+        ]
+        samples.append(("_sum", "", histogram.sum))
+        samples.append(("_count", "", histogram.count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Collection of named metrics.
+
+    The factory methods return the existing metric when called twice with
+    the same name, so modules can declare the metrics they use.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.type_name}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> HistogramMetric:
+        """Get or create a histogram."""
+        return self._get_or_create(HistogramMetric, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric by name."""
+        return self._metrics.get(name)
+
+    def expose(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served by the metrics endpoint
+REGISTRY = MetricsRegistry()
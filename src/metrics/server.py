@@ -0,0 +1,159 @@
+"""
+HTTP endpoint exposing metrics to Prometheus.
+
+    /metrics   registry in the Prometheus text format
+    /healthz   200 while every heartbeat is fresh, 503 once one is stale
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from src.config.settings import METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_STALL_SECONDS
+from src.metrics.instruments import HEARTBEAT, heartbeat, set_component
+from src.metrics.registry import REGISTRY, MetricsRegistry
+from src.utils.logger import logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Port offset of each process from METRICS_PORT
+COMPONENT_PORT_OFFSETS = {
+    "scraper": 0,
+    "monitor": 1,
+    "alerts": 2,
+    "daemon": 0,
+    "coordinator": 0,
+    "worker": 3,
+    "sniper": 4,
+}
+
+
+class MetricsServer:
+    """
+    Threaded HTTP server serving a metrics registry.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        host: str = METRICS_HOST,
+        port: int = METRICS_PORT,
+        stall_after: float = METRICS_STALL_SECONDS,
+    ):
+        """
+        Initialize metrics server.
+
+        Args:
+            registry: Registry to expose
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            stall_after: Seconds without a heartbeat before /healthz fails
+        """
+        self.registry = registry
+        self.stall_after = stall_after
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MetricsServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrics available at {self.url}/metrics")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def stale_components(self, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Components whose heartbeat is older than the stall threshold.
+
+        Returns:
+            Mapping of component to seconds since its last heartbeat
+        """
+        now = now if now is not None else time.time()
+        stale = {}
+        for (component,), gauge in HEARTBEAT.series():
+            age = now - gauge.value
+            if age > self.stall_after:
+                stale[component] = round(age, 1)
+        return stale
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    return self._reply(200, server.registry.expose(), CONTENT_TYPE)
+                if path == "/healthz":
+                    stale = server.stale_components()
+                    body = json.dumps({"ok": not stale, "stale": stale})
+                    return self._reply(503 if stale else 200, body, "application/json")
+                return self._reply(404, "Not Found\n", "text/plain")
+
+            def _reply(self, status: int, body: str, content_type: str) -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def start_metrics_server(component: str, port: Optional[int] = None) -> Optional[MetricsServer]:
+    """
+    Start the metrics endpoint of this process if metrics are enabled.
+
+    The component's heartbeat starts now, so /healthz reports a process that
+    never makes progress. A busy port is logged and ignored: the process
+    keeps running without an endpoint.
+
+    Args:
+        component: Process role (scraper, monitor, alerts, daemon, coordinator or worker)
+        port: Port to bind (uses METRICS_PORT plus the component offset if None)
+
+    Returns:
+        Running MetricsServer, or None if disabled or the port is taken
+    """
+    if not METRICS_ENABLED:
+        return None
+    set_component(component)
+    heartbeat()
+    if port is None:
+        port = METRICS_PORT + COMPONENT_PORT_OFFSETS.get(component, 0)
+    try:
+        return MetricsServer(port=port).start()
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started: {e}")
+        return None
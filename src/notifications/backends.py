@@ -0,0 +1,141 @@
+"""
+Non-Telegram notification backends.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from src.config.settings import NOTIFIER_WEBHOOK_URL, NOTIFIER_FILE
+from src.notifications.base import Notifier
+from src.utils.logger import logger
+
+
+class WebhookNotifier(Notifier):
+    """
+    Posts each message as JSON ({"chat_id", "text", "sent_at"}) to an HTTP endpoint.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        chat_ids: Optional[List[str]] = None,
+        timeout: float = 10.0,
+        concurrency: int = 16,
+    ):
+        """
+        Initialize webhook notifier.
+
+        Args:
+            url: Endpoint receiving the messages (uses config default if None)
+            chat_ids: Default recipients
+            timeout: Request timeout in seconds
+            concurrency: Maximum number of requests in flight
+        """
+        super().__init__(chat_ids)
+        self.url = url or NOTIFIER_WEBHOOK_URL
+        if not self.url:
+            raise ValueError("NOTIFIER_WEBHOOK_URL is required for the webhook backend")
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self._client = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        """Open the pooled HTTP client."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency),
+            )
+            # Waiting here is much cheaper than queueing inside the httpx pool
+            self._in_flight = asyncio.Semaphore(self.concurrency)
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send_one(self, chat_id: str, message: str) -> bool:
+        """POST one message."""
+        if self._client is None:
+            await self.start()
+        try:
+            async with self._in_flight:
+                response = await self._client.post(
+                    self.url, json={"chat_id": chat_id, "text": message, "sent_at": time.time()}
+                )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.error(f"Webhook delivery to {chat_id} failed: {e}")
+            return False
+
+
+class FileNotifier(Notifier):
+    """
+    Appends each message as a JSON line to a file.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, chat_ids: Optional[List[str]] = None):
+        """
+        Initialize file notifier.
+
+        Args:
+            file_path: JSON Lines output file (uses config default if None)
+            chat_ids: Default recipients
+        """
+        super().__init__(chat_ids)
+        self.chat_ids = self.chat_ids or ["local"]
+        self.file_path = Path(file_path or NOTIFIER_FILE)
+        self._file = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Open the output file in append mode."""
+        if self._file is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.file_path, "a", encoding="utf-8")
+
+    async def close(self) -> None:
+        """Close the output file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _send_one(self, chat_id: str, message: str) -> bool:
+        """Append one message."""
+        if self._file is None:
+            await self.start()
+        line = json.dumps({"chat_id": chat_id, "text": message, "sent_at": time.time()})
+        async with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return True
+
+
+class StdoutNotifier(Notifier):
+    """
+    Prints messages to standard output (local runs and debugging).
+    """
+
+    def __init__(self, chat_ids: Optional[List[str]] = None):
+        """
+        Initialize stdout notifier.
+
+        Args:
+            chat_ids: Recipients shown as message prefixes
+        """
+        super().__init__(chat_ids)
+        self.chat_ids = self.chat_ids or ["local"]
+
+    async def _send_one(self, chat_id: str, message: str) -> bool:
+        """Print one message."""
+        sys.stdout.write(f"[{chat_id}] {message}\n")
+        return True
@@ -0,0 +1,111 @@
+"""
+Run an async notifier from synchronous code.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from src.notifications.base import Notifier
+from src.utils.logger import logger
+
+
+class BackgroundNotifier:
+    """
+    Owns a notifier and a dedicated event loop thread.
+
+    Synchronous scripts submit messages without blocking; the notifier and
+    its HTTP session live as long as this object.
+    """
+
+    def __init__(self, notifier: Notifier):
+        """
+        Initialize background notifier.
+
+        Args:
+            notifier: Notifier backend (e.g. from create_notifier())
+        """
+        self.notifier = notifier
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BackgroundNotifier":
+        """Start the event loop thread and the notifier."""
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="notifier-loop", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.notifier.start(), self._loop).result()
+        return self
+
+    def submit(self, message: str, chat_ids: Optional[List[str]] = None) -> Future:
+        """
+        Queue a message without waiting for delivery.
+
+        Args:
+            message: The message text to send
+            chat_ids: Optional list of chat IDs. If None, uses the notifier default.
+
+        Returns:
+            Future resolving to the per-chat delivery results
+        """
+        if self._thread is None:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(self.notifier.send(message, chat_ids), self._loop)
+        future.add_done_callback(self._log_failures)
+        return future
+
+    def send(
+        self, message: str, chat_ids: Optional[List[str]] = None, timeout: Optional[float] = None
+    ) -> Dict[str, bool]:
+        """Send a message and wait for the delivery results."""
+        return self.submit(message, chat_ids).result(timeout)
+
+    def run_coroutine(self, coro) -> Future:
+        """
+        Schedule a coroutine (e.g. a dispatcher loop) on the notifier's loop.
+
+        Returns:
+            Future of the coroutine result
+        """
+        if self._thread is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush pending messages, close the notifier and stop the loop."""
+        if self._thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.notifier.close(), self._loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error closing notifier: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop.close()
+        self._thread = None
+        self._loop = None
+
+    def __enter__(self) -> "BackgroundNotifier":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    @staticmethod
+    def _log_failures(future: Future) -> None:
+        """Log recipients a message could not be delivered to."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error:
+            logger.error(f"Notification failed: {error}")
+            return
+        failed = [chat_id for chat_id, ok in future.result().items() if not ok]
+        if failed:
+            logger.error(f"Notification not delivered to {', '.join(failed)}")
@@ -0,0 +1,111 @@
+"""
+Notifier interface and backend factory.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from src.config.settings import TELEGRAM_CHAT_IDS, NOTIFIER_BACKEND
+
+
+class Notifier(ABC):
+    """
+    Base class of notification backends.
+
+    Backends implement _send_one(); send() fans a message out to every
+    recipient concurrently. Backends with their own scheduling (e.g.
+    Telegram rate limiting) override send() instead.
+    """
+
+    def __init__(self, chat_ids: Optional[List[str]] = None):
+        """
+        Initialize notifier.
+
+        Args:
+            chat_ids: Default recipients (uses configured Telegram chat IDs if None)
+        """
+        self.chat_ids = [c for c in (chat_ids or TELEGRAM_CHAT_IDS) if c]
+
+    async def start(self) -> None:
+        """Open connections or files (no-op by default)."""
+
+    async def close(self) -> None:
+        """Flush and release resources (no-op by default)."""
+
+    async def __aenter__(self) -> "Notifier":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def send(self, message: str, chat_ids: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Send a message to all recipients concurrently.
+
+        Args:
+            message: The message text to send
+            chat_ids: Optional list of chat IDs. If None, uses configured default.
+
+        Returns:
+            Mapping of chat ID to delivery success
+        """
+        recipients = chat_ids or self.chat_ids
+        results = await asyncio.gather(
+            *(self._send_one(chat_id, message) for chat_id in recipients),
+            return_exceptions=True,
+        )
+        return {chat_id: ok is True for chat_id, ok in zip(recipients, results)}
+
+    async def send_many(
+        self, messages: List[str], chat_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, bool]]:
+        """
+        Send a burst of messages in parallel.
+
+        Returns:
+            Per-message delivery results, in input order
+        """
+        return await asyncio.gather(*(self.send(message, chat_ids) for message in messages))
+
+    @abstractmethod
+    async def _send_one(self, chat_id: str, message: str) -> bool:
+        """Deliver one message to one recipient."""
+
+
+def create_notifier(backend: Optional[str] = None, **kwargs) -> Notifier:
+    """
+    Create a notifier for a backend name.
+
+    Backends are imported lazily so unused dependencies are never loaded.
+
+    Args:
+        backend: One of telegram, webhook, file, stdout (uses config default if None)
+        **kwargs: Backend-specific options
+
+    Returns:
+        Notifier instance
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend or NOTIFIER_BACKEND).lower()
+    if backend == "telegram":
+        from src.notifications.telegram import TelegramNotifier
+
+        return TelegramNotifier(**kwargs)
+    if backend == "webhook":
+        from src.notifications.backends import WebhookNotifier
+
+        return WebhookNotifier(**kwargs)
+    if backend == "file":
+        from src.notifications.backends import FileNotifier
+
+        return FileNotifier(**kwargs)
+    if backend == "stdout":
+        from src.notifications.backends import StdoutNotifier
+
+        return StdoutNotifier(**kwargs)
+    raise ValueError(f"Unknown notifier backend: {backend}")
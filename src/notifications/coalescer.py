@@ -0,0 +1,141 @@
+"""
+Alert coalescing and digest batching.
+
+Deliveries are buffered per recipient for a short window. Repeated alerts
+for the same lot collapse into one entry, and everything buffered for a
+recipient goes out as a single message. Urgent alerts (closing lots) flush
+their recipient's buffer immediately.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config.settings import ALERT_COALESCE_WINDOW, ALERT_DIGEST_MAX_ITEMS
+from src.notifications.messages import format_alert_message, format_digest_message
+from src.notifications.outbox import Delivery
+from src.storage.models import WatchItem
+
+# When alerts for one lot are merged, the most important type wins
+_TYPE_PRIORITY = {"closing": 2, "new": 1, "updated": 0}
+
+
+@dataclass
+class Batch:
+    """
+    A message ready to be sent to one recipient.
+
+    Attributes:
+        chat_id: Recipient
+        message: Message text (single alert or digest)
+        deliveries: Outbox deliveries acknowledged by this message
+    """
+
+    chat_id: str
+    message: str
+    deliveries: List[Delivery]
+
+
+@dataclass
+class _Buffer:
+    """Alerts buffered for one recipient, grouped by lot."""
+
+    opened_at: float
+    lots: "OrderedDict[str, List[Delivery]]" = field(default_factory=OrderedDict)
+    urgent: bool = False
+
+
+class AlertCoalescer:
+    """
+    Buffers deliveries per recipient and emits merged batches.
+    """
+
+    def __init__(
+        self,
+        window: float = ALERT_COALESCE_WINDOW,
+        max_lots: int = ALERT_DIGEST_MAX_ITEMS,
+        urgent_types: Tuple[str, ...] = ("closing",),
+    ):
+        """
+        Initialize coalescer.
+
+        Args:
+            window: Seconds a recipient's first buffered alert may wait
+            max_lots: Maximum lots per digest message
+            urgent_types: Alert types that flush the buffer immediately
+        """
+        self.window = window
+        self.max_lots = max_lots
+        self.urgent_types = urgent_types
+        self._buffers: Dict[str, _Buffer] = {}
+        self._buffered: Set[Tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self._buffered)
+
+    def add(self, delivery: Delivery, now: Optional[float] = None) -> None:
+        """Buffer a delivery (already buffered deliveries are ignored)."""
+        if (delivery.key, delivery.chat_id) in self._buffered:
+            return
+        self._buffered.add((delivery.key, delivery.chat_id))
+
+        buffer = self._buffers.get(delivery.chat_id)
+        if buffer is None:
+            buffer = _Buffer(opened_at=now if now is not None else time.time())
+            self._buffers[delivery.chat_id] = buffer
+        buffer.lots.setdefault(delivery.alert.lot_id, []).append(delivery)
+        if delivery.alert.alert_type in self.urgent_types:
+            buffer.urgent = True
+
+    def due(self, now: Optional[float] = None) -> List[Batch]:
+        """
+        Take the batches that must be sent now.
+
+        A recipient's buffer is due when it holds an urgent alert, when its
+        oldest alert has waited for the window, or when it is full.
+        """
+        now = now if now is not None else time.time()
+        ready = [
+            chat_id
+            for chat_id, buffer in self._buffers.items()
+            if buffer.urgent
+            or now - buffer.opened_at >= self.window
+            or len(buffer.lots) >= self.max_lots
+        ]
+        return [batch for chat_id in ready for batch in self._take(chat_id)]
+
+    def flush_all(self) -> List[Batch]:
+        """Take every buffered batch regardless of the window."""
+        return [batch for chat_id in list(self._buffers) for batch in self._take(chat_id)]
+
+    def _take(self, chat_id: str) -> List[Batch]:
+        """Remove a recipient's buffer and turn it into messages."""
+        buffer = self._buffers.pop(chat_id)
+        entries = [self._merge(deliveries) for deliveries in buffer.lots.values()]
+        for deliveries in buffer.lots.values():
+            for delivery in deliveries:
+                self._buffered.discard((delivery.key, delivery.chat_id))
+
+        batches = []
+        for start in range(0, len(entries), self.max_lots):
+            chunk = entries[start : start + self.max_lots]
+            if len(chunk) == 1:
+                item, alert_type, deliveries = chunk[0]
+                message = format_alert_message(item, alert_type)
+            else:
+                message = format_digest_message(
+                    [(item, alert_type) for item, alert_type, _ in chunk]
+                )
+            acknowledged = [delivery for _, _, deliveries in chunk for delivery in deliveries]
+            batches.append(Batch(chat_id=chat_id, message=message, deliveries=acknowledged))
+        return batches
+
+    @staticmethod
+    def _merge(deliveries: List[Delivery]) -> Tuple[WatchItem, str, List[Delivery]]:
+        """Collapse the alerts of one lot into its latest state and strongest type."""
+        latest = max(deliveries, key=lambda d: d.alert.item.pull_time)
+        alert_type = max(
+            (d.alert.alert_type for d in deliveries), key=lambda t: _TYPE_PRIORITY.get(t, 0)
+        )
+        return latest.alert.item, alert_type, deliveries
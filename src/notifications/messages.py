@@ -0,0 +1,85 @@
+"""
+Formatting of deal alert messages.
+"""
+
+from typing import Dict, List, Tuple
+
+from src.storage.models import DealAlert, WatchItem
+from src.utils.time_utils import get_difference_with_pull_time
+
+ALERT_HEADERS: Dict[str, str] = {
+    "new": "NEW OFFER FOUND",
+    "updated": "OFFER UPDATED",
+    "closing": "OFFER CLOSING SOON",
+}
+
+# Item fields left out of messages
+HIDDEN_FIELDS = ("pull_time", "item_id", "timings")
+
+
+def format_remaining_time(seconds: float) -> str:
+    """
+    Format remaining seconds as minutes and seconds (e.g. '12m 5s').
+
+    Args:
+        seconds: Remaining time in seconds
+
+    Returns:
+        Formatted string
+    """
+    return f"{int(seconds // 60)}m {int(seconds % 60)}s"
+
+
+def format_alert_message(item: WatchItem, alert_type: str) -> str:
+    """
+    Build the text of a deal alert.
+
+    The remaining time is recomputed from the pull time so the message
+    reflects when it was built, not when the item was scraped.
+
+    Args:
+        item: Alerted watch item
+        alert_type: Type of alert (new, updated, closing)
+
+    Returns:
+        Message text
+    """
+    remaining_time = get_difference_with_pull_time(item.pull_time, item.time)
+    message = f"{ALERT_HEADERS.get(alert_type, alert_type.upper())}:\n\n"
+    for key, value in item.to_dict().items():
+        if key in HIDDEN_FIELDS:
+            continue
+        if key == "time":
+            value = format_remaining_time(remaining_time)
+        message += f"{key} : {value}\n"
+    return message
+
+
+def format_digest_message(entries: List[Tuple[WatchItem, str]]) -> str:
+    """
+    Build one message summarizing several alerts.
+
+    Args:
+        entries: (item, alert_type) pairs, one per lot
+
+    Returns:
+        Message text
+    """
+    message = f"DEAL DIGEST ({len(entries)} lots):\n"
+    for item, alert_type in entries:
+        remaining_time = get_difference_with_pull_time(item.pull_time, item.time)
+        message += (
+            f"\n[{ALERT_HEADERS.get(alert_type, alert_type.upper())}] {item.title}\n"
+            f"price : {item.price} (estimate {item.estimated_price})\n"
+            f"time : {format_remaining_time(remaining_time)}\n"
+            f"reserve_price : {item.reserve_price}\n"
+            f"url : {item.url}\n"
+        )
+    return message
+
+
+def build_alert(item: WatchItem, alert_type: str) -> DealAlert:
+    """Create a DealAlert with its formatted message."""
+    return DealAlert(
+        item=item, alert_type=alert_type, message=format_alert_message(item, alert_type)
+    )
@@ -0,0 +1,230 @@
+"""
+Local stand-in for the Telegram Bot API.
+
+Implements just enough of the Bot API (getMe, sendMessage) for
+python-telegram-bot to talk to it, plus a plain webhook endpoint. Latency,
+errors and flood control can be injected to load-test alerting offline.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+
+@dataclass
+class ReceivedMessage:
+    """
+    A message accepted by the mock server.
+
+    Attributes:
+        chat_id: Recipient
+        text: Message text
+        received_at: Unix timestamp of receipt
+    """
+
+    chat_id: str
+    text: str
+    received_at: float
+
+
+class MockTelegramServer:
+    """
+    Threaded HTTP server mimicking the Telegram Bot API.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        flood_rate: float = 0.0,
+        retry_after: int = 1,
+    ):
+        """
+        Initialize mock server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds added to every response
+            error_rate: Fraction of sendMessage calls answered with HTTP 500
+            flood_rate: Fraction of sendMessage calls answered with 429 (flood control)
+            retry_after: retry_after value of flood-control responses
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.flood_rate = flood_rate
+        self.retry_after = retry_after
+        self.messages: List[ReceivedMessage] = []
+        self._lock = threading.Lock()
+        self._message_id = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def bot_api_url(self) -> str:
+        """Value for TelegramNotifier(base_url=...) / TELEGRAM_API_URL."""
+        return f"{self.url}/bot"
+
+    @property
+    def webhook_url(self) -> str:
+        """Value for WebhookNotifier(url=...) / NOTIFIER_WEBHOOK_URL."""
+        return f"{self.url}/webhook"
+
+    def start(self) -> "MockTelegramServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-telegram", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockTelegramServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def _record(self, chat_id: str, text: str) -> Dict[str, Any]:
+        """Store a message and build its Bot API representation."""
+        now = time.time()
+        with self._lock:
+            self._message_id += 1
+            self.messages.append(ReceivedMessage(chat_id, text, now))
+            message_id = self._message_id
+        return {
+            "message_id": message_id,
+            "date": int(now),
+            "chat": {"id": int(chat_id) if chat_id.lstrip("-").isdigit() else 0, "type": "private"},
+            "text": text,
+        }
+
+    def _handler_class(self):
+        """Build the request handler bound to this server."""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive, so clients can reuse pooled connections, and no Nagle
+            # delay between the header and body writes
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                if mock.latency:
+                    time.sleep(mock.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                params = self._parse(self.rfile.read(length))
+                method = self.path.rstrip("/").rsplit("/", 1)[-1]
+
+                if self.path.startswith("/webhook"):
+                    mock._record(str(params.get("chat_id", "")), str(params.get("text", "")))
+                    return self._reply(200, {"ok": True})
+                if method == "getMe":
+                    return self._reply(200, {"ok": True, "result": _BOT_USER})
+                if method == "sendMessage":
+                    roll = random.random()
+                    if roll < mock.flood_rate:
+                        return self._reply(
+                            429,
+                            {
+                                "ok": False,
+                                "error_code": 429,
+                                "description": "Too Many Requests",
+                                "parameters": {"retry_after": mock.retry_after},
+                            },
+                        )
+                    if roll < mock.flood_rate + mock.error_rate:
+                        return self._reply(
+                            500, {"ok": False, "error_code": 500, "description": "Injected error"}
+                        )
+                    result = mock._record(
+                        str(params.get("chat_id", "")), str(params.get("text", ""))
+                    )
+                    return self._reply(200, {"ok": True, "result": result})
+                return self._reply(
+                    404, {"ok": False, "error_code": 404, "description": "Not Found"}
+                )
+
+            def _parse(self, body: bytes) -> Dict[str, Any]:
+                content_type = self.headers.get("Content-Type", "")
+                if "json" in content_type:
+                    return json.loads(body or b"{}")
+                # python-telegram-bot posts form fields holding JSON-encoded values
+                params = {}
+                for key, values in parse_qs(body.decode("utf-8")).items():
+                    try:
+                        params[key] = json.loads(values[0])
+                    except json.JSONDecodeError:
+                        params[key] = values[0]
+                return params
+
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+_BOT_USER = {
+    "id": 1,
+    "is_bot": True,
+    "first_name": "Mock",
+    "username": "mock_catawiki_bot",
+    "can_join_groups": False,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": False,
+}
+
+
+def main() -> None:
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local mock of the Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockTelegramServer(
+        args.host, args.port, args.latency, args.error_rate, args.flood_rate
+    ).start()
+    print(f"Mock Telegram API on {server.bot_api_url} (webhook: {server.webhook_url})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
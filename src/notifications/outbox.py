@@ -0,0 +1,417 @@
+"""
+Durable notification outbox.
+
+Alerts are written to a SQLite outbox with an idempotency key before any
+network call. A dispatcher delivers them in the background, one delivery
+row per recipient, retrying with exponential backoff. Restarts neither
+duplicate alerts (keys are unique) nor drop them (pending rows survive).
+An alert stores its lot's closing time: deliveries still pending once the
+auction has ended are expired instead of sent.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.config.settings import (
+    OUTBOX_DB_FILE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_BASE_DELAY,
+    OUTBOX_RETRY_MAX_DELAY,
+    TELEGRAM_CHAT_IDS,
+)
+from src.metrics.instruments import ALERTS_SENT
+from src.metrics.latency import LatencyTracker, mark_stage
+from src.metrics.profiling import span
+from src.storage.models import DealAlert
+from src.utils.logger import logger
+from src.utils.time_utils import get_total_seconds
+
+# Delivery states
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+EXPIRED = "expired"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    key TEXT PRIMARY KEY,
+    lot_id TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    ends_at REAL
+);
+CREATE INDEX IF NOT EXISTS alerts_lot ON alerts (lot_id, created_at);
+CREATE TABLE IF NOT EXISTS deliveries (
+    key TEXT NOT NULL REFERENCES alerts (key),
+    chat_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    delivered_at REAL,
+    PRIMARY KEY (key, chat_id)
+);
+CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (status, next_attempt_at);
+"""
+
+
+@dataclass
+class Delivery:
+    """
+    One pending delivery of an alert to a recipient.
+
+    Attributes:
+        key: Idempotency key of the alert
+        chat_id: Recipient
+        alert: The alert to deliver
+        attempts: Attempts made so far
+    """
+
+    key: str
+    chat_id: str
+    alert: DealAlert
+    attempts: int
+
+
+class NotificationOutbox:
+    """
+    SQLite-backed outbox of deal alerts.
+    """
+
+    def __init__(
+        self,
+        db_path: str = OUTBOX_DB_FILE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        base_delay: float = OUTBOX_RETRY_BASE_DELAY,
+        max_delay: float = OUTBOX_RETRY_MAX_DELAY,
+    ):
+        """
+        Initialize outbox.
+
+        Args:
+            db_path: SQLite database file
+            max_attempts: Attempts per recipient before giving up
+            base_delay: First retry delay in seconds (doubled each attempt)
+            max_delay: Upper bound of the retry delay
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # outboxes created before alerts had a closing time
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(alerts)")}
+        if "ends_at" not in columns:
+            self._conn.execute("ALTER TABLE alerts ADD COLUMN ends_at REAL")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, alert: DealAlert, chat_ids: Optional[List[str]] = None) -> bool:
+        """
+        Store an alert for delivery.
+
+        Args:
+            alert: Alert to deliver
+            chat_ids: Recipients (uses configured default if None)
+
+        Returns:
+            True if stored, False if an alert with the same key already exists
+        """
+        key = alert.idempotency_key
+        now = time.time()
+        mark_stage(alert.item.timings, "queued", now)
+        recipients = [c for c in (chat_ids or TELEGRAM_CHAT_IDS) if c]
+        item = alert.item
+        ends_at = item.pull_time + get_total_seconds(item.time) if item.is_valid_time else None
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO alerts "
+                    "(key, lot_id, alert_type, payload, created_at, ends_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        alert.lot_id,
+                        alert.alert_type,
+                        json.dumps(alert.to_dict()),
+                        now,
+                        ends_at,
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    return False
+                self._conn.executemany(
+                    "INSERT INTO deliveries (key, chat_id, status, next_attempt_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, chat_id, PENDING, now) for chat_id in recipients],
+                )
+        logger.debug(f"Queued alert {key} for {len(recipients)} recipient(s)")
+        return True
+
+    def has_alert(self, lot_id: str, alert_type: str) -> bool:
+        """Check whether an alert of a given type was queued for a lot."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM alerts WHERE lot_id = ? AND alert_type = ? LIMIT 1",
+                (lot_id, alert_type),
+            ).fetchone()
+        return row is not None
+
+    def latest_alert(self, lot_id: str) -> Optional[DealAlert]:
+        """Get the most recent alert queued for a lot."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM alerts WHERE lot_id = ? ORDER BY created_at DESC LIMIT 1",
+                (lot_id,),
+            ).fetchone()
+        return DealAlert.from_dict(json.loads(row[0])) if row else None
+
+    def latest_alerts(self) -> List[DealAlert]:
+        """Get the most recent alert of every lot."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM alerts a WHERE created_at = "
+                "(SELECT MAX(created_at) FROM alerts b WHERE b.lot_id = a.lot_id)"
+            ).fetchall()
+        return [DealAlert.from_dict(json.loads(row[0])) for row in rows]
+
+    def claim_due(self, limit: int = 100, lease: float = 60.0) -> List[Delivery]:
+        """
+        Claim deliveries whose next attempt is due.
+
+        Claimed rows are pushed back by the lease, so a crash during sending
+        makes them due again instead of losing them. Pending deliveries of
+        alerts whose lot has closed are marked expired and not returned.
+
+        Args:
+            limit: Maximum number of deliveries returned
+            lease: Seconds before an unacknowledged claim becomes due again
+
+        Returns:
+            Claimed deliveries, oldest first
+        """
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                expired = self._conn.execute(
+                    "UPDATE deliveries SET status = ? WHERE status = ? AND key IN "
+                    "(SELECT key FROM alerts WHERE ends_at < ?)",
+                    (EXPIRED, PENDING, now),
+                ).rowcount
+                rows = self._conn.execute(
+                    "SELECT d.key, d.chat_id, d.attempts, a.payload FROM deliveries d "
+                    "JOIN alerts a ON a.key = d.key "
+                    "WHERE d.status = ? AND d.next_attempt_at <= ? "
+                    "ORDER BY d.next_attempt_at LIMIT ?",
+                    (PENDING, now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE deliveries SET next_attempt_at = ? WHERE key = ? AND chat_id = ?",
+                    [(now + lease, key, chat_id) for key, chat_id, _, _ in rows],
+                )
+        if expired:
+            ALERTS_SENT.labels("expired").inc(expired)
+            logger.warning(f"{expired} alert delivery(ies) expired, their lots have closed")
+        return [
+            Delivery(key, chat_id, DealAlert.from_dict(json.loads(payload)), attempts)
+            for key, chat_id, attempts, payload in rows
+        ]
+
+    def mark_delivered(self, key: str, chat_id: str) -> None:
+        """Record a successful delivery."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE deliveries SET status = ?, attempts = attempts + 1, delivered_at = ?, "
+                "last_error = NULL WHERE key = ? AND chat_id = ?",
+                (DELIVERED, time.time(), key, chat_id),
+            )
+
+    def mark_failed(self, key: str, chat_id: str, error: str = "") -> None:
+        """
+        Record a failed attempt and schedule the next one.
+
+        Gives up (status 'failed') once max_attempts is reached.
+        """
+        with self._lock:
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT attempts FROM deliveries WHERE key = ? AND chat_id = ?",
+                    (key, chat_id),
+                ).fetchone()
+                if row is None:
+                    return
+                attempts = row[0] + 1
+                status = FAILED if attempts >= self.max_attempts else PENDING
+                delay = min(self.base_delay * 2 ** (attempts - 1), self.max_delay)
+                delay *= random.uniform(0.8, 1.2)
+                self._conn.execute(
+                    "UPDATE deliveries SET status = ?, attempts = ?, next_attempt_at = ?, "
+                    "last_error = ? WHERE key = ? AND chat_id = ?",
+                    (status, attempts, time.time() + delay, error, key, chat_id),
+                )
+        if status == FAILED:
+            logger.error(f"Alert {key} to {chat_id} failed after {attempts} attempts: {error}")
+        else:
+            logger.warning(f"Alert {key} to {chat_id} failed, retrying in {delay:.0f}s")
+
+    def counts(self) -> Dict[str, int]:
+        """Number of deliveries per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM deliveries GROUP BY status"
+            ).fetchall()
+        counts = {PENDING: 0, DELIVERED: 0, FAILED: 0, EXPIRED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def delivery_latencies(self) -> List[float]:
+        """Seconds between enqueue and delivery of every delivered row."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.delivered_at - a.created_at FROM deliveries d "
+                "JOIN alerts a ON a.key = d.key WHERE d.status = ?",
+                (DELIVERED,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def prune(self, older_than: float = 7 * 86400) -> int:
+        """
+        Delete alerts whose deliveries are all finished and older than a cutoff.
+
+        Returns:
+            Number of alerts removed
+        """
+        cutoff = time.time() - older_than
+        with self._lock:
+            with self._conn:
+                keys = [
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT key FROM alerts WHERE created_at < ? AND key NOT IN "
+                        "(SELECT key FROM deliveries WHERE status = ?)",
+                        (cutoff, PENDING),
+                    ).fetchall()
+                ]
+                self._conn.executemany("DELETE FROM deliveries WHERE key = ?", [(k,) for k in keys])
+                self._conn.executemany("DELETE FROM alerts WHERE key = ?", [(k,) for k in keys])
+        return len(keys)
+
+
+class OutboxDispatcher:
+    """
+    Delivers outbox entries through a notifier in the background.
+
+    With a coalescer, claimed deliveries are buffered per recipient and sent
+    as merged messages instead of one message per alert.
+    """
+
+    def __init__(
+        self,
+        outbox: NotificationOutbox,
+        notifier,
+        poll_interval: float = 0.5,
+        batch_size: int = 100,
+        lease: float = 60.0,
+        coalescer=None,
+        latency: Optional[LatencyTracker] = None,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            outbox: Outbox to drain
+            notifier: Notifier backend used for delivery
+            poll_interval: Seconds between polls when idle
+            batch_size: Maximum deliveries claimed per poll
+            lease: Seconds before an unacknowledged delivery is retried
+            coalescer: Optional AlertCoalescer batching alerts per recipient
+            latency: Optional tracker recording stage latencies of delivered alerts
+        """
+        self.outbox = outbox
+        self.notifier = notifier
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.coalescer = coalescer
+        self.latency = latency
+        # Buffered deliveries must not be re-claimed while they wait
+        self.lease = max(lease, 2 * coalescer.window) if coalescer else lease
+        self._stopping = False
+
+    async def run(self) -> None:
+        """Deliver due entries until stop() is called."""
+        logger.info("Outbox dispatcher started")
+        while not self._stopping:
+            delivered = await self.dispatch_once()
+            if not delivered:
+                await asyncio.sleep(self.poll_interval)
+        if self.coalescer is not None:
+            await asyncio.gather(
+                *(
+                    self._send(batch.message, batch.chat_id, batch.deliveries)
+                    for batch in self.coalescer.flush_all()
+                )
+            )
+        logger.info("Outbox dispatcher stopped")
+
+    def stop(self) -> None:
+        """Ask the dispatcher loop to exit after the current batch."""
+        self._stopping = True
+
+    async def dispatch_once(self) -> int:
+        """
+        Claim due entries and deliver them (or their due batches) concurrently.
+
+        Returns:
+            Number of deliveries claimed
+        """
+        deliveries = self.outbox.claim_due(self.batch_size, self.lease)
+        if self.coalescer is None:
+            sends = [
+                self._send(delivery.alert.message, delivery.chat_id, [delivery])
+                for delivery in deliveries
+            ]
+        else:
+            for delivery in deliveries:
+                self.coalescer.add(delivery)
+            sends = [
+                self._send(batch.message, batch.chat_id, batch.deliveries)
+                for batch in self.coalescer.due()
+            ]
+        if sends:
+            await asyncio.gather(*sends)
+        return len(deliveries)
+
+    async def _send(self, message: str, chat_id: str, deliveries: List[Delivery]) -> None:
+        """Send one message and record the outcome of the deliveries it covers."""
+        try:
+            with span("notify"):
+                results = await self.notifier.send(message, [chat_id])
+            ok = results.get(chat_id, False)
+            error = "" if ok else "not delivered"
+        except Exception as e:
+            ok, error = False, str(e)
+
+        delivered_at = time.time()
+        ALERTS_SENT.labels("delivered" if ok else "failed").inc(len(deliveries))
+        for delivery in deliveries:
+            if ok:
+                self.outbox.mark_delivered(delivery.key, delivery.chat_id)
+                if self.latency is not None:
+                    mark_stage(delivery.alert.item.timings, "delivered", delivered_at)
+                    self.latency.record(delivery.alert.item.timings)
+            else:
+                self.outbox.mark_failed(delivery.key, delivery.chat_id, error)
@@ -4,29 +4,252 @@ Telegram notification client for sending auction alerts.
 
 from sys import argv
 import asyncio
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
 from telegram import Bot
+from telegram.error import Forbidden, BadRequest, RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
 
-from src.config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_IDS
+from src.config.settings import (
+    TELEGRAM_API_URL,
+    TELEGRAM_BOT_TOKEN,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_PER_CHAT_RATE,
+    TELEGRAM_SEND_CONCURRENCY,
+    TELEGRAM_MAX_RETRIES,
+    validate_telegram_config,
+)
+from src.notifications.base import Notifier
+from src.utils.logger import logger
+
+
+class RateLimiter:
+    """
+    Async token bucket (waiters are served in FIFO order).
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (maximum burst size)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float) -> None:
+        """Block the bucket for a given time (e.g. after a flood-control error)."""
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class TelegramNotifier(Notifier):
+    """
+    Long-lived Telegram client with concurrent fan-out.
+
+    A single bot session (with a pooled HTTP connection) is reused for every
+    message. Each recipient has its own queue and sender task, so chats are
+    served in parallel while messages to one chat keep their order. Sends
+    respect both the global and the per-chat Telegram rate limits.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        chat_ids: Optional[List[str]] = None,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        per_chat_rate: float = TELEGRAM_PER_CHAT_RATE,
+        concurrency: int = TELEGRAM_SEND_CONCURRENCY,
+        max_retries: int = TELEGRAM_MAX_RETRIES,
+        base_url: Optional[str] = None,
+        bot: Optional[Bot] = None,
+    ):
+        """
+        Initialize notifier.
+
+        Args:
+            token: Bot token (uses config default if None)
+            chat_ids: Default recipients (uses config default if None)
+            global_rate: Maximum messages per second across all chats
+            per_chat_rate: Maximum messages per second to a single chat
+            concurrency: Maximum number of requests in flight
+            max_retries: Attempts per message under flood control (other errors fail at once)
+            base_url: Bot API endpoint (e.g. a local mock server)
+            bot: Pre-built Bot instance (mainly for tests)
+        """
+        if bot is None and token is None:
+            validate_telegram_config()
+        super().__init__(chat_ids)
+        self.global_rate = global_rate
+        self.per_chat_rate = per_chat_rate
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._bot = bot or Bot(
+            token=token or TELEGRAM_BOT_TOKEN,
+            base_url=base_url or TELEGRAM_API_URL,
+            request=HTTPXRequest(connection_pool_size=concurrency),
+        )
+        self._started = False
+        self._global_limiter: Optional[RateLimiter] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._chats: Dict[str, Tuple[asyncio.Queue, RateLimiter, asyncio.Task]] = {}
+
+    async def start(self) -> None:
+        """Open the bot session."""
+        if self._started:
+            return
+        await self._bot.initialize()
+        self._global_limiter = RateLimiter(self.global_rate, burst=self.global_rate)
+        self._in_flight = asyncio.Semaphore(self.concurrency)
+        self._started = True
+        logger.info("Telegram notifier started")
+
+    async def close(self) -> None:
+        """Wait for queued messages, stop the senders and close the session."""
+        if not self._started:
+            return
+        for queue, _, _ in self._chats.values():
+            await queue.join()
+        for _, _, task in self._chats.values():
+            task.cancel()
+        await asyncio.gather(*(task for _, _, task in self._chats.values()), return_exceptions=True)
+        self._chats = {}
+        self._started = False
+        await self._bot.shutdown()
+        logger.debug("Telegram notifier closed")
+
+    @property
+    def queue_size(self) -> int:
+        """Number of messages waiting to be sent, across all chats."""
+        return sum(queue.qsize() for queue, _, _ in self._chats.values())
+
+    async def send(self, message: str, chat_ids: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Send a message to all recipients concurrently.
+
+        Args:
+            message: The message text to send
+            chat_ids: Optional list of chat IDs. If None, uses configured default.
+
+        Returns:
+            Mapping of chat ID to delivery success
+        """
+        if not self._started:
+            await self.start()
+
+        loop = asyncio.get_running_loop()
+        pending: List[Tuple[str, asyncio.Future]] = []
+        for chat_id in chat_ids or self.chat_ids:
+            future = loop.create_future()
+            self._chat_queue(chat_id).put_nowait((message, future))
+            pending.append((chat_id, future))
+
+        results = await asyncio.gather(*(future for _, future in pending))
+        return {chat_id: ok for (chat_id, _), ok in zip(pending, results)}
+
+    async def _send_one(self, chat_id: str, message: str) -> bool:
+        """Deliver one message to one chat through its queue."""
+        results = await self.send(message, [chat_id])
+        return results[chat_id]
+
+    def _chat_queue(self, chat_id: str) -> asyncio.Queue:
+        """Get the queue of a chat, starting its sender on first use."""
+        if chat_id not in self._chats:
+            queue: asyncio.Queue = asyncio.Queue()
+            limiter = RateLimiter(self.per_chat_rate, burst=1.0)
+            task = asyncio.create_task(
+                self._chat_sender(chat_id, queue, limiter), name=f"telegram-{chat_id}"
+            )
+            self._chats[chat_id] = (queue, limiter, task)
+        return self._chats[chat_id][0]
+
+    async def _chat_sender(self, chat_id: str, queue: asyncio.Queue, limiter: RateLimiter) -> None:
+        """Deliver the messages queued for one chat, in order."""
+        while True:
+            message, future = await queue.get()
+            try:
+                ok = await self._deliver(chat_id, message, limiter)
+                if not future.done():
+                    future.set_result(ok)
+            except Exception as e:
+                logger.error(f"Unexpected error sending to {chat_id}: {e}")
+                if not future.done():
+                    future.set_result(False)
+            finally:
+                queue.task_done()
+
+    async def _deliver(self, chat_id: str, message: str, chat_limiter: RateLimiter) -> bool:
+        """
+        Send one message to one chat, retrying only under flood control.
+
+        Returns:
+            True if the message was delivered
+        """
+        attempt = 0
+        while attempt < self.max_retries:
+            await chat_limiter.acquire()
+            await self._global_limiter.acquire()
+            try:
+                async with self._in_flight:
+                    await self._bot.send_message(chat_id=chat_id, text=message)
+                logger.debug(f"Message sent to {chat_id}")
+                return True
+            except RetryAfter as e:
+                # Flood control: hold back this chat and everyone else; counts as an attempt,
+                # so a chat that stays flood-limited does not hold its queue forever
+                attempt += 1
+                logger.warning(
+                    f"Rate limited by Telegram (attempt {attempt}), retrying in {e.retry_after}s"
+                )
+                chat_limiter.penalize(e.retry_after)
+                self._global_limiter.penalize(e.retry_after)
+            except (Forbidden, BadRequest) as e:
+                logger.error(f"Failed to send message to {chat_id}: {e}")
+                return False
+            except TelegramError as e:
+                # Fail fast: backing off here would stall every later message for this chat
+                # behind the sleep; the outbox retries the delivery on its own schedule
+                logger.warning(f"Send to {chat_id} failed: {e}")
+                return False
+
+        logger.error(f"Giving up on message to {chat_id} after {self.max_retries} attempts")
+        return False
 
 
 async def send_telegram_message(message: str, chat_ids: List[str] = None) -> None:
     """
     Send a message to one or more Telegram chats.
 
+    One-shot helper; long-running processes should keep a TelegramNotifier.
+
     Args:
         message: The message text to send
         chat_ids: Optional list of chat IDs. If None, uses configured default.
     """
-    bot = Bot(token=TELEGRAM_BOT_TOKEN)
-    recipients = chat_ids or TELEGRAM_CHAT_IDS
+    async with TelegramNotifier(chat_ids=chat_ids) as notifier:
+        results = await notifier.send(message)
 
-    for chat_id in recipients:
-        try:
-            await bot.send_message(chat_id=chat_id, text=message)
+    for chat_id, ok in results.items():
+        if ok:
             print(f"Message sent to {chat_id}")
-        except Exception as e:
-            print(f"Failed to send message to {chat_id}: {e}")
+        else:
+            print(f"Failed to send message to {chat_id}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,305 @@
+"""
+Bid status captured from the lot page's own API responses.
+
+An open lot page keeps its bid, reserve and end time up to date with
+background XHR/fetch calls. With Chrome's performance log enabled
+(BrowserManager(capture_network=True)), BidCapture reads those calls from
+the log, fetches the bodies of the responses matching BID_CAPTURE_URLS
+through DevTools (Network.getResponseBody) and turns their JSON into
+BidStatus updates, so a pinned lot tab reports bid changes without a
+reload:
+
+    pinned = PinnedLots(browser.get_driver())
+    pinned.pin(url)
+    for status in pinned.poll():   # call every BID_CAPTURE_POLL seconds
+        item = status.apply(item)
+
+The payload format is not documented; parse_bid_payload() looks for the
+usual field names anywhere in the JSON and ignores what it does not know.
+"""
+
+import base64
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from src.analyzer.dedup import lot_id_from_url
+from src.config.settings import BID_CAPTURE_URLS
+from src.metrics.instruments import BID_UPDATES
+from src.scraper.blocking import pattern_matches
+from src.utils.logger import logger
+from src.utils.time_utils import get_time_var_from_seconds
+
+# Field names tried, in order, in a lot's JSON object
+ID_KEYS = ("lot_id", "id")
+AMOUNT_KEYS = ("current_bid_amount", "highest_bid_amount", "bid_amount", "current_bid", "amount")
+RESERVE_KEYS = ("reserve_price_met", "is_reserve_price_met", "reserve_met")
+END_KEYS = ("bidding_end_time", "bidding_end_at", "end_time", "closes_at", "close_at")
+CURRENCY = "EUR"
+
+_RESOURCE_TYPES = ("XHR", "Fetch")
+
+
+@dataclass
+class BidStatus:
+    """
+    Bid state of a lot read from an API response.
+
+    Attributes:
+        lot_id: Catawiki lot ID
+        amount: Current bid in euros (None if the payload had none)
+        reserve_met: Whether the reserve price is reached (None if unknown)
+        end_time: Closing time as a Unix timestamp (None if unknown)
+        received_at: Time the response was read
+    """
+
+    lot_id: str
+    amount: Optional[float]
+    reserve_met: Optional[bool]
+    end_time: Optional[float]
+    received_at: float
+
+    def key(self) -> tuple:
+        """The fields compared to detect a change."""
+        return (self.amount, self.reserve_met, self.end_time)
+
+    def apply(self, item: Dict) -> Dict:
+        """
+        A copy of a scraped item updated with this status.
+
+        Fields the payload did not carry keep their scraped values.
+        """
+        item = dict(item, timings=dict(item.get("timings") or {}))
+        if self.amount is not None:
+            # grouped like the page shows it, e.g. "5 600 €"
+            item["price"] = f"{self.amount:,.0f} €".replace(",", " ")
+        if self.reserve_met is not None and item.get("reserve_price") != "No reserve price":
+            item["reserve_price"] = (
+                "Reserve price reached" if self.reserve_met else "Reserve price not reached"
+            )
+        if self.end_time is not None:
+            remaining = self.end_time - self.received_at
+            item["time"] = get_time_var_from_seconds(remaining) if remaining >= 1 else "0s"
+        item["pull_time"] = self.received_at
+        item["timings"].update(fetched=self.received_at, parsed=self.received_at)
+        return item
+
+
+def _first(data: Dict, keys: Iterable[str]) -> Any:
+    """Value of the first key present in a dictionary."""
+    for key in keys:
+        if key in data:
+            return data[key]
+    return None
+
+
+def _amount(value: Any) -> Optional[float]:
+    """A bid amount given as a number, {"EUR": 120} or {"amount": 120}."""
+    if isinstance(value, dict):
+        value = value.get(CURRENCY, value.get("amount", value.get("value")))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace("€", "").replace("\xa0", "").replace(" ", ""))
+        except ValueError:
+            return None
+    return None
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """A time given as epoch seconds or milliseconds, or as an ISO 8601 string."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000 if value > 1e12 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_bid_payload(payload: Any, received_at: Optional[float] = None) -> List[BidStatus]:
+    """
+    Bid statuses of every lot found in a JSON payload.
+
+    A lot is any object with an ID and a bid amount field, at any depth.
+    """
+    received_at = received_at if received_at is not None else time.time()
+    statuses = []
+    pending = [payload]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        lot_id = _first(node, ID_KEYS)
+        amount = _amount(_first(node, AMOUNT_KEYS))
+        if lot_id is not None and amount is not None:
+            reserve = _first(node, RESERVE_KEYS)
+            statuses.append(
+                BidStatus(
+                    lot_id=str(lot_id),
+                    amount=amount,
+                    reserve_met=reserve if isinstance(reserve, bool) else None,
+                    end_time=_timestamp(_first(node, END_KEYS)),
+                    received_at=received_at,
+                )
+            )
+        pending.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return statuses
+
+
+class BidCapture:
+    """
+    Reads bid statuses from the API responses in a driver's performance log.
+    """
+
+    def __init__(self, driver, patterns: Optional[Iterable[str]] = None):
+        """
+        Initialize capture.
+
+        Args:
+            driver: Chrome driver launched with the performance log enabled
+            patterns: URL patterns of the bid API calls (BID_CAPTURE_URLS if None)
+        """
+        self.driver = driver
+        if patterns is None:
+            patterns = [part.strip() for part in BID_CAPTURE_URLS.split(",") if part.strip()]
+        self.patterns = list(patterns)
+        # request ID -> tab (DevTools target) of the matching responses not finished yet
+        self._pending: Dict[str, Optional[str]] = {}
+
+    def _matches(self, url: str) -> bool:
+        return any(pattern_matches(pattern, url) for pattern in self.patterns)
+
+    def _body(self, request_id: str, target: Optional[str]) -> Optional[str]:
+        """Body of a finished response, read in the tab that received it."""
+        if target:
+            # Chrome's window handles are its DevTools target IDs
+            handle = next((h for h in self.driver.window_handles if h.endswith(target)), None)
+            if handle is not None and handle != self.driver.current_window_handle:
+                self.driver.switch_to.window(handle)
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException as e:
+            # the body is gone once the page navigated away
+            logger.debug(f"No body for request {request_id}: {e}")
+            return None
+        if body.get("base64Encoded"):
+            return base64.b64decode(body["body"]).decode("utf-8", "replace")
+        return body["body"]
+
+    def poll(self) -> List[BidStatus]:
+        """
+        Bid statuses received since the last poll.
+
+        Returns:
+            Statuses in the order their responses finished
+        """
+        statuses = []
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])
+            except (KeyError, ValueError):
+                continue
+            event = message.get("message", {})
+            method, params = event.get("method"), event.get("params", {})
+            if method == "Network.responseReceived":
+                if params.get("type") in _RESOURCE_TYPES and self._matches(
+                    params.get("response", {}).get("url", "")
+                ):
+                    self._pending[params["requestId"]] = message.get("webview")
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._pending:
+                target = self._pending.pop(params["requestId"])
+                text = self._body(params["requestId"], target)
+                if text is None:
+                    continue
+                try:
+                    payload = json.loads(text)
+                except ValueError:
+                    continue
+                statuses.extend(parse_bid_payload(payload))
+            elif method == "Network.loadingFailed":
+                self._pending.pop(params.get("requestId"), None)
+        return statuses
+
+
+class PinnedLots:
+    """
+    Lot pages kept open in their own tabs, reporting bid changes as they happen.
+    """
+
+    def __init__(self, driver, capture: Optional[BidCapture] = None):
+        """
+        Initialize pinned lots.
+
+        Args:
+            driver: Chrome driver launched with the performance log enabled
+            capture: Reader of the bid API responses (BID_CAPTURE_URLS if None)
+        """
+        self.driver = driver
+        self.capture = capture if capture is not None else BidCapture(driver)
+        # lot ID -> (URL, window handle)
+        self._tabs: Dict[str, tuple] = {}
+        self._last: Dict[str, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._tabs)
+
+    def __contains__(self, url: str) -> bool:
+        return (lot_id_from_url(url) or url) in self._tabs
+
+    def urls(self) -> List[str]:
+        """URLs of the pinned lots."""
+        return [url for url, _ in self._tabs.values()]
+
+    def pin(self, url: str) -> None:
+        """Open a lot in a new tab and keep it open."""
+        lot_id = lot_id_from_url(url) or url
+        if lot_id in self._tabs:
+            return
+        self.driver.switch_to.new_window("tab")
+        self.driver.get(url)
+        self._tabs[lot_id] = (url, self.driver.current_window_handle)
+
+    def unpin(self, url: str) -> None:
+        """Close a pinned lot's tab."""
+        lot_id = lot_id_from_url(url) or url
+        entry = self._tabs.pop(lot_id, None)
+        self._last.pop(lot_id, None)
+        if entry is None:
+            return
+        try:
+            self.driver.switch_to.window(entry[1])
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+        except WebDriverException as e:
+            logger.debug(f"Closing pinned tab failed: {e}")
+
+    def poll(self) -> List[BidStatus]:
+        """
+        Changes of the pinned lots since the last poll.
+
+        Returns:
+            Latest status of every pinned lot whose bid, reserve or end time changed
+        """
+        changed: Dict[str, BidStatus] = {}
+        for status in self.capture.poll():
+            if status.lot_id not in self._tabs or self._last.get(status.lot_id) == status.key():
+                continue
+            self._last[status.lot_id] = status.key()
+            changed[status.lot_id] = status
+        if changed:
+            BID_UPDATES.inc(len(changed))
+        return list(changed.values())
+
+    def url_of(self, status: BidStatus) -> str:
+        """URL of a pinned lot."""
+        return self._tabs[status.lot_id][0]
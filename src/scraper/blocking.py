@@ -0,0 +1,130 @@
+"""
+Network-level request blocking for the scraper's browsers.
+
+Lot pages pull in fonts, videos, analytics and ad scripts the extraction
+never reads. RequestBlocker hands Chrome a list of DevTools URL patterns
+(Network.setBlockedURLs), built from resource types and explicit patterns:
+
+    BROWSER_BLOCK_RESOURCES  resource types, mapped to file-extension patterns
+    BROWSER_BLOCK_URLS       extra URL patterns (analytics and ad hosts by default)
+
+Patterns that would block a request the extraction needs (lot and listing
+documents, Catawiki's scripts and API calls, see REQUIRED_URLS) are dropped
+with a warning, so a too-broad setting cannot break field extraction.
+page_cost() reads what a loaded page transferred, for measuring the savings
+(`python -m src.bench.blocking`).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from src.config.settings import BROWSER_BLOCK_RESOURCES, BROWSER_BLOCK_URLS
+from src.utils.logger import logger
+
+# File extensions of each blockable resource type
+RESOURCE_EXTENSIONS: Dict[str, List[str]] = {
+    "image": ["jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "m3u8", "mp3", "ogg"],
+    "stylesheet": ["css"],
+}
+
+# Requests the extraction needs: no blocking pattern may match them
+REQUIRED_URLS = [
+    "https://www.catawiki.com/fr/l/12345678-omega-seamaster",
+    "https://www.catawiki.com/fr/c/333-montres?page=2",
+    "https://assets.catawiki.com/_next/static/chunks/pages/lot-0a1b2c.js",
+    "https://www.catawiki.com/buyer/api/v3/bidding/lots/12345678",
+]
+
+_PAGE_COST = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const entry of resources) { bytes += entry.transferSize; }
+return {
+    bytes: bytes,
+    ms: nav ? nav.loadEventEnd - nav.startTime : 0,
+    requests: resources.length + 1,
+};
+"""
+
+
+def _split(value: str) -> List[str]:
+    """Items of a comma-separated setting."""
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def pattern_matches(pattern: str, url: str) -> bool:
+    """Whether a DevTools URL pattern ('*' wildcards only) matches a URL."""
+    regex = ".*".join(re.escape(part) for part in pattern.split("*"))
+    return re.fullmatch(regex, url) is not None
+
+
+class RequestBlocker:
+    """
+    Blocks requests by resource type and URL pattern in a Chrome tab.
+    """
+
+    def __init__(
+        self,
+        resources: Optional[Iterable[str]] = None,
+        urls: Optional[Iterable[str]] = None,
+        required: Iterable[str] = REQUIRED_URLS,
+    ):
+        """
+        Initialize blocker.
+
+        Args:
+            resources: Resource types to block (BROWSER_BLOCK_RESOURCES if None)
+            urls: Extra URL patterns to block (BROWSER_BLOCK_URLS if None)
+            required: URLs that must stay reachable
+        """
+        resources = _split(BROWSER_BLOCK_RESOURCES) if resources is None else list(resources)
+        urls = _split(BROWSER_BLOCK_URLS) if urls is None else list(urls)
+        patterns = []
+        for resource in resources:
+            if resource not in RESOURCE_EXTENSIONS:
+                logger.warning(f"Unknown resource type to block: {resource}")
+                continue
+            for extension in RESOURCE_EXTENSIONS[resource]:
+                patterns.extend([f"*.{extension}", f"*.{extension}?*"])
+        patterns.extend(urls)
+        required = list(required)
+        self.patterns: List[str] = []
+        for pattern in dict.fromkeys(patterns):
+            needed = [url for url in required if pattern_matches(pattern, url)]
+            if needed:
+                logger.warning(f"Not blocking {pattern}: extraction needs {needed[0]}")
+            else:
+                self.patterns.append(pattern)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def blocks(self, url: str) -> bool:
+        """Whether a request to a URL is blocked."""
+        return any(pattern_matches(pattern, url) for pattern in self.patterns)
+
+    def apply(self, driver) -> None:
+        """Block the patterns in the driver's current tab (call again for every new tab)."""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+
+    @staticmethod
+    def clear(driver) -> None:
+        """Stop blocking in the driver's current tab."""
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+
+
+def page_cost(driver) -> Dict[str, float]:
+    """
+    What the page loaded in the driver's current tab transferred.
+
+    Cross-origin resources without a Timing-Allow-Origin header report no
+    size, so bytes are a lower bound.
+
+    Returns:
+        Dictionary with bytes, ms (navigation start to load end) and requests
+    """
+    return driver.execute_script(_PAGE_COST)
@@ -1,16 +1,124 @@
 """
 Browser automation manager for web scraping.
+
+A long-lived driver avoids a Chrome launch per lot but grows in memory
+over hundreds of page loads. BrowserManager keeps one driver and replaces
+it once it served BROWSER_MAX_PAGES pages or its process tree (chromedriver
+and every Chrome process) exceeds BROWSER_MAX_RSS_MB. The replacement is
+launched in the background when a limit is near, so the swap itself only
+costs the quit of the old driver, which also happens in the background.
+
+With BROWSER_TABS > 1, fetch_pages() loads lot pages concurrently in that
+many tabs of the one driver (see src/scraper/tabs.py) instead of running a
+browser per concurrent fetch. Such drivers use the "none" page load
+strategy: under "normal", ChromeDriver holds every command to a tab until
+its navigation finished, so the tabs would load one after the other. Their
+driver.get() returns at once, and wait_for_load() waits for the page.
+
+Every tab blocks the requests of a RequestBlocker (fonts, media, analytics
+and ads by default, see src/scraper/blocking.py).
+
+Browsers start on a persistent profile leased from a ProfileStore (see
+src/scraper/profiles.py), so their HTTP cache and cookies carry over from
+the previous browser on the slot. Chrome failing to start on a profile gets
+it emptied and one more try.
 """
 
-from typing import Optional
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List, Optional, Tuple
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import WebDriverException
 
-from src.config.settings import CHROME_BINARY, CHROMEDRIVER_BINARY, HEADLESS_MODE
+from src.config.settings import (
+    BROWSER_MAX_PAGES,
+    BROWSER_MAX_RSS_MB,
+    BROWSER_PROFILE_CACHE_MB,
+    BROWSER_RSS_CHECK_EVERY,
+    BROWSER_TAB_TIMEOUT,
+    BROWSER_TABS,
+    BROWSER_WARM_SPARE,
+    CHROME_BINARY,
+    CHROMEDRIVER_BINARY,
+    HEADLESS_MODE,
+)
+from src.metrics.instruments import (
+    DRIVER_CRASHES,
+    DRIVER_LAUNCHES,
+    DRIVER_RECYCLES,
+    DRIVER_RSS,
+    LOTS_FAILED,
+)
+from src.scraper.blocking import RequestBlocker
+from src.scraper.extraction import lot_fields
+from src.scraper.profiles import ProfileLease, ProfileStore
+from src.scraper.tabs import TabPage, TabPool
 from src.utils.logger import logger
 
+# Fraction of a limit at which the spare driver is launched
+SPARE_AT = 0.9
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of a process and all its descendants, in bytes.
+
+    Pages shared between processes are counted in each of them, as in
+    `ps`; limits should be set against this measure.
+
+    Returns:
+        Total RSS, or None where /proc is not available
+    """
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children: Dict[int, List[int]] = defaultdict(list)
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            data = stat.read_text()
+        except OSError:
+            continue
+        # the command name may contain spaces: fields restart after its closing parenthesis
+        ppid = int(data[data.rfind(")") + 2 :].split()[1])
+        children[ppid].append(int(stat.parent.name))
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            resident = int((proc / str(current) / "statm").read_text().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        total += resident * _PAGE_SIZE
+        pending.extend(children.get(current, ()))
+    return total
+
+
+def wait_for_load(driver, timeout: float = BROWSER_TAB_TIMEOUT) -> None:
+    """
+    Wait for the page after driver.get() on a driver that does not wait itself.
+
+    Only drivers on the "none" page load strategy (those serving tabs) need
+    it; for any other driver this returns at once.
+
+    Raises:
+        TimeoutException: If the page did not load within the timeout
+    """
+    capabilities = getattr(driver, "capabilities", None) or {}
+    if capabilities.get("pageLoadStrategy") != "none":
+        return
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
 
 class BrowserManager:
     """
@@ -22,6 +130,14 @@ class BrowserManager:
         headless: bool = None,
         chrome_binary: Optional[str] = None,
         chromedriver_binary: Optional[str] = None,
+        max_pages: int = BROWSER_MAX_PAGES,
+        max_rss_mb: float = BROWSER_MAX_RSS_MB,
+        rss_check_every: int = BROWSER_RSS_CHECK_EVERY,
+        warm_spare: bool = BROWSER_WARM_SPARE,
+        tabs: int = BROWSER_TABS,
+        blocker: Optional[RequestBlocker] = None,
+        capture_network: bool = False,
+        profiles: Optional[ProfileStore] = None,
     ):
         """
         Initialize browser manager.
@@ -30,15 +146,46 @@ class BrowserManager:
             headless: Run in headless mode (uses config default if None)
             chrome_binary: Path to Chrome/Chromium binary
             chromedriver_binary: Path to ChromeDriver binary
+            max_pages: Pages served by a driver before it is replaced (0 for no limit)
+            max_rss_mb: Memory of a driver's process tree before it is replaced (0 for no limit)
+            rss_check_every: Pages between two memory checks
+            warm_spare: Launch the replacement in the background before a limit is reached
+            tabs: Tabs used by fetch_pages() to load pages concurrently (with more
+                than one, drivers use the "none" page load strategy, see wait_for_load())
+            blocker: Requests blocked in every tab (from BROWSER_BLOCK_* settings if None)
+            capture_network: Enable Chrome's performance log (network events) for
+                BidCapture; the log grows until it is read, so only for pinned lots
+            profiles: Persistent profiles the drivers start on (from BROWSER_PROFILE_*
+                settings if None; an empty ProfileStore("") for temporary profiles)
         """
         self.headless = headless if headless is not None else HEADLESS_MODE
         self.chrome_binary = chrome_binary or CHROME_BINARY
         self.chromedriver_binary = chromedriver_binary or CHROMEDRIVER_BINARY
+        self.max_pages = max_pages
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.rss_check_every = max(1, rss_check_every)
+        self.warm_spare = warm_spare
+        self.tabs = max(1, tabs)
+        self.blocker = blocker if blocker is not None else RequestBlocker()
+        self.capture_network = capture_network
+        self.profiles = profiles if profiles is not None else ProfileStore()
+        # id of a driver -> its profile, released once it quit
+        self._leases: Dict[int, ProfileLease] = {}
         self._driver: Optional[webdriver.Chrome] = None
+        self._pool: Optional[TabPool] = None
+        self.pages = 0
+        self.rss: Optional[int] = None
+        self._rss_checked_at = 0
+        self._spare: Optional[webdriver.Chrome] = None
+        self._spare_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
 
     def get_driver(self) -> webdriver.Chrome:
         """
-        Get or create a Chrome driver instance.
+        Get the driver for the next page, replacing it first if it reached a limit.
+
+        Every call counts as one page served by the driver, so call it once
+        per page and never keep a driver across calls.
 
         Returns:
             Configured Chrome WebDriver
@@ -46,13 +193,170 @@ class BrowserManager:
         Raises:
             WebDriverException: If driver initialization fails
         """
-        if self._driver is None:
-            self._driver = self._create_driver()
-        return self._driver
+        return self._checkout(1)
+
+    def fetch_pages(
+        self, urls: Iterable[str], read: Optional[Callable[[webdriver.Chrome], Any]] = None
+    ) -> Iterator[TabPage]:
+        """
+        Load pages concurrently in the tabs of the current driver.
+
+        Pages are loaded in batches of a few per tab; the driver is only
+        recycled between batches, and each page counts against max_pages.
+
+        Args:
+            urls: Pages to load
+            read: Reads a ready page from the driver (its page_source if None)
+
+        Yields:
+            TabPage per URL, in completion order
+
+        Raises:
+            WebDriverException: If the browser fails (call discard() before retrying)
+        """
+        urls = list(urls)
+        batch = 4 * self.tabs
+        for start in range(0, len(urls), batch):
+            chunk = urls[start : start + batch]
+            driver = self._checkout(len(chunk))
+            if self._pool is None or self._pool.driver is not driver:
+                self._pool = TabPool(driver, size=self.tabs, on_open=self._block)
+            yield from self._pool.fetch(chunk, read)
+
+    def _checkout(self, pages: int) -> webdriver.Chrome:
+        """The driver for the next pages, replaced first if it reached a limit."""
+        with self._lock:
+            if self._driver is not None:
+                reason = self._recycle_reason()
+                if reason:
+                    self._retire(reason)
+            if self._driver is None:
+                self._driver = self._take_spare() or self._create_driver()
+                self.pages = 0
+                self.rss = None
+                self._rss_checked_at = 0
+            self.pages += pages
+            if self.warm_spare and self._near_limit():
+                self._launch_spare()
+            return self._driver
+
+    def discard(self, reason: str = "crash") -> None:
+        """Replace the current driver on the next get_driver() (e.g. after it crashed)."""
+        with self._lock:
+            if self._driver is not None:
+                self._retire(reason)
+
+    def _block(self, driver: webdriver.Chrome) -> None:
+        """Apply the request blocking to the driver's current tab."""
+        if not self.blocker:
+            return
+        try:
+            self.blocker.apply(driver)
+        except WebDriverException as e:
+            # pages still load, only slower
+            logger.warning(f"Request blocking unavailable: {e}")
+
+    def driver_rss(self, driver: webdriver.Chrome) -> Optional[int]:
+        """Memory of a driver's process tree (chromedriver and its browsers) in bytes."""
+        process = getattr(getattr(driver, "service", None), "process", None)
+        return process_tree_rss(process.pid) if process is not None else None
+
+    def _recycle_reason(self) -> Optional[str]:
+        """Why the current driver must be replaced ("pages" or "memory"), if it must."""
+        if self.max_pages and self.pages >= self.max_pages:
+            return "pages"
+        if self.max_rss and self.pages - self._rss_checked_at >= self.rss_check_every:
+            self._rss_checked_at = self.pages
+            self.rss = self.driver_rss(self._driver)
+            if self.rss is not None:
+                DRIVER_RSS.set(self.rss)
+                if self.rss >= self.max_rss:
+                    return "memory"
+        return None
+
+    def _near_limit(self) -> bool:
+        """Whether the current driver is close enough to a limit to prepare its replacement."""
+        if self.max_pages and self.pages >= SPARE_AT * self.max_pages:
+            return True
+        return bool(self.max_rss and self.rss and self.rss >= SPARE_AT * self.max_rss)
+
+    def _retire(self, reason: str) -> None:
+        """Quit the current driver in the background."""
+        driver, self._driver = self._driver, None
+        # its tabs go with it
+        self._pool = None
+        DRIVER_RECYCLES.labels(reason).inc()
+        logger.info(
+            f"Recycling browser driver ({reason}) after {self.pages} pages"
+            + (f", {self.rss / 1024 / 1024:.0f} MB" if self.rss else "")
+        )
+        threading.Thread(target=self._quit, args=(driver,), name="driver-quit", daemon=True).start()
+
+    def _quit(self, driver: webdriver.Chrome) -> None:
+        """Quit a driver, ignoring errors of an already broken one, and free its profile."""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+        finally:
+            lease = self._leases.pop(id(driver), None)
+            if lease is not None:
+                self.profiles.release(lease)
+
+    def _launch_spare(self) -> None:
+        """Start launching the spare driver unless one is ready or on its way."""
+        if self._spare is not None or self._spare_thread is not None:
+            return
+
+        def launch() -> None:
+            try:
+                self._spare = self._create_driver()
+            except WebDriverException:
+                # get_driver() launches one itself when no spare is ready
+                pass
+
+        self._spare_thread = threading.Thread(target=launch, name="driver-spare", daemon=True)
+        self._spare_thread.start()
+
+    def _take_spare(self) -> Optional[webdriver.Chrome]:
+        """The spare driver, waiting for it if it is still starting."""
+        if self._spare_thread is not None:
+            self._spare_thread.join()
+            self._spare_thread = None
+        spare, self._spare = self._spare, None
+        return spare
 
     def _create_driver(self) -> webdriver.Chrome:
         """
-        Create a new Chrome driver with configured options.
+        Create a new Chrome driver on a free persistent profile.
+
+        Returns:
+            New Chrome WebDriver instance
+        """
+        lease = self.profiles.acquire() if self.profiles else None
+        try:
+            try:
+                driver = self.launch(lease)
+            except WebDriverException:
+                if lease is None or lease.fresh:
+                    raise
+                # a used profile Chrome cannot start on is most likely corrupted
+                self.profiles.wipe(lease)
+                driver = self.launch(lease)
+        except WebDriverException:
+            if lease is not None:
+                self.profiles.release(lease)
+            raise
+        if lease is not None:
+            self._leases[id(driver)] = lease
+        return driver
+
+    def launch(self, profile: Optional[ProfileLease] = None) -> webdriver.Chrome:
+        """
+        Start Chrome with the configured options, outside the manager's recycling.
+
+        Args:
+            profile: Profile directory to start on (a temporary profile if None)
 
         Returns:
             New Chrome WebDriver instance
@@ -68,6 +372,10 @@ class BrowserManager:
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-blink-features=AutomationControlled")
+        # pinned tabs keep updating while another tab is in front
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-renderer-backgrounding")
+        options.add_argument("--disable-backgrounding-occluded-windows")
 
         # Disable images for faster loading (optional)
         prefs = {
@@ -76,6 +384,18 @@ class BrowserManager:
         }
         options.add_experimental_option("prefs", prefs)
 
+        if profile is not None:
+            options.add_argument(f"--user-data-dir={profile.path.resolve()}")
+            if BROWSER_PROFILE_CACHE_MB:
+                options.add_argument(f"--disk-cache-size={BROWSER_PROFILE_CACHE_MB * 1024 * 1024}")
+
+        if self.capture_network:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        if self.tabs > 1:
+            # the TabPool polls tabs that are still loading
+            options.page_load_strategy = "none"
+
         # Set binary location if specified
         if self.chrome_binary:
             options.binary_location = self.chrome_binary
@@ -86,6 +406,7 @@ class BrowserManager:
             "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         )
 
+        DRIVER_LAUNCHES.inc()
         try:
             # Create service if chromedriver path specified
             if self.chromedriver_binary:
@@ -94,23 +415,29 @@ class BrowserManager:
             else:
                 driver = webdriver.Chrome(options=options)
 
-            logger.info("Browser driver initialized successfully")
+            self._block(driver)
+            logger.info(
+                "Browser driver initialized successfully"
+                + (f" on profile {profile.name}" if profile is not None else "")
+            )
             return driver
 
         except WebDriverException as e:
+            DRIVER_CRASHES.inc()
             logger.error(f"Failed to initialize browser driver: {e}")
             raise
 
     def close(self) -> None:
-        """Close the browser and clean up resources."""
-        if self._driver:
-            try:
-                self._driver.quit()
+        """Close the browser and its spare, and clean up resources."""
+        with self._lock:
+            spare = self._take_spare()
+            if spare is not None:
+                self._quit(spare)
+            if self._driver:
+                self._quit(self._driver)
                 logger.debug("Browser driver closed")
-            except Exception as e:
-                logger.warning(f"Error closing browser: {e}")
-            finally:
                 self._driver = None
+                self._pool = None
 
     def __enter__(self):
         """Context manager entry."""
@@ -120,3 +447,79 @@ class BrowserManager:
         """Context manager exit."""
         self.close()
         return False
+
+
+def scrape_lot(browser: BrowserManager, url: str) -> Optional[Dict]:
+    """
+    Scrape a lot page with the manager's driver (main.py parser).
+
+    A driver that raised is replaced before the next page.
+
+    Returns:
+        The lot's item dictionary, or None if the page never loaded
+    """
+    # main.py is the production parser, importable from the project root
+    import main as scraper
+
+    try:
+        return scraper.get_object_information(url, isCounted=False, driver=browser.get_driver())
+    except WebDriverException:
+        browser.discard()
+        raise
+
+
+def scrape_listing(
+    browser: BrowserManager, url: str, known: Optional[Container[str]] = None, relists=None
+) -> List[str]:
+    """
+    Collect the lot links of a listing with the manager's driver (main.py crawler).
+
+    A driver that raised is replaced before the next page.
+
+    Args:
+        browser: Manager of the driver
+        url: Listing URL
+        known: Lot IDs already crawled: only new lots are collected, and the listing
+            is read until CRAWL_KNOWN_RUN of them in a row (every lot if None)
+        relists: OfferClassifier whose ended alerted lots are skipped when a card's
+            title relists one (no card is skipped if None)
+
+    Returns:
+        Lot URLs of the listing
+    """
+    import main as scraper
+
+    try:
+        return scraper.get_object_links_with_scroll(
+            url, driver=browser.get_driver(), known=known, relists=relists
+        )
+    except WebDriverException:
+        browser.discard()
+        raise
+
+
+def scrape_lots(
+    browser: BrowserManager, urls: Iterable[str]
+) -> Iterator[Tuple[str, Optional[Dict]]]:
+    """
+    Scrape lot pages concurrently in the tabs of the manager's browser (main.py parser).
+
+    A browser that raised is replaced before the next call.
+
+    Yields:
+        (URL, item dictionary or None if the page did not load), in completion order
+    """
+    import main as scraper
+
+    try:
+        for page in browser.fetch_pages(urls, read=lot_fields):
+            fields, item = page.content, None
+            if fields is not None and fields["time"] is not None:
+                item = scraper.item_from_fields(fields, page.url, page.fetched_at)
+            if item is None:
+                logger.warning("No countdown on %s, skipped", page.url)
+                LOTS_FAILED.inc()
+            yield page.url, item
+    except WebDriverException:
+        browser.discard()
+        raise
@@ -0,0 +1,119 @@
+"""
+Field extraction from lot and listing pages.
+
+With EXTRACTION_MODE=browser, one script runs inside the page and returns
+the few texts the scraper reads as a small JSON object, instead of
+transferring the whole page_source to Python and parsing it with
+BeautifulSoup. The soup functions read the same texts from HTML; they are
+used with EXTRACTION_MODE=soup and for drivers that cannot run scripts
+(e.g. the benchmark's HttpDriver).
+
+Both paths return the raw texts; main.py turns lot fields into an item.
+"""
+
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.config.settings import EXTRACTION_MODE
+from src.metrics.profiling import span
+
+COUNTDOWN_SELECTOR = "time.u-text-tabular-figures"
+BID_SELECTOR = "div.LotBidStatusSection_bid-amount__bWWF4.u-typography-h2"
+ESTIMATE_SELECTOR = "span.u-no-wrap"
+RESERVE_SELECTOR = (
+    "div.LotBidStatusSection_subtitle-content__kkad5.LotBidStatusSection_visible__kj_F3"
+    ".u-typography-h7.u-m-t-xs"
+)
+CARD_SELECTOR = "a.c-lot-card"
+CARD_TITLE_SELECTOR = ".c-lot-card__title"
+PAGE_BUTTON_SELECTOR = (
+    "a.c-button-template.u-cursor-pointer.c-button__container.c-button--primary"
+    ".u-bgcolor-brand.u-typography-h7.u-w-full"
+)
+
+# (field, selector, index of the match read)
+LOT_FIELDS = [
+    ("time", COUNTDOWN_SELECTOR, 0),
+    ("title", "h1", 0),
+    ("price", BID_SELECTOR, 0),
+    ("estimate", ESTIMATE_SELECTOR, 1),
+    ("reserve", RESERVE_SELECTOR, 0),
+]
+
+_LOT_SCRIPT = """
+const fields = {};
+for (const [name, selector, index] of arguments[0]) {
+    const found = document.querySelectorAll(selector);
+    fields[name] = found.length > index ? found[index].textContent : null;
+}
+return fields;
+"""
+
+_LISTING_SCRIPT = """
+const cards = [];
+for (const card of document.querySelectorAll(arguments[0])) {
+    const title = card.querySelector(arguments[1]);
+    cards.push({href: card.getAttribute('href'), title: title ? title.textContent.trim() : null});
+}
+const pages = Array.from(document.querySelectorAll(arguments[2]), a => a.getAttribute('href'));
+return {cards: cards, pages: pages};
+"""
+
+
+def soup_lot_fields(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
+    """Texts of a lot page's fields (None for a missing element)."""
+    fields = {}
+    for name, selector, index in LOT_FIELDS:
+        found = soup.select(selector)
+        fields[name] = found[index].text if len(found) > index else None
+    return fields
+
+
+def soup_listing_cards(soup: BeautifulSoup) -> Dict[str, List]:
+    """Lot cards ({"href", "title"}) and page button links of a listing page."""
+    cards = []
+    for card in soup.select(CARD_SELECTOR):
+        title = card.select_one(CARD_TITLE_SELECTOR)
+        cards.append({"href": card.get("href"), "title": title.text.strip() if title else None})
+    return {"cards": cards, "pages": [a.get("href") for a in soup.select(PAGE_BUTTON_SELECTOR)]}
+
+
+def lot_fields(driver, mode: str = EXTRACTION_MODE) -> Dict[str, Optional[str]]:
+    """
+    Texts of the fields of the lot page loaded in the driver.
+
+    Args:
+        driver: Selenium driver (or a stand-in with page_source)
+        mode: "browser" to extract inside the page, "soup" to parse page_source
+
+    Returns:
+        Dictionary of time, title, price, estimate and reserve texts (None if missing)
+    """
+    if mode == "browser":
+        fields = driver.execute_script(_LOT_SCRIPT, LOT_FIELDS)
+        if isinstance(fields, dict):
+            return fields
+    with span("parse"):
+        return soup_lot_fields(BeautifulSoup(driver.page_source, "html.parser"))
+
+
+def listing_cards(driver, mode: str = EXTRACTION_MODE) -> Dict[str, List]:
+    """
+    Lot cards and page button links of the listing page loaded in the driver.
+
+    Args:
+        driver: Selenium driver (or a stand-in with page_source)
+        mode: "browser" to extract inside the page, "soup" to parse page_source
+
+    Returns:
+        {"cards": [{"href", "title"}], "pages": [href]}
+    """
+    if mode == "browser":
+        listing = driver.execute_script(
+            _LISTING_SCRIPT, CARD_SELECTOR, CARD_TITLE_SELECTOR, PAGE_BUTTON_SELECTOR
+        )
+        if isinstance(listing, dict):
+            return listing
+    with span("parse"):
+        return soup_listing_cards(BeautifulSoup(driver.page_source, "html.parser"))
@@ -0,0 +1,402 @@
+"""
+Synthetic Catawiki site for offline end-to-end testing.
+
+Serves listing pages (lot cards loaded by infinite scroll, pagination
+buttons) and lot pages (countdown, current bid, estimate, reserve state)
+with the same markup the scraper parses. Lots are generated from a seed;
+bids arrive over time and lots close on a staggered schedule, so repeated
+visits see prices, reserve states and countdowns change. Latency, HTTP
+errors and incomplete pages can be injected.
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.utils.time_utils import get_time_var_from_seconds
+
+# Class names of the live site, as matched by the scraper
+CARD_CLASS = "c-lot-card"
+CARD_TITLE_CLASS = "c-lot-card__title"
+PAGE_BUTTON_CLASS = (
+    "c-button-template u-cursor-pointer c-button__container c-button--primary "
+    "u-bgcolor-brand u-typography-h7 u-w-full"
+)
+BID_CLASS = "LotBidStatusSection_bid-amount__bWWF4 u-typography-h2"
+RESERVE_CLASS = (
+    "LotBidStatusSection_subtitle-content__kkad5 LotBidStatusSection_visible__kj_F3 "
+    "u-typography-h7 u-m-t-xs"
+)
+COUNTDOWN_CLASS = "u-text-tabular-figures"
+
+LISTING_PATH = "/fr/c/333-montres"
+
+_BRANDS = ["Rolex", "Omega", "Seiko", "Tudor", "Longines", "Cartier", "Breitling", "Tissot"]
+_MODELS = ["Submariner", "Speedmaster", "Datejust", "Seamaster", "Black Bay", "Tank", "Navitimer"]
+_RESERVE_TEXT = {
+    "none": "Sans prix de réserve",
+    "reached": "Prix de réserve atteint",
+    "not_reached": "Prix de réserve non atteint",
+}
+
+
+def _euros(amount: int) -> str:
+    """Format an amount with non-breaking thousands separators, as the site does."""
+    return f"{amount:,}".replace(",", "\xa0")
+
+
+@dataclass
+class SyntheticLot:
+    """
+    A generated lot whose bids arrive over time.
+
+    Attributes:
+        lot_id: Numeric lot ID
+        title: Lot title
+        low: Low estimate
+        high: High estimate
+        start_bid: Opening bid
+        reserve: Reserve price (None without reserve)
+        ends_at: Unix time the auction closes
+        bid_times: Unix times at which bids are placed, sorted
+    """
+
+    lot_id: int
+    title: str
+    low: int
+    high: int
+    start_bid: int
+    reserve: Optional[int]
+    ends_at: float
+    bid_times: List[float] = field(default_factory=list)
+
+    @property
+    def path(self) -> str:
+        """Path of the lot page."""
+        slug = self.title.lower().replace(" ", "-")
+        return f"/fr/l/{self.lot_id}-{slug}"
+
+    def state(self, now: float) -> Tuple[int, float, str]:
+        """
+        State of the auction at a given time.
+
+        Returns:
+            (current bid, remaining seconds, reserve state)
+        """
+        bids = bisect_right(self.bid_times, min(now, self.ends_at))
+        bid = int(round(self.start_bid * 1.08**bids / 5) * 5)
+        if self.reserve is None:
+            reserve_state = "none"
+        else:
+            reserve_state = "reached" if bid >= self.reserve else "not_reached"
+        return bid, max(0.0, self.ends_at - now), reserve_state
+
+
+class CatawikiFixtureServer:
+    """
+    Threaded HTTP server generating Catawiki-like pages.
+    """
+
+    def __init__(
+        self,
+        lots: int = 1000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        per_page: int = 48,
+        scroll_batch: int = 12,
+        duration: float = 7200.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        incomplete_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Initialize fixture server.
+
+        Args:
+            lots: Number of generated lots
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            per_page: Lot cards per listing page
+            scroll_batch: Cards rendered up front and per scroll fetch (0 renders the
+                whole page server-side, for clients without JavaScript)
+            duration: Closing times are spread over this many seconds from start
+            latency: Seconds added to every response
+            jitter: Random extra latency, up to this many seconds
+            error_rate: Fraction of page requests answered with HTTP 500
+            incomplete_rate: Fraction of lot pages served without their countdown
+                (like a page read before it finished rendering)
+            seed: Random seed of the generated lots
+        """
+        self.per_page = per_page
+        self.scroll_batch = scroll_batch
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.incomplete_rate = incomplete_rate
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed + 1)
+        self._lock = threading.Lock()
+        self.lots = self._generate(lots, duration, seed)
+        self._by_id = {lot.lot_id: lot for lot in self.lots}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _generate(count: int, duration: float, seed: int) -> List[SyntheticLot]:
+        """Generate lots closing between now and now + duration."""
+        rng = random.Random(seed)
+        now = time.time()
+        lots = []
+        for i in range(count):
+            low = rng.randrange(300, 15000, 50)
+            ends_at = now + 60 + duration * i / max(count, 1)
+            opened_at = ends_at - rng.uniform(2, 7) * 86400
+            # Bidding accelerates towards the close
+            bid_times = sorted(
+                ends_at - (ends_at - opened_at) * rng.random() ** 3
+                for _ in range(rng.randint(0, 25))
+            )
+            lots.append(
+                SyntheticLot(
+                    lot_id=70000000 + i,
+                    title=f"{rng.choice(_BRANDS)} {rng.choice(_MODELS)} {rng.randint(1960, 2023)}",
+                    low=low,
+                    high=int(low * rng.uniform(1.2, 1.6)),
+                    start_bid=max(1, int(low * rng.uniform(0.05, 0.3))),
+                    reserve=None if rng.random() < 0.4 else int(low * rng.uniform(0.5, 0.9)),
+                    ends_at=ends_at,
+                    bid_times=bid_times,
+                )
+            )
+        return lots
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def listing_url(self) -> str:
+        """URL of the first listing page (argument of get_object_links_with_scroll)."""
+        return f"{self.url}{LISTING_PATH}"
+
+    @property
+    def pages(self) -> int:
+        """Number of listing pages."""
+        return max(1, -(-len(self.lots) // self.per_page))
+
+    def lot_url(self, lot: SyntheticLot) -> str:
+        """Absolute URL of a lot page."""
+        return f"{self.url}{lot.path}"
+
+    def start(self) -> "CatawikiFixtureServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="catawiki-fixture", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "CatawikiFixtureServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.requests[kind] += 1
+
+    def stats(self) -> dict:
+        """Requests served so far, by kind (listing, fragment, lot, error, incomplete)."""
+        with self._lock:
+            return dict(self.requests)
+
+    def _cards(self, page: int, start: int, stop: int) -> str:
+        """Lot cards of a listing page, from start to stop (page-relative)."""
+        first = (page - 1) * self.per_page
+        lots = self.lots[first + start : first + min(stop, self.per_page)]
+        return "".join(
+            f'<a class="{CARD_CLASS}" href="{self.lot_url(lot)}" '
+            f'style="display:block;height:240px">'
+            f'<span class="{CARD_TITLE_CLASS}">{html.escape(lot.title)}</span></a>'
+            for lot in lots
+        )
+
+    def render_listing(self, page: int) -> str:
+        """Render a listing page with infinite scroll and pagination buttons."""
+        page = min(max(page, 1), self.pages)
+        on_page = min(self.per_page, len(self.lots) - (page - 1) * self.per_page)
+        initial = self.scroll_batch or self.per_page
+
+        buttons = []
+        if page > 1:
+            buttons.append((page - 1, "Précédent"))
+        if page < self.pages:
+            buttons.append((page + 1, "Suivant"))
+        pagination = "".join(
+            f'<a class="{PAGE_BUTTON_CLASS}" href="{LISTING_PATH}?page={target}">{label}</a>'
+            for target, label in buttons
+        )
+        script = ""
+        if self.scroll_batch and on_page > initial:
+            script = f"""<script>
+let start = {initial}, loading = false;
+window.addEventListener('scroll', () => {{
+  if (loading || start >= {on_page}) return;
+  if (window.innerHeight + window.scrollY < document.body.scrollHeight - 600) return;
+  loading = true;
+  fetch('/fragment/listing?page={page}&start=' + start).then(r => r.text()).then(cards => {{
+    document.getElementById('lots').insertAdjacentHTML('beforeend', cards);
+    start += {self.scroll_batch};
+    loading = false;
+  }});
+}});
+</script>"""
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Montres</title></head>"
+            f"<body><div id='lots'>{self._cards(page, 0, initial)}</div>"
+            f"<nav>{pagination}</nav>{script}</body></html>"
+        )
+
+    def render_lot(
+        self, lot: SyntheticLot, now: Optional[float] = None, complete: bool = True
+    ) -> str:
+        """Render a lot page as it looks at a given time."""
+        bid, remaining, reserve_state = lot.state(now if now is not None else time.time())
+        countdown = get_time_var_from_seconds(remaining) if remaining >= 1 else "0s"
+        timer = f'<time class="{COUNTDOWN_CLASS}">{countdown}</time>' if complete else ""
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(lot.title)}</title></head><body>"
+            f"<h1>{html.escape(lot.title)}</h1>"
+            f'<span class="u-no-wrap">Lot {lot.lot_id}</span>'
+            f'<span class="u-no-wrap">{_euros(lot.low)} - {_euros(lot.high)} € </span>'
+            f'<div class="{BID_CLASS}">{_euros(bid)} €</div>'
+            f'<div class="{RESERVE_CLASS}">{_RESERVE_TEXT[reserve_state]}</div>'
+            f"{timer}</body></html>"
+        )
+
+    def _handler_class(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                page = int(query.get("page", ["1"])[0])
+
+                if parts.path == "/stats":
+                    return self._reply(200, json.dumps(fixture.stats()), "application/json")
+
+                delay = fixture.latency + fixture.jitter * fixture._roll()
+                if delay:
+                    time.sleep(delay)
+
+                if parts.path.startswith("/fragment/listing"):
+                    fixture._count("fragment")
+                    start = int(query.get("start", ["0"])[0])
+                    return self._reply(
+                        200, fixture._cards(page, start, start + fixture.scroll_batch)
+                    )
+
+                kind = "listing" if parts.path == LISTING_PATH else "lot"
+                fixture._count(kind)
+                if fixture._roll() < fixture.error_rate:
+                    fixture._count("error")
+                    return self._reply(500, "<html><body>Internal error</body></html>")
+
+                if kind == "listing":
+                    return self._reply(200, fixture.render_listing(page))
+
+                lot_id = parts.path.rsplit("/", 1)[-1].split("-", 1)[0]
+                lot = fixture._by_id.get(int(lot_id)) if lot_id.isdigit() else None
+                if lot is None:
+                    return self._reply(404, "<html><body>Not found</body></html>")
+                complete = fixture._roll() >= fixture.incomplete_rate
+                if not complete:
+                    fixture._count("incomplete")
+                return self._reply(200, fixture.render_lot(lot, complete=complete))
+
+            def _reply(self, status: int, body: str, content_type: str = "text/html") -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the fixture server in the foreground."""
+    parser = argparse.ArgumentParser(description="Synthetic Catawiki site")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--lots", type=int, default=1000)
+    parser.add_argument("--per-page", type=int, default=48)
+    parser.add_argument("--scroll-batch", type=int, default=12)
+    parser.add_argument("--duration", type=float, default=7200.0, help="closing time spread (s)")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--incomplete-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = CatawikiFixtureServer(
+        lots=args.lots,
+        host=args.host,
+        port=args.port,
+        per_page=args.per_page,
+        scroll_batch=args.scroll_batch,
+        duration=args.duration,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        incomplete_rate=args.incomplete_rate,
+        seed=args.seed,
+    )
+    with server:
+        print(f"Serving {args.lots} synthetic lots at {server.listing_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
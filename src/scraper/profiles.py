@@ -0,0 +1,323 @@
+"""
+Persistent Chrome profiles for the browsers of the scraper.
+
+Chrome started on a new temporary profile has an empty HTTP cache and no
+cookies, so the first pages of every browser download Catawiki's JS/CSS
+bundles again and start a new session. With BROWSER_PROFILE_DIR set, each
+browser launched by a BrowserManager leases a slot directory there and uses
+it as its user data dir. The cache (capped at BROWSER_PROFILE_CACHE_MB) and
+the cookies outlive the browser, and the next browser on the slot starts warm.
+
+Chrome locks its user data dir, so a slot serves one browser at a time. The
+lease is a file lock, which also keeps several processes of a host apart.
+A slot created empty is copied from the template profile, which
+`python -m src profiles warm` prepares once: the listing and a lot page are
+loaded and the cookie banner is accepted. That way even a new slot's first
+page comes from a warm cache.
+
+Usage:
+    python -m src profiles list
+    python -m src profiles warm [LISTING_URL]
+    python -m src profiles reset [SLOT ...]    # all slots and the template if none given
+"""
+
+import shutil
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, List, Optional
+
+from src.config.settings import BROWSER_PROFILE_DIR, BROWSER_PROFILE_SLOTS, CATAWIKI_BASE_URL
+from src.metrics.instruments import PROFILE_RESETS
+from src.utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: leases only exclude browsers of the same process
+    fcntl = None
+
+TEMPLATE = "template"
+# Chrome's own locks and crash dumps, stale once its browser is gone
+_STALE_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+_NOT_COPIED = shutil.ignore_patterns(*_STALE_FILES, "Crashpad", "Crash Reports")
+# Accept button of the cookie banner (OneTrust)
+CONSENT_BUTTON = "#onetrust-accept-btn-handler"
+
+
+@dataclass
+class ProfileLease:
+    """
+    A profile directory held by one browser.
+
+    Attributes:
+        name: Slot number, or "template"
+        path: User data dir to start Chrome on
+        fresh: Whether the directory had no profile when it was leased
+    """
+
+    name: str
+    path: Path
+    fresh: bool
+    _lock: Optional[IO] = field(default=None, repr=False)
+
+
+class ProfileStore:
+    """
+    Slot directories of persistent Chrome profiles, leased one browser at a time.
+    """
+
+    def __init__(
+        self, root: Optional[str] = BROWSER_PROFILE_DIR, slots: int = BROWSER_PROFILE_SLOTS
+    ):
+        """
+        Initialize store.
+
+        Args:
+            root: Directory of the slots and the template (profiles disabled if empty)
+            slots: Most browsers on persistent profiles at once
+        """
+        self.root = Path(root) if root else None
+        self.slots = max(1, slots)
+        # leases of this process (flock does not exclude two handles of one process)
+        self._held: set = set()
+        self._mutex = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return self.root is not None
+
+    @property
+    def template(self) -> Path:
+        """The warmed profile new slots are copied from."""
+        return self.root / TEMPLATE
+
+    def path(self, name: str) -> Path:
+        """Directory of a slot (or of the template)."""
+        return self.root / (name if name == TEMPLATE else f"slot-{name}")
+
+    def _lock(self, name: str) -> Optional[IO]:
+        """Take a slot's lock without waiting, or None if another browser holds it."""
+        with self._mutex:
+            if name in self._held:
+                return None
+            self.root.mkdir(parents=True, exist_ok=True)
+            handle = open(self.root / f"{name}.lock", "a")
+            if fcntl is not None:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    handle.close()
+                    return None
+            self._held.add(name)
+            return handle
+
+    def _unlock(self, name: str, handle: IO) -> None:
+        with self._mutex:
+            self._held.discard(name)
+            # closing the file releases the flock
+            handle.close()
+
+    def acquire(self) -> Optional[ProfileLease]:
+        """
+        Lease the first free slot, prepared from the template if it is new.
+
+        Returns:
+            The lease, or None if every slot is in use
+        """
+        for slot in range(self.slots):
+            name = str(slot)
+            handle = self._lock(name)
+            if handle is None:
+                continue
+            path = self.path(name)
+            fresh = not path.is_dir() or not any(path.iterdir())
+            if fresh:
+                self._seed(path)
+            else:
+                self._clear_stale(path)
+            return ProfileLease(name, path, fresh, handle)
+        logger.warning(f"All {self.slots} browser profiles in use, starting on a temporary one")
+        return None
+
+    def acquire_template(self) -> Optional[ProfileLease]:
+        """Lease the template itself (to warm it), or None if it is in use."""
+        handle = self._lock(TEMPLATE)
+        if handle is None:
+            return None
+        path = self.template
+        fresh = not path.is_dir()
+        path.mkdir(parents=True, exist_ok=True)
+        self._clear_stale(path)
+        return ProfileLease(TEMPLATE, path, fresh, handle)
+
+    def release(self, lease: ProfileLease) -> None:
+        """Hand a slot back once its browser has quit."""
+        if lease._lock is not None:
+            self._unlock(lease.name, lease._lock)
+            lease._lock = None
+
+    def _seed(self, path: Path) -> None:
+        """Fill a new slot with a copy of the template, if one is ready."""
+        shutil.rmtree(path, ignore_errors=True)
+        handle = self._lock(TEMPLATE) if self.template.is_dir() else None
+        if handle is None:
+            # no template, or it is being warmed: Chrome creates an empty profile
+            path.mkdir(parents=True, exist_ok=True)
+            return
+        try:
+            shutil.copytree(self.template, path, ignore=_NOT_COPIED)
+            logger.debug(f"Browser profile {path} copied from the template")
+        except (OSError, shutil.Error) as e:
+            logger.warning(f"Could not copy the template profile to {path}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            path.mkdir(parents=True, exist_ok=True)
+        finally:
+            self._unlock(TEMPLATE, handle)
+
+    @staticmethod
+    def _clear_stale(path: Path) -> None:
+        """Remove the locks left by a browser that did not quit cleanly."""
+        for name in _STALE_FILES:
+            stale = path / name
+            if stale.is_symlink() or stale.exists():
+                stale.unlink(missing_ok=True)
+
+    @staticmethod
+    def wipe(lease: ProfileLease) -> None:
+        """Empty a leased profile Chrome failed to start on (likely corrupted)."""
+        PROFILE_RESETS.inc()
+        logger.warning(f"Browser profile {lease.path} reset")
+        shutil.rmtree(lease.path, ignore_errors=True)
+        lease.path.mkdir(parents=True, exist_ok=True)
+        lease.fresh = True
+
+    def reset(self, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Delete profiles, e.g. corrupted ones; new slots start from the template again.
+
+        Args:
+            names: Slot numbers or "template" (every slot and the template if None)
+
+        Returns:
+            Names of the deleted profiles (those in use are skipped)
+        """
+        if self.root is None or not self.root.is_dir():
+            return []
+        if names is None:
+            names = sorted(path.name.split("-", 1)[1] for path in self.root.glob("slot-*"))
+            names.append(TEMPLATE)
+        deleted = []
+        for name in names:
+            path = self.path(name)
+            if not path.exists():
+                continue
+            handle = self._lock(name)
+            if handle is None:
+                logger.warning(f"Browser profile {name} is in use, not reset")
+                continue
+            try:
+                shutil.rmtree(path)
+                PROFILE_RESETS.inc()
+                deleted.append(name)
+            finally:
+                self._unlock(name, handle)
+        return deleted
+
+    def describe(self) -> List[dict]:
+        """Name, size in bytes and use of every existing profile."""
+        if self.root is None or not self.root.is_dir():
+            return []
+        profiles = []
+        for path in sorted(self.root.iterdir()):
+            if not path.is_dir():
+                continue
+            name = path.name if path.name == TEMPLATE else path.name.split("-", 1)[-1]
+            handle = self._lock(name)
+            if handle is not None:
+                self._unlock(name, handle)
+            size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+            profiles.append({"name": name, "bytes": size, "in_use": handle is None})
+        return profiles
+
+
+def warm(store: ProfileStore, listing_url: str = CATAWIKI_BASE_URL, settle: float = 3.0) -> bool:
+    """
+    Prepare the template profile: load the listing and its first lot, accept cookies.
+
+    Request blocking is off for this browser, so the cookie banner loads and
+    its consent is stored with the profile.
+
+    Returns:
+        Whether the template was warmed (False if it is being warmed elsewhere)
+    """
+    import time
+
+    from selenium.common.exceptions import WebDriverException
+
+    from src.scraper.blocking import RequestBlocker
+    from src.scraper.browser import BrowserManager
+    from src.scraper.extraction import CARD_SELECTOR
+
+    lease = store.acquire_template()
+    if lease is None:
+        return False
+    browser = BrowserManager(
+        warm_spare=False, tabs=1, blocker=RequestBlocker(resources=[], urls=[])
+    )
+    try:
+        driver = browser.launch(lease)
+        try:
+            driver.get(listing_url)
+            time.sleep(settle)
+            driver.execute_script(
+                "const button = document.querySelector(arguments[0]); if (button) button.click();",
+                CONSENT_BUTTON,
+            )
+            lots = driver.execute_script(
+                "return Array.from(document.querySelectorAll(arguments[0]), a => a.href);",
+                CARD_SELECTOR,
+            )
+            if lots:
+                driver.get(lots[0])
+                time.sleep(settle)
+        finally:
+            driver.quit()
+    except WebDriverException as e:
+        logger.error(f"Warming the template profile failed: {e}")
+        raise
+    finally:
+        store.release(lease)
+    logger.info(f"Template profile warmed at {lease.path}")
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the persistent browser profiles")
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("list", help="show the profiles, their size and use")
+    warm_parser = actions.add_parser("warm", help="prepare the template new slots start from")
+    warm_parser.add_argument("url", nargs="?", default=CATAWIKI_BASE_URL, help="listing URL")
+    reset_parser = actions.add_parser("reset", help="delete corrupted profiles")
+    reset_parser.add_argument("names", nargs="*", help='slot numbers or "template" (default: all)')
+    args = parser.parse_args(argv)
+
+    store = ProfileStore()
+    if not store:
+        print("BROWSER_PROFILE_DIR is empty: browsers start on temporary profiles")
+        return
+    if args.action == "list":
+        for profile in store.describe():
+            use = "in use" if profile["in_use"] else "free"
+            print(f"{profile['name']:>9}  {profile['bytes'] / 1024 / 1024:8.1f} MB  {use}")
+    elif args.action == "warm":
+        if not warm(store, args.url):
+            print("The template is being warmed by another process")
+    else:
+        deleted = store.reset(args.names or None)
+        print(f"Deleted {len(deleted)} profile(s): {', '.join(deleted) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
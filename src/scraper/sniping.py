@@ -0,0 +1,392 @@
+"""
+Fast path for good deals in their final minutes.
+
+The regular loops see a lot every few seconds to minutes, so a "closing"
+alert or a late bid can be based on stale data. SnipingTracker keeps each
+deal closing within SNIPING_WINDOW open in its own tab and reads its fields
+inside the page every SNIPING_INTERVAL: the page updates its bid and
+countdown itself, so no reload is needed. Every observation goes straight
+through the OfferClassifier to the outbox, so an outbid or reserve change
+is alerted within a cycle and the "closing" alert uses live data.
+
+At most SNIPING_MAX_LOTS lots are tracked. When more deals close at once,
+the ones closing soonest are tracked and the rest stay with the regular
+re-check path (the overflow is exported as catawiki_sniping_lots). A tab
+that fails is closed and picked up again on the next selection; if the
+browser itself died, it is replaced and every lot is pinned again. The
+browser is never recycled while a lot is pinned: its memory limit is only
+enforced when no tab is open.
+
+Usage:
+    python -m src sniper        # standalone, alongside the monitor and alert loops
+    SNIPING_ENABLED=true python -m src daemon
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from src.analyzer.offers import (
+    RESERVE_OK,
+    OfferClassifier,
+    is_underpriced,
+    normalize_estimate,
+    remaining_seconds,
+)
+from src.analyzer.price_stats import PriceStatistics
+from src.config.runtime import current_config
+from src.config.settings import (
+    BROWSER_MAX_RSS_MB,
+    DATA_FILE,
+    DEDUP_SIMILARITY_THRESHOLD,
+    PRICE_STATS_FILE,
+    SNIPING_INTERVAL,
+    SNIPING_MAX_LOTS,
+    SNIPING_REFRESH,
+    SNIPING_WINDOW,
+)
+from src.metrics.instruments import DEALS_FOUND, SNIPING_LOTS, heartbeat
+from src.metrics.latency import mark_stage
+from src.notifications.messages import build_alert
+from src.scraper.extraction import lot_fields
+from src.storage.models import WatchItem
+from src.utils.logger import logger
+
+# Seconds a tab may show no countdown before its page is reloaded
+RELOAD_AFTER = 5.0
+
+
+def _scraper():
+    """The Selenium scraper (main.py), imported when first needed."""
+    import main as scraper
+
+    return scraper
+
+
+@dataclass
+class TrackedLot:
+    """
+    A lot kept open in a tab.
+
+    Attributes:
+        url: Lot URL
+        handle: Window handle of its tab
+        seen_at: Last time its countdown was read
+        state: Price and reserve last observed
+    """
+
+    url: str
+    handle: str
+    seen_at: float
+    state: Optional[tuple] = None
+
+
+class SnipingTracker:
+    """
+    Observes good deals in their final window from pinned tabs.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], List[Dict]],
+        outbox,
+        browser=None,
+        classifier: Optional[OfferClassifier] = None,
+        on_update: Optional[Callable[[Dict], None]] = None,
+        price_stats: Optional[PriceStatistics] = None,
+        window: float = SNIPING_WINDOW,
+        max_lots: int = SNIPING_MAX_LOTS,
+        interval: float = SNIPING_INTERVAL,
+        refresh: float = SNIPING_REFRESH,
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            source: Returns the current items, to select the deals from
+            outbox: NotificationOutbox the alerts are queued in
+            browser: BrowserManager hosting the tabs (a new one if None)
+            classifier: Offer classifier (one on the outbox if None)
+            on_update: Called with the item of a lot whose price or reserve changed
+            price_stats: Realised prices deals are judged against (estimate midpoint if None)
+            window: Seconds before closing from which a deal is tracked
+            max_lots: Most lots tracked at once (one tab each)
+            interval: Seconds between two observations of every tab
+            refresh: Seconds between two selections of the lots to track
+        """
+        self.source = source
+        self.outbox = outbox
+        self._browser = browser
+        self.price_stats = price_stats
+        self.classifier = classifier or OfferClassifier(
+            outbox, dedup_threshold=DEDUP_SIMILARITY_THRESHOLD, price_stats=price_stats
+        )
+        self.on_update = on_update
+        self.window = window
+        self.max_lots = max_lots
+        self.interval = interval
+        self.refresh = refresh
+        self.lots: Dict[str, TrackedLot] = {}
+        # copy of the tracked URLs for other threads
+        self.tracked: FrozenSet[str] = frozenset()
+        self.overflow = 0
+        self._stop = threading.Event()
+
+    @property
+    def browser(self):
+        """The BrowserManager hosting the tabs."""
+        if self._browser is None:
+            from src.scraper.browser import BrowserManager
+
+            # tabs stay open for minutes: no recycling while they are, see _recycle_idle()
+            self._browser = BrowserManager(max_pages=0, max_rss_mb=0, warm_spare=False, tabs=1)
+        return self._browser
+
+    def _recycle_idle(self) -> None:
+        """Replace the browser past BROWSER_MAX_RSS_MB, before pinning into an empty one."""
+        if not BROWSER_MAX_RSS_MB:
+            return
+        rss = self.browser.driver_rss(self.browser.get_driver())
+        if rss is not None and rss >= BROWSER_MAX_RSS_MB * 1024 * 1024:
+            self.browser.discard("memory")
+
+    @staticmethod
+    def _alive(driver) -> bool:
+        """Whether a driver that raised still answers (only the tab failed)."""
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def _browser_lost(self) -> None:
+        """Replace a dead browser; its tabs went with it, so every lot is pinned again."""
+        logger.warning(f"Sniping browser died, {len(self.lots)} lot(s) to pin again")
+        self.browser.discard()
+        self.lots = {}
+        self.tracked = frozenset()
+
+    def candidates(self, items: List[Dict]) -> List[Dict]:
+        """Good deals closing within the window, soonest first."""
+        threshold = current_config().price_threshold
+        selected = []
+        for item in items:
+            remaining = remaining_seconds(item)
+            if remaining is None or not 0 < remaining <= self.window:
+                continue
+            if item["reserve_price"] not in RESERVE_OK:
+                continue
+            if is_underpriced(item, threshold, self.price_stats):
+                selected.append((remaining, item))
+        return [item for _, item in sorted(selected, key=lambda pair: pair[0])]
+
+    def select(self, items: List[Dict]) -> List[str]:
+        """
+        Track the deals closing soonest, up to max_lots, and drop the others.
+
+        Returns:
+            URLs of the tracked lots
+        """
+        wanted = [item["url"] for item in self.candidates(items)]
+        overflow = max(0, len(wanted) - self.max_lots)
+        if overflow and overflow != self.overflow:
+            logger.warning(
+                f"{len(wanted)} deals closing within {self.window:.0f}s, tracking the "
+                f"{self.max_lots} closing soonest; {overflow} left to the regular re-checks"
+            )
+        self.overflow = overflow
+        wanted = wanted[: self.max_lots]
+        for url in list(self.lots):
+            if url not in wanted:
+                self._unpin(url)
+        if wanted and not self.lots:
+            self._recycle_idle()
+        for url in wanted:
+            if url not in self.lots:
+                self._pin(url)
+        self.tracked = frozenset(self.lots)
+        SNIPING_LOTS.labels("tracked").set(len(self.lots))
+        SNIPING_LOTS.labels("overflow").set(overflow)
+        return list(self.lots)
+
+    def _pin(self, url: str) -> None:
+        """Open a lot in a new tab."""
+        driver = self.browser.get_driver()
+        handle = None
+        try:
+            driver.switch_to.new_window("tab")
+            handle = driver.current_window_handle
+            driver.get(url)
+        except WebDriverException as e:
+            logger.warning(f"Could not open {url} for sniping: {e}")
+            if not self._alive(driver):
+                self._browser_lost()
+            elif handle is not None:
+                self._close_tab(driver, handle, url)
+            return
+        self.lots[url] = TrackedLot(url, handle, time.time())
+        logger.info(f"Tracking {url} in its final window")
+
+    def _unpin(self, url: str) -> None:
+        """Close a lot's tab."""
+        lot = self.lots.pop(url)
+        self._close_tab(self.browser.get_driver(), lot.handle, url)
+
+    @staticmethod
+    def _close_tab(driver, handle: str, url: str) -> None:
+        """Close a tab and go back to the first one."""
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+        except WebDriverException as e:
+            logger.debug(f"Closing tab of {url} failed: {e}")
+
+    def observe_once(self) -> int:
+        """
+        Read every tracked tab once and push its item to the alert path.
+
+        Returns:
+            Number of alerts queued
+        """
+        driver = self.browser.get_driver()
+        queued = 0
+        for lot in list(self.lots.values()):
+            now = time.time()
+            try:
+                driver.switch_to.window(lot.handle)
+                fields = lot_fields(driver)
+                if fields["time"] is None:
+                    if now - lot.seen_at > RELOAD_AFTER:
+                        driver.get(lot.url)
+                        lot.seen_at = now
+                    continue
+            except WebDriverException as e:
+                if not self._alive(driver):
+                    self._browser_lost()
+                    break
+                logger.warning(f"Tab of {lot.url} failed, closed until the next selection: {e}")
+                self._unpin(lot.url)
+                continue
+            lot.seen_at = now
+            item = _scraper().item_from_fields(fields, lot.url, now)
+            normalize_estimate(item)
+            state = (item["price"], item["reserve_price"])
+            if state != lot.state:
+                lot.state = state
+                if self.on_update is not None:
+                    self.on_update(item)
+            queued += self.push(item)
+            remaining = remaining_seconds(item)
+            if remaining is not None and remaining <= 0:
+                self._unpin(lot.url)
+        self.tracked = frozenset(self.lots)
+        return queued
+
+    def push(self, item: Dict) -> int:
+        """
+        Classify a fresh item and queue its alerts.
+
+        Returns:
+            Number of alerts queued
+        """
+        offers_by_type = zip(("new", "updated", "closing"), self.classifier.classify([item]))
+        analysed_at = time.time()
+        queued = 0
+        for alert_type, offers in offers_by_type:
+            for offer in offers:
+                DEALS_FOUND.labels(alert_type).inc()
+                mark_stage(offer.setdefault("timings", {}), "analysed", analysed_at)
+                if self.outbox.enqueue(build_alert(WatchItem.from_dict(offer), alert_type)):
+                    logger.info(f"Queued {alert_type} alert for {offer['url']} (sniping)")
+                    queued += 1
+        return queued
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """
+        Select lots every refresh and observe them every interval.
+
+        Args:
+            stop: Event ending the loop (stop() sets the tracker's own if None)
+        """
+        stop = stop or self._stop
+        selected_at = 0.0
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                if started - selected_at >= self.refresh:
+                    self.select(self.source())
+                    selected_at = started
+                self.observe_once()
+                heartbeat("sniper")
+                elapsed = time.monotonic() - started
+                if elapsed > self.interval and self.lots:
+                    logger.debug(f"Sniping cycle took {elapsed:.2f}s for {len(self.lots)} lots")
+                stop.wait(max(0.0, self.interval - elapsed))
+        finally:
+            self.lots = {}
+            self.tracked = frozenset()
+            SNIPING_LOTS.labels("tracked").set(0)
+
+    def stop(self) -> None:
+        """Stop after the current cycle."""
+        self._stop.set()
+
+    def close(self) -> None:
+        """Close the browser."""
+        if self._browser is not None:
+            self._browser.close()
+
+
+def read_items(path: str = DATA_FILE) -> Callable[[], List[Dict]]:
+    """Item source reading a JSON items file (the last good read while it is rewritten)."""
+    last: List[Dict] = []
+
+    def source() -> List[Dict]:
+        nonlocal last
+        try:
+            last = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Items file not readable, keeping the last read: {e}")
+        return last
+
+    return source
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    import argparse
+
+    from src.config.runtime import start_config_reloading
+    from src.metrics.server import start_metrics_server
+    from src.notifications.outbox import NotificationOutbox
+
+    parser = argparse.ArgumentParser(description="Track good deals in their final minutes")
+    parser.add_argument("--items", default=DATA_FILE, help="items file to select deals from")
+    parser.add_argument("--max-lots", type=int, default=SNIPING_MAX_LOTS, help="tabs at most")
+    args = parser.parse_args(argv)
+
+    start_metrics_server("sniper")
+    start_config_reloading()
+    # alerts go to the shared outbox, delivered by the alert loop's dispatcher
+    tracker = SnipingTracker(
+        read_items(args.items),
+        NotificationOutbox(),
+        price_stats=PriceStatistics(PRICE_STATS_FILE),
+        max_lots=args.max_lots,
+    )
+    try:
+        tracker.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tracker.close()
+
+
+if __name__ == "__main__":
+    main()
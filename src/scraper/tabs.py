@@ -0,0 +1,181 @@
+"""
+Concurrent page loads in the tabs of one browser.
+
+WebDriver commands go to one tab at a time, but page loads run inside the
+browser. TabPool starts a navigation in every tab with a non-blocking
+location change, then polls the tabs through the DevTools-backed window
+handles and collects each page as soon as it is ready. N tabs share one
+Chrome process tree instead of N browsers.
+
+A tab that does not finish within its timeout is closed and replaced by a
+fresh one, so a hung page never blocks the others.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+from src.config.settings import BROWSER_TAB_TIMEOUT, BROWSER_TABS
+from src.metrics.instruments import PAGES_FETCHED, TAB_RESETS
+from src.utils.logger import logger
+
+# Element showing that a lot page rendered its countdown
+LOT_READY_SELECTOR = "time.u-text-tabular-figures"
+
+# The marker only exists on the document being navigated away from
+_NAVIGATE = "window.__tabPending = true; window.location.href = arguments[0];"
+_STATE = """
+if (window.__tabPending || document.readyState !== 'complete') { return 'loading'; }
+return document.querySelector(arguments[0]) ? 'ready' : 'complete';
+"""
+
+
+@dataclass
+class TabPage:
+    """
+    A page loaded in a tab.
+
+    Attributes:
+        url: Requested URL
+        content: Page HTML (or what fetch()'s read function returned), None if the tab timed out
+        started: Time the navigation started
+        fetched_at: Time the page was read
+    """
+
+    url: str
+    content: Any
+    started: float
+    fetched_at: float
+
+
+class TabPool:
+    """
+    Loads pages concurrently in the tabs of one driver.
+    """
+
+    def __init__(
+        self,
+        driver,
+        size: int = BROWSER_TABS,
+        timeout: float = BROWSER_TAB_TIMEOUT,
+        ready_selector: str = LOT_READY_SELECTOR,
+        settle: float = 1.0,
+        poll_interval: float = 0.05,
+        on_open: Optional[Callable[[object], None]] = None,
+    ):
+        """
+        Initialize pool (tabs are opened on first use).
+
+        Args:
+            driver: Selenium driver whose browser hosts the tabs
+            size: Number of tabs
+            timeout: Seconds a page may take before its tab is reset
+            ready_selector: CSS selector present once a page is usable
+            settle: Seconds a loaded page without the selector is given to render it
+            poll_interval: Pause between two polls of the tabs
+            on_open: Called with the driver after it switched to a newly opened tab
+        """
+        self.driver = driver
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.ready_selector = ready_selector
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.on_open = on_open
+        self._handles: List[str] = []
+
+    def _open(self) -> None:
+        """Open the missing tabs (the driver's current window is the first)."""
+        if not self._handles:
+            self._handles.append(self.driver.current_window_handle)
+        while len(self._handles) < self.size:
+            self._handles.append(self._new_tab())
+
+    def _new_tab(self) -> str:
+        """Open a tab and switch to it."""
+        self.driver.switch_to.new_window("tab")
+        if self.on_open is not None:
+            self.on_open(self.driver)
+        return self.driver.current_window_handle
+
+    def _reset(self, handle: str) -> str:
+        """Close a tab and open a fresh one in its place."""
+        TAB_RESETS.inc()
+        # open first: closing the last tab would end the browser session
+        fresh = self._new_tab()
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except WebDriverException as e:
+            logger.debug("Closing tab failed: %s", e)
+        self.driver.switch_to.window(fresh)
+        self._handles[self._handles.index(handle)] = fresh
+        return fresh
+
+    def fetch(
+        self, urls: Iterable[str], read: Optional[Callable[[Any], Any]] = None
+    ) -> Iterator[TabPage]:
+        """
+        Load pages across the tabs, yielding each one when it is ready.
+
+        Pages come back in completion order, not request order.
+
+        Args:
+            urls: Pages to load
+            read: Reads a ready page from the driver (its page_source if None)
+
+        Yields:
+            TabPage per URL (content None for pages that timed out)
+        """
+        self._open()
+        pending: Deque[str] = deque(urls)
+        idle: Deque[str] = deque(self._handles)
+        # handle -> (url, navigation start, first time loaded without the selector)
+        active: Dict[str, Tuple[str, float, Optional[float]]] = {}
+        while pending or active:
+            while pending and idle:
+                handle, url = idle.popleft(), pending.popleft()
+                self.driver.switch_to.window(handle)
+                self.driver.execute_script(_NAVIGATE, url)
+                active[handle] = (url, time.time(), None)
+
+            for handle, (url, started, loaded) in list(active.items()):
+                self.driver.switch_to.window(handle)
+                now = time.time()
+                state = self.driver.execute_script(_STATE, self.ready_selector)
+                if state == "complete" and loaded is None:
+                    active[handle] = (url, started, now)
+                settled = state == "complete" and loaded and now - loaded >= self.settle
+                if state == "ready" or settled:
+                    PAGES_FETCHED.labels("lot").inc()
+                    content = read(self.driver) if read else self.driver.page_source
+                    page = TabPage(url, content, started, time.time())
+                    idle.append(handle)
+                elif now - started >= self.timeout:
+                    logger.warning(
+                        "Tab timed out after %.0fs on %s, resetting it", now - started, url
+                    )
+                    page = TabPage(url, None, started, time.time())
+                    idle.append(self._reset(handle))
+                else:
+                    continue
+                del active[handle]
+                yield page
+
+            if active:
+                time.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        """Close every tab but the first."""
+        for handle in self._handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except WebDriverException:
+                pass
+        if self._handles:
+            self.driver.switch_to.window(self._handles[0])
+        self._handles = self._handles[:1]
@@ -7,6 +7,9 @@ from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 
+from src.metrics.instruments import STORE_ITEMS
+from src.metrics.latency import mark_stage
+from src.metrics.profiling import timed
 from src.storage.models import WatchItem
 from src.utils.logger import logger
 
@@ -32,6 +35,7 @@ class JSONStorage:
             self.save([])
             logger.info(f"Created new storage file: {self.file_path}")
 
+    @timed("store")
     def load(self) -> List[WatchItem]:
         """
         Load all items from storage.
@@ -52,6 +56,7 @@ class JSONStorage:
             logger.error(f"Error loading items: {e}")
             return []
 
+    @timed("store")
     def save(self, items: List[WatchItem]) -> bool:
         """
         Save items to storage.
@@ -73,6 +78,7 @@ class JSONStorage:
             data = [item.to_dict() for item in items]
             with open(self.file_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            STORE_ITEMS.set(len(items))
 
             logger.info(f"Saved {len(items)} items to {self.file_path}")
             return True
@@ -92,6 +98,7 @@ class JSONStorage:
             True if successful
         """
         items = self.load()
+        mark_stage(item.timings, "stored")
         items.append(item)
         return self.save(items)
 
@@ -108,6 +115,7 @@ class JSONStorage:
         items = self.load()
         for i, item in enumerate(items):
             if item.url == updated_item.url:
+                mark_stage(updated_item.timings, "stored")
                 items[i] = updated_item
                 self.save(items)
                 logger.debug(f"Updated item: {updated_item.url}")
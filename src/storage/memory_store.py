@@ -0,0 +1,209 @@
+"""
+In-memory item store shared by the tasks of one process.
+
+Items are kept as the dictionaries the scraper produces, keyed by URL.
+Writers publish change events to subscriber queues, so consumers react to
+new data instead of re-reading a file. The store is written to disk as a
+snapshot in the items.json format, periodically and on shutdown.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.metrics.instruments import STORE_ITEMS
+from src.metrics.latency import mark_stage
+from src.metrics.profiling import span
+from src.utils.logger import logger
+from src.utils.time_utils import get_total_seconds
+
+# Fields that change on every visit and are not reported as changes
+VOLATILE_FIELDS = ("pull_time", "timings")
+
+
+def _copy(item: Dict) -> Dict:
+    """Copy an item, including its nested stage timings."""
+    return {**item, "timings": dict(item.get("timings") or {})}
+
+
+@dataclass
+class ItemEvent:
+    """
+    A change in the store.
+
+    Attributes:
+        kind: "added", "changed" or "removed"
+        url: URL of the item
+        changes: Changed fields as (old, new) pairs (empty for removals)
+        at: Time of the change
+    """
+
+    kind: str
+    url: str
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    at: float = field(default_factory=time.time)
+
+
+class ItemStore:
+    """
+    Thread-safe item store with change events and disk snapshots.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, queue_size: int = 10000):
+        """
+        Initialize store.
+
+        Args:
+            snapshot_path: File the store is snapshotted to (no snapshots if None)
+            queue_size: Capacity of each subscriber queue
+        """
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.queue_size = queue_size
+        self._items: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+        self._dirty = False
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._items
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Create a queue receiving every later ItemEvent.
+
+        A full queue drops events, so a slow consumer never blocks writers;
+        consumers should re-scan the store when they fall behind.
+        """
+        events: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.append(events)
+        return events
+
+    def _publish(self, event: ItemEvent) -> None:
+        """Send an event to every subscriber."""
+        for events in self._subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                logger.debug("Event queue full, dropped %s event", event.kind)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Copy of the item stored under a URL, or None."""
+        with self._lock:
+            item = self._items.get(url)
+            return _copy(item) if item is not None else None
+
+    def items(self) -> List[Dict]:
+        """Copies of all items, in insertion order."""
+        with self._lock:
+            return [_copy(item) for item in self._items.values()]
+
+    def upsert(self, item: Dict) -> Optional[ItemEvent]:
+        """
+        Add an item or replace the stored version of it.
+
+        Args:
+            item: Item dictionary (its "url" is the key); the store keeps a copy
+
+        Returns:
+            The published event, or None if nothing but volatile fields changed
+        """
+        item = _copy(item)
+        mark_stage(item["timings"], "stored")
+        with self._lock:
+            old = self._items.get(item["url"])
+            self._items[item["url"]] = item
+            self._dirty = True
+            self.version += 1
+            STORE_ITEMS.set(len(self._items))
+        if old is None:
+            event = ItemEvent("added", item["url"])
+        else:
+            changes = {
+                key: (old.get(key), value)
+                for key, value in item.items()
+                if key not in VOLATILE_FIELDS and old.get(key) != value
+            }
+            if not changes:
+                return None
+            event = ItemEvent("changed", item["url"], changes)
+        self._publish(event)
+        return event
+
+    def remove(self, url: str) -> bool:
+        """
+        Remove an item.
+
+        Returns:
+            True if the item was stored
+        """
+        with self._lock:
+            if self._items.pop(url, None) is None:
+                return False
+            self._dirty = True
+            self.version += 1
+            STORE_ITEMS.set(len(self._items))
+        self._publish(ItemEvent("removed", url))
+        return True
+
+    def load(self) -> int:
+        """
+        Fill the store from the snapshot file (no events are published).
+
+        Returns:
+            Number of items loaded
+        """
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return 0
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load snapshot {self.snapshot_path}: {e}")
+            return 0
+        with self._lock:
+            for item in data:
+                self._items[item["url"]] = item
+            STORE_ITEMS.set(len(self._items))
+        logger.info(f"Loaded {len(data)} items from {self.snapshot_path}")
+        return len(data)
+
+    def snapshot(self, force: bool = False) -> bool:
+        """
+        Write the store to the snapshot file if it changed since the last one.
+
+        Items are sorted by remaining time, like the scraper's items.json. The
+        file is replaced atomically, so readers never see a partial write.
+
+        Args:
+            force: Write even if nothing changed
+
+        Returns:
+            True if a snapshot was written
+        """
+        if self.snapshot_path is None or not (self._dirty or force):
+            return False
+        with self._lock:
+            items = list(self._items.values())
+            self._dirty = False
+        items.sort(key=lambda x: get_total_seconds(x["time"]) if x["time"] != "No time" else 1e12)
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            with span("store"):
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_text(json.dumps(items), encoding="utf-8")
+                os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            self._dirty = True
+            logger.error(f"Failed to write snapshot {self.snapshot_path}: {e}")
+            return False
+        logger.debug("Snapshot of %d items written to %s", len(items), self.snapshot_path)
+        return True
@@ -21,6 +21,7 @@ class WatchItem:
         pull_time: Unix timestamp when data was scraped
         reserve_price: Reserve price status
         item_id: Optional unique identifier
+        timings: Pipeline stage timestamps (see src.metrics.latency)
     """
 
     title: str
@@ -31,6 +32,7 @@ class WatchItem:
     pull_time: float
     reserve_price: str
     item_id: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
 
     def __post_init__(self):
         """Generate item_id from URL if not provided."""
@@ -135,6 +137,23 @@ class DealAlert:
     message: str
     created_at: datetime = field(default_factory=datetime.now)
 
+    @property
+    def lot_id(self) -> str:
+        """Identifier of the alerted lot."""
+        return self.item.item_id or self.item.url
+
+    @property
+    def idempotency_key(self) -> str:
+        """
+        Key identifying this alert across restarts.
+
+        New and closing alerts are sent once per lot; updates once per
+        distinct price/reserve state.
+        """
+        if self.alert_type == "updated":
+            return f"{self.lot_id}:updated:{self.item.price}:{self.item.reserve_price}"
+        return f"{self.lot_id}:{self.alert_type}"
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -143,3 +162,13 @@ class DealAlert:
             "message": self.message,
             "created_at": self.created_at.isoformat(),
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DealAlert":
+        """Create DealAlert from dictionary."""
+        return cls(
+            item=WatchItem.from_dict(data["item"]),
+            alert_type=data["alert_type"],
+            message=data["message"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+        )
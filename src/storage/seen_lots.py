@@ -0,0 +1,131 @@
+"""
+Lots already crawled, with their last-known closing time.
+
+The listing is sorted by closing date, latest first, and a new lot closes
+later than the lots listed before it, so new lots are at the top. An
+incremental crawl reads the listing only until CRAWL_KNOWN_RUN lots in a
+row are in the seen-set, and fetches only the lots that are not. A lot
+leaves the set once it has ended, so the file stays the size of the
+listing. A listing URL without that sort (see sorted_by_closing()) gets
+full crawls only, since a run of known lots says nothing there.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from src.analyzer.dedup import lot_id_from_url
+from src.analyzer.offers import remaining_seconds
+from src.utils.logger import logger
+
+# Listing order an incremental crawl relies on (closing date, latest first)
+LISTING_SORT = "bidding_end_desc"
+
+
+def lot_key(url: str) -> str:
+    """The lot ID of a lot URL (the URL itself if it has none)."""
+    return lot_id_from_url(url) or url
+
+
+def sorted_by_closing(listing_url: str) -> bool:
+    """Whether a listing URL lists the lots closing latest first (new lots on top)."""
+    return parse_qs(urlsplit(listing_url).query).get("sort") == [LISTING_SORT]
+
+
+class SeenLots:
+    """
+    Persistent set of crawled lot IDs and their closing times.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        """
+        Initialize seen-set.
+
+        Args:
+            file_path: Optional JSON file used to persist the set
+        """
+        self.file_path = Path(file_path) if file_path else None
+        # lot ID -> closing time (None for a lot without a countdown)
+        self._end_times: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+
+        if self.file_path and self.file_path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._end_times)
+
+    def __contains__(self, lot_id: str) -> bool:
+        return lot_id in self._end_times
+
+    def end_time(self, lot_id: str) -> Optional[float]:
+        """Last-known closing time of a lot (None if unknown)."""
+        return self._end_times.get(lot_id)
+
+    def record(self, item: Dict) -> None:
+        """Add a scraped lot, or update its closing time."""
+        remaining = remaining_seconds(item)
+        end_time = item["pull_time"] + remaining if remaining is not None else None
+        with self._lock:
+            self._end_times[lot_key(item["url"])] = end_time
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Forget the lots that have ended; they no longer appear in the listing.
+
+        Returns:
+            Number of lots removed
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            ended = [key for key, end in self._end_times.items() if end is not None and end < now]
+            for key in ended:
+                del self._end_times[key]
+        return len(ended)
+
+    def save(self) -> bool:
+        """
+        Persist the set to the configured file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.file_path:
+            return False
+        try:
+            with self._lock:
+                data = {"updated_at": time.time(), "lots": dict(self._end_times)}
+            tmp_path = self.file_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.file_path)
+            logger.debug(f"Saved {len(data['lots'])} seen lots")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save seen lots: {e}")
+            return False
+
+    def load(self) -> bool:
+        """
+        Load the set from the configured file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._end_times = dict(data["lots"])
+            logger.debug(f"Loaded {len(self._end_times)} seen lots")
+            return True
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.error(f"Failed to parse seen lots from {self.file_path}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error loading seen lots: {e}")
+            return False
@@ -1,17 +1,148 @@
 """
 Logging configuration and utilities.
+
+Records are handed to a background writer through a bounded queue, so the
+scraping and alerting loops never wait on console or file I/O. Messages are
+formatted on the writer thread: pass arguments lazily
+(logger.debug("Parsed %s", url)) rather than with f-strings in hot paths.
+Debug records are rate limited per call site and can be sampled.
 """
 
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import (
+    LOG_ASYNC,
+    LOG_DEBUG_RATE,
+    LOG_DEBUG_SAMPLE,
+    LOG_FILE,
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+)
+
+# Attributes of every LogRecord; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listeners: List[QueueListener] = []
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    Fields passed with `extra` (e.g. extra={"lot_id": "123"}) are included.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "func": record.funcName,
+            "line": record.lineno,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class DebugRateFilter(logging.Filter):
+    """
+    Rate limits and samples debug records per call site.
+
+    Each call site (file and line) gets a token bucket of `rate` records per
+    second; records above it are dropped. Records that pass are kept with
+    probability `sample`. Records above DEBUG are never filtered.
+    """
+
+    def __init__(self, rate: float = LOG_DEBUG_RATE, sample: float = LOG_DEBUG_SAMPLE):
+        """
+        Initialize filter.
+
+        Args:
+            rate: Debug records per second per call site (0 disables the limit)
+            sample: Fraction of debug records kept
+        """
+        super().__init__()
+        self.rate = rate
+        self.sample = sample
+        self.dropped = 0
+        self._buckets: Dict[Tuple[str, int], Tuple[float, float]] = {}
+        self._lock = threading.Lock()
 
-from src.config.settings import LOG_LEVEL, LOG_FILE
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample < 1.0 and random.random() >= self.sample:
+            self.dropped += 1
+            return False
+        if self.rate <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self.dropped += 1
+                return False
+            self._buckets[key] = (tokens - 1, now)
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the caller.
+
+    Records are enqueued as they are (formatting happens on the writer
+    thread); when the queue is full they are dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _stop_listeners() -> None:
+    """Flush queued records at exit."""
+    while _listeners:
+        try:
+            _listeners.pop().stop()
+        except queue.Full:
+            pass
 
 
 def setup_logger(
-    name: str = "catawiki_scraper", log_file: Optional[str] = None, level: Optional[str] = None
+    name: str = "catawiki_scraper",
+    log_file: Optional[str] = None,
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
 ) -> logging.Logger:
     """
     Configure and return a logger instance.
@@ -20,6 +151,8 @@ def setup_logger(
         name: Logger name
         log_file: Optional log file path (uses config default if None)
         level: Log level (uses config default if None)
+        log_format: "text" or "json" (uses config default if None)
+        use_queue: Write through a background thread (uses config default if None)
 
     Returns:
         Configured logger instance
@@ -35,22 +168,28 @@ def setup_logger(
         return logger
 
     # Create formatters
-    detailed_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    simple_formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S"
-    )
+    if (log_format or LOG_FORMAT) == "json":
+        detailed_formatter = simple_formatter = JsonFormatter()
+    else:
+        detailed_formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+        simple_formatter = logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S"
+        )
+
+    handlers: List[logging.Handler] = []
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler
     file_path = log_file or LOG_FILE
+    file_error = None
     if file_path:
         try:
             # Ensure log directory exists
@@ -60,9 +199,27 @@ def setup_logger(
             file_handler = logging.FileHandler(file_path, encoding="utf-8")
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(detailed_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
-            logger.warning(f"Could not setup file logging: {e}")
+            file_error = e
+
+    # Debug records are thinned out before they are queued
+    logger.addFilter(DebugRateFilter())
+
+    if LOG_ASYNC if use_queue is None else use_queue:
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        logger.addHandler(NonBlockingQueueHandler(log_queue))
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        if not _listeners:
+            atexit.register(_stop_listeners)
+        _listeners.append(listener)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    if file_error:
+        logger.warning(f"Could not setup file logging: {file_error}")
 
     return logger
 
@@ -0,0 +1,52 @@
+"""
+Shared test fixtures.
+"""
+
+import time
+from typing import Callable, Optional
+
+import pytest
+
+from src.storage.models import WatchItem
+
+
+def build_item(
+    lot: int = 1,
+    price: str = "5 000 €",
+    remaining: str = "20m",
+    title: Optional[str] = None,
+    **fields,
+) -> dict:
+    """
+    Build a scraped item dictionary for a lot.
+
+    Args:
+        lot: Lot ID, also used in the default title and the URL
+        price: Current bid text
+        remaining: Countdown text
+        title: Lot title ("Rolex Submariner <lot>" if None)
+        **fields: Other fields to override (estimated_price, pull_time, ...)
+    """
+    item = {
+        "title": title if title is not None else f"Rolex Submariner {lot}",
+        "price": price,
+        "time": remaining,
+        "url": f"https://www.catawiki.com/fr/l/{lot}-watch",
+        "estimated_price": "9 000 € - 11 000 €",
+        "pull_time": time.time(),
+        "reserve_price": "No reserve price",
+    }
+    item.update(fields)
+    return item
+
+
+@pytest.fixture
+def make_item() -> Callable[..., dict]:
+    """Factory of scraped item dictionaries (see build_item)."""
+    return build_item
+
+
+@pytest.fixture
+def make_watch_item() -> Callable[..., WatchItem]:
+    """Factory of WatchItems, with the arguments of build_item."""
+    return lambda *args, **kwargs: WatchItem.from_dict(build_item(*args, **kwargs))
@@ -0,0 +1,37 @@
+"""
+Tests for the scale benchmark suite.
+"""
+
+from src.bench.scale import CASES, compare, load_results, make_items, run_suite, save_results
+
+
+class TestScaleBenchmark:
+    """Test suite for the models/analyzer/storage benchmarks."""
+
+    def test_dataset_is_reproducible_and_parseable(self):
+        """Test that synthetic items are deterministic and mostly well-formed."""
+        items = make_items(500, seed=3)
+        again = make_items(10, seed=3)
+        assert [(i.title, i.price, i.time) for i in items[:10]] == [
+            (i.title, i.price, i.time) for i in again
+        ]
+        prices = [item.get_price_numeric() for item in items]
+        assert sum(p is not None for p in prices) > 450
+        assert sum(item.get_estimated_range() is not None for item in items) > 400
+
+    def test_suite_runs_every_case(self):
+        """Test that every case runs on a small dataset."""
+        results = run_suite(sizes=[50], rounds=1)
+        assert set(results) == {f"{case.name}[50]" for case in CASES}
+
+    def test_saved_runs_flag_regressions(self, tmp_path):
+        """Test that a slower run is reported against the saved baseline."""
+        baseline = {"storage.load[1000]": {"median_s": 0.010}, "model[1000]": {"median_s": 0.002}}
+        save_results(baseline, "v1", str(tmp_path))
+        saved = load_results(None, str(tmp_path))
+        assert saved["version"] == "v1"
+
+        current = {"storage.load[1000]": {"median_s": 0.015}, "model[1000]": {"median_s": 0.002}}
+        rows = {row["case"]: row for row in compare(current, saved["results"], threshold=0.2)}
+        assert rows["storage.load[1000]"]["regression"]
+        assert not rows["model[1000]"]["regression"]
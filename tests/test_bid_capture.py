@@ -0,0 +1,210 @@
+"""
+Tests for bid capture from network responses.
+"""
+
+import json
+import time
+
+from src.scraper.bid_capture import BidCapture, BidStatus, PinnedLots, parse_bid_payload
+
+API_URL = "https://www.catawiki.com/buyer/api/v1/lots/live?ids=101"
+
+
+class FakeSwitchTo:
+    """Window switching of FakeCaptureDriver."""
+
+    def __init__(self, driver: "FakeCaptureDriver"):
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind: str) -> None:
+        handle = f"target-{len(self.driver.window_handles)}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+
+class FakeCaptureDriver:
+    """Stand-in for a Chrome driver with a performance log of API responses."""
+
+    def __init__(self):
+        self.window_handles = ["target-0"]
+        self.current_window_handle = "target-0"
+        self.switch_to = FakeSwitchTo(self)
+        self.log = []
+        self.bodies = {}
+        self.loaded = []
+
+    def respond(self, url: str, payload, kind: str = "XHR") -> None:
+        """Log a finished response with a JSON body in the current tab."""
+        request_id = str(len(self.bodies))
+        self.bodies[request_id] = (self.current_window_handle, json.dumps(payload))
+        for method, params in (
+            (
+                "Network.responseReceived",
+                {"requestId": request_id, "type": kind, "response": {"url": url}},
+            ),
+            ("Network.loadingFinished", {"requestId": request_id}),
+        ):
+            message = {"message": {"method": method, "params": params}}
+            message["webview"] = self.current_window_handle
+            self.log.append({"message": json.dumps(message)})
+
+    def get_log(self, kind: str):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, command: str, params: dict):
+        handle, body = self.bodies[params["requestId"]]
+        assert handle == self.current_window_handle
+        return {"body": body, "base64Encoded": False}
+
+    def get(self, url: str) -> None:
+        self.loaded.append(url)
+
+    def close(self) -> None:
+        self.window_handles.remove(self.current_window_handle)
+
+
+def lot_payload(lot: int, amount: int, reserve: bool = False) -> dict:
+    """API payload of one lot."""
+    return {
+        "lots": [
+            {
+                "id": lot,
+                "current_bid_amount": {"EUR": amount, "USD": amount * 1.1},
+                "reserve_price_met": reserve,
+                "bidding_end_time": "2030-01-01T12:00:00Z",
+            }
+        ]
+    }
+
+
+class TestParseBidPayload:
+    """Test suite for parse_bid_payload."""
+
+    def test_nested_lots_are_found(self):
+        """Test that lots at any depth are read with euro amounts and ISO end times."""
+        statuses = parse_bid_payload({"data": lot_payload(101, 450, reserve=True)}, 0.0)
+
+        assert statuses == [BidStatus("101", 450.0, True, 1893499200.0, 0.0)]
+
+    def test_objects_without_amount_are_ignored(self):
+        """Test that objects missing an ID or a bid amount are not lots."""
+        assert parse_bid_payload({"id": 1, "title": "Omega", "bids": []}) == []
+
+
+class TestBidStatus:
+    """Test suite for BidStatus.apply."""
+
+    def test_item_fields_are_updated(self):
+        """Test that price, reserve and countdown of an item follow the status."""
+        item = {
+            "price": "300 €",
+            "reserve_price": "Reserve price not reached",
+            "time": "1h",
+            "pull_time": 0.0,
+            "timings": {"fetched": 0.0},
+        }
+        status = BidStatus("101", 450.0, True, 1000.0 + 3600 + 120, 1000.0)
+
+        updated = status.apply(item)
+
+        assert updated["price"] == "450 €"
+        assert updated["reserve_price"] == "Reserve price reached"
+        assert updated["time"] == "1h 2m"
+        assert updated["pull_time"] == 1000.0
+        assert item["timings"] == {"fetched": 0.0}
+
+
+class TestBidCapture:
+    """Test suite for BidCapture."""
+
+    def test_matching_api_responses_are_read(self):
+        """Test that only XHR/fetch responses matching the patterns are parsed."""
+        driver = FakeCaptureDriver()
+        capture = BidCapture(driver, patterns=["*catawiki.com/buyer/api/*"])
+        driver.respond(API_URL, lot_payload(101, 450))
+        driver.respond("https://www.example.com/api", lot_payload(102, 10))
+        driver.respond(API_URL, lot_payload(103, 20), kind="Document")
+
+        statuses = capture.poll()
+
+        assert [status.lot_id for status in statuses] == ["101"]
+        assert capture.poll() == []
+
+
+class TestPinnedLots:
+    """Test suite for PinnedLots."""
+
+    def test_only_changes_of_pinned_lots_are_reported(self):
+        """Test that pinned tabs report new bids once and unpinned lots are ignored."""
+        driver = FakeCaptureDriver()
+        pinned = PinnedLots(driver, BidCapture(driver, patterns=["*/buyer/api/*"]))
+        url = "https://www.catawiki.com/fr/l/101-omega"
+        pinned.pin(url)
+        pinned.pin(url)
+
+        driver.respond(API_URL, lot_payload(101, 450))
+        driver.respond(API_URL, lot_payload(999, 10))
+        first = pinned.poll()
+        driver.respond(API_URL, lot_payload(101, 450))
+        repeated = pinned.poll()
+        driver.switch_to.window("target-0")
+        driver.respond(API_URL, lot_payload(101, 500))
+        raised = pinned.poll()
+
+        assert driver.loaded == [url]
+        assert [status.amount for status in first] == [450.0]
+        assert repeated == []
+        assert [pinned.url_of(status) for status in raised] == [url]
+
+        pinned.unpin(url)
+        assert url not in pinned
+        assert driver.window_handles == ["target-0"]
+
+
+class TestDaemonBidWatch:
+    """Test suite for the daemon's bid capture task."""
+
+    def test_pinned_lot_updates_store_and_skips_recheck(self, tmp_path):
+        """Test that a pinned lot's bid change is stored and the rechecker leaves it alone."""
+        from src.analyzer.price_stats import PriceStatistics
+        from src.daemon import ScraperDaemon
+        from src.metrics.latency import LatencyTracker
+        from src.notifications.base import create_notifier
+        from src.notifications.outbox import NotificationOutbox
+        from src.storage.memory_store import ItemStore
+
+        fetched = []
+        daemon = ScraperDaemon(
+            store=ItemStore(),
+            fetch_links=lambda url, known=None: [],
+            fetch_item=lambda url: fetched.append(url),
+            notifier=create_notifier("file", file_path=str(tmp_path / "out.jsonl")),
+            outbox=NotificationOutbox(str(tmp_path / "outbox.db")),
+            price_stats=PriceStatistics(),
+            latency=LatencyTracker(),
+        )
+        item = {
+            "title": "Rolex Submariner",
+            "price": "5 000 €",
+            "time": "20m",
+            "url": "https://www.catawiki.com/fr/l/101-rolex",
+            "estimated_price": "9 000 € - 11 000 €",
+            "pull_time": time.time(),
+            "reserve_price": "No reserve price",
+        }
+        daemon.store.upsert(item)
+        driver = FakeCaptureDriver()
+        pinned = PinnedLots(driver, BidCapture(driver, patterns=["*/buyer/api/*"]))
+
+        daemon.watch_bids_once(pinned)
+        driver.respond(API_URL, lot_payload(101, 5600))
+        updated = daemon.watch_bids_once(pinned)
+
+        assert updated == 1
+        assert daemon.store.get(item["url"])["price"] == "5 600 €"
+        assert daemon.recheck_once() == 0
+        assert fetched == []
@@ -0,0 +1,45 @@
+"""
+Tests for network-level request blocking.
+"""
+
+from src.scraper.blocking import REQUIRED_URLS, RequestBlocker, pattern_matches
+
+
+class TestPatternMatches:
+    """Test suite for DevTools URL pattern matching."""
+
+    def test_wildcards_match_whole_url(self):
+        """Test that '*' matches any text and the rest must match literally."""
+        assert pattern_matches("*.woff2", "https://cdn.example.com/font.woff2")
+        assert not pattern_matches("*.woff2", "https://cdn.example.com/font.woff2.js")
+        assert pattern_matches("*hotjar.com/*", "https://static.hotjar.com/c/hotjar-1.js?sv=6")
+        assert not pattern_matches("*.png", "https://cdn.example.com/a?png")
+
+
+class TestRequestBlocker:
+    """Test suite for RequestBlocker."""
+
+    def test_resource_types_become_patterns(self):
+        """Test that resource types block their files, query strings included."""
+        blocker = RequestBlocker(resources=["image", "font"], urls=[])
+
+        assert blocker.blocks("https://assets.catawiki.com/image/cw_ldp_l/plain/lot.jpg?w=800")
+        assert blocker.blocks("https://www.catawiki.com/fonts/inter.woff2")
+        assert not blocker.blocks("https://www.catawiki.com/styles/main.css")
+
+    def test_defaults_keep_what_extraction_needs(self):
+        """Test that the default settings block analytics but no required request."""
+        blocker = RequestBlocker()
+
+        assert blocker.blocks("https://www.googletagmanager.com/gtm.js?id=GTM-XXXX")
+        assert not any(blocker.blocks(url) for url in REQUIRED_URLS)
+
+    def test_patterns_blocking_required_requests_are_dropped(self):
+        """Test that a too-broad pattern is ignored instead of breaking extraction."""
+        blocker = RequestBlocker(resources=["unknown"], urls=["*catawiki.com/*", "*ads.example/*"])
+
+        assert blocker.patterns == ["*ads.example/*"]
+
+    def test_empty_blocker_is_falsy(self):
+        """Test that a blocker without patterns reports that it blocks nothing."""
+        assert not RequestBlocker(resources=[], urls=[])
@@ -0,0 +1,100 @@
+"""
+Tests for browser driver recycling.
+"""
+
+import os
+import time
+
+from src.scraper.browser import BrowserManager, process_tree_rss
+
+
+class FakeDriver:
+    """Stand-in for a Chrome driver recording whether it was quit."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.quit_called = False
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class FakeBrowserManager(BrowserManager):
+    """BrowserManager launching fake drivers with a settable memory use."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.launched = []
+        self.memory = 0
+
+    def _create_driver(self):
+        driver = FakeDriver(len(self.launched))
+        self.launched.append(driver)
+        return driver
+
+    def driver_rss(self, driver):
+        return self.memory
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestBrowserManager:
+    """Test suite for BrowserManager driver recycling."""
+
+    def test_recycled_after_max_pages_using_spare(self):
+        """Test that a driver is replaced after max_pages by the pre-launched spare."""
+        browser = FakeBrowserManager(max_pages=10, max_rss_mb=0, warm_spare=True)
+
+        drivers = [browser.get_driver() for _ in range(10)]
+        assert all(driver is drivers[0] for driver in drivers)
+        assert wait_for(lambda: len(browser.launched) == 2)
+
+        replacement = browser.get_driver()
+
+        assert replacement is browser.launched[1]
+        assert wait_for(lambda: drivers[0].quit_called)
+        assert browser.pages == 1
+        browser.close()
+        assert replacement.quit_called
+
+    def test_recycled_when_memory_exceeds_limit(self):
+        """Test that memory is checked every rss_check_every pages against max_rss_mb."""
+        browser = FakeBrowserManager(
+            max_pages=0, max_rss_mb=100, rss_check_every=5, warm_spare=False
+        )
+        first = browser.get_driver()
+
+        browser.memory = 200 * 1024 * 1024
+        assert all(browser.get_driver() is first for _ in range(4))
+        second = browser.get_driver()
+
+        assert second is not first
+        assert len(browser.launched) == 2
+
+    def test_discard_replaces_crashed_driver(self):
+        """Test that a discarded driver is quit and replaced on the next page."""
+        browser = FakeBrowserManager(max_pages=0, max_rss_mb=0, warm_spare=False)
+        crashed = browser.get_driver()
+
+        browser.discard()
+
+        assert browser.get_driver() is not crashed
+        assert wait_for(lambda: crashed.quit_called)
+
+
+class TestProcessTreeRss:
+    """Test suite for process_tree_rss."""
+
+    def test_current_process_has_memory(self):
+        """Test that the test process itself reports a plausible resident size."""
+        rss = process_tree_rss(os.getpid())
+
+        assert rss is None or rss > 1024 * 1024
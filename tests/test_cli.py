@@ -0,0 +1,81 @@
+"""
+Tests for the command-line entry point.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.cli import main
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_items(path, items):
+    """Write raw item dictionaries as the scraper stores them."""
+    path.write_text(json.dumps(items), encoding="utf-8")
+    return str(path)
+
+
+class TestAnalyzeCommand:
+    """Test suite for the analyze subcommand."""
+
+    def test_lists_good_deals_best_first(self, tmp_path, capsys, make_item):
+        """Test that good deals are printed, cheapest relative to estimate first."""
+        items_file = write_items(
+            tmp_path / "items.json",
+            [
+                make_item(1, "8 000 €", title="Omega Speedmaster"),
+                make_item(2, "5 000 €", title="Rolex Submariner"),
+                make_item(3, "9 900 €", title="Expensive Watch"),
+            ],
+        )
+
+        assert main(["analyze", "--file", items_file]) == 0
+
+        output = capsys.readouterr().out
+        assert output.index("Rolex") < output.index("Omega")
+        assert "Expensive Watch" not in output
+        assert "2 good deal(s) out of 3 item(s)" in output
+
+    def test_threshold_option(self, tmp_path, capsys, make_item):
+        """Test that --threshold overrides the configured price ratio."""
+        items_file = write_items(tmp_path / "items.json", [make_item(1, "8 000 €", title="Omega")])
+
+        main(["analyze", "--file", items_file, "--threshold", "0.5"])
+
+        assert "0 good deal(s) out of 1 item(s)" in capsys.readouterr().out
+
+
+class TestLazyImports:
+    """Test suite for startup cost of the CLI."""
+
+    def test_analyze_without_heavy_dependencies_or_credentials(self, tmp_path):
+        """Test that analyze loads neither Selenium nor Telegram and needs no token."""
+        items_file = write_items(tmp_path / "items.json", [])
+        code = (
+            "import sys; from src.cli import main; "
+            f"main(['analyze', '--file', {items_file!r}]); "
+            "print(sorted(m for m in ('selenium', 'bs4', 'telegram') if m in sys.modules))"
+        )
+        env = {"PATH": os.environ.get("PATH", ""), "LOG_FILE": str(tmp_path / "log.txt")}
+
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert "[]" in result.stdout.splitlines()
+
+    def test_unknown_command_is_rejected(self):
+        """Test that an unknown subcommand exits with a usage error."""
+        with pytest.raises(SystemExit):
+            main(["unknown"])
@@ -0,0 +1,96 @@
+"""
+Tests for alert coalescing.
+"""
+
+import time
+
+from src.notifications.coalescer import AlertCoalescer
+from src.notifications.messages import build_alert
+from src.notifications.outbox import Delivery, NotificationOutbox, OutboxDispatcher
+from src.storage.models import WatchItem
+
+
+def make_delivery(lot_id: int, alert_type: str, price: str = "5 000 €", chat_id: str = "1"):
+    """Build a Delivery for a lot."""
+    item = WatchItem(
+        title=f"Watch {lot_id}",
+        price=price,
+        time="20m",
+        url=f"https://www.catawiki.com/fr/l/{lot_id}-watch",
+        estimated_price="9 000 € - 11 000 €",
+        pull_time=time.time(),
+        reserve_price="No reserve price",
+    )
+    alert = build_alert(item, alert_type)
+    return Delivery(alert.idempotency_key, chat_id, alert, 0)
+
+
+class TestAlertCoalescer:
+    """Test suite for AlertCoalescer."""
+
+    def test_batches_after_window(self):
+        """Test that alerts wait for the window, then go out as one digest."""
+        coalescer = AlertCoalescer(window=10)
+        coalescer.add(make_delivery(1, "new"), now=0)
+        coalescer.add(make_delivery(2, "new"), now=1)
+
+        assert coalescer.due(now=5) == []
+        batches = coalescer.due(now=10)
+        assert len(batches) == 1
+        assert batches[0].message.startswith("DEAL DIGEST (2 lots)")
+        assert len(batches[0].deliveries) == 2
+        assert len(coalescer) == 0
+
+    def test_updates_of_same_lot_merged(self):
+        """Test that repeated alerts for a lot collapse to its latest state."""
+        coalescer = AlertCoalescer(window=10)
+        coalescer.add(make_delivery(1, "new", "5 000 €"), now=0)
+        coalescer.add(make_delivery(1, "updated", "5 500 €"), now=1)
+
+        batch = coalescer.due(now=10)[0]
+        assert batch.message.startswith("NEW OFFER FOUND")
+        assert "5 500 €" in batch.message
+        assert len(batch.deliveries) == 2
+
+    def test_closing_alert_flushes_immediately(self):
+        """Test that urgent alerts bypass the window."""
+        coalescer = AlertCoalescer(window=60)
+        coalescer.add(make_delivery(1, "new"), now=0)
+        coalescer.add(make_delivery(2, "closing"), now=1)
+
+        batches = coalescer.due(now=1)
+        assert len(batches) == 1
+        assert "[OFFER CLOSING SOON]" in batches[0].message
+
+    def test_digest_split_by_max_lots(self):
+        """Test that large buffers are split into several messages."""
+        coalescer = AlertCoalescer(window=10, max_lots=2)
+        for lot_id in range(3):
+            coalescer.add(make_delivery(lot_id, "new"), now=0)
+
+        assert len(coalescer.flush_all()) == 2
+
+
+class TestCoalescingDispatcher:
+    """Test suite for OutboxDispatcher with coalescing."""
+
+    async def test_one_call_per_recipient(self, tmp_path):
+        """Test that a burst of alerts costs one API call per recipient."""
+
+        class CountingNotifier:
+            calls = 0
+
+            async def send(self, message, chat_ids=None):
+                CountingNotifier.calls += 1
+                return {chat_id: True for chat_id in chat_ids}
+
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        for lot_id in range(5):
+            outbox.enqueue(make_delivery(lot_id, "new").alert, ["1", "2"])
+        dispatcher = OutboxDispatcher(
+            outbox, CountingNotifier(), coalescer=AlertCoalescer(window=0)
+        )
+
+        await dispatcher.dispatch_once()
+        assert CountingNotifier.calls == 2
+        assert outbox.counts()["delivered"] == 10
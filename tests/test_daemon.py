@@ -0,0 +1,133 @@
+"""
+Tests for the in-memory item store and the single-process daemon.
+"""
+
+import json
+import time
+
+from src.analyzer.price_stats import PriceStatistics
+from src.metrics.latency import LatencyTracker
+from src.notifications.base import create_notifier
+from src.notifications.outbox import NotificationOutbox
+from src.daemon import ScraperDaemon
+from src.storage.memory_store import ItemStore
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestItemStore:
+    """Test suite for ItemStore."""
+
+    def test_events_report_changes(self, make_item):
+        """Test that subscribers see additions and field changes, not volatile updates."""
+        store = ItemStore()
+        events = store.subscribe()
+
+        store.upsert(make_item(1))
+        store.upsert(make_item(1))
+        store.upsert(make_item(1, price="6 000 €"))
+
+        added, changed = events.get_nowait(), events.get_nowait()
+        assert added.kind == "added"
+        assert changed.kind == "changed"
+        assert changed.changes == {"price": ("5 000 €", "6 000 €")}
+        assert events.empty()
+
+    def test_items_are_copies(self, make_item):
+        """Test that callers cannot modify stored items in place."""
+        store = ItemStore()
+        store.upsert(make_item(1))
+
+        store.items()[0]["timings"]["analysed"] = 1.0
+
+        assert "analysed" not in store.get(make_item(1)["url"])["timings"]
+        assert "stored" in store.get(make_item(1)["url"])["timings"]
+
+    def test_snapshot_round_trip(self, tmp_path, make_item):
+        """Test that snapshots are only written when dirty and reload into a new store."""
+        path = tmp_path / "items.json"
+        store = ItemStore(str(path))
+        store.upsert(make_item(1, remaining="2h"))
+        store.upsert(make_item(2, remaining="5m"))
+
+        assert store.snapshot()
+        assert not store.snapshot()
+
+        data = json.loads(path.read_text())
+        assert [item["time"] for item in data] == ["5m", "2h"]
+        restored = ItemStore(str(path))
+        assert restored.load() == 2
+        assert make_item(1)["url"] in restored
+
+
+class TestScraperDaemon:
+    """Test suite for ScraperDaemon."""
+
+    def make_daemon(self, tmp_path, lots):
+        """Build a daemon with fake fetchers serving the given lots."""
+        fetched = []
+
+        def fetch_item(url):
+            fetched.append(url)
+            return dict(lots[url])
+
+        daemon = ScraperDaemon(
+            store=ItemStore(str(tmp_path / "items.json")),
+            fetch_links=lambda url, known=None: list(lots),
+            fetch_item=fetch_item,
+            notifier=create_notifier("file", file_path=str(tmp_path / "out.jsonl")),
+            outbox=NotificationOutbox(str(tmp_path / "outbox.db")),
+            price_stats=PriceStatistics(),
+            latency=LatencyTracker(),
+            crawl_interval=3600,
+            recheck_idle=0.1,
+            recheck_pause=0.1,
+            analyze_interval=0.1,
+            snapshot_interval=0.1,
+        )
+        return daemon, fetched
+
+    def test_crawled_deal_is_alerted_without_items_file(self, tmp_path, make_item):
+        """Test that a crawled deal reaches the outbox through store events."""
+        deal, expensive = make_item(1), make_item(2, price="9 900 €")
+        lots = {deal["url"]: deal, expensive["url"]: expensive}
+        daemon, _ = self.make_daemon(tmp_path, lots)
+
+        with daemon:
+            assert wait_for(lambda: daemon.outbox.has_alert("1", "new"))
+            assert wait_for(lambda: (tmp_path / "items.json").exists())
+
+        assert not daemon.outbox.has_alert("2", "new")
+        assert len(json.loads((tmp_path / "items.json").read_text())) == 2
+
+    def test_recheck_updates_store(self, tmp_path, make_item):
+        """Test that promising lots are re-visited and price changes stored."""
+        deal = make_item(1)
+        lots = {deal["url"]: deal}
+        daemon, fetched = self.make_daemon(tmp_path, lots)
+        daemon.store.upsert(deal)
+
+        lots[deal["url"]] = make_item(1, price="5 500 €")
+        assert daemon.recheck_once() == 1
+
+        assert fetched == [deal["url"]]
+        assert daemon.store.get(deal["url"])["price"] == "5 500 €"
+
+    def test_ended_lots_are_dropped_after_retention(self, tmp_path, make_item):
+        """Test that a crawl removes lots that ended longer ago than the retention."""
+        daemon, _ = self.make_daemon(tmp_path, {})
+        ended = make_item(3)
+        ended["pull_time"] = time.time() - 7200
+        daemon.store.upsert(ended)
+
+        daemon.crawl_once()
+
+        assert ended["url"] not in daemon.store
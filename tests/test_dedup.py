@@ -0,0 +1,62 @@
+"""
+Tests for near-duplicate lot detection.
+"""
+
+from src.analyzer.dedup import DuplicateDetector, lot_id_from_url, normalize_title
+
+
+class TestDuplicateDetector:
+    """Test suite for DuplicateDetector."""
+
+    def test_normalize_title(self):
+        """Test that punctuation, accents and stop words are dropped."""
+        assert normalize_title("Rolex - Datejust Homme - Réf. 16233") == [
+            "rolex",
+            "datejust",
+            "homme",
+            "ref",
+            "16233",
+        ]
+
+    def test_lot_id_from_url(self):
+        """Test lot ID extraction from lot URLs."""
+        assert lot_id_from_url("https://www.catawiki.com/fr/l/98500195-rolex?x=1") == "98500195"
+        assert lot_id_from_url("https://example.com/item/1") is None
+
+    def test_relisted_lot_detected(self, make_watch_item):
+        """Test that a relisted lot with a new ID is flagged."""
+        detector = DuplicateDetector()
+        detector.add_item(
+            make_watch_item(1, title="Omega - Seamaster 300M - 2531.80 - Homme - 2000")
+        )
+
+        relisted = make_watch_item(2, title="Omega - Seamaster 300M - 2531.80 - Homme - 2000")
+        assert detector.find_item_duplicate(relisted) == "1"
+
+    def test_different_lots_not_flagged(self, make_watch_item):
+        """Test that unrelated lots and different estimates are not flagged."""
+        detector = DuplicateDetector()
+        detector.add_item(
+            make_watch_item(1, title="Omega - Seamaster 300M - 2531.80 - Homme - 2000")
+        )
+
+        other_watch = make_watch_item(
+            2, title="Seiko - Presage Cocktail Time - SRPB43 - Homme - 2020"
+        )
+        cheaper_copy = make_watch_item(
+            3,
+            title="Omega - Seamaster 300M - 2531.80 - Homme - 2000",
+            estimated_price="900 € - 1 100 €",
+        )
+        assert detector.find_item_duplicate(other_watch) is None
+        assert detector.find_item_duplicate(cheaper_copy) is None
+
+    def test_lot_does_not_match_itself(self, make_watch_item):
+        """Test that an indexed lot is not reported as its own duplicate."""
+        detector = DuplicateDetector()
+        item = make_watch_item(1, title="Tudor Black Bay 58")
+        detector.add_item(item)
+
+        assert detector.find_item_duplicate(item) is None
+        detector.remove("1")
+        assert "1" not in detector
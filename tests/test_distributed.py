@@ -0,0 +1,134 @@
+"""
+Tests for the distributed work queue, workers and coordinator.
+"""
+
+import time
+
+from src.analyzer.price_stats import PriceStatistics
+from src.distributed.coordinator import Coordinator
+from src.distributed.work_queue import DEAD, LISTING, LOT, RECHECK, SQLiteWorkQueue
+from src.distributed.worker import Worker
+from src.metrics.latency import LatencyTracker
+from src.notifications.base import create_notifier
+from src.notifications.outbox import NotificationOutbox
+from src.storage.memory_store import ItemStore
+
+LISTING_URL = "https://www.catawiki.com/fr/c/333-montres"
+
+
+class TestSQLiteWorkQueue:
+    """Test suite for SQLiteWorkQueue."""
+
+    def test_claimed_jobs_are_hidden_and_deduplicated(self, tmp_path):
+        """Test that a claim hides a job from other workers and pending URLs are not re-added."""
+        path = str(tmp_path / "queue.db")
+        first, second = SQLiteWorkQueue(path), SQLiteWorkQueue(path)
+
+        assert first.put(LOT, ["a", "b"]) == 2
+        assert first.put(LOT, ["a"]) == 0
+        assert first.put(RECHECK, ["a"]) == 1
+
+        claimed = first.claim("w1", limit=2)
+        others = second.claim("w2", limit=5)
+
+        assert [job.url for job in claimed] == ["a", "b"]
+        assert [(job.kind, job.url) for job in others] == [(RECHECK, "a")]
+        assert second.counts()["leased"] == 3
+
+    def test_expired_lease_is_redelivered(self, tmp_path):
+        """Test that a crashed worker's job comes back and its late result is dropped."""
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.db"))
+        queue.put(LOT, ["a"])
+        crashed = queue.claim("w1", lease=0.05)[0]
+
+        assert queue.claim("w2") == []
+        time.sleep(0.1)
+        retried = queue.claim("w2")[0]
+
+        assert retried.id == crashed.id and retried.attempts == 2
+        assert not queue.complete(crashed, {"url": "a"})
+        assert queue.complete(retried, {"url": "a", "price": "1 €"})
+        results = queue.take_results()
+        assert [(r.url, r.result["price"], r.worker) for r in results] == [("a", "1 €", "w2")]
+        assert queue.take_results() == []
+
+    def test_failures_retry_then_give_up(self, tmp_path):
+        """Test that failed jobs are retried after a delay until max_attempts."""
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=2, retry_delay=0.05)
+        queue.put(LOT, ["a"])
+
+        assert queue.fail(queue.claim("w1")[0], "timeout")
+        assert queue.claim("w1") == []
+        time.sleep(0.1)
+        assert queue.fail(queue.claim("w1")[0], "timeout")
+
+        assert queue.counts()[DEAD] == 1
+        assert queue.put(LOT, ["a"]) == 1
+
+
+class TestWorkerAndCoordinator:
+    """Test suite for Worker and Coordinator."""
+
+    def make_coordinator(self, tmp_path, queue):
+        """Build a coordinator around a queue, with alerts written to a file."""
+        return Coordinator(
+            work_queue=queue,
+            store=ItemStore(str(tmp_path / "items.json")),
+            listing_url=LISTING_URL,
+            notifier=create_notifier("file", file_path=str(tmp_path / "out.jsonl")),
+            outbox=NotificationOutbox(str(tmp_path / "outbox.db")),
+            price_stats=PriceStatistics(),
+            latency=LatencyTracker(),
+        )
+
+    def test_listing_lots_and_rechecks_flow_through_queue(self, tmp_path, make_item):
+        """Test that workers fetch queued pages and the coordinator stores their items."""
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.db"))
+        lots = {item["url"]: item for item in (make_item(1), make_item(2, price="9 900 €"))}
+        worker = Worker(queue, fetch_links=lambda url: list(lots), fetch_item=lots.get)
+        coordinator = self.make_coordinator(tmp_path, queue)
+
+        assert coordinator.crawl_once() == 1
+        assert worker.work_once()
+        assert coordinator.apply_results() == 1
+        while worker.work_once():
+            pass
+        assert coordinator.apply_results() == 2
+        assert len(coordinator.store) == 2
+
+        # only the underpriced lot is re-checked, and only once while pending
+        assert coordinator.recheck_once() == 1
+        coordinator.recheck_once()
+        lots[make_item(1)["url"]] = make_item(1, price="6 000 €")
+        assert worker.work_once() and not worker.work_once()
+        coordinator.apply_results()
+
+        assert coordinator.store.get(make_item(1)["url"])["price"] == "6 000 €"
+        assert coordinator.analyze_once() == 1
+
+    def test_crawl_prunes_finished_jobs(self, tmp_path, make_item):
+        """Test that the coordinator removes finished jobs past the queue's retention."""
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), retention=0.01)
+        queue.put(LOT, ["a"])
+        queue.complete(queue.claim("w1")[0], make_item(1))
+        coordinator = self.make_coordinator(tmp_path, queue)
+        time.sleep(0.02)
+
+        coordinator.crawl_once()
+
+        assert queue.counts()["done"] == 0
+        assert queue.counts()["pending"] == 1
+
+    def test_failing_job_is_released(self, tmp_path):
+        """Test that a fetch error releases the job for a later retry."""
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), retry_delay=60)
+        queue.put(LISTING, [LISTING_URL])
+
+        def broken(url):
+            raise RuntimeError("chrome crashed")
+
+        worker = Worker(queue, fetch_links=broken, fetch_item=broken)
+
+        assert worker.work_once()
+        assert queue.counts()["pending"] == 1
+        assert queue.take_results() == []
@@ -0,0 +1,102 @@
+"""
+Tests for lot and listing field extraction.
+"""
+
+from bs4 import BeautifulSoup
+
+import main as scraper
+from src.scraper.extraction import (
+    LOT_FIELDS,
+    listing_cards,
+    lot_fields,
+    soup_listing_cards,
+    soup_lot_fields,
+)
+from src.scraper.fixture_server import CatawikiFixtureServer
+
+
+class ScriptDriver:
+    """Stand-in for a driver whose page scripts return a fixed result."""
+
+    def __init__(self, result, page_source: str = ""):
+        self.result = result
+        self.page_source = page_source
+        self.scripts = []
+
+    def execute_script(self, script: str, *args):
+        self.scripts.append(args)
+        return self.result
+
+
+class TestLotFields:
+    """Test suite for lot page field extraction."""
+
+    def test_soup_reads_every_field(self):
+        """Test that the texts of a lot page are read from its HTML."""
+        server = CatawikiFixtureServer(lots=1)
+        lot = server.lots[0]
+
+        fields = soup_lot_fields(BeautifulSoup(server.render_lot(lot), "html.parser"))
+
+        assert fields["title"] == lot.title
+        assert fields["time"]
+        assert "€" in fields["estimate"] and "€" in fields["price"]
+        assert fields["reserve"]
+
+    def test_missing_countdown_is_none(self):
+        """Test that an incomplete page has no time field."""
+        server = CatawikiFixtureServer(lots=1)
+        html = server.render_lot(server.lots[0], complete=False)
+
+        assert soup_lot_fields(BeautifulSoup(html, "html.parser"))["time"] is None
+
+    def test_browser_mode_returns_script_result(self):
+        """Test that the in-page script result is used without reading page_source."""
+        result = {"time": "1h", "title": "Omega", "price": None, "estimate": None, "reserve": None}
+        driver = ScriptDriver(result)
+
+        assert lot_fields(driver, mode="browser") is result
+        assert driver.scripts == [(LOT_FIELDS,)]
+
+    def test_falls_back_to_soup_without_scripts(self):
+        """Test that drivers that cannot run scripts are parsed from page_source."""
+        server = CatawikiFixtureServer(lots=1)
+        lot = server.lots[0]
+        driver = ScriptDriver(0, page_source=server.render_lot(lot))
+
+        assert lot_fields(driver, mode="browser")["title"] == lot.title
+
+    def test_fields_build_the_same_item_as_soup(self):
+        """Test that items built from extracted fields match parsing the page."""
+        server = CatawikiFixtureServer(lots=5, seed=2)
+        for lot in server.lots:
+            html = server.render_lot(lot, now=lot.ends_at - 600)
+            soup = BeautifulSoup(html, "html.parser")
+
+            parsed = scraper.parse_object_page(soup, lot.title, 0.0)
+            built = scraper.item_from_fields(soup_lot_fields(soup), lot.title, 0.0)
+
+            for key in ("title", "price", "time", "estimated_price", "reserve_price"):
+                assert parsed[key] == built[key]
+
+
+class TestListingCards:
+    """Test suite for listing page extraction."""
+
+    def test_soup_reads_cards_and_page_buttons(self):
+        """Test that lot cards and pagination links are read from a listing page."""
+        server = CatawikiFixtureServer(lots=30, per_page=10, scroll_batch=0)
+
+        listing = soup_listing_cards(BeautifulSoup(server.render_listing(2), "html.parser"))
+
+        assert [card["href"] for card in listing["cards"]] == [
+            server.lot_url(lot) for lot in server.lots[10:20]
+        ]
+        assert listing["cards"][0]["title"] == server.lots[10].title
+        assert len(listing["pages"]) == 2
+
+    def test_browser_mode_returns_script_result(self):
+        """Test that the in-page listing script result is used as is."""
+        result = {"cards": [{"href": "/fr/l/1", "title": None}], "pages": []}
+
+        assert listing_cards(ScriptDriver(result), mode="browser") is result
@@ -0,0 +1,87 @@
+"""
+Tests for the synthetic Catawiki fixture server.
+"""
+
+import contextlib
+import io
+import time
+
+import main as scraper
+from src.analyzer.offers import OfferClassifier
+from src.bench.scraper import HttpDriver
+from src.notifications.messages import build_alert
+from src.notifications.outbox import NotificationOutbox
+from src.scraper.fixture_server import CatawikiFixtureServer
+from src.storage.models import WatchItem
+
+
+class TestCatawikiFixtureServer:
+    """Test suite for CatawikiFixtureServer."""
+
+    def test_listing_crawl_follows_pagination(self):
+        """Test that the scraper collects every lot across listing pages."""
+        with CatawikiFixtureServer(lots=60, per_page=25, scroll_batch=0) as server:
+            driver = HttpDriver()
+            with contextlib.redirect_stdout(io.StringIO()):
+                links = scraper.get_object_links_with_scroll(server.listing_url, driver=driver)
+            driver.close()
+            assert sorted(links) == sorted(server.lot_url(lot) for lot in server.lots)
+            assert server.stats()["listing"] == 3
+
+    def test_listing_crawl_skips_relists_of_ended_lots(self, tmp_path, make_item):
+        """Test that cards titled like an ended alerted lot are not collected."""
+        with CatawikiFixtureServer(lots=30, per_page=25, scroll_batch=0) as server:
+            title = server.lots[3].title
+            ended = make_item(999999, remaining="1m", title=title, pull_time=time.time() - 3600)
+            outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+            outbox.enqueue(build_alert(WatchItem.from_dict(ended), "new"), ["1"])
+            driver = HttpDriver()
+            with contextlib.redirect_stdout(io.StringIO()):
+                links = scraper.get_object_links_with_scroll(
+                    server.listing_url, driver=driver, relists=OfferClassifier(outbox)
+                )
+            driver.close()
+
+            expected = [server.lot_url(lot) for lot in server.lots if lot.title != title]
+            assert sorted(links) == sorted(expected)
+            assert len(expected) < len(server.lots)
+
+    def test_lot_page_parses_like_the_live_site(self):
+        """Test that get_object_information extracts consistent fields from a lot page."""
+        with CatawikiFixtureServer(lots=3) as server:
+            lot = server.lots[0]
+            driver = HttpDriver()
+            with contextlib.redirect_stdout(io.StringIO()):
+                item = scraper.get_object_information(server.lot_url(lot), False, driver)
+            driver.close()
+
+        bid, _, reserve_state = lot.state(item["pull_time"])
+        item["estimated_price"] = item["estimated_price"].replace("\xa0", "")
+        watch_item = WatchItem.from_dict(item)
+        assert watch_item.title == lot.title
+        assert watch_item.get_price_numeric() == bid
+        assert watch_item.get_estimated_range() == (lot.low, lot.high)
+        expected_reserve = {
+            "none": "No reserve price",
+            "reached": "Reserve price reached",
+            "not_reached": "Reserve price not reached",
+        }[reserve_state]
+        assert watch_item.reserve_price == expected_reserve
+        assert watch_item.is_valid_time
+
+    def test_lots_evolve_and_failures_are_injected(self):
+        """Test that bids rise over time and injected failures are served."""
+        server = CatawikiFixtureServer(lots=50, seed=4)
+        lot = max(server.lots, key=lambda lot: len(lot.bid_times))
+        opening, _, _ = lot.state(lot.bid_times[0] - 1)
+        closing, remaining, _ = lot.state(lot.ends_at + 10)
+        assert closing > opening and remaining == 0
+        assert "<time" not in server.render_lot(lot, complete=False)
+
+        server.error_rate = 1.0
+        with server:
+            driver = HttpDriver()
+            driver.get(server.listing_url)
+            driver.close()
+            assert "Internal error" in driver.page_source
+            assert server.stats()["error"] == 1
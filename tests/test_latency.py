@@ -0,0 +1,93 @@
+"""
+Tests for scrape-to-alert latency instrumentation.
+"""
+
+import time
+
+from src.metrics.histogram import Histogram
+from src.metrics.latency import TOTAL, LatencyTracker, mark_stage, stage_durations
+from src.notifications.messages import build_alert, format_alert_message
+from src.notifications.outbox import NotificationOutbox, OutboxDispatcher
+from src.storage.models import WatchItem
+
+
+class FakeNotifier:
+    """Async notifier stand-in that always succeeds."""
+
+    async def send(self, message, chat_ids=None):
+        return {chat_id: True for chat_id in chat_ids}
+
+
+class TestHistogram:
+    """Test suite for Histogram."""
+
+    def test_quantiles_follow_observations(self):
+        """Test that quantile estimates stay within a bucket of the truth."""
+        histogram = Histogram()
+        for i in range(1, 1001):
+            histogram.observe(i / 100)  # 0.01s .. 10s
+        assert histogram.count == 1000
+        assert abs(histogram.mean - 5.005) < 1e-9
+        assert 4.0 <= histogram.quantile(0.5) <= 8.2
+        assert histogram.quantile(0.99) <= 16.4
+        assert histogram.cumulative_counts()[-1] == 1000
+
+    def test_round_trip_and_merge(self):
+        """Test that serialized histograms can be restored and merged."""
+        histogram = Histogram()
+        histogram.observe(0.5)
+        restored = Histogram.from_dict(histogram.to_dict())
+        restored.merge(histogram)
+        assert restored.count == 2
+        assert restored.sum == 1.0
+
+
+class TestLatencyTracker:
+    """Test suite for stage latency tracking."""
+
+    def test_stage_durations_skip_missing_stages(self):
+        """Test that a missing stage is counted in the next stamped one."""
+        timings = {"fetched": 100.0, "parsed": 101.0, "analysed": 105.0, "delivered": 106.5}
+        durations = stage_durations(timings)
+        assert durations == {"parsed": 1.0, "analysed": 4.0, "delivered": 1.5, TOTAL: 6.5}
+
+    def test_report_and_persistence(self, tmp_path):
+        """Test that recorded latencies survive a restart and appear in the report."""
+        file_path = str(tmp_path / "latency.json")
+        tracker = LatencyTracker(file_path)
+        tracker.record({"fetched": 0.0, "parsed": 0.5, "stored": 2.5, "delivered": 3.0})
+        assert tracker.save()
+        assert not tracker.save()  # nothing new since the last save
+
+        restored = LatencyTracker(file_path)
+        assert restored.histograms["stored"].count == 1
+        report = restored.report()
+        assert "stored" in report and "67%" in report
+
+    def test_timings_hidden_from_messages(self, make_watch_item):
+        """Test that stage timestamps do not leak into alert messages."""
+        item = make_watch_item(42)
+        mark_stage(item.timings, "fetched")
+        assert "timings" not in format_alert_message(item, "new")
+        assert WatchItem.from_dict(item.to_dict()).timings == item.timings
+
+
+class TestDispatcherLatency:
+    """Test suite for latency recording on delivery."""
+
+    async def test_delivery_records_pipeline(self, tmp_path, make_watch_item):
+        """Test that a delivered alert records every stage it went through."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        tracker = LatencyTracker()
+        item = make_watch_item(42)
+        now = time.time()
+        item.timings.update({"fetched": now - 3, "parsed": now - 2.5, "analysed": now - 1})
+        outbox.enqueue(build_alert(item, "new"), ["1"])
+
+        dispatcher = OutboxDispatcher(outbox, FakeNotifier(), latency=tracker)
+        await dispatcher.dispatch_once()
+
+        for stage in ("parsed", "analysed", "queued", "delivered", TOTAL):
+            assert tracker.histograms[stage].count == 1
+        assert tracker.histograms["stored"].count == 0
+        assert tracker.histograms[TOTAL].sum >= 3
@@ -0,0 +1,92 @@
+"""
+Tests for the logging setup.
+"""
+
+import json
+import logging
+import queue
+
+from src.utils.logger import (
+    DebugRateFilter,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    _listeners,
+    setup_logger,
+)
+
+
+def make_record(level=logging.DEBUG, lineno=10, msg="Parsed %s", args=("lot",), **extra):
+    """Build a log record as a logger call at a given line would."""
+    record = logging.LogRecord("test", level, "scraper.py", lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    """Test suite for JSON log lines."""
+
+    def test_fields_and_extras(self):
+        """Test that a record becomes one JSON object including extra fields."""
+        line = JsonFormatter().format(make_record(logging.INFO, lot_id="123"))
+
+        data = json.loads(line)
+        assert data["message"] == "Parsed lot"
+        assert data["level"] == "INFO"
+        assert data["lot_id"] == "123"
+        assert "args" not in data
+
+
+class TestDebugRateFilter:
+    """Test suite for debug rate limiting."""
+
+    def test_limits_per_call_site(self):
+        """Test that each call site gets its own budget of debug records."""
+        rate_filter = DebugRateFilter(rate=3, sample=1.0)
+
+        kept = [rate_filter.filter(make_record(lineno=10)) for _ in range(10)]
+        other_site = rate_filter.filter(make_record(lineno=20))
+
+        assert sum(kept) == 3
+        assert other_site
+        assert rate_filter.dropped == 7
+
+    def test_info_is_never_filtered(self):
+        """Test that records above DEBUG always pass."""
+        rate_filter = DebugRateFilter(rate=1, sample=0.0)
+
+        assert all(rate_filter.filter(make_record(logging.INFO)) for _ in range(5))
+        assert not rate_filter.filter(make_record())
+
+    def test_zero_rate_disables_limit(self):
+        """Test that a rate of 0 keeps every debug record."""
+        rate_filter = DebugRateFilter(rate=0, sample=1.0)
+
+        assert all(rate_filter.filter(make_record()) for _ in range(100))
+
+
+class TestQueuedLogging:
+    """Test suite for the background log writer."""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that records are dropped when the queue is full."""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+
+        for _ in range(5):
+            handler.handle(make_record(logging.INFO))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_records_reach_the_file(self, tmp_path):
+        """Test that queued records are written once the listener is flushed."""
+        log_file = tmp_path / "scraper.log"
+        logger = setup_logger(
+            "test_queued", str(log_file), level="DEBUG", log_format="json", use_queue=True
+        )
+
+        logger.info("Lot changed %s", "123", extra={"lot_id": "123"})
+        _listeners.pop().stop()
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[-1])["lot_id"] == "123"
+        logger.handlers.clear()
@@ -0,0 +1,69 @@
+"""
+Tests for the metrics registry and endpoint.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.metrics.instruments import HEARTBEAT
+from src.metrics.registry import MetricsRegistry
+from src.metrics.server import MetricsServer
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry."""
+
+    def test_exposition_format(self):
+        """Test that counters, gauges and histograms render in the Prometheus format."""
+        registry = MetricsRegistry()
+        pages = registry.counter("pages_total", "Pages fetched", ["kind"])
+        pages.labels("lot").inc(3)
+        pages.labels(kind="listing").inc()
+        registry.gauge("queue_depth", "Queue depth").set_function(lambda: 7)
+        parse = registry.histogram("parse_seconds", "Parse time", buckets=(0.1, 1.0))
+        parse.observe(0.05)
+        parse.observe(0.5)
+
+        text = registry.expose()
+        assert "# TYPE pages_total counter" in text
+        assert 'pages_total{kind="lot"} 3' in text
+        assert 'pages_total{kind="listing"} 1' in text
+        assert "queue_depth 7" in text
+        assert 'parse_seconds_bucket{le="0.1"} 1' in text
+        assert 'parse_seconds_bucket{le="+Inf"} 2' in text
+        assert "parse_seconds_count 2" in text
+
+    def test_metrics_are_shared_by_name(self):
+        """Test that declaring a metric twice returns the same instance."""
+        registry = MetricsRegistry()
+        assert registry.counter("a_total", "A") is registry.counter("a_total", "A")
+        with pytest.raises(ValueError):
+            registry.gauge("a_total", "A")
+        with pytest.raises(ValueError):
+            registry.counter("a_total", "A").inc(-1)
+
+
+class TestMetricsServer:
+    """Test suite for the metrics endpoint."""
+
+    def test_metrics_and_health(self):
+        """Test that /metrics serves the registry and /healthz reports stalls."""
+        registry = MetricsRegistry()
+        registry.counter("alerts_total", "Alerts").inc()
+        with MetricsServer(registry, host="127.0.0.1", port=0, stall_after=60) as server:
+            with urllib.request.urlopen(f"{server.url}/metrics") as response:
+                assert "alerts_total 1" in response.read().decode()
+
+            HEARTBEAT.labels("test-component").set(time.time())
+            with urllib.request.urlopen(f"{server.url}/healthz") as response:
+                assert json.loads(response.read())["ok"]
+
+            HEARTBEAT.labels("test-component").set(time.time() - 120)
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{server.url}/healthz")
+            assert error.value.code == 503
+            HEARTBEAT.labels("test-component").set(time.time())
@@ -0,0 +1,158 @@
+"""
+Tests for the notification clients.
+"""
+
+import asyncio
+import json
+import time
+
+from telegram.error import RetryAfter, TelegramError
+
+from src.notifications.background import BackgroundNotifier
+from src.notifications.base import create_notifier
+from src.notifications.mock_server import MockTelegramServer
+from src.notifications.telegram import TelegramNotifier
+
+
+class FakeBot:
+    """Stand-in for telegram.Bot recording sent messages."""
+
+    def __init__(self, delay: float = 0.0, flood_errors: int = 0, errors: int = 0):
+        self.delay = delay
+        self.flood_errors = flood_errors
+        self.errors = errors
+        self.sent = []
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def send_message(self, chat_id, text):
+        if self.flood_errors:
+            self.flood_errors -= 1
+            raise RetryAfter(0)
+        if self.errors:
+            self.errors -= 1
+            raise TelegramError("Bad Gateway")
+        await asyncio.sleep(self.delay)
+        self.sent.append((chat_id, text, time.monotonic()))
+
+
+class TestTelegramNotifier:
+    """Test suite for TelegramNotifier."""
+
+    async def test_fan_out_is_concurrent(self):
+        """Test that recipients are served in parallel."""
+        bot = FakeBot(delay=0.1)
+        chat_ids = [str(i) for i in range(5)]
+
+        async with TelegramNotifier(chat_ids=chat_ids, bot=bot) as notifier:
+            started = time.monotonic()
+            results = await notifier.send("deal")
+            elapsed = time.monotonic() - started
+
+        assert results == {chat_id: True for chat_id in chat_ids}
+        assert elapsed < 0.3
+
+    async def test_per_chat_rate_limit(self):
+        """Test that messages to one chat are spaced and kept in order."""
+        bot = FakeBot()
+
+        async with TelegramNotifier(chat_ids=["1"], per_chat_rate=20, bot=bot) as notifier:
+            await notifier.send_many(["a", "b", "c"])
+
+        assert [text for _, text, _ in bot.sent] == ["a", "b", "c"]
+        gaps = [later[2] - earlier[2] for earlier, later in zip(bot.sent, bot.sent[1:])]
+        assert min(gaps) >= 0.04
+
+    async def test_flood_control_retried(self):
+        """Test that RetryAfter errors are retried within max_retries."""
+        bot = FakeBot(flood_errors=2)
+
+        async with TelegramNotifier(
+            chat_ids=["1"], per_chat_rate=100, bot=bot, max_retries=3
+        ) as notifier:
+            results = await notifier.send("deal")
+
+        assert results == {"1": True}
+        assert len(bot.sent) == 1
+
+    async def test_flood_control_gives_up(self):
+        """Test that a chat flood-limited on every attempt is given up on."""
+        bot = FakeBot(flood_errors=5)
+
+        async with TelegramNotifier(
+            chat_ids=["1"], per_chat_rate=100, bot=bot, max_retries=2
+        ) as notifier:
+            results = await notifier.send("deal")
+
+        assert results == {"1": False}
+        assert bot.sent == [] and bot.flood_errors == 3
+
+    async def test_transient_error_does_not_stall_the_chat(self):
+        """Test that a failed send is reported at once instead of delaying the chat's queue."""
+        bot = FakeBot(errors=1)
+
+        async with TelegramNotifier(chat_ids=["1"], per_chat_rate=100, bot=bot) as notifier:
+            started = time.monotonic()
+            failed, delivered = await asyncio.gather(notifier.send("a"), notifier.send("b"))
+            elapsed = time.monotonic() - started
+
+        assert failed == {"1": False} and delivered == {"1": True}
+        assert [text for _, text, _ in bot.sent] == ["b"]
+        assert elapsed < 0.5
+
+
+class TestBackgroundNotifier:
+    """Test suite for BackgroundNotifier."""
+
+    def test_submit_from_sync_code(self):
+        """Test that synchronous callers can queue messages."""
+        bot = FakeBot(delay=0.01)
+
+        with BackgroundNotifier(
+            TelegramNotifier(chat_ids=["1", "2"], per_chat_rate=100, bot=bot)
+        ) as notifier:
+            futures = [notifier.submit(f"deal {i}") for i in range(3)]
+            results = [future.result(timeout=5) for future in futures]
+
+        assert all(all(r.values()) for r in results)
+        assert len(bot.sent) == 6
+
+
+class TestBackends:
+    """Test suite for the pluggable notifier backends."""
+
+    async def test_file_backend(self, tmp_path):
+        """Test that the file backend writes one JSON line per recipient."""
+        path = tmp_path / "out.jsonl"
+
+        async with create_notifier("file", file_path=str(path), chat_ids=["1", "2"]) as notifier:
+            results = await notifier.send("deal")
+
+        assert results == {"1": True, "2": True}
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["chat_id"] for line in lines] == ["1", "2"]
+
+    async def test_telegram_against_mock_server(self):
+        """Test the real Telegram client end to end against the local mock API."""
+        with MockTelegramServer() as server:
+            notifier = create_notifier(
+                "telegram", token="0:test", base_url=server.bot_api_url, chat_ids=["1", "2"]
+            )
+            async with notifier:
+                results = await notifier.send("deal")
+
+        assert results == {"1": True, "2": True}
+        assert sorted(m.chat_id for m in server.messages) == ["1", "2"]
+
+    async def test_webhook_against_mock_server(self):
+        """Test the webhook backend against the local mock endpoint."""
+        with MockTelegramServer() as server:
+            async with create_notifier("webhook", url=server.webhook_url, chat_ids=["7"]) as n:
+                results = await n.send("deal")
+
+        assert results == {"7": True}
+        assert server.messages[0].text == "deal"
@@ -0,0 +1,129 @@
+"""
+Tests for lot selection and offer classification.
+"""
+
+import time
+
+from src.analyzer.offers import OfferClassifier, is_underpriced, select_items_to_check
+from src.analyzer.price_stats import PriceStatistics
+from src.notifications.messages import build_alert
+from src.notifications.outbox import NotificationOutbox
+from src.storage.models import WatchItem
+
+
+class TestSelectItemsToCheck:
+    """Test suite for select_items_to_check."""
+
+    def test_underpriced_and_closing_soon(self, make_item):
+        """Test that only cheap lots closing within the time limit are selected."""
+        items = [
+            make_item(1),
+            make_item(2, price="9 900 €"),
+            make_item(3, remaining="5h"),
+            make_item(4, price="No price"),
+            make_item(5, estimated_price="No estimated price"),
+        ]
+
+        selected = select_items_to_check(items, threshold=0.9, time_limit=1800)
+
+        assert [item["url"] for item in selected] == [items[0]["url"]]
+
+    def test_realised_prices_replace_the_estimate(self, make_item):
+        """Test that a lot cheap against its estimate is skipped if such lots close lower."""
+        stats = PriceStatistics()
+        # Omega lots historically close at 40% of their estimate
+        for lot in range(30):
+            stats.record_sale(WatchItem.from_dict(make_item(100 + lot, price="4 000 €")))
+        item = make_item(1)
+
+        assert is_underpriced(item, threshold=0.9)
+        assert not is_underpriced(item, threshold=0.9, price_stats=stats)
+        assert select_items_to_check([item], 0.9, 1800, price_stats=stats) == []
+        # too little history: the estimate is the reference again
+        assert is_underpriced(item, threshold=0.9, price_stats=PriceStatistics())
+
+
+class TestOfferClassifier:
+    """Test suite for OfferClassifier."""
+
+    def test_new_then_updated_then_closing(self, tmp_path, make_item):
+        """Test that alert history decides between new, updated and closing offers."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        classifier = OfferClassifier(outbox, threshold=0.9, time_limit=1800)
+        # as scraped, with non-breaking spaces
+        item = make_item(1, estimated_price="9\xa0000 € - 11\xa0000 €")
+
+        new, updated, closing = classifier.classify([item])
+        assert new == [item] and not updated and not closing
+        assert item["estimated_price"] == "9000 € - 11000 €"
+        outbox.enqueue(build_alert(WatchItem.from_dict(item), "new"), ["1"])
+
+        raised = make_item(1, price="6 000 €")
+        assert classifier.classify([raised]) == ([], [raised], [])
+        outbox.enqueue(build_alert(WatchItem.from_dict(raised), "updated"), ["1"])
+
+        closing_item = make_item(1, price="6 000 €", remaining="45s")
+        assert classifier.classify([closing_item]) == ([], [], [closing_item])
+
+    def test_reserve_not_met_is_ignored(self, tmp_path, make_item):
+        """Test that lots below their reserve are never offered."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        classifier = OfferClassifier(outbox)
+
+        item = make_item(1, reserve_price="Reserve price not reached")
+
+        assert classifier.classify([item]) == ([], [], [])
+
+    def test_only_relists_of_ended_lots_are_skipped(self, tmp_path, make_item):
+        """Test that same-model lots running together are alerted, a relist of an ended one not."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        title = "Omega Seamaster 300M 2531.80 Homme"
+        ended = make_item(1, title=title, remaining="1m", pull_time=time.time() - 3600)
+        outbox.enqueue(build_alert(WatchItem.from_dict(ended), "new"), ["1"])
+        other_title = "Rolex Submariner 16610 Date"
+        running = make_item(2, title=other_title)
+        outbox.enqueue(build_alert(WatchItem.from_dict(running), "new"), ["1"])
+        classifier = OfferClassifier(outbox, threshold=0.9, time_limit=1800)
+
+        relist = make_item(3, title=title)
+        twin = make_item(4, title=other_title)
+        new, _, _ = classifier.classify([relist, twin])
+
+        assert new == [twin]
+        # skipped for now, not for good: it is judged again on the next pass
+        assert classifier.relist_of(WatchItem.from_dict(relist)) == "1"
+
+    def test_relists_are_told_from_their_listing_card(self, tmp_path, make_item):
+        """Test that a card titled like an ended alerted lot is a relist, a running twin not."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        title = "Omega Seamaster 300M 2531.80 Homme"
+        ended = make_item(1, title=title, remaining="1m", pull_time=time.time() - 3600)
+        outbox.enqueue(build_alert(WatchItem.from_dict(ended), "new"), ["1"])
+        running = make_item(2, title="Rolex Submariner 16610 Date")
+        outbox.enqueue(build_alert(WatchItem.from_dict(running), "new"), ["1"])
+        classifier = OfferClassifier(outbox)
+
+        card = {"href": "/fr/l/3-omega", "title": title}
+        assert classifier.relist_of_card(card) == "1"
+        assert (
+            classifier.relist_of_card({"href": "/fr/l/4-rolex", "title": running["title"]}) is None
+        )
+        assert classifier.relist_of_card({"href": "/fr/l/1-omega", "title": title}) is None
+        assert classifier.relist_of_card({"href": "/fr/l/5-omega", "title": None}) is None
+
+    def test_lots_ended_past_the_horizon_are_forgotten(self, tmp_path, make_item):
+        """Test that lots ended longer ago than the relist horizon leave the index."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        title = "Omega Seamaster 300M 2531.80 Homme"
+        old = make_item(1, title=title, remaining="1m", pull_time=time.time() - 7200)
+        recent = make_item(2, title="Rolex Submariner 16610 Date", remaining="1m")
+        for item in (old, recent):
+            outbox.enqueue(build_alert(WatchItem.from_dict(item), "new"), ["1"])
+
+        classifier = OfferClassifier(outbox, relist_horizon=3600)
+
+        assert list(classifier.end_times) == ["2"]
+        assert "1" not in classifier.duplicates and "1" not in classifier.titles
+        assert classifier.relist_of_card({"href": "/fr/l/3-omega", "title": title}) is None
+        assert classifier.prune(now=time.time() + 7200) == 1
+        assert not classifier.end_times and not len(classifier.duplicates)
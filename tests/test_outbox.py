@@ -0,0 +1,91 @@
+"""
+Tests for the durable notification outbox.
+"""
+
+import time
+
+from src.notifications.messages import build_alert
+from src.notifications.outbox import NotificationOutbox, OutboxDispatcher
+
+
+class FakeNotifier:
+    """Async notifier stand-in failing the first `failures` sends."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.sent = []
+
+    async def send(self, message, chat_ids=None):
+        if self.failures:
+            self.failures -= 1
+            return {chat_id: False for chat_id in chat_ids}
+        self.sent.extend((chat_id, message) for chat_id in chat_ids)
+        return {chat_id: True for chat_id in chat_ids}
+
+
+class TestNotificationOutbox:
+    """Test suite for NotificationOutbox."""
+
+    def test_enqueue_is_idempotent_across_restarts(self, tmp_path, make_watch_item):
+        """Test that the same alert is only stored once, even after a restart."""
+        db_path = str(tmp_path / "outbox.db")
+        outbox = NotificationOutbox(db_path)
+        assert outbox.enqueue(build_alert(make_watch_item(42), "new"), ["1", "2"])
+        assert not outbox.enqueue(build_alert(make_watch_item(42), "new"), ["1", "2"])
+        outbox.close()
+
+        restarted = NotificationOutbox(db_path)
+        assert not restarted.enqueue(build_alert(make_watch_item(42), "new"), ["1", "2"])
+        assert restarted.has_alert("42", "new")
+        assert restarted.counts()["pending"] == 2
+
+    def test_updates_keyed_by_state(self, tmp_path, make_watch_item):
+        """Test that updates are stored once per price/reserve state."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        assert outbox.enqueue(build_alert(make_watch_item(42, "6 000 €"), "updated"), ["1"])
+        assert not outbox.enqueue(build_alert(make_watch_item(42, "6 000 €"), "updated"), ["1"])
+        assert outbox.enqueue(build_alert(make_watch_item(42, "6 500 €"), "updated"), ["1"])
+        assert outbox.latest_alert("42").item.price == "6 500 €"
+
+    def test_failures_retried_then_given_up(self, tmp_path, make_watch_item):
+        """Test backoff scheduling and the attempt limit."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"), max_attempts=2, base_delay=0)
+        outbox.enqueue(build_alert(make_watch_item(42), "new"), ["1"])
+
+        delivery = outbox.claim_due()[0]
+        assert outbox.claim_due() == []  # claimed rows are leased
+        outbox.mark_failed(delivery.key, delivery.chat_id, "timeout")
+        assert outbox.counts()["pending"] == 1
+
+        delivery = outbox.claim_due()[0]
+        outbox.mark_failed(delivery.key, delivery.chat_id, "timeout")
+        assert outbox.counts()["failed"] == 1
+
+    def test_alerts_of_closed_lots_expire(self, tmp_path, make_watch_item):
+        """Test that deliveries still pending after the lot closed are expired, not sent."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        closed = make_watch_item(42)
+        closed.pull_time = time.time() - 3600
+        outbox.enqueue(build_alert(closed, "new"), ["1", "2"])
+        outbox.enqueue(build_alert(make_watch_item(42, "6 000 €"), "updated"), ["1"])
+
+        claimed = outbox.claim_due()
+
+        assert [delivery.alert.alert_type for delivery in claimed] == ["updated"]
+        assert outbox.counts()["expired"] == 2
+
+
+class TestOutboxDispatcher:
+    """Test suite for OutboxDispatcher."""
+
+    async def test_dispatch_retries_until_delivered(self, tmp_path, make_watch_item):
+        """Test that a failed send is retried and then recorded as delivered."""
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"), base_delay=0)
+        outbox.enqueue(build_alert(make_watch_item(42), "new"), ["1", "2"])
+        notifier = FakeNotifier(failures=1)
+        dispatcher = OutboxDispatcher(outbox, notifier)
+
+        assert await dispatcher.dispatch_once() == 2
+        assert await dispatcher.dispatch_once() == 1
+        assert outbox.counts() == {"pending": 0, "delivered": 2, "failed": 0, "expired": 0}
+        assert len(notifier.sent) == 2
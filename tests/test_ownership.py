@@ -0,0 +1,91 @@
+"""
+Tests for lease-based lot ownership.
+"""
+
+import time
+
+from src.distributed.ownership import HashRing, LotOwnership
+
+PARTITIONS = 32
+
+
+def make_instance(tmp_path, name: str, lease: float = 30.0) -> LotOwnership:
+    """Build a monitor instance sharing the test database."""
+    return LotOwnership(
+        "monitor",
+        db_path=str(tmp_path / "ownership.db"),
+        instance_id=name,
+        partitions=PARTITIONS,
+        lease=lease,
+    )
+
+
+class TestHashRing:
+    """Test suite for HashRing."""
+
+    def test_leaving_member_only_moves_its_keys(self):
+        """Test that removing a member reassigns its keys and no others."""
+        keys = [str(key) for key in range(1000)]
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b"])
+
+        moved = [key for key in keys if before.owner(key) != after.owner(key)]
+
+        assert moved and all(before.owner(key) == "c" for key in moved)
+        assert 200 < len(moved) < 470
+
+
+class TestLotOwnership:
+    """Test suite for LotOwnership."""
+
+    def test_join_hands_partitions_over_without_overlap(self, tmp_path):
+        """Test that a joining instance gets its share only after the owner released it."""
+        first, second = make_instance(tmp_path, "m1"), make_instance(tmp_path, "m2")
+
+        assert first.refresh() == set(range(PARTITIONS))
+        assert second.refresh() == set()
+
+        first.refresh()
+        second.refresh()
+
+        assert first.owned().isdisjoint(second.owned())
+        assert first.owned() | second.owned() == set(range(PARTITIONS))
+        assert second.owned()
+        assert first.members() == ["m1", "m2"]
+
+    def test_dead_instance_partitions_are_taken_over(self, tmp_path):
+        """Test that partitions of an instance that stopped renewing move after its lease."""
+        dead, survivor = make_instance(tmp_path, "m1", lease=0.2), make_instance(tmp_path, "m2")
+        dead.refresh()
+        survivor.refresh()
+        dead.refresh()
+        assert survivor.refresh() != set(range(PARTITIONS))
+
+        time.sleep(0.3)
+
+        assert dead.owned() == set()
+        assert survivor.refresh() == set(range(PARTITIONS))
+
+    def test_stop_releases_immediately(self, tmp_path):
+        """Test that a stopping instance lets the others take over on their next refresh."""
+        first, second = make_instance(tmp_path, "m1"), make_instance(tmp_path, "m2")
+        first.refresh()
+        second.refresh()
+
+        first.stop()
+
+        assert second.refresh() == set(range(PARTITIONS))
+
+    def test_each_lot_has_one_owner(self, tmp_path):
+        """Test that every item is kept by exactly one of the instances."""
+        instances = [make_instance(tmp_path, f"m{index}") for index in range(3)]
+        for _ in range(2):
+            for instance in instances:
+                instance.refresh()
+        items = [{"url": f"https://www.catawiki.com/fr/l/{lot}-omega"} for lot in range(300)]
+
+        kept = [instance.filter(items) for instance in instances]
+
+        assert sum(len(share) for share in kept) == len(items)
+        assert all(share for share in kept)
+        assert all(instances[0].owns_item(item) for item in kept[0])
@@ -0,0 +1,97 @@
+"""
+Tests for the streaming price statistics.
+"""
+
+import random
+import time
+
+import pytest
+
+from src.analyzer.filters import DealAnalyzer, DealCriteria
+from src.analyzer.price_stats import P2Quantile, PriceStatistics, extract_brand
+
+
+class TestP2Quantile:
+    """Test suite for the streaming quantile estimator."""
+
+    def test_median_close_to_exact(self):
+        """Test that the streaming median tracks the exact median."""
+        rng = random.Random(42)
+        values = [rng.uniform(0, 1000) for _ in range(5000)]
+        estimator = P2Quantile(0.5)
+        for value in values:
+            estimator.add(value)
+
+        exact = sorted(values)[len(values) // 2]
+        assert estimator.value == pytest.approx(exact, rel=0.05)
+
+    def test_round_trip(self):
+        """Test that serialized estimators keep their state."""
+        estimator = P2Quantile(0.75)
+        for value in range(100):
+            estimator.add(float(value))
+
+        restored = P2Quantile.from_dict(estimator.to_dict())
+        restored.add(100.0)
+        estimator.add(100.0)
+        assert restored.value == estimator.value
+
+
+class TestPriceStatistics:
+    """Test suite for PriceStatistics."""
+
+    def test_extract_brand(self):
+        """Test brand detection from titles."""
+        assert extract_brand("Rolex - Submariner - 16610") == "rolex"
+        assert extract_brand("TAG Heuer Carrera") == "tag heuer"
+        assert extract_brand("Unknownbrand Diver") == "unknownbrand"
+
+    def test_sale_recorded_once(self, make_watch_item):
+        """Test that the same lot is only recorded once."""
+        stats = PriceStatistics()
+        item = make_watch_item(1, "6 000 €", title="Omega Speedmaster")
+
+        assert stats.record_sale(item)
+        assert not stats.record_sale(item)
+        assert stats.get("omega").count == 1
+
+    def test_only_sales_seen_near_the_close_are_observed(self, make_watch_item):
+        """Test that an ended lot counts only if it was last scraped shortly before closing."""
+        stats = PriceStatistics(close_window=120)
+        closing = make_watch_item(1, "6 000 €", "1m", title="Omega Speedmaster")
+        early = make_watch_item(2, "1 000 €", "2j", title="Omega Speedmaster")
+        closing.pull_time = early.pull_time = time.time() - 3 * 24 * 3600
+
+        assert stats.observe(closing)
+        assert not stats.observe(early)
+        assert stats.get("omega").count == 1
+
+    def test_persistence(self, tmp_path, make_watch_item):
+        """Test that statistics survive a save/load cycle."""
+        path = tmp_path / "stats.json"
+        stats = PriceStatistics(str(path))
+        for lot_id in range(10):
+            stats.record_sale(make_watch_item(lot_id, "5 000 €", title="Seiko 5"))
+        assert stats.save()
+
+        restored = PriceStatistics(str(path))
+        assert restored.get("seiko").count == 10
+        assert not restored.record_sale(make_watch_item(3, "5 000 €", title="Seiko 5"))
+
+    def test_analyzer_uses_realised_prices(self, make_watch_item):
+        """Test that deal scores use realised prices once history exists."""
+        stats = PriceStatistics()
+        # Rolex lots historically close at 50% of their estimate
+        for lot_id in range(30):
+            stats.record_sale(make_watch_item(lot_id, "5 000 €", title="Rolex Datejust"))
+
+        item = make_watch_item(100, "6 000 €", title="Rolex Datejust")
+        plain = DealAnalyzer()
+        informed = DealAnalyzer(DealCriteria(min_price_samples=20), price_stats=stats)
+
+        assert plain.get_deal_score(item) == pytest.approx(0.6)
+        assert informed.get_deal_score(item) == pytest.approx(1.2)
+
+        is_good, reason = informed.is_good_deal(item)
+        assert not is_good
+        assert "realised price" in reason
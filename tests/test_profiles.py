@@ -0,0 +1,128 @@
+"""
+Tests for persistent browser profiles.
+"""
+
+from selenium.common.exceptions import WebDriverException
+
+from src.scraper.browser import BrowserManager
+from src.scraper.profiles import ProfileStore
+
+
+class FakeDriver:
+    """Stand-in for a Chrome driver started on a profile."""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.quit_called = False
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class ProfileBrowserManager(BrowserManager):
+    """BrowserManager whose launches fail while a profile contains a broken file."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.launches = []
+
+    def launch(self, profile=None):
+        self.launches.append(profile.path if profile is not None else None)
+        if profile is not None and (profile.path / "broken").exists():
+            raise WebDriverException("Chrome failed to start: crashed")
+        return FakeDriver(profile)
+
+
+class TestProfileStore:
+    """Test suite for ProfileStore."""
+
+    def test_slots_are_leased_one_browser_at_a_time(self, tmp_path):
+        """Test that a held slot is skipped, also by another process, and reused once released."""
+        store = ProfileStore(str(tmp_path), slots=2)
+        # a second store on the same directory stands for another process
+        other = ProfileStore(str(tmp_path), slots=2)
+
+        first = store.acquire()
+        second = other.acquire()
+
+        assert (first.name, second.name) == ("0", "1")
+        assert store.acquire() is None
+        store.release(first)
+        assert other.acquire().name == "0"
+
+    def test_new_slot_starts_from_the_template(self, tmp_path):
+        """Test that a new slot copies the template without Chrome's stale locks."""
+        store = ProfileStore(str(tmp_path), slots=1)
+        (store.template / "Default").mkdir(parents=True)
+        (store.template / "Default" / "Cookies").write_text("consent")
+        (store.template / "SingletonLock").write_text("host-123")
+
+        lease = store.acquire()
+
+        assert lease.fresh
+        assert (lease.path / "Default" / "Cookies").read_text() == "consent"
+        assert not (lease.path / "SingletonLock").exists()
+
+    def test_used_slot_is_kept_without_stale_locks(self, tmp_path):
+        """Test that a used slot keeps its cache but loses the locks of a crashed browser."""
+        store = ProfileStore(str(tmp_path), slots=1)
+        lease = store.acquire()
+        (lease.path / "Cache").write_text("bundles")
+        store.release(lease)
+        (lease.path / "SingletonLock").symlink_to("host-123")
+
+        again = store.acquire()
+
+        assert not again.fresh
+        assert (again.path / "Cache").read_text() == "bundles"
+        assert not (again.path / "SingletonLock").is_symlink()
+
+    def test_reset_skips_profiles_in_use(self, tmp_path):
+        """Test that reset deletes free slots and the template but not a leased slot."""
+        store = ProfileStore(str(tmp_path), slots=2)
+        store.template.mkdir(parents=True)
+        held = store.acquire()
+        store.release(store.acquire())
+
+        deleted = store.reset()
+
+        assert deleted == ["1", "template"]
+        assert held.path.is_dir()
+        assert not store.template.exists()
+
+    def test_empty_root_disables_profiles(self):
+        """Test that an empty directory setting means temporary profiles."""
+        assert not ProfileStore("")
+
+
+class TestBrowserManagerProfiles:
+    """Test suite for BrowserManager on persistent profiles."""
+
+    def test_profile_released_when_driver_quits(self, tmp_path):
+        """Test that a driver holds its slot until the browser is closed."""
+        store = ProfileStore(str(tmp_path), slots=1)
+        browser = ProfileBrowserManager(warm_spare=False, profiles=store)
+
+        driver = browser.get_driver()
+        assert driver.profile.name == "0"
+        assert store.acquire() is None
+
+        browser.close()
+
+        assert driver.quit_called
+        assert store.acquire().name == "0"
+
+    def test_corrupted_profile_is_emptied_and_retried(self, tmp_path):
+        """Test that Chrome failing on a used profile gets it emptied and a second launch."""
+        store = ProfileStore(str(tmp_path), slots=1)
+        lease = store.acquire()
+        (lease.path / "broken").write_text("")
+        store.release(lease)
+        browser = ProfileBrowserManager(warm_spare=False, profiles=store)
+
+        driver = browser.get_driver()
+
+        assert browser.launches == [lease.path, lease.path]
+        assert driver.profile.fresh
+        assert not (lease.path / "broken").exists()
+        browser.close()
@@ -0,0 +1,69 @@
+"""
+Tests for the profiling hooks.
+"""
+
+import time
+
+import pytest
+
+from src.metrics import profiling
+
+
+@pytest.fixture
+def enabled_profiling(tmp_path):
+    """Turn profiling on for one test, writing reports to a temporary directory."""
+    saved = dict(profiling._config)
+    profiling.configure(enabled=True, output_dir=str(tmp_path), cycle=1)
+    profiling.reset_spans()
+    yield tmp_path
+    profiling._config.update(saved)
+    profiling.reset_spans()
+
+
+class TestSpans:
+    """Test suite for stage spans."""
+
+    def test_disabled_spans_are_free(self):
+        """Test that spans and decorators are no-ops while profiling is off."""
+
+        def work():
+            return 42
+
+        assert not profiling.is_enabled()
+        assert profiling.span("parse") is profiling.span("store")
+        assert profiling.timed("analyze")(work) is work
+
+    def test_nested_spans_fold_to_self_time(self, enabled_profiling):
+        """Test that nested spans are reported with their self time."""
+        with profiling.span("cycle"):
+            with profiling.span("parse"):
+                time.sleep(0.01)
+            profiling.record_span("store", 0.5)
+
+        totals = profiling.span_totals()
+        assert totals[("cycle", "parse")][0] == 1
+        assert totals[("cycle", "store")] == (1, 0.5)
+        folded = dict(line.rsplit(" ", 1) for line in profiling.folded_spans().splitlines())
+        assert int(folded["cycle;store"]) == 500000
+        assert int(folded["cycle;parse"]) >= 10000
+        assert "parse" in profiling.span_report()
+
+
+class TestCycleProfiler:
+    """Test suite for per-cycle capture."""
+
+    @pytest.mark.parametrize("profiler, suffix", [("cprofile", ".prof"), ("sampling", ".folded")])
+    def test_captures_configured_cycle(self, enabled_profiling, profiler, suffix):
+        """Test that only the configured cycle is captured and dumped."""
+        profiling.configure(profiler=profiler, cycle=2, interval=0.001)
+        cycles = profiling.CycleProfiler("loop")
+        for _ in range(3):
+            cycles.next_cycle()
+            with profiling.span("analyze"):
+                time.sleep(0.02)
+        cycles.finish()
+
+        dumps = sorted(p.name for p in enabled_profiling.iterdir())
+        assert any(name.startswith("loop-2-") and name.endswith(suffix) for name in dumps)
+        assert any(name.endswith(".spans.folded") for name in dumps)
+        assert not any(name.startswith(("loop-1-", "loop-3-")) for name in dumps)
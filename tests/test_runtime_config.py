@@ -0,0 +1,93 @@
+"""
+Tests for the hot-reloadable runtime configuration.
+"""
+
+import json
+from dataclasses import replace
+
+import pytest
+
+from src.analyzer.filters import DealAnalyzer, DealCriteria
+from src.config.runtime import ConfigManager, RuntimeConfig, parse_overrides, runtime_config
+
+
+@pytest.fixture
+def restore_runtime_config():
+    """Put the process-wide configuration back after a test."""
+    saved = runtime_config.current()
+    yield runtime_config
+    runtime_config.update(saved)
+
+
+class TestParseOverrides:
+    """Test suite for parse_overrides."""
+
+    def test_environment_names_are_applied(self):
+        """Test that overrides use environment names and are cast to the field type."""
+        config = parse_overrides({"PRICE_PERCENTAGE_THRESHOLD": "0.8", "SCRAPER_MAX_ITEMS": 50})
+
+        assert config.price_threshold == 0.8
+        assert config.scraper_max_items == 50
+        assert config.page_load_delay == RuntimeConfig().page_load_delay
+
+    def test_invalid_overrides_are_rejected(self):
+        """Test that unknown keys, non-numbers and out-of-range values raise."""
+        with pytest.raises(ValueError, match="Unknown setting"):
+            parse_overrides({"PRICE_THRESHOLD": 0.8})
+        with pytest.raises(ValueError, match="must be a number"):
+            parse_overrides({"SCRAPER_SCROLL_DELAY": "fast"})
+        with pytest.raises(ValueError, match="price_threshold"):
+            parse_overrides({"PRICE_PERCENTAGE_THRESHOLD": 1.5})
+
+
+class TestConfigManager:
+    """Test suite for ConfigManager."""
+
+    def test_reload_from_file(self, tmp_path):
+        """Test that the file is applied, listeners notified and removal restores defaults."""
+        path = tmp_path / "runtime_config.json"
+        manager = ConfigManager(str(path))
+        seen = []
+        manager.subscribe(lambda old, new: seen.append((old.price_threshold, new.price_threshold)))
+
+        path.write_text(json.dumps({"PRICE_PERCENTAGE_THRESHOLD": 0.7}))
+        assert manager.reload()
+        assert manager.current().price_threshold == 0.7
+        assert not manager.reload()
+
+        path.unlink()
+        assert manager.reload()
+        assert seen == [
+            (RuntimeConfig().price_threshold, 0.7),
+            (0.7, RuntimeConfig().price_threshold),
+        ]
+        assert manager.version == 2
+
+    def test_invalid_file_keeps_current(self, tmp_path):
+        """Test that a broken or invalid file leaves the running configuration in place."""
+        path = tmp_path / "runtime_config.json"
+        manager = ConfigManager(str(path))
+        path.write_text(json.dumps({"REMAINING_TIME_THRESHOLD": 600}))
+        manager.reload()
+
+        for content in ("{not json", json.dumps({"REMAINING_TIME_THRESHOLD": -1}), "[]"):
+            path.write_text(content)
+            assert not manager.reload()
+            assert manager.current().remaining_time_threshold == 600
+
+
+class TestLiveCriteria:
+    """Test suite for analyzers following the runtime configuration."""
+
+    def test_analyzer_follows_updates(self, restore_runtime_config, make_watch_item):
+        """Test that default criteria follow updates while explicit criteria stay pinned."""
+        live = DealAnalyzer()
+        pinned = DealAnalyzer(DealCriteria(price_threshold=0.9))
+        item = make_watch_item(1, "8 500 €")
+
+        assert live.is_good_deal(item)[0] and pinned.is_good_deal(item)[0]
+
+        restore_runtime_config.update(replace(RuntimeConfig(), price_threshold=0.8))
+
+        assert not live.is_good_deal(item)[0]
+        assert pinned.is_good_deal(item)[0]
@@ -0,0 +1,121 @@
+"""
+Tests for incremental listing crawls.
+"""
+
+import contextlib
+import io
+import time
+
+import main as scraper
+from src.bench.scraper import HttpDriver
+from src.daemon import ScraperDaemon
+from src.notifications.outbox import NotificationOutbox
+from src.scraper.fixture_server import CatawikiFixtureServer
+from src.storage.memory_store import ItemStore
+from src.storage.seen_lots import SeenLots, lot_key, sorted_by_closing
+
+
+class TestSeenLots:
+    """Test suite for SeenLots."""
+
+    def test_lots_are_kept_until_they_end(self, tmp_path, make_item):
+        """Test that recorded lots persist with their closing time and leave once ended."""
+        seen = SeenLots(str(tmp_path / "seen.json"))
+        running, ending = make_item(1, remaining="20m"), make_item(2, remaining="1s")
+        seen.record(running)
+        seen.record(ending)
+        assert seen.save()
+
+        restored = SeenLots(str(tmp_path / "seen.json"))
+        assert restored.end_time("1") == seen.end_time("1")
+        assert restored.prune(now=time.time() + 60) == 1
+        assert "1" in restored and "2" not in restored
+
+    def test_lot_key_is_the_lot_id(self):
+        """Test that a lot is known by its ID whatever the URL's slug or language."""
+        assert lot_key("https://www.catawiki.com/fr/l/123-omega") == "123"
+        assert lot_key("https://www.catawiki.com/en/l/123-omega-speedmaster?x=1") == "123"
+
+    def test_only_listings_sorted_by_closing_qualify(self):
+        """Test that incremental crawls are only allowed on a listing with new lots on top."""
+        assert sorted_by_closing("https://www.catawiki.com/fr/c/333-montres?sort=bidding_end_desc")
+        assert sorted_by_closing("https://x/c/1?filters=a%3Db&sort=bidding_end_desc")
+        assert not sorted_by_closing("https://www.catawiki.com/fr/c/333-montres")
+        assert not sorted_by_closing("https://x/c/1?sort=bidding_end_asc")
+
+
+class TestIncrementalListing:
+    """Test suite for listing crawls stopping at known lots."""
+
+    def test_listing_stops_at_a_run_of_known_lots(self):
+        """Test that only new lots are collected and the listing is not read past known ones."""
+        with CatawikiFixtureServer(lots=60, per_page=25, scroll_batch=0) as server:
+            urls = [server.lot_url(lot) for lot in server.lots]
+            known = {lot_key(url) for url in urls[10:]}
+            driver = HttpDriver()
+            with contextlib.redirect_stdout(io.StringIO()):
+                links = scraper.get_object_links_with_scroll(
+                    server.listing_url, driver=driver, known=known, known_run=5
+                )
+            driver.close()
+
+            assert sorted(links) == sorted(urls[:10])
+            assert server.stats()["listing"] == 1
+
+
+class TestIncrementalDaemon:
+    """Test suite for ScraperDaemon incremental crawls."""
+
+    def test_only_new_lots_are_fetched_between_full_crawls(self, tmp_path, make_item):
+        """Test that crawls after the first fetch only new lots, and every nth is full."""
+        lots = {item["url"]: item for item in (make_item(1), make_item(2))}
+        fetched = []
+        seen_by_fetcher = []
+
+        def fetch_links(url, known=None):
+            seen_by_fetcher.append(known is not None)
+            return list(lots)
+
+        def fetch_item(url):
+            fetched.append(url)
+            return dict(lots[url])
+
+        daemon = ScraperDaemon(
+            store=ItemStore(str(tmp_path / "items.json")),
+            fetch_links=fetch_links,
+            fetch_item=fetch_item,
+            outbox=NotificationOutbox(str(tmp_path / "outbox.db")),
+            incremental=True,
+            seen_lots=SeenLots(str(tmp_path / "seen.json")),
+            full_crawl_every=3,
+        )
+
+        assert daemon.crawl_once() == 2
+        new = make_item(3)
+        lots[new["url"]] = new
+        assert daemon.crawl_once() == 1
+        assert daemon.crawl_once() == 0
+        assert daemon.crawl_once() == 3
+
+        assert seen_by_fetcher == [False, True, True, False]
+        assert fetched[2] == new["url"]
+        assert len(SeenLots(str(tmp_path / "seen.json"))) == 3
+
+    def test_unsorted_listing_is_always_crawled_in_full(self, tmp_path):
+        """Test that a listing not sorted by closing date never gets an incremental crawl."""
+        seen_by_fetcher = []
+        daemon = ScraperDaemon(
+            store=ItemStore(str(tmp_path / "items.json")),
+            listing_url="https://www.catawiki.com/fr/c/333-montres",
+            fetch_links=lambda url, known=None: seen_by_fetcher.append(known) or [],
+            fetch_item=lambda url: None,
+            outbox=NotificationOutbox(str(tmp_path / "outbox.db")),
+            incremental=True,
+            seen_lots=SeenLots(str(tmp_path / "seen.json")),
+        )
+
+        daemon.crawl_once()
+        daemon.crawl_once()
+
+        assert daemon.seen_lots is None
+        assert seen_by_fetcher == [None, None]
@@ -0,0 +1,186 @@
+"""
+Tests for the final-window sniping tracker.
+"""
+
+from selenium.common.exceptions import WebDriverException
+
+from src.notifications.outbox import NotificationOutbox
+from src.scraper.sniping import SnipingTracker
+
+
+class FakeSwitchTo:
+    """Window switching of FakeTabDriver."""
+
+    def __init__(self, driver: "FakeTabDriver"):
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        if handle not in self.driver.window_handles:
+            raise WebDriverException("no such window")
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind: str) -> None:
+        handle = f"tab-{self.driver.opened}"
+        self.driver.opened += 1
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+
+class FakeTabDriver:
+    """Stand-in for a driver whose tabs show live lot fields."""
+
+    def __init__(self):
+        self.window_handles = ["tab-0"]
+        self.current_window_handle = "tab-0"
+        self.opened = 1
+        self.switch_to = FakeSwitchTo(self)
+        self.urls = {}
+        # URL -> fields the page currently shows
+        self.pages = {}
+
+    def get(self, url: str) -> None:
+        self.urls[self.current_window_handle] = url
+
+    def execute_script(self, script: str, *args):
+        url = self.urls[self.current_window_handle]
+        return dict(self.pages[url])
+
+    def close(self) -> None:
+        self.window_handles.remove(self.current_window_handle)
+
+
+class DeadDriver:
+    """Stand-in for a driver whose browser died: every command raises."""
+
+    def __getattr__(self, name):
+        raise WebDriverException("chrome not reachable")
+
+
+class FakeBrowser:
+    """BrowserManager stand-in holding one FakeTabDriver."""
+
+    def __init__(self, rss: int = 0):
+        self.driver = FakeTabDriver()
+        self.rss = rss
+        self.discarded = []
+
+    def get_driver(self) -> FakeTabDriver:
+        return self.driver
+
+    def driver_rss(self, driver) -> int:
+        return self.rss
+
+    def discard(self, reason: str = "crash") -> None:
+        self.discarded.append(reason)
+        self.driver = FakeTabDriver()
+
+    def close(self) -> None:
+        pass
+
+
+def page(price: str = "5 000 €", remaining: str = "1m 10s") -> dict:
+    """Fields of a live lot page."""
+    return {
+        "time": remaining,
+        "title": "Omega Speedmaster",
+        "price": price,
+        "estimate": "9 000 - 11 000 € ",
+        "reserve": "Sans prix de réserve",
+    }
+
+
+class TestSnipingTracker:
+    """Test suite for SnipingTracker."""
+
+    def make_tracker(self, tmp_path, items, browser=None, **kwargs):
+        """Build a tracker on a fake browser and a temporary outbox."""
+        return SnipingTracker(
+            lambda: items,
+            NotificationOutbox(str(tmp_path / "outbox.db")),
+            browser=browser or FakeBrowser(),
+            **kwargs,
+        )
+
+    def test_soonest_deals_are_tracked_up_to_the_cap(self, tmp_path, make_item):
+        """Test that only deals in the window are tracked, soonest first, within max_lots."""
+        items = [
+            make_item(1, remaining="4m"),
+            make_item(2, remaining="1m"),
+            make_item(3, remaining="2m"),
+            make_item(4, remaining="1h"),
+            make_item(5, remaining="30s", price="9 500 €"),
+        ]
+        tracker = self.make_tracker(tmp_path, items, window=300, max_lots=2)
+
+        tracked = tracker.select(items)
+
+        assert tracked == [items[1]["url"], items[2]["url"]]
+        assert tracker.overflow == 1
+        assert tracker.tracked == frozenset(tracked)
+        assert len(tracker.browser.driver.window_handles) == 3
+
+    def test_every_observation_reaches_the_alert_path(self, tmp_path, make_item):
+        """Test that live readings queue new, closing and updated alerts without reloads."""
+        item = make_item(7, remaining="2m")
+        updates = []
+        tracker = self.make_tracker(tmp_path, [item], on_update=updates.append)
+        driver = tracker.browser.driver
+        driver.pages[item["url"]] = page()
+        tracker.select([item])
+
+        first = tracker.observe_once()
+        second = tracker.observe_once()
+        driver.pages[item["url"]] = page(price="5 500 €")
+        third = tracker.observe_once()
+
+        assert (first, second, third) == (1, 1, 1)
+        assert tracker.outbox.has_alert("7", "new")
+        assert tracker.outbox.has_alert("7", "closing")
+        assert tracker.outbox.has_alert("7", "updated")
+        assert [update["price"] for update in updates] == ["5 000 €", "5 500 €"]
+        assert list(driver.urls.values()) == [item["url"]]
+
+    def test_failed_tab_is_dropped(self, tmp_path, make_item):
+        """Test that a tab that disappeared is dropped until the next selection."""
+        item = make_item(8, remaining="2m")
+        tracker = self.make_tracker(tmp_path, [item])
+        driver = tracker.browser.driver
+        driver.pages[item["url"]] = page()
+        tracker.select([item])
+        driver.window_handles.remove(tracker.lots[item["url"]].handle)
+
+        tracker.observe_once()
+
+        assert tracker.lots == {}
+        tracker.select([item])
+        assert list(tracker.lots) == [item["url"]]
+
+    def test_dead_browser_is_replaced_and_lots_pinned_again(self, tmp_path, make_item):
+        """Test that a crashed browser is discarded and the next selection uses a new one."""
+        item = make_item(9, remaining="2m")
+        tracker = self.make_tracker(tmp_path, [item])
+        browser = tracker.browser
+        browser.driver.pages[item["url"]] = page()
+        tracker.select([item])
+        browser.driver = DeadDriver()
+
+        assert tracker.observe_once() == 0
+
+        assert browser.discarded == ["crash"]
+        assert tracker.lots == {} and tracker.tracked == frozenset()
+        browser.driver.pages[item["url"]] = page()
+        tracker.select([item])
+        assert tracker.observe_once() == 1
+        assert browser.driver.urls == {tracker.lots[item["url"]].handle: item["url"]}
+
+    def test_memory_recycling_waits_for_an_empty_browser(self, tmp_path, make_item):
+        """Test that an oversized browser is only replaced while no lot is pinned."""
+        first, second = make_item(10, remaining="2m"), make_item(11, remaining="2m")
+        browser = FakeBrowser(rss=10 * 1024**3)
+        tracker = self.make_tracker(tmp_path, [], browser=browser)
+
+        tracker.select([first])
+        tracker.select([first, second])
+
+        assert browser.discarded == ["memory"]
+        assert list(tracker.lots) == [first["url"], second["url"]]
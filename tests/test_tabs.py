@@ -0,0 +1,189 @@
+"""
+Tests for concurrent page loads in browser tabs.
+"""
+
+import time
+
+from src.scraper.blocking import RequestBlocker
+from src.scraper.browser import BrowserManager, wait_for_load
+from src.scraper.tabs import _NAVIGATE, TabPool
+
+
+class FakeSwitchTo:
+    """Window switching of FakeTabDriver."""
+
+    def __init__(self, driver: "FakeTabDriver"):
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        assert handle in self.driver.windows
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind: str) -> None:
+        handle = f"tab-{self.driver.opened}"
+        self.driver.opened += 1
+        self.driver.windows[handle] = (None, 0.0)
+        self.driver.current_window_handle = handle
+
+
+class FakeTabDriver:
+    """Stand-in for a Chrome driver whose tabs load pages after a delay."""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.windows = {"tab-0": (None, 0.0)}
+        self.current_window_handle = "tab-0"
+        self.opened = 1
+        self.closed = []
+        self.quit_called = False
+        self.blocked = {}
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_cdp_cmd(self, command: str, params: dict):
+        if command == "Network.setBlockedURLs":
+            self.blocked[self.current_window_handle] = params["urls"]
+        return {}
+
+    def execute_script(self, script: str, *args):
+        handle = self.current_window_handle
+        if script == _NAVIGATE:
+            url = args[0]
+            ready_at = float("inf") if "hang" in url else time.monotonic() + self.delay
+            self.windows[handle] = (url, ready_at)
+            return None
+        url, ready_at = self.windows[handle]
+        return "ready" if time.monotonic() >= ready_at else "loading"
+
+    @property
+    def page_source(self) -> str:
+        return f"<html>{self.windows[self.current_window_handle][0]}</html>"
+
+    def close(self) -> None:
+        self.closed.append(self.current_window_handle)
+        del self.windows[self.current_window_handle]
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class TabBrowserManager(BrowserManager):
+    """BrowserManager launching fake tab drivers."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.launched = []
+
+    def _create_driver(self):
+        driver = FakeTabDriver(delay=0.01)
+        self.launched.append(driver)
+        return driver
+
+
+def lot_urls(count: int):
+    """Lot page URLs."""
+    return [f"https://www.catawiki.com/fr/l/{lot}" for lot in range(count)]
+
+
+class TestTabPool:
+    """Test suite for TabPool."""
+
+    def test_pages_load_concurrently(self):
+        """Test that pages in different tabs load at the same time."""
+        driver = FakeTabDriver(delay=0.1)
+        pool = TabPool(driver, size=4, timeout=5.0, poll_interval=0.005)
+        urls = lot_urls(8)
+
+        started = time.monotonic()
+        pages = list(pool.fetch(urls))
+        elapsed = time.monotonic() - started
+
+        assert sorted(page.url for page in pages) == sorted(urls)
+        assert all(page.content == f"<html>{page.url}</html>" for page in pages)
+        assert len(driver.windows) == 4
+        assert elapsed < 0.6
+
+    def test_hung_tab_is_reset(self):
+        """Test that a page past the timeout comes back empty and its tab is replaced."""
+        driver = FakeTabDriver(delay=0.02)
+        pool = TabPool(driver, size=2, timeout=0.2, poll_interval=0.005)
+        urls = ["https://www.catawiki.com/fr/l/hang"] + lot_urls(5)
+
+        pages = {page.url: page for page in pool.fetch(urls)}
+
+        assert pages["https://www.catawiki.com/fr/l/hang"].content is None
+        assert all(pages[url].content for url in urls[1:])
+        assert len(driver.closed) == 1
+        assert len(driver.windows) == 2
+
+    def test_close_keeps_first_tab(self):
+        """Test that closing the pool leaves the browser on its original tab."""
+        driver = FakeTabDriver(delay=0.0)
+        pool = TabPool(driver, size=3, poll_interval=0.005)
+        list(pool.fetch(lot_urls(3)))
+
+        pool.close()
+
+        assert list(driver.windows) == ["tab-0"]
+        assert driver.current_window_handle == "tab-0"
+
+
+class TestBrowserManagerTabs:
+    """Test suite for BrowserManager.fetch_pages."""
+
+    def test_pages_count_towards_recycling(self):
+        """Test that tabbed pages count against max_pages and recycle between batches."""
+        browser = TabBrowserManager(max_pages=8, max_rss_mb=0, warm_spare=False, tabs=2)
+        urls = lot_urls(16)
+
+        pages = list(browser.fetch_pages(urls))
+
+        assert sorted(page.url for page in pages) == sorted(urls)
+        assert len(browser.launched) == 2
+        assert browser.pages == 8
+        browser.close()
+
+    def test_new_tabs_block_requests(self):
+        """Test that the request blocking is applied to every tab the pool opens."""
+        blocker = RequestBlocker(resources=["font"], urls=[])
+        browser = TabBrowserManager(max_pages=0, max_rss_mb=0, tabs=3, blocker=blocker)
+
+        list(browser.fetch_pages(lot_urls(3)))
+
+        driver = browser.launched[0]
+        assert set(driver.blocked) == {"tab-1", "tab-2"}
+        assert all(urls == blocker.patterns for urls in driver.blocked.values())
+
+    def test_tab_drivers_do_not_wait_for_page_loads(self, monkeypatch):
+        """Test that only drivers serving tabs are launched on the "none" page load strategy."""
+        from src.scraper import browser as browser_module
+
+        strategies = []
+
+        def chrome(service=None, options=None):
+            strategies.append(options.page_load_strategy)
+            return FakeTabDriver()
+
+        monkeypatch.setattr(browser_module.webdriver, "Chrome", chrome)
+        blocker = RequestBlocker(resources=[], urls=[])
+        for tabs in (4, 1):
+            BrowserManager(tabs=tabs, blocker=blocker, chromedriver_binary="").launch()
+
+        assert strategies == ["none", "normal"]
+
+    def test_wait_for_load_only_on_drivers_that_do_not_wait(self):
+        """Test that get() is followed by a wait for the document on "none" drivers only."""
+
+        class LoadingDriver:
+            def __init__(self, strategy):
+                self.capabilities = {"pageLoadStrategy": strategy}
+                self.polls = 0
+
+            def execute_script(self, script, *args):
+                self.polls += 1
+                return "complete" if self.polls >= 3 else "loading"
+
+        eager, lazy = LoadingDriver("normal"), LoadingDriver("none")
+        wait_for_load(eager)
+        wait_for_load(lazy, timeout=5)
+
+        assert (eager.polls, lazy.polls) == (0, 3)